@@ -0,0 +1,213 @@
+"""
+Account State Cache
+
+In-memory snapshot of positions and balances for the trading hot path.
+Pushed updates (e.g. Hyperliquid webData2 over WebSocket) keep it fresh,
+our own orders and fills invalidate it, and a TTL-bounded REST refresh
+through the exchange adapter backs it up when the feed goes quiet.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from interfaces.exchange import Balance, ExchangeAdapter
+from interfaces.strategy import Position
+
+
+class AccountStateCache:
+    """
+    Positions and balances served from memory.
+
+    Reads return the cached snapshot unless it is older than `ttl` seconds
+    or has been invalidated, in which case one shared REST refresh runs and
+    every concurrent reader awaits it.
+    """
+
+    def __init__(
+        self,
+        exchange: ExchangeAdapter,
+        ttl: float = 30.0,
+        balance_assets: Iterable[str] = ("USD",),
+        clock: Callable[[], float] = time.time,
+    ):
+        self.exchange = exchange
+        self.ttl = ttl
+        self.balance_assets = list(balance_assets)
+        self._clock = clock
+
+        self._positions: List[Position] = []
+        self._balances: Dict[str, Balance] = {}
+        self._updated_at: Optional[float] = None
+        self._dirty = True
+        self._generation = 0  # bumped on every invalidation
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.rest_refreshes = 0
+        self.refresh_errors = 0
+        self.pushed_updates = 0
+        self.invalidations = 0
+        self.last_source: Optional[str] = None
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------ state
+
+    @property
+    def age(self) -> Optional[float]:
+        if self._updated_at is None:
+            return None
+        return self._clock() - self._updated_at
+
+    def is_stale(self) -> bool:
+        return self._dirty or self._updated_at is None or self.age > self.ttl
+
+    def invalidate(self, reason: str = "") -> None:
+        """Mark the snapshot stale and start refreshing it in the background"""
+
+        self._dirty = True
+        self._generation += 1
+        self.invalidations += 1
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._start_refresh()
+
+    def apply_snapshot(
+        self,
+        positions: List[Position],
+        balances: Optional[Dict[str, Balance]] = None,
+        source: str = "push",
+    ) -> None:
+        """Replace the snapshot with state pushed by the exchange feed"""
+
+        self._positions = list(positions)
+        if balances is not None and source == "push":
+            # Feeds may only carry some balances; keep the rest from REST
+            self._balances.update(balances)
+        elif balances is not None:
+            self._balances = dict(balances)
+        self._updated_at = self._clock()
+        self._dirty = False
+        self.last_source = source
+        if source == "push":
+            self.pushed_updates += 1
+
+    def mark_price(self, asset: str, price: float) -> None:
+        """Revalue cached positions in `asset` at the latest price"""
+
+        for idx, position in enumerate(self._positions):
+            if position.asset != asset:
+                continue
+            unrealized = (
+                position.size * (price - position.entry_price)
+                if position.entry_price > 0
+                else 0.0
+            )
+            self._positions[idx] = replace(
+                position,
+                current_value=abs(position.size) * price,
+                unrealized_pnl=unrealized,
+            )
+
+    # ------------------------------------------------------------------ refresh
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        # Retrieve the exception even when nobody awaits a background refresh
+        if task.cancelled() or task.exception() is None:
+            return
+        self.refresh_errors += 1
+        self._dirty = True
+        self.logger.warning(f"⚠️ Account state refresh failed: {task.exception()}")
+
+    async def _refresh(self) -> None:
+        generation = self._generation
+        # Adapters that swallow errors into [] expose a raising variant; an
+        # empty list from a failed call must not be cached as "no positions"
+        fetch_positions = getattr(self.exchange, "fetch_positions", self.exchange.get_positions)
+        positions = await fetch_positions()
+        balances = {
+            asset: await self.exchange.get_balance(asset) for asset in self.balance_assets
+        }
+        self.rest_refreshes += 1
+        self.apply_snapshot(positions, balances, source="rest")
+        if self._generation != generation:
+            # Invalidated mid-flight: this data may predate the change
+            self._dirty = True
+
+    async def refresh(self) -> None:
+        """Force a REST refresh (shared with any refresh already running)"""
+
+        await asyncio.shield(self._start_refresh())
+
+    async def _ensure_fresh(self) -> None:
+        if self.is_stale():
+            await self.refresh()
+
+    # ------------------------------------------------------------------ reads
+
+    async def get_positions(self) -> List[Position]:
+        await self._ensure_fresh()
+        return list(self._positions)
+
+    async def get_balance(self, asset: str) -> Balance:
+        if asset not in self.balance_assets:
+            self.balance_assets.append(asset)
+            self._dirty = True
+        await self._ensure_fresh()
+        return self._balances.get(
+            asset, Balance(asset=asset, available=0.0, locked=0.0, total=0.0)
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "age": self.age,
+            "stale": self.is_stale(),
+            "positions": len(self._positions),
+            "rest_refreshes": self.rest_refreshes,
+            "refresh_errors": self.refresh_errors,
+            "pushed_updates": self.pushed_updates,
+            "invalidations": self.invalidations,
+            "last_source": self.last_source,
+        }
+
+
+async def subscribe_account_feed(
+    cache: AccountStateCache, exchange: ExchangeAdapter, market_data: Any
+) -> bool:
+    """
+    Keep `cache` fed from the exchange's user channels (webData2 / userEvents).
+
+    Returns False when the exchange or feed does not support account pushes,
+    in which case the cache relies on TTL-bounded REST refreshes.
+    """
+
+    user = getattr(exchange, "wallet_address", None)
+    parse_user_state = getattr(exchange, "parse_user_state", None)
+    record_account_state = getattr(exchange, "record_account_state", None)
+    if not user or not parse_user_state or not market_data:
+        return False
+
+    def on_user_state(payload: Dict[str, Any]) -> None:
+        state = payload.get("clearinghouseState")
+        if not state:
+            return
+        positions, balances = parse_user_state(state, market_data.get_latest_price)
+        cache.apply_snapshot(positions, balances)
+        if record_account_state:
+            record_account_state(state)
+
+    def on_user_event(payload: Dict[str, Any]) -> None:
+        if payload.get("fills") or payload.get("liquidation"):
+            cache.invalidate("fill")
+
+    await market_data.subscribe_user_updates(user, on_user_state, on_user_event)
+    return True
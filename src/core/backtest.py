@@ -0,0 +1,352 @@
+"""
+Backtesting
+
+Replays historical candles through the live decision path: each candle
+becomes one or more ticks fed to TradingEngine._handle_price_update, which
+runs the strategy, risk manager and order tracker against a
+BacktestExchange. Time comes from a simulated clock advanced by the ticks,
+so there are no sleeps and no WebSocket.
+
+With ML enabled, the model reads the replay's closed candles (never
+MongoDB), so a signal evaluated during a bar only sees the bars before it.
+"""
+
+import asyncio
+import copy
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.engine import TradingEngine
+from exchanges.paper import BacktestExchange
+from interfaces.strategy import MarketData
+from utils.candle_time import interval_to_ms
+
+
+class SimulatedClock:
+    """Callable clock the backtest moves forward tick by tick"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance_to(self, timestamp: float) -> None:
+        if timestamp > self.now:
+            self.now = timestamp
+
+
+class ReplayFeed:
+    """
+    Stands in for HyperliquidMarketData: the backtester pushes ticks into
+    the engine itself, the feed only remembers the latest one per asset.
+    """
+
+    candles = None
+
+    def __init__(self) -> None:
+        self.latest: Dict[str, MarketData] = {}
+        self.ticks = 0
+
+    async def connect(self) -> bool:
+        return True
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def subscribe_price_updates(self, asset: str, callback: Callable) -> None:
+        pass
+
+    async def unsubscribe_price_updates(self, asset: str, callback: Callable) -> None:
+        pass
+
+    def push(self, market_data: MarketData) -> None:
+        self.latest[market_data.asset] = market_data
+        self.ticks += 1
+
+    def get_latest_data(self, asset: str) -> Optional[MarketData]:
+        return self.latest.get(asset)
+
+    def get_latest_price(self, asset: str) -> Optional[float]:
+        data = self.latest.get(asset)
+        return data.price if data else None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"replay": True, "ticks": self.ticks}
+
+
+class ReplayCandles:
+    """
+    Candle source for the ML service: the candles the replay has closed so
+    far, oldest first (the interface of the live CandleAggregator).
+    """
+
+    def __init__(self, symbol: str, timeframe: str, capacity: int):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.intervals = {timeframe: interval_to_ms(timeframe)}
+        self._closed: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+
+    def close(self, candle: Dict[str, Any]) -> None:
+        self._closed.append(candle)
+
+    def closed_candles(
+        self, asset: str, timeframe: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        if (asset, timeframe) != (self.symbol, self.timeframe):
+            return []
+        if limit is None or limit >= len(self._closed):
+            return list(self._closed)
+        return list(self._closed)[-limit:]
+
+    def latest_closed(self, asset: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        if (asset, timeframe) != (self.symbol, self.timeframe) or not self._closed:
+            return None
+        return self._closed[-1]
+
+
+def candle_ticks(
+    candle: Dict[str, Any], interval_ms: int, ticks_per_bar: int = 4
+) -> List[Tuple[float, float]]:
+    """
+    Synthetic (timestamp, price) ticks for one candle.
+
+    One tick replays the close only. Four or more walk open -> low -> high
+    -> close (open -> high -> low -> close on a down bar), interpolating
+    between those points, so resting orders see the bar's full range.
+    """
+
+    start = candle["open_time"] / 1000.0
+    span = (interval_ms - 1) / 1000.0
+    if ticks_per_bar == 1:
+        return [(start + span, float(candle["close"]))]
+    if ticks_per_bar < 4:
+        raise ValueError("ticks_per_bar must be 1 or at least 4")
+
+    open_, close = float(candle["open"]), float(candle["close"])
+    high, low = float(candle["high"]), float(candle["low"])
+    path = [open_, low, high, close] if close >= open_ else [open_, high, low, close]
+    ticks = []
+    for idx in range(ticks_per_bar):
+        position = idx * 3 / (ticks_per_bar - 1)
+        segment = min(int(position), 2)
+        fraction = position - segment
+        price = path[segment] + (path[segment + 1] - path[segment]) * fraction
+        ticks.append((start + span * idx / (ticks_per_bar - 1), price))
+    return ticks
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of one backtest run"""
+
+    symbol: str
+    bars: int
+    ticks: int
+    initial_balance: float
+    final_equity: float
+    realized_pnl: float
+    unrealized_pnl: float
+    fees_paid: float
+    trades: int
+    orders_placed: int
+    orders_cancelled: int
+    max_drawdown_pct: float
+    elapsed: float
+    start_time: Optional[int] = None
+    end_time: Optional[int] = None
+    # (candle open_time, equity at the bar's close)
+    equity_curve: List[Tuple[int, float]] = field(default_factory=list)
+
+    @property
+    def total_pnl(self) -> float:
+        return self.final_equity - self.initial_balance
+
+    @property
+    def return_pct(self) -> float:
+        if not self.initial_balance:
+            return 0.0
+        return self.total_pnl / self.initial_balance * 100
+
+    def to_dict(self, include_curve: bool = False) -> Dict[str, Any]:
+        data = {
+            "symbol": self.symbol,
+            "bars": self.bars,
+            "ticks": self.ticks,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "initial_balance": self.initial_balance,
+            "final_equity": self.final_equity,
+            "total_pnl": self.total_pnl,
+            "return_pct": self.return_pct,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "fees_paid": self.fees_paid,
+            "trades": self.trades,
+            "orders_placed": self.orders_placed,
+            "orders_cancelled": self.orders_cancelled,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "elapsed": self.elapsed,
+        }
+        if include_curve:
+            data["equity_curve"] = [list(point) for point in self.equity_curve]
+        return data
+
+
+class Backtester:
+    """
+    Runs one engine config over a candle series.
+
+    `config` is an engine config (what TradingEngine takes); it is copied,
+    with paper trading on. Candles are dicts with open_time (ms) and
+    open/high/low/close/volume, ascending. With ML enabled the first
+    `ml.lookback` candles only fill the model's window and are not traded,
+    and the shared signal cache is off.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        candles: Iterable[Dict[str, Any]],
+        initial_balance: float = 1000.0,
+        ticks_per_bar: int = 4,
+        maker_fee: float = 0.00015,
+        taker_fee: float = 0.00045,
+        log_level: str = "WARNING",
+    ):
+        self.config = copy.deepcopy(config)
+        self.config["paper"] = {"enabled": True, "initial_balance": initial_balance}
+        ml_config = self.config.get("ml") or {}
+        if ml_config.get("enabled"):
+            self.config["ml"] = {**ml_config, "signal_cache": {"enabled": False}}
+        self.config.setdefault("log_level", log_level)
+        strategy_config = self.config.setdefault("strategy", {})
+        self.symbol = strategy_config.get("symbol", "BTC")
+        self.interval_ms = interval_to_ms(strategy_config.get("timeframe", "15m"))
+
+        self.candles = candles
+        self.initial_balance = initial_balance
+        self.ticks_per_bar = ticks_per_bar
+        self.log_level = log_level
+
+        self.clock = SimulatedClock()
+        self.exchange = BacktestExchange(
+            self.symbol,
+            initial_balance,
+            clock=self.clock,
+            maker_fee=maker_fee,
+            taker_fee=taker_fee,
+        )
+        self.feed = ReplayFeed()
+        self.replay_candles: Optional[ReplayCandles] = None
+        self.engine: Optional[TradingEngine] = None
+
+    async def _start_engine(self) -> TradingEngine:
+        await self.exchange.connect()
+        engine = TradingEngine(
+            self.config, exchange=self.exchange, market_data=self.feed, clock=self.clock
+        )
+        engine.logger.setLevel(self.log_level)
+        if not await engine.initialize():
+            raise RuntimeError("Backtest engine failed to initialize")
+        for component in (engine.strategy, engine.risk_manager):
+            logger = getattr(component, "logger", None)
+            if logger is not None:
+                logger.setLevel(self.log_level)
+        # Fills from the simulated book go through the order tracker, as live
+        self.exchange.fill_listener = engine.order_tracker.on_user_fills
+        if engine.ml_service:
+            service = engine.ml_service
+            self.replay_candles = ReplayCandles(
+                service.symbol, service.timeframe, service.history_limit
+            )
+            service.attach_candle_source(self.replay_candles, seed=False)
+        engine.running = True
+        return engine
+
+    def _ticks(
+        self, candles: Iterable[Dict[str, Any]]
+    ) -> Iterator[Tuple[Dict[str, Any], float, float]]:
+        for candle in candles:
+            for timestamp, price in candle_ticks(candle, self.interval_ms, self.ticks_per_bar):
+                yield candle, timestamp, price
+
+    async def run(self) -> BacktestResult:
+        started = time.perf_counter()
+        self.engine = engine = await self._start_engine()
+        exchange = self.exchange
+        replay_candles = self.replay_candles
+        candles = iter(self.candles)
+        if replay_candles is not None:
+            for candle in itertools.islice(candles, engine.ml_service.lookback):
+                replay_candles.close(candle)
+
+        bars = ticks = 0
+        peak = self.initial_balance
+        max_drawdown = 0.0
+        curve: List[Tuple[int, float]] = []
+        first_bar: Optional[int] = None
+        last_candle: Optional[Dict[str, Any]] = None
+
+        for candle, timestamp, price in self._ticks(candles):
+            if candle is not last_candle:
+                if last_candle is not None:
+                    curve.append((int(last_candle["open_time"]), exchange._equity()))
+                    if replay_candles is not None:
+                        replay_candles.close(last_candle)
+                last_candle = candle
+                bars += 1
+                if first_bar is None:
+                    first_bar = int(candle["open_time"])
+
+            self.clock.advance_to(timestamp)
+            market_data = MarketData(
+                asset=self.symbol,
+                price=price,
+                volume_24h=float(candle.get("volume", 0.0)),
+                timestamp=timestamp,
+            )
+            self.feed.push(market_data)
+            await engine._handle_price_update(market_data)
+            ticks += 1
+
+            equity = exchange._equity()
+            if equity > peak:
+                peak = equity
+            elif peak > 0:
+                max_drawdown = max(max_drawdown, (peak - equity) / peak * 100)
+
+        if last_candle is not None:
+            curve.append((int(last_candle["open_time"]), exchange._equity()))
+        await engine.stop()
+
+        summary = exchange.get_summary()
+        return BacktestResult(
+            symbol=self.symbol,
+            bars=bars,
+            ticks=ticks,
+            initial_balance=self.initial_balance,
+            final_equity=summary["equity"],
+            realized_pnl=summary["realized_pnl"],
+            unrealized_pnl=summary["unrealized_pnl"],
+            fees_paid=summary["fees_paid"],
+            trades=summary["trade_count"],
+            orders_placed=summary["orders_placed"],
+            orders_cancelled=summary["orders_cancelled"],
+            max_drawdown_pct=max_drawdown,
+            elapsed=time.perf_counter() - started,
+            start_time=first_bar,
+            end_time=int(last_candle["open_time"]) if last_candle else None,
+            equity_curve=curve,
+        )
+
+
+def run_backtest(
+    config: Dict[str, Any], candles: Iterable[Dict[str, Any]], **options: Any
+) -> BacktestResult:
+    """Synchronous wrapper around Backtester.run"""
+
+    return asyncio.run(Backtester(config, candles, **options).run())
@@ -8,7 +8,7 @@ Clean, focused responsibility - no confusing naming like "enhanced" or "advanced
 import asyncio
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import logging
 
 from interfaces.strategy import (
@@ -26,9 +26,13 @@ from interfaces.exchange import (
     OrderStatus,
 )
 from exchanges.hyperliquid import HyperliquidMarketData
+from core.account_state import AccountStateCache, subscribe_account_feed
+from core.order_tracker import OrderTracker
 from core.key_manager import key_manager
-from core.risk_manager import RiskManager, RiskEvent, RiskAction, AccountMetrics
+from core.risk_manager import RiskManager, RiskEvent, RiskAction
 from ml.service import MLSignalService
+from ml.signal_cache import SignalCache, create_signal_cache
+from utils.candle_time import bar_open_time, interval_to_ms
 from utils.pattern_helpers import classify_pattern
 
 
@@ -43,26 +47,51 @@ class TradingEngine:
     - Coordinate between all components
 
     This is the main "bot" - clean and focused.
+
+    An exchange adapter, market data feed, account state cache or ML signal
+    cache passed in is treated as shared (e.g. by BotSupervisor): the engine
+    uses it but does not connect, feed or disconnect it, and only ever
+    cancels its own orders. `clock` lets a backtest run on simulated time.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        exchange: Optional[ExchangeAdapter] = None,
+        market_data: Optional[HyperliquidMarketData] = None,
+        account_state: Optional[AccountStateCache] = None,
+        signal_cache: Optional[SignalCache] = None,
+        clock: Callable[[], float] = time.time,
+    ):
         self.config = config
         self.running = False
+        self._clock = clock
 
         # Core components
         self.strategy: Optional[TradingStrategy] = None
-        self.exchange: Optional[ExchangeAdapter] = None
-        self.market_data: Optional[HyperliquidMarketData] = None
+        self.exchange: Optional[ExchangeAdapter] = exchange
+        self.market_data: Optional[HyperliquidMarketData] = market_data
         self.risk_manager: Optional[RiskManager] = None
         self.ml_service: Optional[MLSignalService] = None
+        self.account_state: Optional[AccountStateCache] = account_state
+        self.signal_cache = signal_cache
+        self._shared_exchange = exchange is not None
+        self._shared_market_data = market_data is not None
+        self._shared_account_state = account_state is not None
 
         # State tracking
         self.current_positions: List[Position] = []
-        self.pending_orders: Dict[str, Order] = {}
+        self.order_tracker = OrderTracker(on_fill=self._on_order_filled, clock=clock)
         self.executed_trades = 0
         self.total_pnl = 0.0
         self._ml_signal_cache: Optional[Dict[str, Any]] = None
         self._ml_last_eval = 0.0
+        # ML results are memoized per closed bar (open_time of the latest closed candle)
+        self._ml_cache_bar: Optional[int] = None
+        self._ml_eval_task: Optional[asyncio.Future] = None
+        self._ml_eval_task_bar: Optional[int] = None
+        self._ml_evaluations = 0
+        self._ml_cache_hits = 0
         ml_config = self.config.get("ml", {}) or {}
         self._ml_enter_threshold = ml_config.get("enter_threshold", 0.6)
         self._ml_exit_threshold = ml_config.get("exit_threshold", 0.4)
@@ -106,6 +135,15 @@ class TradingEngine:
             if not await self._initialize_market_data():
                 return False
 
+            # Market orders price off the streamed mid instead of all_mids
+            self._attach_price_provider()
+
+            # Cache account state fed by the user WebSocket channels
+            await self._initialize_account_state()
+
+            # Track our orders from the order update / fill streams
+            await self._initialize_order_tracking()
+
             # Initialize strategy
             if not self._initialize_strategy():
                 return False
@@ -128,6 +166,9 @@ class TradingEngine:
     async def _initialize_exchange(self) -> bool:
         """Initialize exchange adapter"""
 
+        if self._shared_exchange:
+            return self.exchange.is_connected
+
         paper_config = self.config.get("paper", {}) or {}
         exchange_config = self.config.get("exchange", {})
         testnet = exchange_config.get("testnet", True)
@@ -179,8 +220,24 @@ class TradingEngine:
     async def _initialize_market_data(self) -> bool:
         """Initialize market data provider"""
 
+        if self._shared_market_data:
+            return True
+
         testnet = self.config.get("exchange", {}).get("testnet", True)
-        self.market_data = HyperliquidMarketData(testnet)
+        md_config = self.config.get("market_data", {}) or {}
+        candle_persist = None
+        if md_config.get("persist_candles"):
+            from exchanges.hyperliquid.candle_builder import mongo_candle_sink
+
+            candle_persist = mongo_candle_sink(
+                md_config.get("candle_collection", "live_candles")
+            )
+        self.market_data = HyperliquidMarketData(
+            testnet,
+            candle_timeframes=md_config.get("candle_timeframes", ["1m", "5m", "15m"]),
+            candle_capacity=md_config.get("candle_capacity", 1000),
+            candle_persist=candle_persist,
+        )
 
         if await self.market_data.connect():
             self.logger.info("✅ Market data provider connected")
@@ -189,6 +246,98 @@ class TradingEngine:
             self.logger.error("❌ Failed to connect to market data")
             return False
 
+    def _attach_price_provider(self) -> None:
+        set_price_provider = getattr(self.exchange, "set_price_provider", None)
+        if not callable(set_price_provider) or not self.market_data:
+            return
+        max_age = (self.config.get("exchange", {}) or {}).get("max_price_age")
+        set_price_provider(self.market_data.get_latest_data, max_age)
+
+    async def _initialize_account_state(self) -> None:
+        """Serve positions/balance from memory instead of REST on every tick"""
+
+        account_config = self.config.get("account_state", {}) or {}
+        # PaperExchange already answers from memory; a shared cache is fed by its owner
+        if self._paper_mode or self._shared_account_state or not account_config.get("enabled", True):
+            return
+
+        self.account_state = AccountStateCache(
+            self.exchange, ttl=float(account_config.get("ttl", 30.0))
+        )
+        if await subscribe_account_feed(self.account_state, self.exchange, self.market_data):
+            self.logger.info("✅ Account state cache enabled (ttl %.0fs)", self.account_state.ttl)
+
+    async def _initialize_order_tracking(self) -> None:
+        """Feed the order tracker from orderUpdates / userFills"""
+
+        if self._paper_mode:
+            # Paper orders fill on placement and report it like userFills
+            self.exchange.fill_listener = self.order_tracker.on_user_fills
+            return
+
+        user = getattr(self.exchange, "wallet_address", None)
+        subscribe = getattr(self.market_data, "subscribe_order_updates", None)
+        if not user or not subscribe:
+            return
+
+        # A shared exchange gets its fills once, from whoever owns it
+        exchange_fills = (
+            None if self._shared_exchange else getattr(self.exchange, "on_user_fills", None)
+        )
+
+        def on_user_fills(payload: Dict[str, Any]) -> None:
+            self.order_tracker.on_user_fills(payload)
+            if exchange_fills:
+                # Realized PnL / fees for the exchange's equity curve
+                exchange_fills(payload)
+
+        await subscribe(user, self.order_tracker.on_order_updates, on_user_fills)
+        self.logger.info("✅ Order tracking enabled")
+
+    @property
+    def pending_orders(self) -> Dict[str, Order]:
+        """Open orders by client id, maintained by the order tracker"""
+        return self.order_tracker.open_by_id
+
+    def _on_order_filled(self, order: Order, signal: Optional[TradingSignal]) -> None:
+        """Called once per order when the tracker sees it filled"""
+
+        self.logger.info(
+            f"✅ Order filled: {order.side.value} {order.filled_size} {order.asset} @ ${order.average_fill_price:.2f}"
+        )
+        self.executed_trades += 1
+        if self.strategy and signal is not None:
+            try:
+                self.strategy.on_trade_executed(
+                    signal, order.average_fill_price, order.filled_size
+                )
+            except Exception as e:
+                self.logger.error(f"❌ Error in on_trade_executed: {e}")
+        if self.risk_manager:
+            self.risk_manager.request_account_sync()
+
+    def _invalidate_account_state(self, reason: str) -> None:
+        if self.account_state:
+            self.account_state.invalidate(reason)
+
+    def _owns_asset(self, asset: str) -> bool:
+        """On a shared exchange only the strategy's own symbol is ours to manage"""
+        if not self._shared_exchange:
+            return True
+        return asset == self.config.get("strategy", {}).get("symbol", "BTC")
+
+    async def _get_positions(self) -> List[Position]:
+        if self.account_state:
+            positions = await self.account_state.get_positions()
+        else:
+            positions = await self.exchange.get_positions()
+        return [position for position in positions if self._owns_asset(position.asset)]
+
+    async def _get_balance(self, asset: str):
+        if self.account_state:
+            return await self.account_state.get_balance(asset)
+        return await self.exchange.get_balance(asset)
+
     def _initialize_strategy(self) -> bool:
         """Initialize trading strategy"""
 
@@ -212,7 +361,7 @@ class TradingEngine:
         """Initialize risk manager"""
 
         try:
-            self.risk_manager = RiskManager(self.config)
+            self.risk_manager = RiskManager(self.config, clock=self._clock)
             self.logger.info("✅ Risk manager initialized")
             return True
 
@@ -239,14 +388,34 @@ class TradingEngine:
                 pattern_horizon=ml_config.get("pattern_horizon", 4),
                 context_days=ml_config.get("context_days", 7),
             )
+            self.ml_service.signal_cache = self.signal_cache or create_signal_cache(
+                ml_config.get("signal_cache")
+            )
             self.logger.info(
                 "✅ ML signal service enabled (model: %s)", ml_config["model_path"]
             )
+            self._attach_live_candles()
             return True
         except Exception as exc:
             self.logger.error(f"❌ Failed to initialize ML service: {exc}")
             return False
 
+    def _attach_live_candles(self) -> None:
+        """Let the ML service read candles streamed by the market data feed"""
+
+        candles = getattr(self.market_data, "candles", None)
+        if not candles or self.ml_service.timeframe not in candles.intervals:
+            return
+        try:
+            self.ml_service.attach_candle_source(candles)
+            candles.add_listener(self._on_candle_closed)
+            self.logger.info(
+                "✅ ML service reading %s candles from the live feed",
+                self.ml_service.timeframe,
+            )
+        except Exception as exc:
+            self.logger.warning(f"⚠️ Live candles unavailable for ML, using MongoDB: {exc}")
+
     async def start(self) -> None:
         """Start the trading engine"""
 
@@ -277,7 +446,7 @@ class TradingEngine:
         if self.exchange:
             try:
                 # Get current positions before shutdown
-                current_positions = await self.exchange.get_positions()
+                current_positions = await self._get_positions()
 
                 if current_positions:
                     self.logger.info(
@@ -295,17 +464,23 @@ class TradingEngine:
                     )
 
                 # Cancel all pending orders
-                cancelled_orders = await self.exchange.cancel_all_orders()
+                cancelled_orders = await self._cancel_orders()
                 if cancelled_orders > 0:
                     self.logger.info(f"✅ Cancelled {cancelled_orders} pending orders")
 
             except Exception as e:
                 self.logger.error(f"❌ Error during cleanup: {e}")
 
-        # Disconnect components
-        if self.market_data:
+        # Disconnect components (shared ones belong to their owner)
+        if self.market_data and self._shared_market_data:
+            asset = self.config.get("strategy", {}).get("symbol", "BTC")
+            await self.market_data.unsubscribe_price_updates(asset, self._handle_price_update)
+            candles = getattr(self.market_data, "candles", None)
+            if candles:
+                candles.remove_listener(self._on_candle_closed)
+        elif self.market_data:
             await self.market_data.disconnect()
-        if self.exchange:
+        if self.exchange and not self._shared_exchange:
             await self.exchange.disconnect()
 
         self.logger.info("✅ Trading engine stopped")
@@ -320,13 +495,14 @@ class TradingEngine:
             update_price = getattr(self.exchange, "update_price", None)
             if callable(update_price):
                 update_price(market_data.price)
-            # Update current positions from exchange
-            self.current_positions = await self.exchange.get_positions()
+            if self.account_state:
+                self.account_state.mark_price(market_data.asset, market_data.price)
+
+            # Update current positions (cached account state when available)
+            self.current_positions = await self._get_positions()
 
             # Get current balance
-            balance_info = await self.exchange.get_balance(
-                "USD"
-            )  # Assuming USD balance
+            balance_info = await self._get_balance("USD")  # Assuming USD balance
             balance = balance_info.available
 
             # Risk management check
@@ -391,31 +567,84 @@ class TradingEngine:
                 market_data, self.current_positions, balance
             )
 
-            # Execute signals
-            for signal in signals:
-                await self._execute_signal(signal)
+            # Execute signals (orders from one call go out as a single batch)
+            await self._execute_signals(signals)
 
         except Exception as e:
             self.logger.error(f"❌ Error handling price update: {e}")
 
-    async def _evaluate_ml_signal(self) -> Optional[Dict[str, Any]]:
-        """Evaluate ML signal with caching"""
+    def _current_ml_bar(self) -> int:
+        """open_time of the latest closed candle the ML signal should reflect"""
 
-        if not self.ml_service:
-            return None
+        interval_ms = interval_to_ms(self.ml_service.timeframe)
+        source = getattr(self.ml_service, "candle_source", None)
+        if source is not None:
+            latest = source.latest_closed(self.ml_service.symbol, self.ml_service.timeframe)
+            if latest:
+                return bar_open_time(latest["open_time"], interval_ms)
+        return bar_open_time(int(self._clock() * 1000), interval_ms) - interval_ms
+
+    def _ml_signal_bar(self, signal: Dict[str, Any]) -> int:
+        """
+        Bar a signal was computed from. MongoDB candles from the Hyperliquid
+        collector are labelled with their close time, so labels are floored
+        to the bar open before comparing with `_current_ml_bar`.
+        """
+
+        timestamp = signal.get("timestamp")
+        if not timestamp:
+            return 0
+        return bar_open_time(timestamp, interval_to_ms(self.ml_service.timeframe))
+
+    async def _on_candle_closed(self, candle: Dict[str, Any]) -> None:
+        """Bar-close hook: evaluate ML as soon as the model's candle closes"""
 
-        now = time.time()
         if (
-            self._ml_signal_cache
-            and now - self._ml_last_eval < self._ml_eval_interval
+            not self.running
+            or not self.ml_service
+            or candle.get("symbol") != self.ml_service.symbol
+            or candle.get("timeframe") != self.ml_service.timeframe
         ):
-            return self._ml_signal_cache
+            return
+        await self._evaluate_ml_signal()
 
+    async def _evaluate_ml_signal(self) -> Optional[Dict[str, Any]]:
+        """
+        Evaluate the ML signal once per closed candle.
+
+        The result is memoized until the next bar closes. If the candle source
+        lags behind the clock (e.g. MongoDB not yet updated), the evaluation is
+        retried every `eval_interval` seconds until the new bar shows up.
+        """
+
+        if not self.ml_service:
+            return None
+
+        bar = self._current_ml_bar()
+        if self._ml_signal_cache is not None and self._ml_cache_bar == bar:
+            lagging = self._ml_signal_bar(self._ml_signal_cache) < bar
+            if not lagging or self._clock() - self._ml_last_eval < self._ml_eval_interval:
+                self._ml_cache_hits += 1
+                return self._ml_signal_cache
+
+        # Concurrent ticks for the same bar share one evaluation
+        task = self._ml_eval_task
+        if task is None or task.done() or self._ml_eval_task_bar != bar:
+            task = asyncio.ensure_future(self._run_ml_evaluation(bar))
+            self._ml_eval_task = task
+            self._ml_eval_task_bar = bar
+        return await asyncio.shield(task)
+
+    async def _run_ml_evaluation(self, bar: int) -> Optional[Dict[str, Any]]:
         loop = asyncio.get_running_loop()
         try:
-            signal = await loop.run_in_executor(None, self.ml_service.evaluate_signal)
+            signal = await loop.run_in_executor(None, self.ml_service.evaluate_cached, bar)
+            self._ml_evaluations += 1
+            if self._ml_cache_bar is not None and bar < self._ml_cache_bar:
+                return signal  # Superseded by a newer bar's evaluation
             self._ml_signal_cache = signal
-            self._ml_last_eval = now
+            self._ml_cache_bar = bar
+            self._ml_last_eval = self._clock()
             probability = signal.get("probability", 0.0)
             active_patterns = [
                 name for name, value in (signal.get("patterns") or {}).items() if value
@@ -628,24 +857,21 @@ class TradingEngine:
         """Handle risk management events"""
 
         try:
-            # Get account metrics
-            account_metrics_data = await self.exchange.get_account_metrics()
-            account_metrics = AccountMetrics(
-                total_value=account_metrics_data.get("total_value", 0.0),
-                total_pnl=account_metrics_data.get("total_pnl", 0.0),
-                unrealized_pnl=account_metrics_data.get("unrealized_pnl", 0.0),
-                realized_pnl=account_metrics_data.get("realized_pnl", 0.0),
-                drawdown_pct=account_metrics_data.get("drawdown_pct", 0.0),
-                positions_count=account_metrics_data.get("positions_count", 0),
-                largest_position_pct=account_metrics_data.get(
-                    "largest_position_pct", 0.0
-                ),
-            )
+            # Account value comes from the exchange only when a re-sync is due
+            # (interval elapsed or a fill landed); ticks update it locally
+            if self.risk_manager.account_sync_due():
+                account_metrics_data = await self.exchange.get_account_metrics()
+                self.risk_manager.sync_account(
+                    account_metrics_data.get("total_value", 0.0),
+                    positions=self.current_positions,
+                    realized_pnl=account_metrics_data.get("realized_pnl"),
+                    high_water_mark=account_metrics_data.get("high_water_mark"),
+                    equity=account_metrics_data.get("equity"),
+                )
 
-            # Evaluate risk events
-            market_data_dict = {market_data.asset: market_data}
-            risk_events = self.risk_manager.evaluate_risks(
-                self.current_positions, market_data_dict, account_metrics
+            # Only rules affected by this tick are evaluated
+            risk_events = self.risk_manager.on_market_data(
+                market_data, self.current_positions
             )
 
             # Handle risk events
@@ -661,7 +887,12 @@ class TradingEngine:
         try:
             self.logger.warning(f"🚨 Risk Event: {event.reason}")
 
-            if event.action == RiskAction.CLOSE_POSITION:
+            if event.action in (RiskAction.CLOSE_POSITION, RiskAction.REDUCE_POSITION) and (
+                not self._owns_asset(event.asset)
+            ):
+                self.logger.warning(f"⚠️ {event.asset} belongs to another bot, not touching it")
+
+            elif event.action == RiskAction.CLOSE_POSITION:
                 success = await self.exchange.close_position(event.asset)
                 if success:
                     self.logger.info(f"✅ Position closed for {event.asset}")
@@ -685,7 +916,7 @@ class TradingEngine:
                         break
 
             elif event.action == RiskAction.CANCEL_ORDERS:
-                cancelled = await self.exchange.cancel_all_orders()
+                cancelled = await self._cancel_orders()
                 self.logger.info(f"✅ Cancelled {cancelled} orders")
 
             elif event.action == RiskAction.PAUSE_TRADING:
@@ -695,12 +926,13 @@ class TradingEngine:
 
             elif event.action == RiskAction.EMERGENCY_EXIT:
                 self.logger.critical(f"🚨 EMERGENCY EXIT: {event.reason}")
-                # Get fresh positions from exchange and close all
+                # Get fresh positions from exchange and close ours
                 current_positions = await self.exchange.get_positions()
                 for pos in current_positions:
-                    await self.exchange.close_position(pos.asset)
+                    if self._owns_asset(pos.asset):
+                        await self.exchange.close_position(pos.asset)
                 # Cancel all orders
-                await self.exchange.cancel_all_orders()
+                await self._cancel_orders()
                 # Stop trading
                 if self.strategy:
                     self.strategy.is_active = False
@@ -709,13 +941,31 @@ class TradingEngine:
             self.logger.error(
                 f"❌ Error executing risk action for {event.rule_name}: {e}"
             )
+        finally:
+            if event.action != RiskAction.PAUSE_TRADING:
+                self._invalidate_account_state(f"risk action {event.action.value}")
+                self.risk_manager.request_account_sync()
+
+    async def _execute_signals(self, signals: List[TradingSignal]) -> None:
+        """Execute signals in order, batching consecutive BUY/SELL signals"""
+
+        batch: List[TradingSignal] = []
+        for signal in signals:
+            if signal.signal_type in [SignalType.BUY, SignalType.SELL]:
+                batch.append(signal)
+                continue
+            # Keep ordering: e.g. a rebalance cancel must run before the new grid
+            await self._place_orders(batch)
+            batch = []
+            await self._execute_signal(signal)
+        await self._place_orders(batch)
 
     async def _execute_signal(self, signal: TradingSignal) -> None:
         """Execute a trading signal"""
 
         try:
             if signal.signal_type in [SignalType.BUY, SignalType.SELL]:
-                await self._place_order(signal)
+                await self._place_orders([signal])
             elif signal.signal_type == SignalType.CLOSE:
                 await self._close_positions(signal)
 
@@ -725,46 +975,89 @@ class TradingEngine:
             if self.strategy:
                 self.strategy.on_error(e, {"signal": signal})
 
-    async def _place_order(self, signal: TradingSignal) -> None:
-        """Place an order based on trading signal"""
-
-        # Create order
-        current_time = time.time()
-        order = Order(
-            id=f"order_{int(current_time * 1000)}",  # Simple ID generation
-            asset=signal.asset,
-            side=OrderSide.BUY
-            if signal.signal_type == SignalType.BUY
-            else OrderSide.SELL,
-            size=signal.size,
-            order_type=OrderType.LIMIT if signal.price else OrderType.MARKET,
-            price=signal.price,
-            created_at=current_time,
-        )
+    async def _place_orders(self, signals: List[TradingSignal]) -> None:
+        """Place the orders for a group of signals in one exchange request"""
 
-        # Place order with exchange
-        exchange_order_id = await self.exchange.place_order(order)
-        if exchange_order_id == "filled":
-            self.logger.info(
-                f"📝 Placed {order.side.value} order: {order.size} {order.asset} (executada imediatamente)"
+        if not signals:
+            return
+
+        current_time = self._clock()
+        orders = [
+            Order(
+                id=f"order_{int(current_time * 1000)}_{idx}",  # Simple ID generation
+                asset=signal.asset,
+                side=OrderSide.BUY
+                if signal.signal_type == SignalType.BUY
+                else OrderSide.SELL,
+                size=signal.size,
+                order_type=OrderType.LIMIT if signal.price else OrderType.MARKET,
+                price=signal.price,
+                created_at=current_time,
             )
+            for idx, signal in enumerate(signals)
+        ]
+
+        try:
+            results = await self.exchange.place_orders(orders)
+        except Exception as e:
+            self.logger.error(f"❌ Error executing signal: {e}")
             if self.strategy:
-                executed_price = order.price or 0.0
-                self.strategy.on_trade_executed(signal, executed_price, order.size)
-            self.executed_trades += 1
-        else:
-            order.exchange_order_id = exchange_order_id
-            order.status = OrderStatus.SUBMITTED
-            self.pending_orders[order.id] = order
-            self.logger.info(
-                f"📝 Placed {order.side.value} order: {order.size} {order.asset} @ ${order.price}"
-            )
+                for signal in signals:
+                    self.strategy.on_error(e, {"signal": signal})
+            return
+        finally:
+            self._invalidate_account_state("orders placed")
+
+        placed = 0
+        for signal, result in zip(signals, results):
+            order = result.order
+            if not result.ok:
+                error = RuntimeError(result.error)
+                self.logger.error(f"❌ Error executing signal: {error}")
+                if self.strategy:
+                    self.strategy.on_error(error, {"signal": signal})
+                continue
+
+            placed += 1
+            if result.exchange_order_id == "filled":
+                self.logger.info(
+                    f"📝 Placed {order.side.value} order: {order.size} {order.asset} (executada imediatamente)"
+                )
+                if self.strategy:
+                    executed_price = order.price or 0.0
+                    self.strategy.on_trade_executed(signal, executed_price, order.size)
+                self.executed_trades += 1
+            else:
+                order.exchange_order_id = result.exchange_order_id
+                order.status = OrderStatus.SUBMITTED
+                self.order_tracker.track(order, signal)
+                self.logger.info(
+                    f"📝 Placed {order.side.value} order: {order.size} {order.asset} @ ${order.price}"
+                )
+
+        if len(orders) > 1:
+            self.logger.info(f"📦 Batch: {placed}/{len(orders)} orders placed in one request")
+
+    async def _cancel_orders(self) -> int:
+        """Cancel open orders: all of them, or only ours on a shared exchange"""
+
+        if not self._shared_exchange:
+            return await self.exchange.cancel_all_orders()
+        order_ids = [
+            order.exchange_order_id
+            for order in self.order_tracker.open_orders()
+            if order.exchange_order_id
+        ]
+        if not order_ids:
+            return 0
+        return sum(await self.exchange.cancel_orders(order_ids))
 
     async def _close_positions(self, signal: TradingSignal) -> None:
         """Close positions (e.g., cancel all orders for rebalancing)"""
 
         if signal.metadata.get("action") == "cancel_all":
-            cancelled = await self.exchange.cancel_all_orders()
+            cancelled = await self._cancel_orders()
+            self._invalidate_account_state("orders cancelled")
             self.logger.info(f"🗑️ Cancelled {cancelled} orders for rebalancing")
 
     async def _trading_loop(self) -> None:
@@ -775,8 +1068,8 @@ class TradingEngine:
                 # Periodic health checks, order status updates, etc.
                 await asyncio.sleep(60)  # Check every minute
 
-                # Update order statuses (simplified)
-                await self._update_order_statuses()
+                # Catch anything the order streams missed
+                await self._reconcile_orders()
 
                 # Log status
                 if self.executed_trades > 0:
@@ -786,19 +1079,32 @@ class TradingEngine:
                 self.logger.error(f"❌ Error in trading loop: {e}")
                 await asyncio.sleep(60)
 
-    async def _update_order_statuses(self) -> None:
-        """Update status of pending orders"""
-
-        # This would query the exchange for order statuses
-        # For now, we'll just clean up old orders
-        current_time = time.time()
+    async def _reconcile_orders(self) -> None:
+        """Diff tracked orders against the exchange's open orders"""
 
-        for order_id in list(self.pending_orders.keys()):
-            order = self.pending_orders[order_id]
-
-            # Remove orders older than 1 hour (they're probably filled or cancelled)
-            if current_time - order.created_at > 3600:
-                del self.pending_orders[order_id]
+        if not self.exchange or not self.exchange.is_connected:
+            return
+        as_of = self._clock()
+        open_orders = await self.exchange.get_open_orders()
+        # Orders that left the book without us seeing them fill: ask how they ended
+        statuses = {}
+        for order in self.order_tracker.unresolved(open_orders, as_of):
+            try:
+                statuses[str(order.exchange_order_id)] = await self.exchange.get_order_status(
+                    order.exchange_order_id
+                )
+            except Exception as e:
+                self.logger.warning(
+                    f"⚠️ Status lookup failed for order {order.exchange_order_id}: {e}"
+                )
+        # On a shared account unknown orders belong to other bots
+        diff = self.order_tracker.reconcile(
+            open_orders, as_of=as_of, adopt=not self._shared_exchange, statuses=statuses
+        )
+        if diff["missing"] or diff["adopted"]:
+            self.logger.info(
+                f"🔁 Order reconciliation: {len(diff['missing'])} closed, {len(diff['adopted'])} adopted"
+            )
 
     def get_status(self) -> Dict[str, Any]:
         """Get engine status"""
@@ -813,6 +1119,20 @@ class TradingEngine:
             else None,
             "executed_trades": self.executed_trades,
             "pending_orders": len(self.pending_orders),
+            "orders": self.order_tracker.get_status(),
             "current_positions": len(self.current_positions),
             "total_pnl": self.total_pnl,
+            "account_state": self.account_state.get_status()
+            if self.account_state
+            else None,
+            "ml": {
+                "evaluations": self._ml_evaluations,
+                "cache_hits": self._ml_cache_hits,
+                "last_bar": self._ml_cache_bar,
+                "shared_cache": self.ml_service.signal_cache.get_status()
+                if getattr(self.ml_service, "signal_cache", None)
+                else None,
+            }
+            if self.ml_service
+            else None,
         }
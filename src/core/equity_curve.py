@@ -0,0 +1,242 @@
+"""
+Equity Curve
+
+Account value samples and realized PnL kept in an append-only binary log,
+so the high-water mark, peak-to-trough drawdown and realized PnL survive
+restarts. Samples come from the account feed (e.g. Hyperliquid webData2)
+and fills from userFills; every metric is maintained incrementally and
+read in O(1).
+
+Drawdown is measured on PnL-based equity: the first sample's value net of
+its unrealized PnL, plus realized and unrealized PnL since. Deposits and
+withdrawals move the account value but not equity, so they neither raise
+the high-water mark nor count as drawdown.
+
+Each record is 25 bytes: kind (u8), timestamp (f8), trade id (i8, 0 for
+samples), amount (f8: account value, closed PnL net of fees, or the
+unrealized PnL of the value samples that follow).
+"""
+
+import struct
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Set, Tuple
+
+RECORD = struct.Struct("<Bdqd")
+KIND_VALUE = 1
+KIND_FILL = 2
+KIND_UNREALIZED = 3
+
+
+def read_log(path: Path) -> Iterator[Tuple[int, float, int, float]]:
+    """Yield (kind, timestamp, tid, amount) records; a torn last record is skipped"""
+    with open(path, "rb") as f:
+        data = f.read()
+    usable = len(data) - len(data) % RECORD.size
+    yield from RECORD.iter_unpack(data[:usable])
+
+
+class EquityCurve:
+    """
+    High-water mark, drawdown and realized PnL from sampled account values.
+
+    `value` is the raw account value; `equity` (and with it the high-water
+    mark and drawdown) only moves with PnL.
+
+    Samples are written at most every `sample_interval` seconds unless the
+    value moved by `min_change_pct` or more, which bounds the log size and
+    the error on the persisted peak. Fills are always written. Without a
+    `path` the curve lives in memory only.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        sample_interval: float = 60.0,
+        min_change_pct: float = 0.05,
+        max_tids: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path) if path else None
+        self.sample_interval = sample_interval
+        self.min_change_pct = min_change_pct
+        self.max_tids = max_tids
+        self._clock = clock
+
+        self.value: Optional[float] = None
+        self.updated_at: Optional[float] = None
+        self.capital: Optional[float] = None  # first sample net of PnL
+        self.unrealized_pnl = 0.0
+        self.high_water_mark = 0.0
+        self.max_drawdown_pct = 0.0
+        self.realized_pnl = 0.0
+        self.fills = 0
+        self.started_at: Optional[float] = None
+
+        self._last_written: Optional[Tuple[float, float]] = None  # (timestamp, value)
+        self._written_unrealized = 0.0
+        self._seen_tids: Set[int] = set()
+        self._tid_order: Deque[int] = deque()
+        self._file = None
+        self.records_written = 0
+
+        if self.path is not None and self.path.exists():
+            self._replay()
+
+    # ------------------------------------------------------------------ persistence
+
+    def _replay(self) -> None:
+        size = self.path.stat().st_size
+        if size % RECORD.size:
+            # Crash mid-write: drop the torn record so appends stay aligned
+            with open(self.path, "r+b") as f:
+                f.truncate(size - size % RECORD.size)
+
+        for kind, timestamp, tid, amount in read_log(self.path):
+            if self.started_at is None:
+                self.started_at = timestamp
+            if kind == KIND_VALUE:
+                self._apply_value(amount, timestamp)
+                self._last_written = (timestamp, amount)
+            elif kind == KIND_FILL:
+                self._remember_tid(tid)
+                self._apply_pnl(amount)
+            elif kind == KIND_UNREALIZED:
+                self.unrealized_pnl = self._written_unrealized = amount
+
+    def _write(self, kind: int, timestamp: float, tid: int, amount: float) -> None:
+        if self.path is None:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(RECORD.pack(kind, timestamp, tid, amount))
+        self._file.flush()
+        self.records_written += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ------------------------------------------------------------------ updates
+
+    def _apply_value(self, value: float, timestamp: float) -> None:
+        self.value = value
+        self.updated_at = timestamp
+        if self.capital is None:
+            self.capital = value - self.unrealized_pnl - self.realized_pnl
+        if self.equity > self.high_water_mark:
+            self.high_water_mark = self.equity
+        self.max_drawdown_pct = max(self.max_drawdown_pct, self.drawdown_pct)
+
+    def _apply_pnl(self, pnl: float) -> None:
+        self.realized_pnl += pnl
+        self.fills += 1
+
+    def _remember_tid(self, tid: int) -> None:
+        self._seen_tids.add(tid)
+        self._tid_order.append(tid)
+        while len(self._tid_order) > self.max_tids:
+            self._seen_tids.discard(self._tid_order.popleft())
+
+    def _should_write(self, value: float, timestamp: float) -> bool:
+        if self._last_written is None:
+            return True
+        last_time, last_value = self._last_written
+        if timestamp - last_time >= self.sample_interval:
+            return True
+        if last_value == 0:
+            return value != 0
+        return abs(value - last_value) / abs(last_value) * 100 >= self.min_change_pct
+
+    def record_value(
+        self,
+        value: float,
+        timestamp: Optional[float] = None,
+        unrealized_pnl: float = 0.0,
+    ) -> None:
+        """Sample the account value and the unrealized PnL it includes"""
+        timestamp = self._clock() if timestamp is None else timestamp
+        if self.started_at is None:
+            self.started_at = timestamp
+        self.unrealized_pnl = float(unrealized_pnl)
+        self._apply_value(float(value), timestamp)
+        if self._should_write(value, timestamp):
+            if self.unrealized_pnl != self._written_unrealized:
+                self._write(KIND_UNREALIZED, timestamp, 0, self.unrealized_pnl)
+                self._written_unrealized = self.unrealized_pnl
+            self._write(KIND_VALUE, timestamp, 0, float(value))
+            self._last_written = (timestamp, float(value))
+
+    def record_fill(self, fill: Dict[str, Any]) -> bool:
+        """Book a fill's closed PnL net of fees; returns False for duplicates"""
+        tid = int(fill.get("tid") or 0)
+        if tid and tid in self._seen_tids:
+            return False
+        try:
+            pnl = float(fill.get("closedPnl") or 0.0) - float(fill.get("fee") or 0.0)
+        except (TypeError, ValueError):
+            return False
+        if tid:
+            self._remember_tid(tid)
+        timestamp = float(fill["time"]) / 1000 if fill.get("time") else self._clock()
+        self._apply_pnl(pnl)
+        self._write(KIND_FILL, timestamp, tid, pnl)
+        return True
+
+    def on_user_fills(self, payload: Dict[str, Any]) -> None:
+        """
+        Apply a userFills payload.
+
+        The snapshot sent on (re)subscribe is applied only for fills made
+        after this curve started, which picks up fills missed while offline
+        without importing the account's older history.
+        """
+        snapshot = payload.get("isSnapshot")
+        for fill in payload.get("fills") or []:
+            if snapshot and (
+                self.started_at is None or float(fill.get("time", 0)) / 1000 < self.started_at
+            ):
+                continue
+            self.record_fill(fill)
+
+    # ------------------------------------------------------------------ reads
+
+    @property
+    def equity(self) -> float:
+        if self.capital is None:
+            return 0.0
+        return self.capital + self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def drawdown_pct(self) -> float:
+        if self.value is None or self.high_water_mark <= 0:
+            return 0.0
+        return max(0.0, (self.high_water_mark - self.equity) / self.high_water_mark * 100)
+
+    @property
+    def age(self) -> Optional[float]:
+        if self.updated_at is None:
+            return None
+        return self._clock() - self.updated_at
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "total_value": self.value or 0.0,
+            "equity": self.equity,
+            "high_water_mark": self.high_water_mark,
+            "drawdown_pct": self.drawdown_pct,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "realized_pnl": self.realized_pnl,
+            "fills": self.fills,
+            "updated_at": self.updated_at,
+        }
+
+
+def default_log_path(root: Path, address: str, testnet: bool) -> Path:
+    """One log per wallet and network"""
+    network = "testnet" if testnet else "mainnet"
+    return Path(root) / f"{network}_{address.lower()}.equity"
+
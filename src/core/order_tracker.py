@@ -0,0 +1,367 @@
+"""
+Order Tracker
+
+Local book of the orders this bot placed, kept exact by the exchange's
+order-update and fill streams (Hyperliquid orderUpdates / userFills) rather
+than by polling. Orders are indexed by client id, exchange order id, asset
+and price level, so every lookup is O(1). A periodic `reconcile` against the
+exchange's open orders (plus a status lookup for orders that left the book
+unfilled) is the safety net for missed stream messages.
+"""
+
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Container, Deque, Dict, List, Mapping, Optional, Set, Tuple
+
+from interfaces.exchange import Order, OrderStatus
+from interfaces.strategy import TradingSignal
+
+TERMINAL_STATUSES = (OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.REJECTED)
+
+# Filled size is compared against the (exchange-rounded) order size
+SIZE_TOLERANCE = 1e-9
+
+FillCallback = Callable[[Order, Optional[TradingSignal]], Any]
+
+
+def map_order_status(status: str) -> Optional[OrderStatus]:
+    """Translate a Hyperliquid order status string"""
+
+    if status in ("open", "triggered"):
+        return OrderStatus.SUBMITTED
+    if status == "filled":
+        return OrderStatus.FILLED
+    if status.endswith("anceled"):  # canceled, marginCanceled, reduceOnlyCanceled, ...
+        return OrderStatus.CANCELLED
+    if status.endswith("ejected"):
+        return OrderStatus.REJECTED
+    return None
+
+
+class OrderTracker:
+    """
+    Exact open-order state built from order updates and fills.
+
+    `on_fill(order, signal)` runs once per order when it is completely
+    filled, or when it reaches another terminal state after a partial fill.
+    Fills that arrive before the placement call returns are buffered and
+    applied when the order is tracked.
+    """
+
+    def __init__(
+        self,
+        on_fill: Optional[FillCallback] = None,
+        history: int = 1000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.on_fill = on_fill
+        self.history = history
+        self._clock = clock
+
+        self._orders: Dict[str, Order] = {}
+        self._signals: Dict[str, TradingSignal] = {}
+        self._by_oid: Dict[str, str] = {}
+        self._open: Dict[str, Order] = {}
+        self._by_asset: Dict[str, Set[str]] = {}
+        self._by_level: Dict[Tuple[str, float], Set[str]] = {}
+        self._closed: Deque[str] = deque()
+        self._notified: Set[str] = set()
+
+        # Fills for oids we do not know yet (placement still in flight)
+        self._early_fills: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._seen_tids: Set[Any] = set()
+        self._seen_order: Deque[Any] = deque()
+
+        self.fills_applied = 0
+        self.updates_applied = 0
+        self.reconciliations = 0
+        self.missing_orders = 0
+        self.adopted_orders = 0
+
+    # ------------------------------------------------------------------ queries
+
+    @property
+    def open_by_id(self) -> Mapping[str, Order]:
+        """Open orders keyed by client order id (live view, do not mutate)"""
+        return self._open
+
+    def get(self, order_id: str) -> Optional[Order]:
+        return self._orders.get(order_id)
+
+    def get_by_oid(self, exchange_order_id: Any) -> Optional[Order]:
+        order_id = self._by_oid.get(str(exchange_order_id))
+        return self._orders.get(order_id) if order_id else None
+
+    def open_orders(self, asset: Optional[str] = None) -> List[Order]:
+        if asset is None:
+            return list(self._open.values())
+        return [self._open[order_id] for order_id in self._by_asset.get(asset, ())]
+
+    def orders_at(self, asset: str, price: float) -> List[Order]:
+        """Open orders resting at an exact price level"""
+        return [self._open[order_id] for order_id in self._by_level.get((asset, price), ())]
+
+    def has_open_orders(self, asset: Optional[str] = None) -> bool:
+        if asset is None:
+            return bool(self._open)
+        return bool(self._by_asset.get(asset))
+
+    # ------------------------------------------------------------------ tracking
+
+    def track(self, order: Order, signal: Optional[TradingSignal] = None) -> None:
+        """Start tracking an order accepted by the exchange"""
+
+        if order.status == OrderStatus.PENDING:
+            order.status = OrderStatus.SUBMITTED
+        self._orders[order.id] = order
+        if signal is not None:
+            self._signals[order.id] = signal
+        if order.exchange_order_id:
+            self._by_oid[str(order.exchange_order_id)] = order.id
+
+        if order.status in TERMINAL_STATUSES:
+            self._finish(order)
+        else:
+            self._index(order)
+
+        for fill in self._early_fills.pop(str(order.exchange_order_id), []):
+            self._apply_fill(order, fill)
+
+    def _index(self, order: Order) -> None:
+        self._open[order.id] = order
+        self._by_asset.setdefault(order.asset, set()).add(order.id)
+        if order.price is not None:
+            self._by_level.setdefault((order.asset, order.price), set()).add(order.id)
+
+    def _unindex(self, order: Order) -> None:
+        if self._open.pop(order.id, None) is None:
+            return
+        ids = self._by_asset.get(order.asset)
+        if ids is not None:
+            ids.discard(order.id)
+            if not ids:
+                del self._by_asset[order.asset]
+        level = (order.asset, order.price)
+        ids = self._by_level.get(level)
+        if ids is not None:
+            ids.discard(order.id)
+            if not ids:
+                del self._by_level[level]
+
+    def _finish(self, order: Order) -> None:
+        """Move an order out of the open indexes and notify a fill once"""
+
+        if order.id in self._open:
+            self._unindex(order)
+            self._closed.append(order.id)
+            self._evict()
+        if order.filled_size > 0 and order.id not in self._notified:
+            self._notified.add(order.id)
+            if self.on_fill:
+                self.on_fill(order, self._signals.get(order.id))
+
+    def _evict(self) -> None:
+        while len(self._closed) > self.history:
+            order_id = self._closed.popleft()
+            order = self._orders.pop(order_id, None)
+            self._signals.pop(order_id, None)
+            self._notified.discard(order_id)
+            if order is not None and order.exchange_order_id:
+                self._by_oid.pop(str(order.exchange_order_id), None)
+
+    # ------------------------------------------------------------------ stream events
+
+    def on_order_updates(self, updates: List[Dict[str, Any]]) -> None:
+        """Apply an orderUpdates payload (list of {"order": {...}, "status": ...})"""
+
+        for update in updates or []:
+            info = update.get("order") or {}
+            order = self.get_by_oid(info.get("oid"))
+            status = map_order_status(update.get("status", ""))
+            if order is None or status is None:
+                continue
+
+            self.updates_applied += 1
+            if info.get("origSz") is not None:
+                # The exchange's rounded size is what fills are measured against
+                order.size = float(info["origSz"])
+            if status == OrderStatus.SUBMITTED and order.filled_size > 0:
+                status = OrderStatus.PARTIALLY_FILLED
+            order.status = status
+            if status in TERMINAL_STATUSES:
+                self._finish(order)
+
+    def on_user_fills(self, payload: Dict[str, Any]) -> None:
+        """
+        Apply a userFills payload.
+
+        The snapshot sent on (re)subscribe is history, except for fills of
+        orders we track: those may have happened while the stream was down.
+        Fills already applied are skipped by trade id.
+        """
+
+        snapshot = payload.get("isSnapshot")
+        for fill in payload.get("fills") or []:
+            if snapshot and str(fill.get("oid")) not in self._by_oid:
+                continue
+            self.apply_fill(fill)
+
+    def apply_fill(self, fill: Dict[str, Any]) -> Optional[Order]:
+        tid = fill.get("tid")
+        if tid is not None:
+            if tid in self._seen_tids:
+                return None
+            self._remember_tid(tid)
+
+        oid = str(fill.get("oid"))
+        order_id = self._by_oid.get(oid)
+        if order_id is None:
+            self._early_fills.setdefault(oid, []).append(fill)
+            while len(self._early_fills) > self.history:
+                self._early_fills.popitem(last=False)
+            return None
+
+        order = self._orders[order_id]
+        self._apply_fill(order, fill)
+        return order
+
+    def _remember_tid(self, tid: Any) -> None:
+        self._seen_tids.add(tid)
+        self._seen_order.append(tid)
+        while len(self._seen_order) > self.history * 4:
+            self._seen_tids.discard(self._seen_order.popleft())
+
+    def _apply_fill(self, order: Order, fill: Dict[str, Any]) -> None:
+        try:
+            price = float(fill["px"])
+            size = float(fill["sz"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        self._add_filled(order, price, size)
+        self.fills_applied += 1
+
+        if order.filled_size >= order.size - SIZE_TOLERANCE:
+            order.status = OrderStatus.FILLED
+            self._finish(order)
+        elif order.status in TERMINAL_STATUSES:
+            # Late fill for an order already closed by an update
+            self._finish(order)
+        else:
+            order.status = OrderStatus.PARTIALLY_FILLED
+
+    @staticmethod
+    def _add_filled(order: Order, price: float, size: float) -> None:
+        total = order.filled_size + size
+        order.average_fill_price = (
+            order.average_fill_price * order.filled_size + price * size
+        ) / total
+        order.filled_size = total
+
+    # ------------------------------------------------------------------ reconciliation
+
+    def _gone(self, listed: Container[str], as_of: float) -> List[Order]:
+        """Open orders created before `as_of` that the exchange no longer lists"""
+        return [
+            order
+            for order in self._open.values()
+            if str(order.exchange_order_id) not in listed and order.created_at < as_of
+        ]
+
+    def unresolved(
+        self, exchange_open_orders: List[Order], as_of: Optional[float] = None
+    ) -> List[Order]:
+        """
+        Orders `reconcile` would close without having seen them fill.
+
+        Their fills may have been missed (e.g. while the stream was down), so
+        the caller should look up their status and pass it to `reconcile`.
+        """
+
+        as_of = self._clock() if as_of is None else as_of
+        listed = {str(order.exchange_order_id) for order in exchange_open_orders}
+        return [
+            order
+            for order in self._gone(listed, as_of)
+            if order.filled_size < order.size - SIZE_TOLERANCE
+        ]
+
+    def _apply_status(self, order: Order, known: Order) -> None:
+        """Close `order` from an exchange status lookup, booking fills we missed"""
+
+        filled = known.filled_size
+        if known.status == OrderStatus.FILLED:
+            filled = max(filled, order.size)
+        missed = filled - order.filled_size
+        if missed > SIZE_TOLERANCE:
+            price = known.average_fill_price or known.price or order.price or 0.0
+            self._add_filled(order, price, missed)
+        order.status = known.status
+
+    def reconcile(
+        self,
+        exchange_open_orders: List[Order],
+        as_of: Optional[float] = None,
+        adopt: bool = True,
+        statuses: Optional[Mapping[str, Order]] = None,
+    ) -> Dict[str, List[Order]]:
+        """
+        Diff the local book against the exchange's open orders.
+
+        Orders created before `as_of` (when the snapshot was requested) that
+        the exchange no longer lists are closed locally: with the status
+        looked up for them in `statuses` (by exchange order id, see
+        `unresolved`), else filled if the fills say so and cancelled
+        otherwise. Exchange orders we do not know are adopted unless `adopt`
+        is False (an account shared with other bots). Returns
+        {"missing": [...], "adopted": [...]}.
+        """
+
+        as_of = self._clock() if as_of is None else as_of
+        self.reconciliations += 1
+        listed = {
+            str(order.exchange_order_id): order
+            for order in exchange_open_orders
+            if order.exchange_order_id
+        }
+
+        missing = []
+        for order in self._gone(listed, as_of):
+            known = (statuses or {}).get(str(order.exchange_order_id))
+            if known is not None and known.status in (
+                OrderStatus.SUBMITTED,
+                OrderStatus.PARTIALLY_FILLED,
+            ):
+                continue  # still resting, the snapshot was stale
+            if known is not None and known.status in TERMINAL_STATUSES:
+                self._apply_status(order, known)
+            # Gone from the book: filled if the fills say so, otherwise cancelled
+            elif order.filled_size >= order.size - SIZE_TOLERANCE:
+                order.status = OrderStatus.FILLED
+            else:
+                order.status = OrderStatus.CANCELLED
+            self._finish(order)
+            missing.append(order)
+
+        adopted = []
+        for oid, order in listed.items():
+            if adopt and oid not in self._by_oid:
+                self.track(order)
+                adopted.append(order)
+
+        self.missing_orders += len(missing)
+        self.adopted_orders += len(adopted)
+        return {"missing": missing, "adopted": adopted}
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "open": len(self._open),
+            "tracked": len(self._orders),
+            "assets": {asset: len(ids) for asset, ids in self._by_asset.items()},
+            "fills_applied": self.fills_applied,
+            "updates_applied": self.updates_applied,
+            "early_fills": len(self._early_fills),
+            "reconciliations": self.reconciliations,
+            "missing_orders": self.missing_orders,
+            "adopted_orders": self.adopted_orders,
+        }
@@ -6,8 +6,8 @@ and position size management. Designed for extensibility and clarity.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Any, Set
+from dataclasses import dataclass, replace
 from enum import Enum
 import time
 
@@ -35,11 +35,8 @@ class RiskEvent:
     reason: str
     severity: str  # "LOW", "MEDIUM", "HIGH", "CRITICAL"
     metadata: Dict[str, Any]
-    timestamp: float = None
-
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = time.time()
+    # Left as None by rules; the RiskManager stamps it from its clock
+    timestamp: Optional[float] = None
 
 
 @dataclass
@@ -55,14 +52,29 @@ class AccountMetrics:
     largest_position_pct: float
 
 
+# Inputs a rule can depend on; the manager only re-runs rules whose inputs changed
+TRIGGER_PRICE = "price"
+TRIGGER_POSITION = "position"
+TRIGGER_ACCOUNT = "account"
+ALL_TRIGGERS = frozenset({TRIGGER_PRICE, TRIGGER_POSITION, TRIGGER_ACCOUNT})
+
+
 class RiskRule(ABC):
     """
     Base interface for risk rules
 
     Each rule implements one specific risk check (e.g., stop loss, drawdown)
     and returns risk events when violations occur.
+
+    `triggers` lists the inputs the rule depends on. When `per_asset` is
+    True the rule only looks at individual positions, so a price tick or
+    position change re-runs it for the affected assets only. Custom rules
+    default to running on any change.
     """
 
+    triggers: FrozenSet[str] = ALL_TRIGGERS
+    per_asset: bool = False
+
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
@@ -96,6 +108,9 @@ class RiskRule(ABC):
 class StopLossRule(RiskRule):
     """Stop loss risk rule - closes positions when loss exceeds threshold"""
 
+    triggers = frozenset({TRIGGER_PRICE, TRIGGER_POSITION})
+    per_asset = True
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("stop_loss", config)
         self.loss_pct = config.get("loss_pct", 5.0)
@@ -148,6 +163,9 @@ class StopLossRule(RiskRule):
 class TakeProfitRule(RiskRule):
     """Take profit risk rule - closes positions when profit exceeds threshold"""
 
+    triggers = frozenset({TRIGGER_PRICE, TRIGGER_POSITION})
+    per_asset = True
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("take_profit", config)
         self.profit_pct = config.get("profit_pct", 20.0)
@@ -197,6 +215,8 @@ class TakeProfitRule(RiskRule):
 class DrawdownRule(RiskRule):
     """Drawdown risk rule - stops trading when account drawdown exceeds threshold"""
 
+    triggers = frozenset({TRIGGER_ACCOUNT})
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("max_drawdown", config)
         self.max_drawdown_pct = config.get("max_drawdown_pct", 15.0)
@@ -237,6 +257,10 @@ class DrawdownRule(RiskRule):
 class PositionSizeRule(RiskRule):
     """Position size risk rule - prevents individual positions from being too large"""
 
+    # Depends on account value too, so an account change re-checks every position
+    triggers = ALL_TRIGGERS
+    per_asset = True
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("max_position_size", config)
         self.max_position_size_pct = config.get("max_position_size_pct", 30.0)
@@ -282,18 +306,279 @@ class PositionSizeRule(RiskRule):
         return events
 
 
+class RiskEventHistory:
+    """
+    Time-bucketed ring buffer of risk events.
+
+    Buckets are `bucket_seconds` wide and the ring keeps `max_buckets` of
+    them, so memory is bounded no matter how long the bot runs. Each bucket
+    also caps the events it stores (counts stay exact). A running count of
+    the events older than each bucket makes `count_since` O(1).
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: float = 60.0,
+        max_buckets: int = 1440,
+        max_events_per_bucket: int = 100,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.max_buckets = max_buckets
+        self.max_events_per_bucket = max_events_per_bucket
+        self._clock = clock
+
+        self._bucket_ids: List[Optional[int]] = [None] * max_buckets
+        self._events: List[List[RiskEvent]] = [[] for _ in range(max_buckets)]
+        # Events in buckets older than each bucket
+        self._before: List[int] = [0] * max_buckets
+        self._head: Optional[int] = None  # newest bucket id
+        self.total = 0
+
+    @property
+    def window_seconds(self) -> float:
+        return self.bucket_seconds * self.max_buckets
+
+    def _bucket_id(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _advance(self, bucket_id: int) -> None:
+        """Open buckets up to `bucket_id`, recycling the oldest slots"""
+        if self._head is not None and bucket_id <= self._head:
+            return
+        start = bucket_id - self.max_buckets + 1
+        if self._head is not None:
+            start = max(start, self._head + 1)
+        for bid in range(start, bucket_id + 1):
+            slot = bid % self.max_buckets
+            self._bucket_ids[slot] = bid
+            self._events[slot] = []
+            self._before[slot] = self.total
+        self._head = bucket_id
+
+    def add(self, event: RiskEvent) -> None:
+        bucket_id = self._bucket_id(event.timestamp)
+        self._advance(bucket_id)
+        if bucket_id <= self._head - self.max_buckets:
+            return  # older than the ring
+        slot = bucket_id % self.max_buckets
+        bucket = self._events[slot]
+        if len(bucket) < self.max_events_per_bucket:
+            bucket.append(event)
+        self.total += 1
+        # A late event lands in an older bucket; newer buckets must count it
+        for bid in range(bucket_id + 1, self._head + 1):
+            self._before[bid % self.max_buckets] += 1
+
+    def extend(self, events: Iterable[RiskEvent]) -> None:
+        for event in events:
+            self.add(event)
+
+    def count_since(self, seconds: float) -> int:
+        """Number of events in the last `seconds` (bucket resolution)"""
+        if self._head is None:
+            return 0
+        now = self._clock()
+        self._advance(self._bucket_id(now))
+        first = max(self._bucket_id(now - seconds), self._head - self.max_buckets + 1)
+        return self.total - self._before[first % self.max_buckets]
+
+    def events_since(self, seconds: float) -> List[RiskEvent]:
+        """Stored events from the last `seconds`, oldest first"""
+        if self._head is None:
+            return []
+        cutoff = self._clock() - seconds
+        first = max(self._bucket_id(cutoff), self._head - self.max_buckets + 1)
+        events: List[RiskEvent] = []
+        for bid in range(first, self._head + 1):
+            slot = bid % self.max_buckets
+            if self._bucket_ids[slot] == bid:
+                events.extend(e for e in self._events[slot] if e.timestamp >= cutoff)
+        return events
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._events)
+
+
+class AccountMetricsTracker:
+    """
+    Account metrics maintained incrementally from ticks, positions and syncs.
+
+    The account value is the last synced value adjusted by the change in
+    unrealized PnL since then, so a price tick updates it in O(1). The
+    high-water mark and drawdown follow PnL-based equity instead (capital
+    plus realized and unrealized PnL), so deposits and withdrawals between
+    syncs never read as drawdown. Per-asset exposure is kept alongside.
+    """
+
+    def __init__(self):
+        self.positions: Dict[str, Position] = {}
+        self.exposure: Dict[str, float] = {}
+        self.unrealized_pnl = 0.0
+        self.realized_pnl = 0.0
+        self.base_value: Optional[float] = None  # account value minus unrealized PnL
+        self.capital: Optional[float] = None  # equity net of PnL
+        self.high_water_mark = 0.0
+        self.synced_at: Optional[float] = None
+
+    @property
+    def account_value(self) -> float:
+        if self.base_value is None:
+            return 0.0
+        return self.base_value + self.unrealized_pnl
+
+    @property
+    def equity(self) -> float:
+        if self.capital is None:
+            return 0.0
+        return self.capital + self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def drawdown_pct(self) -> float:
+        if self.high_water_mark <= 0:
+            return 0.0
+        return max(0.0, (self.high_water_mark - self.equity) / self.high_water_mark * 100)
+
+    def _update_high_water_mark(self) -> None:
+        if self.capital is not None:
+            self.high_water_mark = max(self.high_water_mark, self.equity)
+
+    def _set_position(self, position: Optional[Position], asset: str) -> None:
+        previous = self.positions.get(asset)
+        if previous is not None:
+            self.unrealized_pnl -= previous.unrealized_pnl
+        if position is None or position.size == 0:
+            self.positions.pop(asset, None)
+            self.exposure.pop(asset, None)
+            return
+        self.positions[asset] = position
+        self.exposure[asset] = abs(position.current_value)
+        self.unrealized_pnl += position.unrealized_pnl
+
+    def sync(
+        self,
+        total_value: float,
+        positions: Optional[List[Position]] = None,
+        realized_pnl: Optional[float] = None,
+        timestamp: Optional[float] = None,
+        high_water_mark: Optional[float] = None,
+        equity: Optional[float] = None,
+    ) -> None:
+        """
+        Re-anchor on an authoritative account snapshot.
+
+        `equity` and `high_water_mark` come from the same PnL-based curve
+        (e.g. a persisted one from before a restart). Without `equity`,
+        capital is anchored on the first synced value and later syncs only
+        move the account value.
+        """
+        if positions is not None:
+            self.update_positions(positions)
+        if realized_pnl is not None:
+            self.realized_pnl = realized_pnl
+        if equity is not None:
+            self.capital = equity - self.realized_pnl - self.unrealized_pnl
+        elif self.capital is None:
+            self.capital = total_value - self.realized_pnl - self.unrealized_pnl
+        if high_water_mark:
+            self.high_water_mark = max(self.high_water_mark, high_water_mark)
+        self.base_value = total_value - self.unrealized_pnl
+        self.synced_at = time.time() if timestamp is None else timestamp
+        self._update_high_water_mark()
+
+    def update_positions(self, positions: List[Position]) -> Set[str]:
+        """Replace positions; returns the assets whose size or entry changed"""
+        changed: Set[str] = set()
+        current = {position.asset: position for position in positions}
+        for asset in set(self.positions) | set(current):
+            old, new = self.positions.get(asset), current.get(asset)
+            if old is not None and new is not None and (old.size, old.entry_price) == (
+                new.size,
+                new.entry_price,
+            ):
+                continue
+            self._set_position(new, asset)
+            changed.add(asset)
+        if changed:
+            self._update_high_water_mark()
+        return changed
+
+    def on_price(self, asset: str, price: float) -> bool:
+        """Revalue the position in `asset`; returns True if one exists"""
+        position = self.positions.get(asset)
+        if position is None:
+            return False
+        unrealized = (
+            position.size * (price - position.entry_price)
+            if position.entry_price > 0
+            else 0.0
+        )
+        self._set_position(
+            replace(
+                position,
+                current_value=abs(position.size) * price,
+                unrealized_pnl=unrealized,
+            ),
+            asset,
+        )
+        self._update_high_water_mark()
+        return True
+
+    def on_realized_pnl(self, pnl: float) -> None:
+        """Book PnL closed by a fill (fees included by the caller)"""
+        self.realized_pnl += pnl
+        if self.base_value is not None:
+            self.base_value += pnl
+            self._update_high_water_mark()
+
+    def snapshot(self) -> AccountMetrics:
+        total_value = self.account_value
+        largest = max(self.exposure.values(), default=0.0)
+        return AccountMetrics(
+            total_value=total_value,
+            total_pnl=self.realized_pnl + self.unrealized_pnl,
+            unrealized_pnl=self.unrealized_pnl,
+            realized_pnl=self.realized_pnl,
+            drawdown_pct=self.drawdown_pct,
+            positions_count=len(self.positions),
+            largest_position_pct=largest / total_value * 100 if total_value > 0 else 0.0,
+        )
+
+
 class RiskManager:
     """
     Main risk management orchestrator
 
     Coordinates multiple risk rules and provides unified risk assessment.
     Designed to be extensible - new risk rules can be easily added.
+
+    Event-driven use: feed `on_market_data` / `sync_account` / `on_fill`
+    and only the rules whose inputs changed are re-run (per-asset rules
+    only for the affected assets). `evaluate_risks` still runs every rule
+    against caller-supplied state.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], clock: Callable[[], float] = time.time):
         self.config = config
         self.rules: List[RiskRule] = []
-        self.risk_events_history: List[RiskEvent] = []
+        self._clock = clock
+
+        risk_config = self.config.get("risk_management", {}) or {}
+        self.account_sync_interval = float(risk_config.get("account_sync_interval", 60.0))
+        self.history = RiskEventHistory(
+            bucket_seconds=float(risk_config.get("history_bucket_seconds", 60.0)),
+            max_buckets=int(risk_config.get("history_buckets", 1440)),
+            clock=clock,
+        )
+
+        self.metrics = AccountMetricsTracker()
+        self.market_data: Dict[str, MarketData] = {}
+        self._rules_by_trigger: Dict[str, List[RiskRule]] = {}
+        self._dirty: Set[str] = set()
+        self._dirty_assets: Set[str] = set()
+        self._account_sync_requested = True
+        self.evaluations = 0
+        self.rule_runs = 0
 
         # Initialize risk rules based on configuration
         self._initialize_rules()
@@ -305,7 +590,7 @@ class RiskManager:
 
         # Stop loss rule
         if risk_config.get("stop_loss_enabled", False):
-            self.rules.append(
+            self.add_rule(
                 StopLossRule(
                     {"enabled": True, "loss_pct": risk_config.get("stop_loss_pct", 5.0)}
                 )
@@ -313,7 +598,7 @@ class RiskManager:
 
         # Take profit rule
         if risk_config.get("take_profit_enabled", False):
-            self.rules.append(
+            self.add_rule(
                 TakeProfitRule(
                     {
                         "enabled": True,
@@ -323,7 +608,7 @@ class RiskManager:
             )
 
         # Drawdown rule
-        self.rules.append(
+        self.add_rule(
             DrawdownRule(
                 {
                     "enabled": True,
@@ -333,7 +618,7 @@ class RiskManager:
         )
 
         # Position size rule
-        self.rules.append(
+        self.add_rule(
             PositionSizeRule(
                 {
                     "enabled": True,
@@ -344,6 +629,40 @@ class RiskManager:
             )
         )
 
+    def _index_rules(self) -> None:
+        self._rules_by_trigger = {}
+        for rule in self.rules:
+            for trigger in rule.triggers:
+                self._rules_by_trigger.setdefault(trigger, []).append(rule)
+
+    def _run_rule(
+        self,
+        rule: RiskRule,
+        positions: List[Position],
+        market_data: Dict[str, MarketData],
+        account_metrics: AccountMetrics,
+    ) -> List[RiskEvent]:
+        self.rule_runs += 1
+        try:
+            events = rule.evaluate(positions, market_data, account_metrics)
+        except Exception as e:
+            # Log error but continue with other rules
+            events = [
+                RiskEvent(
+                    rule_name=rule.name,
+                    asset="SYSTEM",
+                    action=RiskAction.NONE,
+                    reason=f"Risk rule evaluation failed: {e}",
+                    severity="LOW",
+                    metadata={"error": str(e)},
+                )
+            ]
+        now = self._clock()
+        for event in events:
+            if event.timestamp is None:
+                event.timestamp = now
+        return events
+
     def evaluate_risks(
         self,
         positions: List[Position],
@@ -363,59 +682,146 @@ class RiskManager:
         """
 
         all_events = []
-
         for rule in self.rules:
-            try:
-                events = rule.evaluate(positions, market_data, account_metrics)
-                all_events.extend(events)
+            all_events.extend(
+                self._run_rule(rule, positions, market_data, account_metrics)
+            )
 
-                # Store events in history
-                self.risk_events_history.extend(events)
+        # Store events in history (rule failures are returned, not stored)
+        self.history.extend(e for e in all_events if e.asset != "SYSTEM")
+        return all_events
 
-            except Exception as e:
-                # Log error but continue with other rules
-                error_event = RiskEvent(
-                    rule_name=rule.name,
-                    asset="SYSTEM",
-                    action=RiskAction.NONE,
-                    reason=f"Risk rule evaluation failed: {e}",
-                    severity="LOW",
-                    metadata={"error": str(e)},
-                )
-                all_events.append(error_event)
+    # ------------------------------------------------------------------ event-driven inputs
 
-        return all_events
+    def account_sync_due(self, now: Optional[float] = None) -> bool:
+        """True when account value should be re-read from the exchange"""
+        now = self._clock() if now is None else now
+        synced_at = self.metrics.synced_at
+        return (
+            self._account_sync_requested
+            or synced_at is None
+            or now - synced_at >= self.account_sync_interval
+        )
+
+    def request_account_sync(self) -> None:
+        self._account_sync_requested = True
+
+    def sync_account(
+        self,
+        total_value: float,
+        positions: Optional[List[Position]] = None,
+        realized_pnl: Optional[float] = None,
+        high_water_mark: Optional[float] = None,
+        equity: Optional[float] = None,
+    ) -> None:
+        """Anchor metrics on an exchange account snapshot"""
+        if positions is not None:
+            self._mark_positions(positions)
+        self.metrics.sync(
+            total_value,
+            realized_pnl=realized_pnl,
+            timestamp=self._clock(),
+            high_water_mark=high_water_mark,
+            equity=equity,
+        )
+        self._account_sync_requested = False
+        self._dirty.add(TRIGGER_ACCOUNT)
+
+    def _mark_positions(self, positions: List[Position]) -> None:
+        changed = self.metrics.update_positions(positions)
+        if changed:
+            self._dirty.update((TRIGGER_POSITION, TRIGGER_ACCOUNT))
+            self._dirty_assets.update(changed)
+
+    def on_fill(self, realized_pnl: float = 0.0) -> None:
+        """Book realized PnL from a fill and schedule an account re-sync"""
+        if realized_pnl:
+            self.metrics.on_realized_pnl(realized_pnl)
+            self._dirty.add(TRIGGER_ACCOUNT)
+        self.request_account_sync()
+
+    def on_market_data(
+        self, market_data: MarketData, positions: Optional[List[Position]] = None
+    ) -> List[RiskEvent]:
+        """Apply a price tick (and current positions) and evaluate affected rules"""
+        self.market_data[market_data.asset] = market_data
+        if positions is not None:
+            self._mark_positions(positions)
+        if self.metrics.on_price(market_data.asset, market_data.price):
+            self._dirty.update((TRIGGER_PRICE, TRIGGER_ACCOUNT))
+            self._dirty_assets.add(market_data.asset)
+        return self.evaluate_pending()
+
+    def evaluate_pending(self) -> List[RiskEvent]:
+        """Run the rules whose inputs changed since the last evaluation"""
+        if not self._dirty:
+            return []
+
+        dirty, self._dirty = self._dirty, set()
+        assets, self._dirty_assets = self._dirty_assets, set()
+        selected = {
+            id(rule) for trigger in dirty for rule in self._rules_by_trigger.get(trigger, ())
+        }
+        account_metrics = self.metrics.snapshot()
+        all_positions = list(self.metrics.positions.values())
+
+        events: List[RiskEvent] = []
+        for rule in self.rules:
+            if id(rule) not in selected or not rule.enabled:
+                continue
+            if rule.per_asset and TRIGGER_ACCOUNT not in (rule.triggers & dirty):
+                positions = [
+                    self.metrics.positions[a] for a in assets if a in self.metrics.positions
+                ]
+                if not positions:
+                    continue
+            else:
+                positions = all_positions
+            events.extend(self._run_rule(rule, positions, self.market_data, account_metrics))
+
+        self.evaluations += 1
+        self.history.extend(e for e in events if e.asset != "SYSTEM")
+        return events
+
+    def get_account_metrics(self) -> AccountMetrics:
+        return self.metrics.snapshot()
+
+    # ------------------------------------------------------------------ rules
 
     def add_rule(self, rule: RiskRule):
         """Add a custom risk rule"""
         self.rules.append(rule)
+        self._index_rules()
 
     def remove_rule(self, rule_name: str):
         """Remove a risk rule by name"""
         self.rules = [rule for rule in self.rules if rule.name != rule_name]
+        self._index_rules()
+
+    @property
+    def risk_events_history(self) -> List[RiskEvent]:
+        """Events still held in the history ring, oldest first"""
+        return self.history.events_since(self.history.window_seconds)
 
     def get_status(self) -> Dict[str, Any]:
         """Get risk manager status"""
 
+        metrics = self.metrics
         return {
             "enabled_rules": [rule.name for rule in self.rules if rule.enabled],
             "disabled_rules": [rule.name for rule in self.rules if not rule.enabled],
             "total_rules": len(self.rules),
-            "recent_events": len(
-                [
-                    e
-                    for e in self.risk_events_history
-                    if time.time() - e.timestamp < 3600
-                ]
-            ),  # Last hour
+            "recent_events": self.history.count_since(3600),  # Last hour
+            "account_value": metrics.account_value,
+            "equity": metrics.equity,
+            "high_water_mark": metrics.high_water_mark,
+            "drawdown_pct": metrics.drawdown_pct,
+            "exposure": dict(metrics.exposure),
+            "evaluations": self.evaluations,
+            "rule_runs": self.rule_runs,
             "config": self.config.get("risk_management", {}),
         }
 
     def get_recent_events(self, hours: int = 1) -> List[RiskEvent]:
         """Get recent risk events"""
-        cutoff_time = time.time() - (hours * 3600)
-        return [
-            event
-            for event in self.risk_events_history
-            if event.timestamp >= cutoff_time
-        ]
+        return self.history.events_since(hours * 3600)
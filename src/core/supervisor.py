@@ -0,0 +1,236 @@
+"""
+Bot Supervisor
+
+Runs several bot configs in one process. Bots on the same network share
+one WebSocket feed, with every account's user channels multiplexed on it;
+bots on the same account also share one exchange adapter and one account
+state cache. Ticks reach each bot's strategy through the feed's per-asset
+callbacks (each with its own mailbox), and ML evaluations are shared
+through one signal cache. Every bot keeps its own TradingEngine - strategy,
+risk manager, order tracker - so one failing bot does not stop the others.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.account_state import AccountStateCache, subscribe_account_feed
+from core.engine import TradingEngine
+from core.key_manager import key_manager
+from exchanges.hyperliquid import HyperliquidMarketData
+from interfaces.exchange import ExchangeAdapter
+from ml.signal_cache import SignalCache, create_signal_cache
+
+# (exchange type, testnet, key digest); None for paper bots
+AccountKey = Optional[Tuple[str, bool, str]]
+
+
+def _default_exchange_factory(exchange_config: Dict[str, Any]) -> ExchangeAdapter:
+    from exchanges import create_exchange_adapter
+
+    return create_exchange_adapter(exchange_config.get("type", "hyperliquid"), exchange_config)
+
+
+class BotSupervisor:
+    """
+    Owns the shared components and one TradingEngine per bot config.
+
+    `configs` maps bot names to engine configs (the format TradingEngine
+    takes). The factories and key resolver exist for tests and alternative
+    deployments.
+    """
+
+    def __init__(
+        self,
+        configs: Dict[str, Dict[str, Any]],
+        feed_factory: Callable[..., Any] = HyperliquidMarketData,
+        exchange_factory: Callable[[Dict[str, Any]], ExchangeAdapter] = _default_exchange_factory,
+        key_resolver: Callable[[bool, Optional[Dict[str, Any]]], str] = key_manager.get_private_key,
+        signal_cache: Optional[SignalCache] = None,
+    ):
+        self.configs = configs
+        self.feed_factory = feed_factory
+        self.exchange_factory = exchange_factory
+        self.key_resolver = key_resolver
+        # Without Redis, bots in this process still share evaluations
+        self.signal_cache = signal_cache or create_signal_cache(
+            None if os.getenv("REDIS_URL") else {"backend": "memory"}
+        )
+
+        self.engines: Dict[str, TradingEngine] = {}
+        self.failed: Dict[str, str] = {}
+        self.feeds: Dict[bool, Any] = {}  # by testnet flag
+        self.exchanges: Dict[AccountKey, ExchangeAdapter] = {}
+        self.account_states: Dict[AccountKey, AccountStateCache] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.running = False
+
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------ shared components
+
+    def _feed_options(self) -> Dict[str, Any]:
+        """One feed serves every bot: aggregate the candle timeframes they need"""
+
+        timeframes: List[str] = []
+        capacity = 0
+        for config in self.configs.values():
+            md_config = config.get("market_data", {}) or {}
+            for timeframe in md_config.get("candle_timeframes", ["1m", "5m", "15m"]):
+                if timeframe not in timeframes:
+                    timeframes.append(timeframe)
+            capacity = max(capacity, int(md_config.get("candle_capacity", 1000)))
+        return {"candle_timeframes": timeframes, "candle_capacity": capacity}
+
+    async def _get_feed(self, testnet: bool) -> Any:
+        # One socket per network; each account subscribes its own user channels
+        feed = self.feeds.get(testnet)
+        if feed is None:
+            feed = self.feed_factory(testnet, **self._feed_options())
+            if not await feed.connect():
+                raise RuntimeError("market data feed failed to connect")
+            self.feeds[testnet] = feed
+            self.logger.info(
+                "📡 Shared feed opened (%s)", "testnet" if testnet else "mainnet"
+            )
+        return feed
+
+    async def _get_exchange(
+        self, account: AccountKey, config: Dict[str, Any], private_key: str, feed: Any
+    ) -> ExchangeAdapter:
+        exchange = self.exchanges.get(account)
+        if exchange is not None:
+            return exchange
+
+        exchange_config = {
+            **(config.get("exchange", {}) or {}),
+            "private_key": private_key,
+            "symbol": config.get("strategy", {}).get("symbol", "BTC"),
+        }
+        exchange = self.exchange_factory(exchange_config)
+        if not await exchange.connect():
+            raise RuntimeError("exchange failed to connect")
+        self.exchanges[account] = exchange
+
+        set_price_provider = getattr(exchange, "set_price_provider", None)
+        if callable(set_price_provider):
+            set_price_provider(feed.get_latest_data, exchange_config.get("max_price_age"))
+
+        account_config = config.get("account_state", {}) or {}
+        if account_config.get("enabled", True):
+            cache = AccountStateCache(exchange, ttl=float(account_config.get("ttl", 30.0)))
+            self.account_states[account] = cache
+            await subscribe_account_feed(cache, exchange, feed)
+
+        # Fills reach the exchange's equity curve once, not once per bot
+        user = getattr(exchange, "wallet_address", None)
+        on_user_fills = getattr(exchange, "on_user_fills", None)
+        subscribe = getattr(feed, "subscribe_order_updates", None)
+        if user and on_user_fills and subscribe:
+            await subscribe(user, None, on_user_fills)
+        return exchange
+
+    async def _build_engine(self, config: Dict[str, Any]) -> TradingEngine:
+        testnet = (config.get("exchange", {}) or {}).get("testnet", True)
+        if (config.get("paper") or {}).get("enabled"):
+            # Paper exchanges hold per-bot simulated state
+            feed = await self._get_feed(testnet)
+            return TradingEngine(config, market_data=feed, signal_cache=self.signal_cache)
+
+        private_key = self.key_resolver(testnet, config.get("bot_config"))
+        exchange_type = (config.get("exchange", {}) or {}).get("type", "hyperliquid")
+        digest = hashlib.sha256(private_key.encode("utf-8")).hexdigest()[:16]
+        account: AccountKey = (exchange_type, testnet, digest)
+
+        feed = await self._get_feed(testnet)
+        exchange = await self._get_exchange(account, config, private_key, feed)
+        return TradingEngine(
+            config,
+            exchange=exchange,
+            market_data=feed,
+            account_state=self.account_states.get(account),
+            signal_cache=self.signal_cache,
+        )
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def initialize(self) -> bool:
+        """Build every bot; a bot that fails is reported and skipped"""
+
+        for name, config in self.configs.items():
+            try:
+                engine = await self._build_engine(config)
+                if not await engine.initialize():
+                    raise RuntimeError("engine initialization failed")
+                self.engines[name] = engine
+                self.logger.info("✅ Bot ready: %s", name)
+            except Exception as e:
+                self.failed[name] = str(e)
+                self.logger.error(f"❌ Bot {name} not started: {e}")
+        return bool(self.engines)
+
+    async def _run_engine(self, name: str, engine: TradingEngine) -> None:
+        try:
+            await engine.start()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed[name] = str(e)
+            self.logger.error(f"❌ Bot {name} crashed: {e}")
+            try:
+                await engine.stop()
+            except Exception as stop_error:
+                self.logger.error(f"❌ Error stopping {name}: {stop_error}")
+
+    async def run(self) -> None:
+        """Run all bots until they stop"""
+
+        self.running = True
+        self._tasks = {
+            name: asyncio.create_task(self._run_engine(name, engine))
+            for name, engine in self.engines.items()
+        }
+        try:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        finally:
+            self.running = False
+
+    async def stop(self) -> None:
+        """Stop every bot, then close the shared feeds and exchanges"""
+
+        self.running = False
+        for name, engine in self.engines.items():
+            if not engine.running:
+                continue
+            try:
+                await engine.stop()
+            except Exception as e:
+                self.logger.error(f"❌ Error stopping {name}: {e}")
+        for task in self._tasks.values():
+            task.cancel()  # the engines' periodic loops
+
+        for feed in self.feeds.values():
+            try:
+                await feed.disconnect()
+            except Exception as e:
+                self.logger.error(f"❌ Error closing market data feed: {e}")
+        for exchange in self.exchanges.values():
+            try:
+                await exchange.disconnect()
+            except Exception as e:
+                self.logger.error(f"❌ Error disconnecting exchange: {e}")
+        self.feeds.clear()
+        self.exchanges.clear()
+        self.account_states.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "bots": {name: engine.get_status() for name, engine in self.engines.items()},
+            "failed": dict(self.failed),
+            "feeds": len(self.feeds),
+            "exchanges": len(self.exchanges),
+            "signal_cache": self.signal_cache.get_status() if self.signal_cache else None,
+        }
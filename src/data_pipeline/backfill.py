@@ -0,0 +1,390 @@
+"""
+Concurrent chunked backfill scheduler shared by the candle collectors.
+
+Chunk fetches run N at a time behind a token bucket, 429 responses are
+retried with jittered exponential backoff, and fetched chunks are handed to
+a single writer through a bounded queue so Mongo writes overlap with the
+next fetches instead of serializing behind them.
+
+Incremental runs only request the gaps in existing coverage, and a JSON
+checkpoint of completed chunks lets an interrupted run resume (and stops
+ranges the exchange has no data for from being re-requested every run).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_CHECKPOINT_DIR = BASE_DIR / "data" / "checkpoints"
+
+Candle = Dict[str, Any]
+FetchChunk = Callable[[int, int], Awaitable[List[Candle]]]
+SaveCandles = Callable[[List[Candle]], int]
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, bursts up to `capacity`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        # The lock keeps waiters FIFO so one slow caller cannot be starved
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True for Hyperliquid ClientError / httpx HTTPStatusError with HTTP 429."""
+
+    return _status_code(exc) == 429
+
+
+def _retry_after(exc: BaseException) -> float:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exc, "header", None) or {}
+    try:
+        return float(headers.get("Retry-After", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Exponential backoff with jitter in [50%, 100%] of the capped delay."""
+
+    delay = min(max_delay, base_delay * 2**attempt)
+    return delay * (0.5 + rng() / 2)
+
+
+async def retry_with_backoff(
+    call: Callable[[], Awaitable[Any]],
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    should_retry: Callable[[BaseException], bool] = is_rate_limited,
+    before_attempt: Optional[Callable[[], Awaitable[None]]] = None,
+) -> Any:
+    """
+    Await `call()` retrying rate-limit errors up to `max_retries` attempts.
+
+    `before_attempt` runs before every attempt, including retries, so callers
+    can route each request through a rate limiter.
+    """
+
+    attempt = 0
+    while True:
+        if before_attempt is not None:
+            await before_attempt()
+        try:
+            return await call()
+        except Exception as exc:
+            attempt += 1
+            if not should_retry(exc) or attempt >= max_retries:
+                raise
+            delay = max(backoff_delay(attempt, base_delay, max_delay), _retry_after(exc))
+            await asyncio.sleep(delay)
+
+
+def chunk_ranges(start_ts: int, end_ts: int, chunk_ms: int) -> List[Tuple[int, int]]:
+    """Split [start_ts, end_ts] into inclusive, non-overlapping chunks."""
+
+    ranges = []
+    current = start_ts
+    while current <= end_ts:
+        chunk_end = min(current + chunk_ms, end_ts)
+        ranges.append((current, chunk_end))
+        current = chunk_end + 1
+    return ranges
+
+
+def find_gaps(
+    open_times: Sequence[int], start_ts: int, end_ts: int, interval_ms: int
+) -> List[Tuple[int, int]]:
+    """
+    Inclusive [start, end] ranges inside [start_ts, end_ts] with no candles.
+
+    `open_times` must be sorted. Consecutive open times further apart than
+    `interval_ms` leave a gap between them; so do missing head and tail
+    stretches of the window.
+    """
+
+    times = np.asarray(open_times, dtype=np.int64)
+    times = times[(times >= start_ts) & (times <= end_ts)]
+    if len(times) == 0:
+        return [(start_ts, end_ts)] if start_ts <= end_ts else []
+
+    gaps: List[Tuple[int, int]] = []
+    if times[0] - interval_ms >= start_ts:
+        gaps.append((start_ts, int(times[0]) - interval_ms))
+    holes = np.flatnonzero(np.diff(times) > interval_ms)
+    gaps.extend(
+        (int(times[idx]) + interval_ms, int(times[idx + 1]) - interval_ms) for idx in holes
+    )
+    if times[-1] + interval_ms <= end_ts:
+        gaps.append((int(times[-1]) + interval_ms, end_ts))
+    return gaps
+
+
+def merge_ranges(ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping or adjacent inclusive ranges."""
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(
+    ranges: Iterable[Tuple[int, int]], covered: Iterable[Tuple[int, int]]
+) -> List[Tuple[int, int]]:
+    """Parts of `ranges` not inside any `covered` range (all inclusive)."""
+
+    covered = merge_ranges(covered)
+    remaining: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        current = start
+        for cov_start, cov_end in covered:
+            if cov_end < current:
+                continue
+            if cov_start > end:
+                break
+            if cov_start > current:
+                remaining.append((current, cov_start - 1))
+            current = max(current, cov_end + 1)
+            if current > end:
+                break
+        if current <= end:
+            remaining.append((current, end))
+    return remaining
+
+
+class BackfillCheckpoint:
+    """
+    Completed chunk ranges for one (source, symbol, timeframe), kept as JSON.
+
+    The file is rewritten atomically after every chunk so a crash loses at
+    most the chunk in flight.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.completed: List[Tuple[int, int]] = []
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.completed = [(int(a), int(b)) for a, b in data.get("completed", [])]
+
+    @classmethod
+    def for_series(
+        cls, source: str, symbol: str, timeframe: str, root: Optional[Path] = None
+    ) -> "BackfillCheckpoint":
+        root = Path(root or os.getenv("BACKFILL_CHECKPOINT_DIR") or DEFAULT_CHECKPOINT_DIR)
+        return cls(root / f"{source}_{symbol}_{timeframe}.json")
+
+    def mark(self, start: int, end: int) -> None:
+        self.completed = merge_ranges(self.completed + [(start, end)])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"completed": self.completed}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.completed = []
+        if self.path.exists():
+            self.path.unlink()
+
+
+def plan_backfill(
+    open_times: Sequence[int],
+    start_ts: int,
+    end_ts: int,
+    interval_ms: int,
+    chunk_ms: int,
+    checkpoint: Optional[BackfillCheckpoint] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Chunks covering the gaps in `open_times`, minus checkpointed ranges.
+
+    The newest stored candle is always re-requested because it may have been
+    saved while still open.
+    """
+
+    times = list(open_times)
+    if times and start_ts <= times[-1] <= end_ts:
+        times = times[:-1]
+    gaps = find_gaps(times, start_ts, end_ts, interval_ms)
+    if checkpoint is not None:
+        gaps = subtract_ranges(gaps, checkpoint.completed)
+    return [chunk for start, end in gaps for chunk in chunk_ranges(start, end, chunk_ms)]
+
+
+@dataclass
+class BackfillStats:
+    chunks: int = 0
+    candles: int = 0
+    upserts: int = 0
+    retries: int = 0
+
+
+class BackfillScheduler:
+    """
+    Runs `fetch_chunk(start, end)` over many ranges and persists the results.
+
+    Up to `concurrency` fetches are in flight, each gated by a token bucket of
+    `rate` requests/second. A single writer drains a queue of at most
+    `queue_size` chunks and calls `save(candles)` in an executor, so fetchers
+    pause when persistence falls behind instead of buffering unbounded data.
+    `on_chunk_saved(start, end, candles)` fires after each chunk is written.
+    """
+
+    def __init__(
+        self,
+        fetch_chunk: FetchChunk,
+        save: SaveCandles,
+        concurrency: int = 4,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        queue_size: int = 8,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        executor: Optional[Executor] = None,
+        on_chunk_saved: Optional[Callable[[int, int, List[Candle]], None]] = None,
+    ):
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.fetch_chunk = fetch_chunk
+        self.save = save
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.executor = executor
+        self.on_chunk_saved = on_chunk_saved
+
+    async def _fetch(self, start: int, end: int, stats: BackfillStats) -> List[Candle]:
+        attempts = 0
+
+        async def attempt() -> List[Candle]:
+            nonlocal attempts
+            attempts += 1
+            return await self.fetch_chunk(start, end)
+
+        try:
+            return await retry_with_backoff(
+                attempt,
+                max_retries=self.max_retries,
+                base_delay=self.base_delay,
+                max_delay=self.max_delay,
+                before_attempt=self.bucket.acquire,
+            )
+        finally:
+            stats.retries += attempts - 1
+
+    async def run(self, ranges: Iterable[Tuple[int, int]]) -> BackfillStats:
+        pending: asyncio.Queue = asyncio.Queue()
+        for chunk in ranges:
+            pending.put_nowait(chunk)
+        stats = BackfillStats(chunks=pending.qsize())
+        if stats.chunks == 0:
+            return stats
+
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        loop = asyncio.get_running_loop()
+
+        async def fetcher() -> None:
+            while True:
+                try:
+                    start, end = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                candles = await self._fetch(start, end, stats)
+                await results.put((start, end, candles))
+
+        async def writer() -> None:
+            while True:
+                item = await results.get()
+                if item is None:
+                    return
+                start, end, candles = item
+                stats.candles += len(candles)
+                if candles:
+                    stats.upserts += await loop.run_in_executor(
+                        self.executor, self.save, candles
+                    )
+                if self.on_chunk_saved:
+                    self.on_chunk_saved(start, end, candles)
+
+        fetchers = [
+            asyncio.ensure_future(fetcher()) for _ in range(min(self.concurrency, stats.chunks))
+        ]
+
+        async def close_when_fetched() -> None:
+            await asyncio.gather(*fetchers)
+            await results.put(None)
+
+        tasks = fetchers + [
+            asyncio.ensure_future(writer()),
+            asyncio.ensure_future(close_when_fetched()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return stats
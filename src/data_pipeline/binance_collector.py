@@ -9,36 +9,24 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import httpx
 
-from .collector import save_candles_to_mongo  # Reuse existing Mongo helper
+from utils.candle_time import interval_to_ms
+
+from .backfill import BackfillScheduler
+from .collector import plan_incremental_backfill, save_candles_to_mongo
 
 BINANCE_BASE_URL = "https://api.binance.com"
 MAX_LIMIT = 1000
+BACKFILL_CONCURRENCY = 4
 
 
 def parse_date(value: str) -> datetime:
     return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
 
 
-def interval_to_ms(interval: str) -> int:
-    """
-    Convert Binance interval strings (e.g., 5m, 15m, 1h) to milliseconds.
-    """
-
-    unit = interval[-1]
-    value = int(interval[:-1])
-    if unit == "m":
-        return value * 60 * 1000
-    if unit == "h":
-        return value * 60 * 60 * 1000
-    if unit == "d":
-        return value * 24 * 60 * 60 * 1000
-    raise ValueError(f"Unsupported interval: {interval}")
-
-
 async def fetch_binance_klines(
     client: httpx.AsyncClient,
     start_ts: int,
@@ -93,7 +81,21 @@ async def collect_binance_history(
     symbol_pair: str = "BTCUSDT",
     timeframe: str = "15m",
     interval: str = "15m",
+    concurrency: int = BACKFILL_CONCURRENCY,
+    full: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
+    save: Callable[[List[Dict[str, Any]]], int] = save_candles_to_mongo,
+    collection: Any = None,
 ) -> int:
+    """
+    Backfill Binance klines with `concurrency` requests in flight.
+
+    Only ranges missing from MongoDB are requested unless `full` is set.
+
+    `throttle` is the average spacing between requests (seconds), enforced by
+    the scheduler's token bucket rather than a sleep after every call.
+    """
+
     start_dt = parse_date(start_date)
     end_dt = parse_date(end_date) if end_date else datetime.now(tz=timezone.utc)
 
@@ -101,32 +103,46 @@ async def collect_binance_history(
     end_ts = int(end_dt.timestamp() * 1000)
 
     interval_ms = interval_to_ms(interval)
-    chunk_ms = MAX_LIMIT * interval_ms
-    total_candles = 0
-    total_upserts = 0
-    current = start_ts
-
-    async with httpx.AsyncClient() as client:
-        while current < end_ts:
-            chunk_end = min(current + chunk_ms, end_ts)
-            raw = await fetch_binance_klines(client, current, chunk_end, symbol_pair, interval)
-            if not raw:
-                current = chunk_end + 1
-                await asyncio.sleep(throttle)
-                continue
-
-            candles = _normalize_candles(raw, symbol, timeframe, symbol_pair)
-            total_candles += len(candles)
-            total_upserts += save_candles_to_mongo(candles)
-
-            current = int(raw[-1][6]) + 1  # move past last close time
-            await asyncio.sleep(throttle)
+    # Inclusive ranges of MAX_LIMIT open times so no chunk gets truncated
+    chunk_ms = (MAX_LIMIT - 1) * interval_ms
+    ranges, on_chunk_saved = plan_incremental_backfill(
+        "binance",
+        symbol,
+        timeframe,
+        start_ts,
+        end_ts,
+        interval_ms,
+        chunk_ms,
+        full=full,
+        collection=collection,
+    )
+
+    async def fetch_chunk(http: httpx.AsyncClient, chunk_start: int, chunk_end: int):
+        raw = await fetch_binance_klines(http, chunk_start, chunk_end, symbol_pair, interval)
+        return _normalize_candles(raw, symbol, timeframe, symbol_pair)
+
+    async def run(http: httpx.AsyncClient):
+        scheduler = BackfillScheduler(
+            lambda chunk_start, chunk_end: fetch_chunk(http, chunk_start, chunk_end),
+            save,
+            concurrency=concurrency,
+            rate=1.0 / throttle if throttle > 0 else 1000.0,
+            on_chunk_saved=on_chunk_saved,
+        )
+        return await scheduler.run(ranges)
+
+    if client is not None:
+        stats = await run(client)
+    else:
+        async with httpx.AsyncClient() as http:
+            stats = await run(http)
 
     print(
-        f"Collected {total_candles} Binance candles, {total_upserts} upserts "
+        f"Collected {stats.candles} Binance candles in {stats.chunks} chunks, "
+        f"{stats.upserts} upserts "
         f"(range: {start_dt.isoformat()} — {end_dt.isoformat()})"
     )
-    return total_upserts
+    return stats.upserts
 
 
 def main():
@@ -135,7 +151,20 @@ def main():
     parser = argparse.ArgumentParser(description="Binance BTC 15m collector")
     parser.add_argument("--start-date", required=True, help="ISO date (YYYY-MM-DD)")
     parser.add_argument("--end-date", help="ISO date (optional, defaults to now UTC)")
-    parser.add_argument("--throttle", type=float, default=0.2, help="Sleep (s) between calls")
+    parser.add_argument(
+        "--throttle", type=float, default=0.2, help="Average spacing (s) between calls"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BACKFILL_CONCURRENCY,
+        help="Requests kept in flight",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-fetch the whole range instead of only the missing candles",
+    )
     parser.add_argument("--symbol", default="BTC", help="Asset symbol (default: BTC)")
     parser.add_argument(
         "--symbol-pair", default="BTCUSDT", help="Binance symbol pair (default: BTCUSDT)"
@@ -161,6 +190,8 @@ def main():
             symbol_pair=args.symbol_pair,
             timeframe=args.timeframe,
             interval=args.interval,
+            concurrency=args.concurrency,
+            full=args.full,
         )
     )
 
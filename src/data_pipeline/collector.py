@@ -8,27 +8,42 @@ Usage:
 from __future__ import annotations
 
 import asyncio
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import os
 from pathlib import Path
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from hyperliquid.info import Info
-from hyperliquid.utils.error import ClientError
+from pymongo import ASCENDING, UpdateOne
 
 SRC_DIR = Path(__file__).resolve().parents[1]
 if str(SRC_DIR) not in sys.path:
     sys.path.append(str(SRC_DIR))
 
 from core.endpoint_router import get_endpoint_router  # noqa: E402
+from data_pipeline.backfill import (  # noqa: E402
+    BackfillCheckpoint,
+    BackfillScheduler,
+    chunk_ranges,
+    plan_backfill,
+    retry_with_backoff,
+)
 from infrastructure.db import get_mongo_db  # noqa: E402
+from utils.candle_time import interval_to_ms  # noqa: E402
 
 SYMBOL = "BTC"
 TIMEFRAME = "15m"
 INTERVAL = "15m"
 DEFAULT_HISTORY_DAYS = 30
 MAX_CHUNK_DAYS = 30  # Avoid massive payloads per request
+BACKFILL_CONCURRENCY = 4
+BACKFILL_RATE = 1.0  # candleSnapshot requests per second
+UPSERT_BATCH_SIZE = int(os.getenv("CANDLE_UPSERT_BATCH_SIZE", "1000"))
+CANDLE_INDEX_NAME = "symbol_timeframe_open_time_unique"
+
+_indexed_collections: set = set()
 
 
 def _use_testnet() -> bool:
@@ -56,30 +71,14 @@ def _build_info_client() -> Info:
     return Info(base_url, skip_ws=True)
 
 
-async def fetch_btc_15m_candles(
-    start_ts: int, end_ts: int, client: Optional[Info] = None, max_retries: int = 5
-) -> List[Dict[str, Any]]:
-    """
-    Fetch BTC 15m candles between start_ts and end_ts (timestamps in ms).
-    """
+async def _fetch_btc_15m_chunk(start_ts: int, end_ts: int, client: Info) -> List[Dict[str, Any]]:
+    """Single candles_snapshot request, normalized to the Mongo document shape."""
 
-    local_client = client or _build_info_client()
     loop = asyncio.get_running_loop()
-
-    attempt = 0
-    while True:
-        try:
-            raw_candles = await loop.run_in_executor(
-                None,
-                lambda: local_client.candles_snapshot(SYMBOL, INTERVAL, start_ts, end_ts),
-            )
-            break
-        except ClientError as exc:
-            attempt += 1
-            if exc.status_code == 429 and attempt < max_retries:
-                await asyncio.sleep(min(2**attempt, 30))
-                continue
-            raise
+    raw_candles = await loop.run_in_executor(
+        None,
+        lambda: client.candles_snapshot(SYMBOL, INTERVAL, start_ts, end_ts),
+    )
     candles: List[Dict[str, Any]] = []
 
     for entry in raw_candles or []:
@@ -102,28 +101,197 @@ async def fetch_btc_15m_candles(
     return candles
 
 
-def save_candles_to_mongo(candles: List[Dict[str, Any]]) -> int:
+async def fetch_btc_15m_candles(
+    start_ts: int, end_ts: int, client: Optional[Info] = None, max_retries: int = 5
+) -> List[Dict[str, Any]]:
     """
-    Upsert candles into MongoDB using (symbol,timeframe,open_time) as key.
+    Fetch BTC 15m candles between start_ts and end_ts (timestamps in ms).
+    """
+
+    local_client = client or _build_info_client()
+    return await retry_with_backoff(
+        lambda: _fetch_btc_15m_chunk(start_ts, end_ts, local_client),
+        max_retries=max_retries,
+    )
+
+
+@dataclass
+class UpsertStats:
+    """Counters aggregated across bulk_write batches."""
+
+    inserted: int = 0
+    modified: int = 0
+    matched: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.modified
+
+
+def _collection_key(collection: Any) -> Any:
+    """
+    (server addresses, "db.collection") for pymongo collections, so every
+    Collection object for the same name shares one entry. Other objects
+    are kept as-is: holding them means their id is never reused.
+    """
+
+    full_name = getattr(collection, "full_name", None)
+    database = getattr(collection, "database", None)
+    client = getattr(database, "client", None)
+    if full_name is None or client is None:
+        return collection
+    addresses = tuple(sorted(client.topology_description.server_descriptions()))
+    return addresses, full_name
+
+
+def ensure_candle_index(collection: Any) -> None:
+    """
+    Guarantee the unique (symbol, timeframe, open_time) index exists.
+
+    create_index is idempotent, but it is still a round trip, so each
+    collection (server + name) is only checked once per process.
+    """
+
+    key = _collection_key(collection)
+    if key in _indexed_collections:
+        return
+    collection.create_index(
+        [("symbol", ASCENDING), ("timeframe", ASCENDING), ("open_time", ASCENDING)],
+        name=CANDLE_INDEX_NAME,
+        unique=True,
+    )
+    _indexed_collections.add(key)
+
+
+def bulk_upsert_candles(
+    candles: List[Dict[str, Any]],
+    collection: Any = None,
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> UpsertStats:
+    """
+    Upsert candles with unordered bulk_write batches of UpdateOne ops.
+
+    Candles repeated within the input keep the last occurrence, so a batch
+    never carries two ops for the same key.
     """
 
+    stats = UpsertStats()
     if not candles:
-        return 0
+        return stats
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
 
-    db = get_mongo_db()
-    collection = db["candles"]
-    upserts = 0
+    if collection is None:
+        collection = get_mongo_db()["candles"]
+    ensure_candle_index(collection)
 
+    latest: Dict[Tuple[Any, Any, int], Dict[str, Any]] = {}
     for candle in candles:
-        filter_doc = {
-            "symbol": candle["symbol"],
-            "timeframe": candle["timeframe"],
-            "open_time": candle["open_time"],
-        }
-        result = collection.update_one(filter_doc, {"$set": candle}, upsert=True)
-        upserts += bool(result.upserted_id) or result.modified_count > 0
+        latest[(candle["symbol"], candle["timeframe"], candle["open_time"])] = candle
+    unique_candles = list(latest.values())
+
+    for offset in range(0, len(unique_candles), batch_size):
+        operations = [
+            UpdateOne(
+                {
+                    "symbol": candle["symbol"],
+                    "timeframe": candle["timeframe"],
+                    "open_time": candle["open_time"],
+                },
+                {"$set": candle},
+                upsert=True,
+            )
+            for candle in unique_candles[offset : offset + batch_size]
+        ]
+        result = collection.bulk_write(operations, ordered=False)
+        stats.inserted += result.upserted_count
+        stats.modified += result.modified_count
+        stats.matched += result.matched_count
+
+    return stats
+
+
+def save_candles_to_mongo(
+    candles: List[Dict[str, Any]],
+    batch_size: int = UPSERT_BATCH_SIZE,
+    collection: Any = None,
+) -> int:
+    """
+    Upsert candles into MongoDB using (symbol,timeframe,open_time) as key.
+
+    Returns the number of documents inserted or modified.
+    """
 
-    return upserts
+    return bulk_upsert_candles(candles, collection=collection, batch_size=batch_size).changed
+
+
+def load_open_times(
+    symbol: str,
+    timeframe: str,
+    start_ts: Optional[int] = None,
+    end_ts: Optional[int] = None,
+    collection: Any = None,
+) -> List[int]:
+    """
+    Sorted open_times already stored for (symbol, timeframe).
+
+    Only open_time is projected, so the query is covered by the unique
+    candle index and never touches the documents.
+    """
+
+    if collection is None:
+        collection = get_mongo_db()["candles"]
+
+    query: Dict[str, Any] = {"symbol": symbol, "timeframe": timeframe}
+    bounds: Dict[str, int] = {}
+    if start_ts is not None:
+        bounds["$gte"] = start_ts
+    if end_ts is not None:
+        bounds["$lte"] = end_ts
+    if bounds:
+        query["open_time"] = bounds
+
+    cursor = collection.find(
+        query, projection={"_id": 0, "open_time": 1}, sort=[("open_time", ASCENDING)]
+    )
+    return [doc["open_time"] for doc in cursor]
+
+
+def plan_incremental_backfill(
+    source: str,
+    symbol: str,
+    timeframe: str,
+    start_ts: int,
+    end_ts: int,
+    interval_ms: int,
+    chunk_ms: int,
+    full: bool = False,
+    collection: Any = None,
+) -> Tuple[List[Tuple[int, int]], Optional[Callable[[int, int, List[Dict[str, Any]]], None]]]:
+    """
+    Chunk ranges still missing from MongoDB and a checkpoint callback.
+
+    With `full=True` the whole window is re-fetched and the checkpoint is
+    reset. Chunks that end before the current candle opened are recorded in
+    the checkpoint once saved, so a resumed run skips them.
+    """
+
+    checkpoint = BackfillCheckpoint.for_series(source, symbol, timeframe)
+    if full:
+        checkpoint.clear()
+        ranges = chunk_ranges(start_ts, end_ts, chunk_ms)
+    else:
+        open_times = load_open_times(symbol, timeframe, start_ts, end_ts, collection)
+        ranges = plan_backfill(open_times, start_ts, end_ts, interval_ms, chunk_ms, checkpoint)
+
+    now_ms = int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+    closed_before = now_ms - now_ms % interval_ms
+
+    def on_chunk_saved(chunk_start: int, chunk_end: int, _candles: List[Dict[str, Any]]) -> None:
+        if chunk_end < closed_before:
+            checkpoint.mark(chunk_start, chunk_end)
+
+    return ranges, on_chunk_saved
 
 
 def _parse_date(value: Optional[str]) -> Optional[datetime]:
@@ -132,24 +300,24 @@ def _parse_date(value: Optional[str]) -> Optional[datetime]:
     return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
 
 
-def _chunk_ranges(start_ts: int, end_ts: int, chunk_ms: int) -> List[Tuple[int, int]]:
-    ranges = []
-    current = start_ts
-    while current < end_ts:
-        chunk_end = min(current + chunk_ms, end_ts)
-        ranges.append((current, chunk_end))
-        current = chunk_end + 1
-    return ranges
-
-
 async def collect_btc_15m_history(
     days: Optional[int] = None,
     years: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    concurrency: int = BACKFILL_CONCURRENCY,
+    rate: float = BACKFILL_RATE,
+    full: bool = False,
+    client: Optional[Info] = None,
+    save: Callable[[List[Dict[str, Any]]], int] = save_candles_to_mongo,
+    collection: Any = None,
 ) -> int:
     """
     Fetch and persist BTC 15m candles for a configurable window.
+
+    Only gaps in the stored coverage are fetched unless `full` is set.
+    Chunks are fetched concurrently (`concurrency` in flight, `rate` requests
+    per second) while earlier chunks are being written by `save`.
     """
 
     end_dt = _parse_date(end_date) or datetime.now(tz=timezone.utc)
@@ -168,20 +336,33 @@ async def collect_btc_15m_history(
     end_ts = int(end_dt.timestamp() * 1000)
 
     chunk_ms = MAX_CHUNK_DAYS * 24 * 60 * 60 * 1000
-    total_candles = 0
-    total_upserts = 0
-    client = _build_info_client()
-
-    for chunk_start, chunk_end in _chunk_ranges(start_ts, end_ts, chunk_ms):
-        candles = await fetch_btc_15m_candles(chunk_start, chunk_end, client=client)
-        total_candles += len(candles)
-        total_upserts += save_candles_to_mongo(candles)
+    ranges, on_chunk_saved = plan_incremental_backfill(
+        "hyperliquid",
+        SYMBOL,
+        TIMEFRAME,
+        start_ts,
+        end_ts,
+        interval_to_ms(INTERVAL),
+        chunk_ms,
+        full=full,
+        collection=collection,
+    )
+    info_client = client or _build_info_client()
+    scheduler = BackfillScheduler(
+        lambda chunk_start, chunk_end: _fetch_btc_15m_chunk(chunk_start, chunk_end, info_client),
+        save,
+        concurrency=concurrency,
+        rate=rate,
+        on_chunk_saved=on_chunk_saved,
+    )
+    stats = await scheduler.run(ranges)
 
     print(
-        f"Collected {total_candles} candles, {total_upserts} documents upserted "
+        f"Collected {stats.candles} candles in {stats.chunks} chunks, "
+        f"{stats.upserts} documents upserted "
         f"(range: {start_dt.isoformat()} — {end_dt.isoformat()})"
     )
-    return total_upserts
+    return stats.upserts
 
 
 if __name__ == "__main__":
@@ -200,6 +381,23 @@ if __name__ == "__main__":
         type=str,
         help="ISO date (YYYY-MM-DD) to end at (UTC). Defaults to now.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BACKFILL_CONCURRENCY,
+        help="Chunk requests kept in flight",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=BACKFILL_RATE,
+        help="Maximum requests per second",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-fetch the whole window instead of only the missing ranges",
+    )
 
     args = parser.parse_args()
     asyncio.run(
@@ -208,5 +406,8 @@ if __name__ == "__main__":
             years=args.years,
             start_date=args.start_date,
             end_date=args.end_date,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            full=args.full,
         )
     )
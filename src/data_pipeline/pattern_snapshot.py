@@ -1,16 +1,64 @@
 """
 Generate pattern signal documents with outcomes for later training.
+
+Candles are streamed in chunks that overlap by lookback + horizon candles,
+so every entry sees its full window and outcome horizon inside one chunk.
+Chunks are scanned on a process pool (vectorized patterns, indicators and
+outcomes) and written back in order with unordered insert_many batches;
+at most `max_pending` chunks are in flight, which bounds memory.
+
+Runs are incremental: without --replace, generation resumes from the last
+entry_time already stored for the same symbol/timeframe/parameters.
 """
 
 from __future__ import annotations
 
 import argparse
-from typing import Any, Dict, List
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from pymongo import ASCENDING
 
 from infrastructure.db import get_mongo_db
-from ml.dataset import load_candles_from_mongo
-from ml.features import compute_indicator_set
-from ml.patterns import analyze_patterns
+from ml.dataset import candle_columns
+from ml.features import INDICATOR_KEYS, compute_indicator_matrix
+from ml.patterns import PATTERN_NAMES, analyze_patterns_series
+
+SIGNAL_INDEX_NAME = "pattern_signals_run_entry_time"
+DEFAULT_CHUNK_SIZE = 20000
+
+
+@dataclass(frozen=True)
+class SnapshotParams:
+    """Parameters that identify one pattern_signals run"""
+
+    symbol: str = "BTC"
+    timeframe: str = "15m"
+    lookback: int = 48
+    horizon: int = 4
+    gain_pct: float = 0.05
+    stop_pct: float = 0.05
+
+    @property
+    def overlap(self) -> int:
+        """Candles shared by consecutive chunks: lookback - 1 behind, horizon + 1 ahead"""
+
+        return self.lookback + self.horizon
+
+    def query(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "lookback": self.lookback,
+            "horizon": self.horizon,
+            "gain_pct": self.gain_pct,
+            "stop_pct": self.stop_pct,
+        }
 
 
 def evaluate_outcome(
@@ -50,6 +98,278 @@ def evaluate_outcome(
     }
 
 
+def _outcomes(
+    columns: Dict[str, np.ndarray],
+    entries: np.ndarray,
+    horizon: int,
+    gain_pct: float,
+    stop_pct: float,
+) -> List[Dict[str, Any]]:
+    """`evaluate_outcome` for many entries that all have a full horizon"""
+
+    closes = columns["close"]
+    entry_price = closes[entries]
+    future = entries[:, None] + np.arange(1, horizon + 1)
+    up = columns["high"][future] >= (entry_price * (1 + gain_pct))[:, None]
+    down = columns["low"][future] <= (entry_price * (1 - stop_pct))[:, None]
+    hit = up | down
+    first = hit.argmax(axis=1)
+    any_hit = hit.any(axis=1)
+    first_is_up = up[np.arange(len(entries)), first]
+    final_return = closes[entries + horizon] / entry_price - 1
+
+    outcomes = []
+    for reached, is_up, step, final in zip(
+        any_hit.tolist(), first_is_up.tolist(), first.tolist(), final_return.tolist()
+    ):
+        if not reached:
+            outcome = {"outcome": "open", "return": final, "candles_to_outcome": horizon}
+        elif is_up:
+            outcome = {"outcome": "target", "return": gain_pct, "candles_to_outcome": step + 1}
+        else:
+            outcome = {"outcome": "stop", "return": -stop_pct, "candles_to_outcome": step + 1}
+        outcomes.append(outcome)
+    return outcomes
+
+
+def snapshot_chunk(
+    columns: Dict[str, np.ndarray], params: SnapshotParams, since: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pattern signal documents for one chunk of candles.
+
+    Entries are the candles with a full lookback window behind them and
+    horizon + 1 candles after them; `since` skips entries with an earlier
+    open_time. Runs in the worker processes.
+    """
+
+    lookback, horizon = params.lookback, params.horizon
+    total = len(columns["close"])
+    first, stop = lookback - 1, total - horizon - 1
+    if stop <= first:
+        return []
+
+    flags = analyze_patterns_series(columns, lookback)[first:stop]
+    entries = np.flatnonzero(flags.any(axis=1)) + first
+    open_times = columns["open_time"]
+    if since is not None:
+        entries = entries[open_times[entries] >= since]
+    if not len(entries):
+        return []
+
+    indicators = compute_indicator_matrix(
+        columns["close"], columns["high"], columns["low"], columns["volume"], lookback
+    )[entries - lookback + 1].tolist()
+    outcomes = _outcomes(columns, entries, horizon, params.gain_pct, params.stop_pct)
+
+    docs = []
+    for row, entry in enumerate(entries.tolist()):
+        outcome = outcomes[row]
+        for col in np.flatnonzero(flags[entry - first]).tolist():
+            docs.append(
+                {
+                    "symbol": params.symbol,
+                    "timeframe": params.timeframe,
+                    "pattern": PATTERN_NAMES[col],
+                    "entry_time": int(open_times[entry]),
+                    "entry_price": float(columns["close"][entry]),
+                    "lookback": lookback,
+                    "horizon": horizon,
+                    "gain_pct": params.gain_pct,
+                    "stop_pct": params.stop_pct,
+                    "outcome": outcome["outcome"],
+                    "return": outcome["return"],
+                    "candles_to_outcome": outcome["candles_to_outcome"],
+                    "indicators": dict(zip(INDICATOR_KEYS, indicators[row])),
+                }
+            )
+    return docs
+
+
+def _columns(candles: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    columns = candle_columns(candles)
+    columns["open_time"] = np.fromiter(
+        (c["open_time"] for c in candles), dtype=np.int64, count=len(candles)
+    )
+    return columns
+
+
+def candle_chunks(
+    candles: Iterable[Dict[str, Any]], chunk_size: int, overlap: int
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Column chunks of `chunk_size` candles from a (streamed) candle iterable;
+    each chunk repeats the last `overlap` candles of the previous one.
+    """
+
+    if chunk_size <= overlap:
+        raise ValueError("chunk_size must be larger than lookback + horizon")
+    buffer: List[Dict[str, Any]] = []
+    fresh = False
+    for candle in candles:
+        buffer.append(candle)
+        fresh = True
+        if len(buffer) >= chunk_size:
+            yield _columns(buffer)
+            buffer = buffer[-overlap:]
+            fresh = False
+    if fresh:
+        yield _columns(buffer)
+
+
+def series_chunks(
+    columns: Dict[str, np.ndarray], chunk_size: int, overlap: int
+) -> Iterator[Dict[str, np.ndarray]]:
+    """`candle_chunks` over column arrays already in memory (CandleStore)"""
+
+    if chunk_size <= overlap:
+        raise ValueError("chunk_size must be larger than lookback + horizon")
+    total = len(columns["open_time"])
+    step = chunk_size - overlap
+    start = 0
+    while True:
+        yield {name: values[start : start + chunk_size] for name, values in columns.items()}
+        if start + chunk_size >= total:
+            return
+        start += step
+
+
+def ensure_signal_index(collection: Any) -> None:
+    collection.create_index(
+        [
+            ("symbol", ASCENDING),
+            ("timeframe", ASCENDING),
+            ("lookback", ASCENDING),
+            ("horizon", ASCENDING),
+            ("gain_pct", ASCENDING),
+            ("stop_pct", ASCENDING),
+            ("entry_time", ASCENDING),
+        ],
+        name=SIGNAL_INDEX_NAME,
+    )
+
+
+def resume_point(collection: Any, params: SnapshotParams) -> Optional[int]:
+    """
+    Entry time to resume from: the last one stored for this run, or None
+    for a fresh run.
+
+    Documents at that entry_time are removed and regenerated, since an
+    interrupted run may have written only some of its patterns.
+    """
+
+    last = collection.find_one(
+        params.query(), projection={"_id": 0, "entry_time": 1}, sort=[("entry_time", -1)]
+    )
+    if not last:
+        return None
+    entry_time = int(last["entry_time"])
+    collection.delete_many({**params.query(), "entry_time": entry_time})
+    return entry_time
+
+
+def stream_mongo_candles(
+    db: Any,
+    params: SnapshotParams,
+    since: Optional[int] = None,
+    limit: int = 0,
+    batch_size: int = 5000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Ascending candles from MongoDB: up to `limit` (0 = all) from `since`
+    on, preceded by the lookback - 1 candles the first window needs.
+    """
+
+    collection = db["candles"]
+    query: Dict[str, Any] = {"symbol": params.symbol, "timeframe": params.timeframe}
+    projection = {
+        "_id": 0,
+        "open_time": 1,
+        "open": 1,
+        "high": 1,
+        "low": 1,
+        "close": 1,
+        "volume": 1,
+    }
+    if since is not None:
+        warmup = list(
+            collection.find(
+                {**query, "open_time": {"$lt": since}},
+                projection=projection,
+                sort=[("open_time", -1)],
+                limit=params.lookback - 1,
+            )
+        )
+        yield from reversed(warmup)
+        query["open_time"] = {"$gte": since}
+    yield from collection.find(
+        query, projection=projection, sort=[("open_time", 1)], limit=limit, batch_size=batch_size
+    )
+
+
+def store_columns(
+    params: SnapshotParams, since: Optional[int] = None, limit: int = 0
+) -> Dict[str, np.ndarray]:
+    """Same candles as `stream_mongo_candles`, read from the local CandleStore"""
+
+    from infrastructure.candle_store import CandleStore
+
+    store = CandleStore()
+    store.sync_from_mongo(params.symbol, params.timeframe)
+    series = store.series(params.symbol, params.timeframe)
+    start = 0
+    if since is not None:
+        start = int(np.searchsorted(series["open_time"], since, "left"))
+    stop = start + limit if limit else len(series)
+    return series.slice(max(0, start - (params.lookback - 1)), stop).columns
+
+
+def write_signals(
+    collection: Any,
+    chunks: Iterable[Dict[str, np.ndarray]],
+    params: SnapshotParams,
+    since: Optional[int] = None,
+    workers: Optional[int] = None,
+    batch: int = 500,
+    max_pending: Optional[int] = None,
+) -> int:
+    """
+    Scan chunks on `workers` processes (1 = in this process) and insert
+    their documents; returns the number inserted.
+
+    Results are written in chunk order, so an interrupted run leaves a
+    prefix of the series and the next run resumes after it.
+    """
+
+    if batch <= 0:
+        raise ValueError("batch must be positive")
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    inserted = 0
+
+    def insert(docs: List[Dict[str, Any]]) -> None:
+        nonlocal inserted
+        for offset in range(0, len(docs), batch):
+            collection.insert_many(docs[offset : offset + batch], ordered=False)
+        inserted += len(docs)
+
+    if workers <= 1:
+        for columns in chunks:
+            insert(snapshot_chunk(columns, params, since))
+        return inserted
+
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for columns in chunks:
+            # Back-pressure: stop reading candles until the oldest chunk is written
+            if len(pending) >= max_pending:
+                insert(pending.popleft().result())
+            pending.append(pool.submit(snapshot_chunk, columns, params, since))
+        while pending:
+            insert(pending.popleft().result())
+    return inserted
+
+
 def main():
     parser = argparse.ArgumentParser(description="Snapshot pattern outcomes for ML")
     parser.add_argument("--symbol", default="BTC")
@@ -58,65 +378,48 @@ def main():
     parser.add_argument("--horizon", type=int, default=4)
     parser.add_argument("--gain", type=float, default=0.05, help="Target gain pct (0.05=5%)")
     parser.add_argument("--stop", type=float, default=0.05, help="Stop loss pct")
-    parser.add_argument("--max-candles", type=int, default=120000)
-    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument(
+        "--max-candles", type=int, default=120000, help="New candles read per run (0 = all)"
+    )
+    parser.add_argument("--batch", type=int, default=500, help="Documents per insert_many")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
     parser.add_argument("--replace", action="store_true", help="Drop previous pattern signals")
     args = parser.parse_args()
 
-    db = get_mongo_db()
-    collection = db["pattern_signals"]
-    if args.replace:
-        collection.drop()
-
-    candles = load_candles_from_mongo(
-        limit=args.max_candles,
+    if args.horizon < 1:
+        parser.error("--horizon must be >= 1")
+    params = SnapshotParams(
         symbol=args.symbol,
         timeframe=args.timeframe,
+        lookback=args.lookback,
+        horizon=args.horizon,
+        gain_pct=args.gain,
+        stop_pct=args.stop,
     )
-    total = len(candles)
-    inserted = 0
-    docs: List[Dict[str, Any]] = []
-
-    for idx in range(args.lookback, total - args.horizon):
-        window = candles[idx - args.lookback : idx]
-        patterns = analyze_patterns(window)
-        active = {name: flag for name, flag in patterns.items() if flag}
-        if not active:
-            continue
-
-        entry_index = idx - 1
-        outcome = evaluate_outcome(candles, entry_index, args.horizon, args.gain, args.stop)
-        indicators = compute_indicator_set(window)
-        entry_candle = candles[entry_index]
-
-        for pattern_name in active.keys():
-            doc = {
-                "symbol": args.symbol,
-                "timeframe": args.timeframe,
-                "pattern": pattern_name,
-                "entry_time": entry_candle["open_time"],
-                "entry_price": entry_candle["close"],
-                "lookback": args.lookback,
-                "horizon": args.horizon,
-                "gain_pct": args.gain,
-                "stop_pct": args.stop,
-                "outcome": outcome["outcome"],
-                "return": outcome["return"],
-                "candles_to_outcome": outcome["candles_to_outcome"],
-                "indicators": indicators,
-            }
-            docs.append(doc)
 
-        if len(docs) >= args.batch:
-            collection.insert_many(docs)
-            inserted += len(docs)
-            docs.clear()
+    db = get_mongo_db()
+    collection = db["pattern_signals"]
+    if args.replace:
+        collection.drop()
+    ensure_signal_index(collection)
+    since = None if args.replace else resume_point(collection, params)
+    if since is not None:
+        print(f"Resuming from entry_time {since}")
 
-    if docs:
-        collection.insert_many(docs)
-        inserted += len(docs)
+    if os.getenv("CANDLE_SOURCE", "mongo").lower() == "store":
+        columns = store_columns(params, since, args.max_candles)
+        chunks = series_chunks(columns, args.chunk_size, params.overlap)
+    else:
+        candles = stream_mongo_candles(db, params, since, args.max_candles)
+        chunks = candle_chunks(candles, args.chunk_size, params.overlap)
 
-    print(f"Inserted {inserted} pattern signal documents")
+    started = time.perf_counter()
+    inserted = write_signals(collection, chunks, params, since, args.workers, args.batch)
+    print(
+        f"Inserted {inserted} pattern signal documents "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
 
 
 if __name__ == "__main__":
@@ -56,7 +56,21 @@ def create_exchange_adapter(exchange_type: str, config: dict):
         if not private_key:
             raise ValueError("private_key is required for Hyperliquid")
 
-        return exchange_class(private_key, testnet)
+        # Optional tuning for the blocking SDK thread pool
+        sdk_options = {
+            key: config[key]
+            for key in (
+                "sdk_workers",
+                "request_timeout",
+                "order_timeout",
+                "meta_refresh_interval",
+                "max_price_age",
+                "equity_log_dir",
+                "max_equity_age",
+            )
+            if key in config
+        }
+        return exchange_class(private_key, testnet, **sdk_options)
     if exchange_type == "paper":
         symbol = config.get("symbol", "BTC")
         initial_balance = config.get("initial_balance", 100.0)
@@ -5,7 +5,9 @@ Clean implementation of Hyperliquid integration using the exchange interface.
 Technical implementation separated from business logic.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
+import asyncio
+import os
 import time
 
 from interfaces.exchange import (
@@ -14,10 +16,15 @@ from interfaces.exchange import (
     OrderSide,
     OrderType,
     OrderStatus,
+    OrderResult,
     Balance,
     MarketInfo,
 )
 from core.endpoint_router import get_endpoint_router
+from core.equity_curve import EquityCurve, default_log_path
+from core.order_tracker import map_order_status
+from .asset_meta import AssetMeta, AssetMetaCache
+from .sdk_executor import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT, SDKExecutor
 
 
 class HyperliquidAdapter(ExchangeAdapter):
@@ -26,9 +33,36 @@ class HyperliquidAdapter(ExchangeAdapter):
 
     Handles all Hyperliquid-specific technical details while implementing
     the clean exchange interface that strategies can use.
+
+    The SDK is blocking, so every call goes through a bounded thread pool
+    (`self.sdk`) with a timeout: `request_timeout` for info queries and
+    `order_timeout` for exchange actions.
+
+    Tick/lot metadata for every asset is loaded at connect and refreshed in
+    the background every `meta_refresh_interval` seconds.
+
+    With a price provider attached (`set_price_provider`), market orders and
+    position valuation use the streamed mid when it is at most
+    `max_price_age` seconds old and fall back to all_mids otherwise.
+
+    Account value samples and fills feed `self.equity_curve`; with
+    `equity_log_dir` set it is persisted per wallet and replayed at
+    connect. `get_account_metrics` is served from it while the last sample
+    is younger than `max_equity_age`.
     """
 
-    def __init__(self, private_key: str, testnet: bool = True):
+    def __init__(
+        self,
+        private_key: str,
+        testnet: bool = True,
+        sdk_workers: int = DEFAULT_MAX_WORKERS,
+        request_timeout: float = DEFAULT_TIMEOUT,
+        order_timeout: float = 15.0,
+        meta_refresh_interval: float = 3600.0,
+        max_price_age: float = 2.0,
+        equity_log_dir: Optional[str] = None,
+        max_equity_age: float = 30.0,
+    ):
         super().__init__("Hyperliquid")
         self.private_key = private_key
         self.testnet = testnet
@@ -38,6 +72,26 @@ class HyperliquidAdapter(ExchangeAdapter):
         self.info = None
         self.exchange = None
 
+        # Blocking SDK calls run here instead of on the event loop
+        self.sdk = SDKExecutor(max_workers=sdk_workers, timeout=request_timeout)
+        self.order_timeout = order_timeout
+
+        # Per-asset szDecimals / price decimals used for order rounding
+        self.asset_meta = AssetMetaCache(refresh_interval=meta_refresh_interval)
+        self._meta_refresh_task: Optional[asyncio.Task] = None
+
+        # Streamed mids (e.g. HyperliquidMarketData.get_latest_data)
+        self.price_provider: Optional[Callable[[str], Any]] = None
+        self.max_price_age = max_price_age
+        self.streamed_prices_used = 0
+        self.rest_price_fetches = 0
+
+        # High-water mark / drawdown / realized PnL (file-backed once connected)
+        self.equity_log_dir = equity_log_dir or os.getenv("EQUITY_LOG_DIR")
+        self.max_equity_age = max_equity_age
+        self.equity_curve = EquityCurve()
+        self._account_summary: Dict[str, Any] = {}
+
         # Endpoint router for smart routing
         self.endpoint_router = get_endpoint_router(testnet)
 
@@ -75,11 +129,20 @@ class HyperliquidAdapter(ExchangeAdapter):
             wallet = Account.from_key(self.private_key)
 
             # Initialize SDK components with proper endpoint routing
-            self.info = Info(info_base_url, skip_ws=True)
-            self.exchange = Exchange(wallet, exchange_base_url)
+            # (both constructors fetch metadata over HTTP)
+            self.info = await self.sdk.run(Info, info_base_url, skip_ws=True)
+            self.exchange = await self.sdk.run(Exchange, wallet, exchange_base_url)
+
+            # Rounding metadata, loaded once instead of per order
+            await self.refresh_asset_meta()
 
             # Test connection
-            user_state = self.info.user_state(self.exchange.wallet.address)
+            user_state = await self._info_call(
+                self.info.user_state, self.exchange.wallet.address
+            )
+
+            self._open_equity_curve(self.exchange.wallet.address)
+            self.record_account_state(user_state)
 
             self.is_connected = True
             print(
@@ -95,11 +158,191 @@ class HyperliquidAdapter(ExchangeAdapter):
             self.is_connected = False
             return False
 
+    async def _info_call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Info query off the event loop"""
+        return await self.sdk.run(func, *args, **kwargs)
+
+    async def _exchange_call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Exchange action off the event loop"""
+        return await self.sdk.run(func, *args, timeout=self.order_timeout, **kwargs)
+
+    async def refresh_asset_meta(self) -> int:
+        """Reload tick/lot metadata from the meta and spotMeta endpoints"""
+        meta = await self._info_call(self.info.meta)
+        try:
+            spot_meta = await self._info_call(self.info.spot_meta)
+        except Exception as e:
+            print(f"⚠️ spotMeta unavailable, using perp metadata only: {e}")
+            spot_meta = None
+        return self.asset_meta.load(meta, spot_meta)
+
+    async def _refresh_asset_meta_quietly(self) -> None:
+        try:
+            await self.refresh_asset_meta()
+        except Exception as e:
+            print(f"⚠️ Failed to refresh asset metadata: {e}")
+
+    async def _ensure_asset_meta(self) -> None:
+        """Load metadata if missing; refresh stale metadata in the background"""
+        if not self.asset_meta.is_loaded():
+            await self.refresh_asset_meta()
+        elif self.asset_meta.is_stale() and (
+            self._meta_refresh_task is None or self._meta_refresh_task.done()
+        ):
+            self._meta_refresh_task = asyncio.create_task(self._refresh_asset_meta_quietly())
+
+    def set_price_provider(
+        self, provider: Optional[Callable[[str], Any]], max_age: Optional[float] = None
+    ) -> None:
+        """
+        Use streamed prices instead of an all_mids round trip.
+
+        `provider(asset)` returns an object with `price` and `timestamp`
+        (seconds), such as MarketData, or None when nothing is cached.
+        """
+        self.price_provider = provider
+        if max_age is not None:
+            self.max_price_age = max_age
+
+    def _streamed_price(self, asset: str) -> Optional[float]:
+        """Latest streamed mid for `asset` if fresh enough, else None"""
+        if self.price_provider is None:
+            return None
+        try:
+            data = self.price_provider(asset)
+        except Exception:
+            return None
+        if data is None or time.time() - data.timestamp > self.max_price_age:
+            return None
+        self.streamed_prices_used += 1
+        return float(data.price)
+
+    async def _fetch_mids(self) -> Dict[str, str]:
+        self.rest_price_fetches += 1
+        return await self._info_call(self.info.all_mids)
+
+    async def _prices_for(self, assets: List[str]) -> Dict[str, float]:
+        """Prices for `assets`: streamed where fresh, one all_mids for the rest"""
+        prices: Dict[str, float] = {}
+        missing = []
+        for asset in dict.fromkeys(assets):
+            price = self._streamed_price(asset)
+            if price is None:
+                missing.append(asset)
+            else:
+                prices[asset] = price
+        if missing:
+            all_mids = await self._fetch_mids()
+            for asset in missing:
+                if asset in all_mids:
+                    prices[asset] = float(all_mids[asset])
+        return prices
+
+    @property
+    def wallet_address(self) -> Optional[str]:
+        """Address used for user-specific WebSocket subscriptions"""
+        return self.exchange.wallet.address if self.exchange else None
+
+    @staticmethod
+    def parse_user_state(
+        user_state: Dict[str, Any],
+        price_lookup: Callable[[str], Optional[float]],
+    ) -> Tuple[List["Position"], Dict[str, Balance]]:
+        """
+        Convert a user_state / clearinghouseState payload into positions and balances.
+
+        Shared by the REST path and the webData2 WebSocket feed so both produce
+        identical snapshots. Positions without a known price are valued at entry.
+        """
+        from interfaces.strategy import Position
+
+        positions = []
+        for pos_info in user_state.get("assetPositions", []):
+            position_data = pos_info.get("position", {})
+            position_size = float(position_data.get("szi", 0))
+            if position_size == 0:
+                continue
+
+            asset = position_data["coin"]
+            entry_price = float(position_data.get("entryPx") or 0)
+            current_price = price_lookup(asset)
+            if current_price is None:
+                current_price = entry_price
+            unrealized_pnl = (
+                position_size * (current_price - entry_price) if entry_price > 0 else 0.0
+            )
+            positions.append(
+                Position(
+                    asset=asset,
+                    size=position_size,
+                    entry_price=entry_price,
+                    current_value=abs(position_size) * current_price,
+                    unrealized_pnl=unrealized_pnl,
+                    timestamp=time.time(),
+                )
+            )
+
+        balances = {}
+        for balance_info in user_state.get("balances", []):
+            coin = balance_info.get("coin", "")
+            total = float(balance_info.get("total", 0))
+            hold = float(balance_info.get("hold", 0))
+            balances[coin] = Balance(
+                asset=coin, available=total - hold, locked=hold, total=total
+            )
+
+        return positions, balances
+
+    def _open_equity_curve(self, address: str) -> None:
+        """Switch to the wallet's persisted equity log (replaying it)"""
+        if not self.equity_log_dir or self.equity_curve.path is not None:
+            return
+        self.equity_curve = EquityCurve(
+            default_log_path(self.equity_log_dir, address, self.testnet)
+        )
+        if self.equity_curve.value is not None:
+            print(
+                f"📈 Equity log replayed: HWM ${self.equity_curve.high_water_mark:,.2f}, "
+                f"realized PnL ${self.equity_curve.realized_pnl:,.2f}"
+            )
+
+    def record_account_state(self, user_state: Dict[str, Any]) -> None:
+        """
+        Sample account value from a user_state / clearinghouseState payload.
+
+        Called for REST snapshots and for every webData2 push, so metrics
+        stay current without polling.
+        """
+        summary = user_state.get("marginSummary") or user_state.get("crossMarginSummary")
+        if not summary or summary.get("accountValue") is None:
+            return
+        total_value = float(summary["accountValue"])
+        positions, _ = self.parse_user_state(user_state, self._streamed_price)
+        self._account_summary = {
+            "unrealized_pnl": sum(pos.unrealized_pnl for pos in positions),
+            "positions_count": len(positions),
+            "largest_position_pct": max(
+                [abs(pos.current_value) / total_value * 100 for pos in positions],
+                default=0.0,
+            )
+            if total_value > 0
+            else 0.0,
+        }
+        self.equity_curve.record_value(
+            total_value, unrealized_pnl=self._account_summary["unrealized_pnl"]
+        )
+
+    def on_user_fills(self, payload: Dict[str, Any]) -> None:
+        """userFills handler: books closed PnL and fees into the equity curve"""
+        self.equity_curve.on_user_fills(payload)
+
     async def disconnect(self) -> None:
         """Disconnect from Hyperliquid"""
         self.is_connected = False
         self.info = None
         self.exchange = None
+        self.sdk.shutdown()
+        self.equity_curve.close()
         print("🔌 Disconnected from Hyperliquid")
 
     async def get_balance(self, asset: str) -> Balance:
@@ -108,22 +351,15 @@ class HyperliquidAdapter(ExchangeAdapter):
             raise RuntimeError("Not connected to exchange")
 
         try:
-            user_state = self.info.user_state(self.exchange.wallet.address)
-
-            # Find asset balance
-            for balance_info in user_state.get("balances", []):
-                coin = balance_info.get("coin", "")
-                if coin == asset:
-                    total = float(balance_info.get("total", 0))
-                    hold = float(balance_info.get("hold", 0))
-                    available = total - hold
-
-                    return Balance(
-                        asset=asset, available=available, locked=hold, total=total
-                    )
+            user_state = await self._info_call(
+                self.info.user_state, self.exchange.wallet.address
+            )
+            _, balances = self.parse_user_state(user_state, lambda _asset: None)
 
             # Asset not found, return zero balance
-            return Balance(asset=asset, available=0.0, locked=0.0, total=0.0)
+            return balances.get(
+                asset, Balance(asset=asset, available=0.0, locked=0.0, total=0.0)
+            )
 
         except Exception as e:
             raise RuntimeError(f"Failed to get {asset} balance: {e}")
@@ -134,158 +370,244 @@ class HyperliquidAdapter(ExchangeAdapter):
             raise RuntimeError("Not connected to exchange")
 
         try:
-            # Get all mids (market prices)
-            all_mids = self.info.all_mids()
+            # Streamed mid when fresh, otherwise all mids (market prices)
+            prices = await self._prices_for([asset])
 
             # Find asset price
-            if asset in all_mids:
-                return float(all_mids[asset])
+            if asset in prices:
+                return prices[asset]
             else:
                 raise ValueError(f"Asset {asset} not found in market data")
 
         except Exception as e:
             raise RuntimeError(f"Failed to get {asset} price: {e}")
 
+    def _build_order_request(
+        self, order: Order, meta: AssetMeta, market_price: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Convert an Order into an SDK OrderRequest rounded to the asset's precision"""
+        is_buy = order.side == OrderSide.BUY
+
+        if order.order_type == OrderType.MARKET:
+            # Market order - IOC limit through the current price to ensure a fill
+            limit_px = meta.round_price(market_price * (1.01 if is_buy else 0.99))
+            tif = "Ioc"
+        else:
+            limit_px = meta.round_price(order.price)
+            tif = "Gtc"
+
+        size = meta.round_size(order.size)
+        # Reduce-only closes may be smaller than the minimum order value
+        if not order.reduce_only and size * limit_px < meta.min_notional:
+            raise ValueError(
+                f"Order value ${size * limit_px:.2f} below minimum ${meta.min_notional:.2f} "
+                f"(min size {meta.min_size(limit_px)} {order.asset})"
+            )
+
+        return {
+            "coin": order.asset,
+            "is_buy": is_buy,
+            "sz": size,
+            "limit_px": limit_px,
+            "order_type": {"limit": {"tif": tif}},
+            "reduce_only": order.reduce_only,
+        }
+
+    @staticmethod
+    def _parse_order_status(status_info: Any) -> Tuple[Optional[str], Optional[str]]:
+        """Map one bulk_orders status to (exchange order id, error)"""
+        if isinstance(status_info, dict):
+            if "resting" in status_info:
+                return str(status_info["resting"]["oid"]), None
+            if "filled" in status_info:
+                # full fill, no resting order ID
+                return "filled", None
+            if "error" in status_info:
+                return None, str(status_info["error"])
+        return None, f"Unexpected order status: {status_info}"
+
     async def place_order(self, order: Order) -> str:
         """Place an order on Hyperliquid"""
         if not self.is_connected:
             raise RuntimeError("Not connected to exchange")
 
+        [result] = await self.place_orders([order])
+        if not result.ok:
+            raise RuntimeError(f"Failed to place {order.side.value} order: {result.error}")
+        return result.exchange_order_id
+
+    async def place_orders(self, orders: List[Order]) -> List[OrderResult]:
+        """Place all orders in a single bulk_orders request"""
+        if not self.is_connected:
+            raise RuntimeError("Not connected to exchange")
+        if not orders:
+            return []
+
         try:
-            # Convert to Hyperliquid format
-            is_buy = order.side == OrderSide.BUY
-
-            # Import the OrderType from the SDK
-            from hyperliquid.utils.signing import OrderType as HLOrderType
-
-            # Round values to proper precision for Hyperliquid
-            def round_price(price):
-                """Round price to proper tick size for BTC (whole dollars)"""
-                if order.asset == "BTC":
-                    # BTC appears to require whole dollar prices
-                    return float(int(price))
-                else:
-                    # For other assets, use 2 decimal places
-                    return round(float(price), 2)
-
-            def round_size(size):
-                """Round size to proper precision based on szDecimals (5 for BTC)"""
-                return round(float(size), 5)  # BTC has szDecimals=5
-
-            # Ensure minimum size requirements
-            min_size = 0.0001  # Minimum BTC size
-            rounded_size = max(round_size(order.size), min_size)
-
-            if order.order_type == OrderType.MARKET:
-                # Market order - use limit order with current market price
-                market_price = await self.get_market_price(order.asset)
-                # Adjust price slightly to ensure fill for market orders
-                adjusted_price = round_price(market_price * (1.01 if is_buy else 0.99))
-                result = self.exchange.order(
-                    name=order.asset,
-                    is_buy=is_buy,
-                    sz=rounded_size,
-                    limit_px=adjusted_price,
-                    order_type=HLOrderType(
-                        {"limit": {"tif": "Ioc"}}
-                    ),  # Immediate or Cancel for market-like behavior
-                    reduce_only=False,
-                )
-            else:
-                # Limit order
-                rounded_price = round_price(order.price)
-                result = self.exchange.order(
-                    name=order.asset,
-                    is_buy=is_buy,
-                    sz=rounded_size,
-                    limit_px=rounded_price,
-                    order_type=HLOrderType(
-                        {"limit": {"tif": "Gtc"}}
-                    ),  # Good Till Cancel
-                    reduce_only=False,
-                )
+            await self._ensure_asset_meta()
 
-            # Extract order ID from result
-            if result and result.get("status") == "ok":
-                response_data = result.get("response", {}).get("data", {})
-                statuses = response_data.get("statuses") or []
-                if statuses:
-                    status_info = statuses[0]
-                    if "resting" in status_info:
-                        return str(status_info["resting"]["oid"])
-                    if "filled" in status_info:
-                        # full fill, no resting order ID
-                        return "filled"
+            # Streamed mids price market orders; at most one all_mids for stale ones
+            market_prices = await self._prices_for(
+                [order.asset for order in orders if order.order_type == OrderType.MARKET]
+            )
 
-            raise RuntimeError(f"Failed to place order: {result}")
+            results: List[Optional[OrderResult]] = [None] * len(orders)
+            requests = []
+            submitted = []
+            for idx, order in enumerate(orders):
+                meta = self.asset_meta.get(order.asset)
+                if meta is None:
+                    results[idx] = OrderResult(order, error=f"Unknown asset {order.asset}")
+                    continue
+                market_price = None
+                if order.order_type == OrderType.MARKET:
+                    market_price = market_prices.get(order.asset)
+                    if market_price is None:
+                        results[idx] = OrderResult(
+                            order, error=f"Asset {order.asset} not found in market data"
+                        )
+                        continue
+                try:
+                    requests.append(self._build_order_request(order, meta, market_price))
+                except ValueError as e:
+                    # Rejected locally, saving a round trip the exchange would refuse
+                    results[idx] = OrderResult(order, error=str(e))
+                    continue
+                submitted.append(idx)
+
+            if requests:
+                response = await self._exchange_call(self.exchange.bulk_orders, requests)
+                statuses = []
+                if response and response.get("status") == "ok":
+                    response_data = response.get("response", {}).get("data", {})
+                    statuses = response_data.get("statuses") or []
+
+                for position, idx in enumerate(submitted):
+                    if position < len(statuses):
+                        order_id, error = self._parse_order_status(statuses[position])
+                    else:
+                        order_id, error = None, f"Failed to place order: {response}"
+                    results[idx] = OrderResult(orders[idx], order_id, error)
+
+            return results
 
         except Exception as e:
-            raise RuntimeError(f"Failed to place {order.side.value} order: {e}")
+            return [OrderResult(order, error=str(e)) for order in orders]
+
+    async def _bulk_cancel(self, cancels: List[Dict[str, Any]]) -> List[bool]:
+        """Cancel {"coin", "oid"} requests in one bulk_cancel call"""
+        if not cancels:
+            return []
+
+        result = await self._exchange_call(self.exchange.bulk_cancel, cancels)
+        if not (result and isinstance(result, dict) and result.get("status") == "ok"):
+            print(f"❌ Cancel request failed: {result}")
+            return [False] * len(cancels)
+
+        statuses = result.get("response", {}).get("data", {}).get("statuses", [])
+        flags = [
+            idx < len(statuses) and statuses[idx] == "success"
+            for idx in range(len(cancels))
+        ]
+        for cancel, ok in zip(cancels, flags):
+            if not ok:
+                print(f"❌ Cancel failed for order {cancel['oid']}")
+        return flags
 
     async def cancel_order(self, exchange_order_id: str) -> bool:
         """Cancel an order"""
         if not self.is_connected:
             raise RuntimeError("Not connected to exchange")
 
-        try:
-            # Convert to int (Hyperliquid uses integer order IDs)
-            oid = int(exchange_order_id)
-
-            # Find the asset name for this order by querying open orders
-            open_orders = self.info.open_orders(self.exchange.wallet.address)
-            target_order = None
+        [cancelled] = await self.cancel_orders([exchange_order_id])
+        if cancelled:
+            print(f"✅ Order {exchange_order_id} cancelled successfully")
+        return cancelled
 
-            for order in open_orders:
-                if order.get("oid") == oid:
-                    target_order = order
-                    break
+    async def cancel_orders(self, exchange_order_ids: List[str]) -> List[bool]:
+        """Cancel orders with one open_orders lookup and one bulk_cancel"""
+        if not self.is_connected:
+            raise RuntimeError("Not connected to exchange")
+        if not exchange_order_ids:
+            return []
 
-            if not target_order:
-                print(f"❌ Order {exchange_order_id} not found in open orders")
-                return False
+        try:
+            # Hyperliquid cancels need the asset name, so find it in open orders
+            open_orders = await self._info_call(
+                self.info.open_orders, self.exchange.wallet.address
+            )
+            coins = {order.get("oid"): order.get("coin") for order in open_orders}
 
-            asset_name = target_order.get("coin")
-            if not asset_name:
-                print(f"❌ Could not determine asset for order {exchange_order_id}")
-                return False
+            flags = [False] * len(exchange_order_ids)
+            cancels = []
+            positions = []
+            for idx, exchange_order_id in enumerate(exchange_order_ids):
+                oid = int(exchange_order_id)
+                if not coins.get(oid):
+                    print(f"❌ Order {exchange_order_id} not found in open orders")
+                    continue
+                cancels.append({"coin": coins[oid], "oid": oid})
+                positions.append(idx)
+
+            for idx, ok in zip(positions, await self._bulk_cancel(cancels)):
+                flags[idx] = ok
+            return flags
 
-            # Use the correct SDK method: cancel(name, oid)
-            result = self.exchange.cancel(name=asset_name, oid=oid)
+        except Exception as e:
+            print(f"❌ Error cancelling orders {exchange_order_ids}: {e}")
+            return [False] * len(exchange_order_ids)
 
-            # Check if cancellation was successful
-            if result and isinstance(result, dict) and result.get("status") == "ok":
-                response_data = result.get("response", {}).get("data", {})
-                statuses = response_data.get("statuses", [])
+    async def cancel_all_orders(self) -> int:
+        """Cancel every open order in a single bulk_cancel request"""
+        if not self.is_connected:
+            return 0
 
-                if statuses and statuses[0] == "success":
-                    print(f"✅ Order {exchange_order_id} cancelled successfully")
-                    return True
-                else:
-                    print(f"❌ Cancel failed with status: {statuses}")
-                    return False
-            else:
-                print(f"❌ Cancel request failed: {result}")
-                return False
+        try:
+            open_orders = await self._info_call(
+                self.info.open_orders, self.exchange.wallet.address
+            )
+            cancels = [
+                {"coin": order["coin"], "oid": order["oid"]}
+                for order in open_orders
+                if order.get("coin") and order.get("oid") is not None
+            ]
+            return sum(await self._bulk_cancel(cancels))
 
         except Exception as e:
-            print(f"❌ Error cancelling order {exchange_order_id}: {e}")
-            return False
+            print(f"❌ Error cancelling all orders: {e}")
+            return 0
 
     async def get_order_status(self, exchange_order_id: str) -> Order:
-        """Get order status (simplified implementation)"""
+        """
+        Get order status (orderStatus query by oid).
+
+        The response carries the limit price, not fill prices, so
+        `average_fill_price` is the limit price.
+        """
         if not self.is_connected:
             raise RuntimeError("Not connected to exchange")
 
-        # This would require maintaining order state or querying open orders
-        # For now, return a basic order object
+        response = await self._info_call(
+            self.info.query_order_by_oid, self.exchange.wallet.address, int(exchange_order_id)
+        )
+        entry = response.get("order") if response.get("status") == "order" else None
+        if not entry:
+            raise ValueError(f"Unknown order {exchange_order_id}: {response.get('status')}")
+
+        order_info = entry.get("order") or {}
+        size = float(order_info.get("origSz") or order_info.get("sz") or 0)
+        price = float(order_info.get("limitPx") or 0)
         return Order(
-            id=exchange_order_id,
-            asset="BTC",  # Would need to track this
-            side=OrderSide.BUY,  # Would need to track this
-            size=0.0,  # Would need to track this
-            order_type=OrderType.LIMIT,  # Would need to track this
-            status=OrderStatus.SUBMITTED,  # Would need to query actual status
-            exchange_order_id=exchange_order_id,
+            id=str(exchange_order_id),
+            asset=order_info.get("coin", ""),
+            side=OrderSide.BUY if order_info.get("side") == "B" else OrderSide.SELL,
+            size=size,
+            order_type=OrderType.LIMIT,
+            price=price,
+            status=map_order_status(entry.get("status", "")) or OrderStatus.PENDING,
+            filled_size=size - float(order_info.get("sz") or 0),
+            average_fill_price=price,
+            exchange_order_id=str(exchange_order_id),
         )
 
     async def get_market_info(self, asset: str) -> MarketInfo:
@@ -294,24 +616,21 @@ class HyperliquidAdapter(ExchangeAdapter):
             raise RuntimeError("Not connected to exchange")
 
         try:
-            # Get market metadata
-            meta = self.info.meta()
-            universe = meta.get("universe", [])
-
-            # Find asset info
-            for asset_info in universe:
-                if asset_info.get("name") == asset:
-                    return MarketInfo(
-                        symbol=asset,
-                        base_asset=asset,
-                        quote_asset="USD",  # Hyperliquid uses USD
-                        min_order_size=float(asset_info.get("szDecimals", 4)) / 10000,
-                        price_precision=int(asset_info.get("priceDecimals", 2)),
-                        size_precision=int(asset_info.get("szDecimals", 4)),
-                        is_active=True,
-                    )
-
-            raise ValueError(f"Asset {asset} not found")
+            # Served from the cached metadata
+            await self._ensure_asset_meta()
+            meta = self.asset_meta.get(asset)
+            if meta is None:
+                raise ValueError(f"Asset {asset} not found")
+
+            return MarketInfo(
+                symbol=asset,
+                base_asset=asset,
+                quote_asset="USD",  # Hyperliquid uses USD
+                min_order_size=meta.lot_size,
+                price_precision=meta.price_decimals,
+                size_precision=meta.sz_decimals,
+                is_active=True,
+            )
 
         except Exception as e:
             raise RuntimeError(f"Failed to get market info for {asset}: {e}")
@@ -322,7 +641,9 @@ class HyperliquidAdapter(ExchangeAdapter):
             return []
 
         try:
-            open_orders = self.info.open_orders(self.exchange.wallet.address)
+            open_orders = await self._info_call(
+                self.info.open_orders, self.exchange.wallet.address
+            )
             orders = []
 
             for order_info in open_orders:
@@ -343,8 +664,27 @@ class HyperliquidAdapter(ExchangeAdapter):
             return orders
 
         except Exception as e:
-            print(f"❌ Error getting open orders: {e}")
-            return []
+            # Raise rather than report an empty book: reconciliation would
+            # otherwise treat every tracked order as gone
+            raise RuntimeError(f"Failed to get open orders: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        status.update(
+            sdk=self.sdk.get_stats(),
+            asset_meta=self.asset_meta.get_status(),
+            prices={
+                "streamed": self.streamed_prices_used,
+                "rest_fetches": self.rest_price_fetches,
+                "max_age": self.max_price_age,
+            },
+            equity={
+                **self.equity_curve.metrics(),
+                "age": self.equity_curve.age,
+                "log": str(self.equity_curve.path) if self.equity_curve.path else None,
+            },
+        )
+        return status
 
     async def health_check(self) -> bool:
         """Check connection health"""
@@ -353,7 +693,7 @@ class HyperliquidAdapter(ExchangeAdapter):
 
         try:
             # Simple health check - get account state
-            self.info.user_state(self.exchange.wallet.address)
+            await self._info_call(self.info.user_state, self.exchange.wallet.address)
             return True
         except Exception:
             return False
@@ -364,49 +704,38 @@ class HyperliquidAdapter(ExchangeAdapter):
             return []
 
         try:
-            # Import Position here to avoid circular imports
-            from interfaces.strategy import Position
+            return await self.fetch_positions()
+        except Exception as e:
+            print(f"❌ Error getting positions: {e}")
+            return []
 
-            # Get user state which includes positions
-            user_state = self.info.user_state(self.exchange.wallet.address)
-            positions = []
+    async def fetch_positions(self) -> List["Position"]:
+        """Like get_positions, but raises instead of returning [] on errors"""
+        if not self.is_connected:
+            raise RuntimeError("Not connected to exchange")
 
-            # Parse positions from user state
-            if "assetPositions" in user_state:
-                for pos_info in user_state["assetPositions"]:
-                    if float(pos_info.get("position", {}).get("szi", 0)) != 0:
-                        position_size = float(pos_info["position"]["szi"])
-                        entry_price = float(pos_info["position"]["entryPx"] or 0)
+        # Get user state which includes positions
+        user_state = await self._info_call(
+            self.info.user_state, self.exchange.wallet.address
+        )
+        assets = [
+            p["position"]["coin"]
+            for p in user_state.get("assetPositions", [])
+            if float(p.get("position", {}).get("szi", 0)) != 0
+        ]
+        if not assets:
+            return []
 
-                        # Get current price for PnL calculation
-                        current_price = await self.get_market_price(
-                            pos_info["position"]["coin"]
-                        )
-                        current_value = abs(position_size) * current_price
-
-                        # Calculate unrealized PnL
-                        if entry_price > 0:
-                            unrealized_pnl = position_size * (
-                                current_price - entry_price
-                            )
-                        else:
-                            unrealized_pnl = 0.0
-
-                        position = Position(
-                            asset=pos_info["position"]["coin"],
-                            size=position_size,
-                            entry_price=entry_price,
-                            current_value=current_value,
-                            unrealized_pnl=unrealized_pnl,
-                            timestamp=time.time(),
-                        )
-                        positions.append(position)
+        # Streamed mids where fresh; one all_mids covers the rest
+        prices = await self._prices_for(assets)
 
-            return positions
+        def price_lookup(asset: str) -> Optional[float]:
+            if asset not in prices:
+                raise ValueError(f"Asset {asset} not found in market data")
+            return prices[asset]
 
-        except Exception as e:
-            print(f"❌ Error getting positions: {e}")
-            return []
+        positions, _ = self.parse_user_state(user_state, price_lookup)
+        return positions
 
     async def close_position(self, asset: str, size: Optional[float] = None) -> bool:
         """Close a position by placing a market order"""
@@ -433,28 +762,23 @@ class HyperliquidAdapter(ExchangeAdapter):
             else:
                 close_size = min(size, abs(target_position.size))
 
-            # Determine side (opposite of current position)
-            close_side = (
-                "A" if target_position.size > 0 else "B"
-            )  # A=Ask (sell), B=Bid (buy)
-
-            # Place market order to close position
-            order_request = {
-                "coin": asset,
-                "is_buy": close_side == "B",
-                "sz": close_size,
-                "limit_px": None,  # Market order
-                "order_type": {"limit": {"tif": "Ioc"}},  # Immediate or Cancel
-                "reduce_only": True,
-            }
-
-            result = self.exchange.order(order_request)
+            # Reduce-only IOC market order on the opposite side
+            order = Order(
+                id=f"close_{asset}_{int(time.time() * 1000)}",
+                asset=asset,
+                side=OrderSide.SELL if target_position.size > 0 else OrderSide.BUY,
+                size=close_size,
+                order_type=OrderType.MARKET,
+                created_at=time.time(),
+                reduce_only=True,
+            )
+            [result] = await self.place_orders([order])
 
-            if result and result.get("status") == "ok":
+            if result.ok:
                 print(f"✅ Position close order placed: {close_size} {asset}")
                 return True
             else:
-                print(f"❌ Failed to close position: {result}")
+                print(f"❌ Failed to close position: {result.error}")
                 return False
 
         except Exception as e:
@@ -462,7 +786,12 @@ class HyperliquidAdapter(ExchangeAdapter):
             return False
 
     async def get_account_metrics(self) -> Dict[str, Any]:
-        """Get account-level metrics for risk assessment"""
+        """
+        Get account-level metrics for risk assessment
+
+        Served from the equity curve while its last sample is fresh (the
+        account feed keeps it so); otherwise one user_state request refreshes it.
+        """
         if not self.is_connected:
             return {
                 "total_value": 0.0,
@@ -473,48 +802,28 @@ class HyperliquidAdapter(ExchangeAdapter):
             }
 
         try:
-            # Get user state
-            user_state = self.info.user_state(self.exchange.wallet.address)
-
-            # Calculate account metrics
-            total_value = 0.0
-            unrealized_pnl = 0.0
-
-            # Get cross margin summary for total account value
-            if "crossMarginSummary" in user_state:
-                margin_summary = user_state["crossMarginSummary"]
-                total_value = float(margin_summary.get("accountValue", 0))
-                unrealized_pnl = float(margin_summary.get("totalMarginUsed", 0))
-
-            # Get positions for detailed PnL
-            positions = await self.get_positions()
-            position_pnl = sum(pos.unrealized_pnl for pos in positions)
-
-            # Calculate drawdown (simplified - would need historical high water mark)
-            # For now, use unrealized PnL as proxy
-            total_pnl = position_pnl
-
-            # Estimate drawdown percentage (this would be more sophisticated in production)
-            if total_value > 0:
-                drawdown_pct = (
-                    max(0, -total_pnl / total_value * 100) if total_pnl < 0 else 0.0
+            age = self.equity_curve.age
+            if age is None or age > self.max_equity_age:
+                user_state = await self._info_call(
+                    self.info.user_state, self.exchange.wallet.address
                 )
-            else:
-                drawdown_pct = 0.0
+                self.record_account_state(user_state)
 
+            curve = self.equity_curve.metrics()
+            unrealized_pnl = self._account_summary.get("unrealized_pnl", 0.0)
             return {
-                "total_value": total_value,
-                "total_pnl": total_pnl,
+                "total_value": curve["total_value"],
+                "equity": curve["equity"],
+                "total_pnl": curve["realized_pnl"] + unrealized_pnl,
                 "unrealized_pnl": unrealized_pnl,
-                "realized_pnl": 0.0,  # Would need to track this separately
-                "drawdown_pct": drawdown_pct,
-                "positions_count": len(positions),
-                "largest_position_pct": max(
-                    [abs(pos.current_value) / total_value * 100 for pos in positions],
-                    default=0.0,
-                )
-                if total_value > 0
-                else 0.0,
+                "realized_pnl": curve["realized_pnl"],
+                "drawdown_pct": curve["drawdown_pct"],
+                "max_drawdown_pct": curve["max_drawdown_pct"],
+                "high_water_mark": curve["high_water_mark"],
+                "positions_count": self._account_summary.get("positions_count", 0),
+                "largest_position_pct": self._account_summary.get(
+                    "largest_position_pct", 0.0
+                ),
             }
 
         except Exception as e:
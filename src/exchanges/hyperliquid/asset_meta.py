@@ -0,0 +1,158 @@
+"""
+Hyperliquid Asset Metadata
+
+Per-asset size/price precision loaded once from the meta and spotMeta info
+endpoints, so order rounding needs no extra round trip and works for every
+listed asset instead of hardcoded BTC rules.
+
+Hyperliquid rules: sizes are rounded to `szDecimals`; prices have at most
+5 significant figures and at most MAX_DECIMALS - szDecimals decimals
+(6 for perps, 8 for spot); integer prices are always valid.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+PERP_MAX_DECIMALS = 6
+SPOT_MAX_DECIMALS = 8
+PRICE_SIG_FIGS = 5
+MIN_NOTIONAL = 10.0  # USD
+SPOT_ASSET_OFFSET = 10000
+
+
+@dataclass(frozen=True)
+class AssetMeta:
+    """Trading precision for one asset"""
+
+    name: str
+    asset_id: int
+    sz_decimals: int
+    price_decimals: int
+    min_notional: float = MIN_NOTIONAL
+    is_spot: bool = False
+    max_leverage: Optional[int] = None
+
+    @property
+    def lot_size(self) -> float:
+        return 10.0 ** -self.sz_decimals
+
+    def tick_size(self, price: float) -> float:
+        """Smallest price increment at `price` (depends on magnitude)"""
+        if price <= 0:
+            return 10.0 ** -self.price_decimals
+        if price >= 10**PRICE_SIG_FIGS:
+            return 1.0  # integer prices are always valid
+        magnitude = math.floor(math.log10(price))
+        return max(10.0 ** (magnitude - PRICE_SIG_FIGS + 1), 10.0 ** -self.price_decimals)
+
+    def round_price(self, price: float) -> float:
+        price = float(price)
+        if abs(price) >= 10**PRICE_SIG_FIGS:
+            return float(round(price))
+        return round(float(f"{price:.{PRICE_SIG_FIGS}g}"), self.price_decimals)
+
+    def round_size(self, size: float) -> float:
+        return round(float(size), self.sz_decimals)
+
+    def min_size(self, price: float) -> float:
+        """Smallest size meeting the minimum notional at `price`, in whole lots"""
+        if price <= 0:
+            return self.lot_size
+        lots = math.ceil(self.min_notional / price / self.lot_size - 1e-9)
+        return round(max(lots, 1) * self.lot_size, self.sz_decimals)
+
+
+def parse_perp_meta(meta: Dict[str, Any]) -> Dict[str, AssetMeta]:
+    assets = {}
+    for asset_id, info in enumerate(meta.get("universe", [])):
+        if info.get("isDelisted"):
+            continue
+        sz_decimals = int(info.get("szDecimals", 0))
+        assets[info["name"]] = AssetMeta(
+            name=info["name"],
+            asset_id=asset_id,
+            sz_decimals=sz_decimals,
+            price_decimals=max(PERP_MAX_DECIMALS - sz_decimals, 0),
+            max_leverage=info.get("maxLeverage"),
+        )
+    return assets
+
+
+def parse_spot_meta(spot_meta: Dict[str, Any]) -> Dict[str, AssetMeta]:
+    tokens = {token["index"]: token for token in spot_meta.get("tokens", [])}
+    assets = {}
+    for info in spot_meta.get("universe", []):
+        base, quote = info["tokens"]
+        if base not in tokens or quote not in tokens:
+            continue
+        sz_decimals = int(tokens[base].get("szDecimals", 0))
+        meta = AssetMeta(
+            name=info["name"],
+            asset_id=SPOT_ASSET_OFFSET + info["index"],
+            sz_decimals=sz_decimals,
+            price_decimals=max(SPOT_MAX_DECIMALS - sz_decimals, 0),
+            is_spot=True,
+        )
+        assets[info["name"]] = meta
+        # Also reachable by "BASE/QUOTE" (e.g. PURR/USDC)
+        pair = f"{tokens[base]['name']}/{tokens[quote]['name']}"
+        assets.setdefault(pair, meta)
+    return assets
+
+
+class AssetMetaCache:
+    """
+    Asset metadata with a refresh deadline.
+
+    `load` replaces the contents; callers check `is_stale()` and refresh in
+    the background so lookups never wait on the network.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._assets: Dict[str, AssetMeta] = {}
+        self.loaded_at: Optional[float] = None
+
+    def load(
+        self,
+        meta: Optional[Dict[str, Any]] = None,
+        spot_meta: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        assets: Dict[str, AssetMeta] = {}
+        if spot_meta:
+            assets.update(parse_spot_meta(spot_meta))
+        if meta:
+            # Perp names win over spot aliases
+            assets.update(parse_perp_meta(meta))
+        self._assets = assets
+        self.loaded_at = self._clock()
+        return len(assets)
+
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or self._clock() - self.loaded_at > self.refresh_interval
+
+    def get(self, asset: str) -> Optional[AssetMeta]:
+        return self._assets.get(asset)
+
+    def __contains__(self, asset: str) -> bool:
+        return asset in self._assets
+
+    def assets(self) -> Iterable[str]:
+        return self._assets.keys()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "assets": len(self._assets),
+            "loaded_at": self.loaded_at,
+            "stale": self.is_stale(),
+        }
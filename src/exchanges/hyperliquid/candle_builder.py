@@ -0,0 +1,357 @@
+"""
+Hyperliquid Candle Builder
+
+Aggregates streamed mid prices (plus trade sizes when the trades channel is
+subscribed) into OHLCV bars. Closed bars are kept per asset and timeframe in
+bounded ring buffers, so consumers such as the ML service read the latest
+window from memory instead of querying MongoDB.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from utils.candle_time import bar_open_time, interval_to_ms
+
+DEFAULT_TIMEFRAMES = ("1m", "5m", "15m")
+DEFAULT_CAPACITY = 1000
+CANDLE_SOURCE = "hyperliquid_ws"
+
+Candle = Dict[str, Any]
+
+
+class CandleAggregator:
+    """
+    Streaming bar builder with per (asset, timeframe) ring buffers.
+
+    A bar closes on the first tick that falls into a later interval. Intervals
+    without any tick are filled with flat bars at the previous close (volume 0)
+    so the buffered series stays contiguous. Listeners receive every closed
+    bar; an optional `persist(candles)` sink gets them in batches.
+    """
+
+    def __init__(
+        self,
+        timeframes: Iterable[str] = DEFAULT_TIMEFRAMES,
+        capacity: int = DEFAULT_CAPACITY,
+        persist: Optional[Callable[[List[Candle]], Any]] = None,
+        persist_batch_size: int = 100,
+        fill_gaps: bool = True,
+    ):
+        self.intervals: Dict[str, int] = {tf: interval_to_ms(tf) for tf in timeframes}
+        self.capacity = capacity
+        self.persist = persist
+        self.persist_batch_size = persist_batch_size
+        self.fill_gaps = fill_gaps
+
+        self._open: Dict[Tuple[str, str], Candle] = {}
+        self._closed: Dict[Tuple[str, str], Deque[Candle]] = {}
+        self._listeners: List[Callable[[Candle], Any]] = []
+        self._pending_persist: List[Candle] = []
+        self._persist_task: Optional[asyncio.Task] = None
+
+        self.bars_closed = 0
+        self.bars_persisted = 0
+        self.stale_ticks = 0
+        self.history_gaps = 0
+
+    # ------------------------------------------------------------------ listeners
+
+    def add_listener(self, callback: Callable[[Candle], Any]) -> None:
+        """Register a callback (sync or async) invoked for every closed bar."""
+
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Candle], Any]) -> None:
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    # ------------------------------------------------------------------ ingestion
+
+    def on_price(self, asset: str, price: float, timestamp: float) -> List[Candle]:
+        """
+        Feed a mid price observed at `timestamp` (seconds). Returns bars closed by it.
+        """
+
+        ts_ms = int(timestamp * 1000)
+        closed: List[Candle] = []
+        for timeframe, interval_ms in self.intervals.items():
+            bar = self._roll(asset, timeframe, ts_ms - ts_ms % interval_ms, price, closed)
+            if bar is None:
+                continue
+            bar["high"] = max(bar["high"], price)
+            bar["low"] = min(bar["low"], price)
+            bar["close"] = price
+            bar["ticks"] += 1
+        self._dispatch(closed)
+        return closed
+
+    def on_trade(self, asset: str, price: float, size: float, timestamp: float) -> List[Candle]:
+        """Add traded size to the bars open at `timestamp`."""
+
+        ts_ms = int(timestamp * 1000)
+        closed: List[Candle] = []
+        for timeframe, interval_ms in self.intervals.items():
+            bar = self._roll(asset, timeframe, ts_ms - ts_ms % interval_ms, price, closed)
+            if bar is not None:
+                bar["volume"] += size
+        self._dispatch(closed)
+        return closed
+
+    def seed(
+        self,
+        asset: str,
+        timeframe: str,
+        candles: Iterable[Candle],
+        now: Optional[float] = None,
+    ) -> int:
+        """
+        Preload closed historical candles (e.g. from MongoDB) into the buffer.
+
+        Labels are normalized to the bar open time. Candles still forming at
+        `now` (seconds, default: wall clock) or at/after the bar currently
+        being built are ignored. A gap up to the bar being built is bridged
+        like a live gap.
+        """
+
+        if timeframe not in self.intervals:
+            raise ValueError(f"Timeframe {timeframe} is not aggregated")
+        key = (asset, timeframe)
+        interval_ms = self.intervals[timeframe]
+        open_bar = self._open.get(key)
+        forming = bar_open_time(int((time.time() if now is None else now) * 1000), interval_ms)
+        if open_bar:
+            forming = min(forming, open_bar["open_time"])
+
+        bars = sorted(
+            (self._normalize(asset, timeframe, candle) for candle in candles),
+            key=lambda c: c["open_time"],
+        )
+        added = 0
+        for bar in bars:
+            if bar["open_time"] >= forming:
+                break
+            added += self._append_closed(key, bar)
+        if open_bar and added:
+            closed: List[Candle] = []
+            self._bridge_history(key, open_bar["open_time"], closed)
+            self._dispatch(closed)
+        return added
+
+    def _roll(
+        self,
+        asset: str,
+        timeframe: str,
+        open_time: int,
+        price: float,
+        closed: List[Candle],
+    ) -> Optional[Candle]:
+        key = (asset, timeframe)
+        bar = self._open.get(key)
+        if bar is not None:
+            if open_time == bar["open_time"]:
+                return bar
+            if open_time < bar["open_time"]:
+                self.stale_ticks += 1
+                return None
+
+            self._close(key, bar, closed)
+            if self.fill_gaps:
+                self._fill_gap(key, bar, open_time, closed)
+        else:
+            self._bridge_history(key, open_time, closed)
+
+        bar = self._new_bar(asset, timeframe, open_time, price)
+        self._open[key] = bar
+        return bar
+
+    def _fill_gap(
+        self, key: Tuple[str, str], last: Candle, open_time: int, closed: List[Candle]
+    ) -> None:
+        """Flat bars at `last`'s close for the intervals between it and `open_time`."""
+
+        asset, timeframe = key
+        interval_ms = self.intervals[timeframe]
+        first_missing = last["open_time"] + interval_ms
+        start = max(first_missing, open_time - self.capacity * interval_ms)
+        for gap_time in range(start, open_time, interval_ms):
+            flat = self._new_bar(asset, timeframe, gap_time, last["close"])
+            self._close(key, flat, closed)
+
+    def _bridge_history(self, key: Tuple[str, str], open_time: int, closed: List[Candle]) -> None:
+        """Handle a gap between seeded history and the first live bar."""
+
+        buffer = self._closed.get(key)
+        if not buffer:
+            return
+        interval_ms = self.intervals[key[1]]
+        last = buffer[-1]
+        missing = (open_time - last["open_time"]) // interval_ms - 1
+        if missing <= 0:
+            return
+        self.history_gaps += 1
+        action = "filling with flat bars" if self.fill_gaps else "left unfilled"
+        print(
+            f"⚠️ {key[0]} {key[1]}: {missing} candles missing between history and "
+            f"live bars ({action})"
+        )
+        if self.fill_gaps:
+            self._fill_gap(key, last, open_time, closed)
+
+    def _new_bar(self, asset: str, timeframe: str, open_time: int, price: float) -> Candle:
+        return {
+            "symbol": asset,
+            "timeframe": timeframe,
+            "open_time": open_time,
+            "close_time": open_time + self.intervals[timeframe] - 1,
+            "open": price,
+            "high": price,
+            "low": price,
+            "close": price,
+            "volume": 0.0,
+            "ticks": 0,
+            "source": CANDLE_SOURCE,
+        }
+
+    def _normalize(self, asset: str, timeframe: str, candle: Candle) -> Candle:
+        open_time = bar_open_time(int(candle["open_time"]), self.intervals[timeframe])
+        bar = self._new_bar(asset, timeframe, open_time, float(candle["open"]))
+        bar.update(
+            high=float(candle["high"]),
+            low=float(candle["low"]),
+            close=float(candle["close"]),
+            volume=float(candle.get("volume", 0.0)),
+            source=candle.get("source", bar["source"]),
+        )
+        return bar
+
+    def _append_closed(self, key: Tuple[str, str], candle: Candle) -> int:
+        buffer = self._closed.get(key)
+        if buffer is None:
+            buffer = self._closed[key] = deque(maxlen=self.capacity)
+        if buffer and buffer[-1]["open_time"] >= candle["open_time"]:
+            if buffer[-1]["open_time"] == candle["open_time"]:
+                buffer[-1] = candle
+            return 0
+        buffer.append(candle)
+        return 1
+
+    def _close(self, key: Tuple[str, str], bar: Candle, closed: List[Candle]) -> None:
+        self._append_closed(key, bar)
+        self.bars_closed += 1
+        closed.append(bar)
+
+    def _dispatch(self, closed: List[Candle]) -> None:
+        if not closed:
+            return
+
+        for candle in closed:
+            for callback in self._listeners:
+                try:
+                    if asyncio.iscoroutinefunction(callback):
+                        asyncio.create_task(callback(candle))
+                    else:
+                        callback(candle)
+                except Exception as e:
+                    print(f"❌ Error in candle listener: {e}")
+
+        if self.persist is None:
+            return
+        self._pending_persist.extend(closed)
+        if len(self._pending_persist) < self.persist_batch_size:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._persist_now()
+            return
+        if self._persist_task is None or self._persist_task.done():
+            self._persist_task = asyncio.create_task(self.flush())
+
+    # ------------------------------------------------------------------ persistence
+
+    def _take_pending(self) -> List[Candle]:
+        batch, self._pending_persist = self._pending_persist, []
+        return batch
+
+    def _requeue(self, batch: List[Candle], error: Exception) -> None:
+        print(f"❌ Failed to persist {len(batch)} candles: {error}")
+        # Keep the most recent bars for the next attempt, bounded by the ring size
+        limit = self.capacity * max(1, len(self.intervals))
+        self._pending_persist = (batch + self._pending_persist)[-limit:]
+
+    def _persist_now(self) -> None:
+        batch = self._take_pending()
+        if not batch or self.persist is None:
+            return
+        try:
+            self.persist(batch)
+            self.bars_persisted += len(batch)
+        except Exception as e:
+            self._requeue(batch, e)
+
+    async def flush(self) -> None:
+        """Persist pending closed bars without blocking the event loop."""
+
+        batch = self._take_pending()
+        if not batch or self.persist is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.persist, batch)
+            self.bars_persisted += len(batch)
+        except Exception as e:
+            self._requeue(batch, e)
+
+    # ------------------------------------------------------------------ queries
+
+    def closed_candles(
+        self, asset: str, timeframe: str, limit: Optional[int] = None
+    ) -> List[Candle]:
+        """Most recent closed bars, oldest first."""
+
+        buffer = self._closed.get((asset, timeframe))
+        if not buffer:
+            return []
+        if limit is None or limit >= len(buffer):
+            return list(buffer)
+        return list(buffer)[-limit:]
+
+    def latest_closed(self, asset: str, timeframe: str) -> Optional[Candle]:
+        buffer = self._closed.get((asset, timeframe))
+        return buffer[-1] if buffer else None
+
+    def current_candle(self, asset: str, timeframe: str) -> Optional[Candle]:
+        bar = self._open.get((asset, timeframe))
+        return dict(bar) if bar else None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "timeframes": list(self.intervals),
+            "buffered": {f"{a}:{tf}": len(buf) for (a, tf), buf in self._closed.items()},
+            "bars_closed": self.bars_closed,
+            "bars_persisted": self.bars_persisted,
+            "pending_persist": len(self._pending_persist),
+            "stale_ticks": self.stale_ticks,
+            "history_gaps": self.history_gaps,
+        }
+
+
+def mongo_candle_sink(collection_name: str = "live_candles") -> Callable[[List[Candle]], int]:
+    """
+    Persistence callable that bulk upserts closed bars into MongoDB.
+
+    Live bars go to their own collection so they never overwrite the exchange
+    candles written by the collectors.
+    """
+
+    from data_pipeline.collector import save_candles_to_mongo
+    from infrastructure.db import get_mongo_db
+
+    def persist(candles: List[Candle]) -> int:
+        return save_candles_to_mongo(candles, collection=get_mongo_db()[collection_name])
+
+    return persist
@@ -7,11 +7,122 @@ Technical implementation separated from business logic.
 
 import asyncio
 import json
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, Iterable, List, Optional, Callable, Any, Set
 import time
 
 from interfaces.strategy import MarketData
 from core.endpoint_router import get_endpoint_router
+from utils import json_codec
+from .candle_builder import CandleAggregator, DEFAULT_CAPACITY, DEFAULT_TIMEFRAMES
+
+
+ALL_MIDS_PREFIX = '{"channel":"allMids"'
+
+
+def extract_all_mids(message: Any, assets: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    Pull the mids of `assets` straight out of a raw allMids frame.
+
+    Frames are compact JSON like {"channel":"allMids","data":{"mids":{"BTC":"97000.5",...}}},
+    so each coin is located with a substring search instead of decoding
+    hundreds of entries. Returns None when the frame is not allMids or none
+    of the assets could be found, in which case the caller decodes normally.
+    """
+
+    if isinstance(message, (bytes, bytearray)):
+        message = message.decode()
+    if not isinstance(message, str) or not message.startswith(ALL_MIDS_PREFIX):
+        return None
+
+    mids: Dict[str, str] = {}
+    for asset in assets:
+        key = f'"{asset}":"'
+        start = message.find(key)
+        if start < 0:
+            continue
+        start += len(key)
+        end = message.find('"', start)
+        if end > start:
+            mids[asset] = message[start:end]
+    return mids or None
+
+
+class PriceMailbox:
+    """
+    Latest-value mailbox for one async price subscriber.
+
+    At most one handler call is in flight. A tick arriving while the handler
+    is busy replaces any tick still waiting, so slow subscribers always see
+    the newest price, in order, instead of a growing backlog of stale ones.
+    """
+
+    def __init__(self, callback: Callable[[MarketData], Any]):
+        self.callback = callback
+        self.pending: Optional[MarketData] = None
+        self.task: Optional[asyncio.Task] = None
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0  # ticks replaced before delivery
+        self.coalesced = 0  # deliveries that superseded at least one tick
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag_total = 0.0
+        self._superseded = 0
+
+    def post(self, market_data: MarketData) -> None:
+        self.received += 1
+        if self.pending is not None:
+            self.dropped += 1
+            self._superseded += 1
+        self.pending = market_data
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self.pending is not None:
+            market_data, self.pending = self.pending, None
+            if self._superseded:
+                self.coalesced += 1
+                self._superseded = 0
+
+            # Time the tick waited between receipt and handler start
+            lag = max(0.0, time.time() - market_data.timestamp)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self._lag_total += lag
+
+            try:
+                await self.callback(market_data)
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Error in price callback: {e}")
+            self.delivered += 1
+
+    async def close(self) -> None:
+        if self.pending is not None:
+            self.dropped += 1
+            self.pending = None
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": bool(self.task and not self.task.done()),
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "avg_lag": self._lag_total / self.delivered if self.delivered else 0.0,
+        }
 
 
 class HyperliquidMarketData:
@@ -20,16 +131,27 @@ class HyperliquidMarketData:
 
     Provides real-time price feeds and market data via WebSocket.
     Handles reconnection and error recovery automatically.
+
+    When `candle_timeframes` is set, mids are also aggregated into OHLCV bars
+    (volume from the trades channel) available through `get_candles`.
     """
 
-    def __init__(self, testnet: bool = True):
+    def __init__(
+        self,
+        testnet: bool = True,
+        candle_timeframes: Optional[Iterable[str]] = DEFAULT_TIMEFRAMES,
+        candle_capacity: int = DEFAULT_CAPACITY,
+        candle_persist: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        track_volume: bool = True,
+    ):
         self.testnet = testnet
         self.ws = None
         self.running = False
         self.subscribed_assets: set = set()
 
-        # Callbacks
+        # Callbacks (async ones are dispatched through per-subscriber mailboxes)
         self.price_callbacks: Dict[str, List[Callable[[MarketData], None]]] = {}
+        self.mailboxes: Dict[str, Dict[Callable[[MarketData], Any], PriceMailbox]] = {}
 
         # Latest data cache
         self.latest_data: Dict[str, MarketData] = {}
@@ -44,6 +166,26 @@ class HyperliquidMarketData:
         # Endpoint router for smart routing
         self.endpoint_router = get_endpoint_router(testnet)
 
+        # User-specific feeds (webData2 account state, userEvents fills,
+        # orderUpdates / userFills for order tracking), multiplexed for any
+        # number of wallets on this one connection: user -> channels, and
+        # channel -> user -> callbacks
+        self.user_channels: Dict[str, Set[str]] = {}
+        self.user_callbacks: Dict[str, Dict[str, List[Callable[[Any], Any]]]] = {}
+
+        # Decoding: optional fast path for allMids + pluggable JSON backend
+        self.fast_mids_parse = True
+        self._decode = json_codec.loads
+        self._decode_errors = json_codec.DECODE_ERRORS
+
+        # Streaming candle aggregation
+        self.candles: Optional[CandleAggregator] = (
+            CandleAggregator(candle_timeframes, candle_capacity, persist=candle_persist)
+            if candle_timeframes
+            else None
+        )
+        self.track_volume = track_volume and self.candles is not None
+
     async def connect(self) -> bool:
         """Connect to Hyperliquid WebSocket using public endpoint"""
         try:
@@ -92,6 +234,13 @@ class HyperliquidMarketData:
             except asyncio.CancelledError:
                 pass
 
+        for mailboxes in self.mailboxes.values():
+            for mailbox in mailboxes.values():
+                await mailbox.close()
+
+        if self.candles:
+            await self.candles.flush()
+
         if self.ws:
             await self.ws.close()
             self.ws = None
@@ -107,11 +256,15 @@ class HyperliquidMarketData:
 
         self.price_callbacks[asset].append(callback)
         self.subscribed_assets.add(asset)
+        if asyncio.iscoroutinefunction(callback):
+            self.mailboxes.setdefault(asset, {})[callback] = PriceMailbox(callback)
 
         # Subscribe via WebSocket
         if self.ws and self.running:
             subscribe_msg = {"method": "subscribe", "subscription": {"type": "allMids"}}
             await self.ws.send(json.dumps(subscribe_msg))
+            if self.track_volume:
+                await self._subscribe_trades(asset)
 
         print(f"📊 Subscribed to {asset} price updates")
 
@@ -129,6 +282,80 @@ class HyperliquidMarketData:
             except ValueError:
                 pass
 
+        mailbox = self.mailboxes.get(asset, {}).pop(callback, None)
+        if mailbox:
+            await mailbox.close()
+
+    async def subscribe_user_updates(
+        self,
+        user: str,
+        state_callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        event_callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> None:
+        """Subscribe to account state (webData2) and user events (fills) for a wallet"""
+
+        self._add_user_callback("webData2", user, state_callback)
+        self._add_user_callback("userEvents", user, event_callback)
+        await self._add_user_channels(user, ("webData2", "userEvents"))
+
+        print(f"👤 Subscribed to account updates for {user[:10]}...")
+
+    async def subscribe_order_updates(
+        self,
+        user: str,
+        order_callback: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        fill_callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> None:
+        """Subscribe to order status changes (orderUpdates) and fills (userFills)"""
+
+        self._add_user_callback("orderUpdates", user, order_callback)
+        self._add_user_callback("userFills", user, fill_callback)
+        await self._add_user_channels(user, ("orderUpdates", "userFills"))
+
+        print(f"📒 Subscribed to order updates for {user[:10]}...")
+
+    def _add_user_callback(
+        self, channel: str, user: str, callback: Optional[Callable[[Any], Any]]
+    ) -> None:
+        if callback:
+            self.user_callbacks.setdefault(channel, {}).setdefault(user.lower(), []).append(
+                callback
+            )
+
+    async def _add_user_channels(self, user: str, channels: Iterable[str]) -> None:
+        subscribed = self.user_channels.setdefault(user, set())
+        new_channels = [channel for channel in channels if channel not in subscribed]
+        subscribed.update(new_channels)
+        if new_channels and self.ws and self.running:
+            await self._send_user_subscriptions({user: new_channels})
+
+    async def _send_user_subscriptions(
+        self, channels: Optional[Dict[str, Iterable[str]]] = None
+    ) -> None:
+        for user, user_channels in (channels or self.user_channels).items():
+            for sub_type in sorted(user_channels):
+                subscribe_msg = {
+                    "method": "subscribe",
+                    "subscription": {"type": sub_type, "user": user},
+                }
+                await self.ws.send(json.dumps(subscribe_msg))
+
+    def _notify_user(self, channel: str, payload: Any) -> None:
+        """
+        Route a user-channel push to its wallet's callbacks.
+
+        webData2 and userFills name the user; orderUpdates and userEvents do
+        not, so they reach every wallet's callbacks (order trackers ignore
+        unknown oids, and a spurious fill event only invalidates a cache).
+        """
+        by_user = self.user_callbacks.get(channel) or {}
+        user = payload.get("user") if isinstance(payload, dict) else None
+        if user:
+            self._notify(by_user.get(user.lower(), []), payload)
+        else:
+            for callbacks in list(by_user.values()):
+                self._notify(callbacks, payload)
+
     def get_latest_price(self, asset: str) -> Optional[float]:
         """Get latest cached price for an asset"""
         if asset in self.latest_data:
@@ -139,6 +366,21 @@ class HyperliquidMarketData:
         """Get latest cached market data for an asset"""
         return self.latest_data.get(asset)
 
+    def get_candles(
+        self, asset: str, timeframe: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the most recent closed candles built from the stream"""
+        if not self.candles:
+            return []
+        return self.candles.closed_candles(asset, timeframe, limit)
+
+    async def _subscribe_trades(self, asset: str) -> None:
+        subscribe_msg = {
+            "method": "subscribe",
+            "subscription": {"type": "trades", "coin": asset},
+        }
+        await self.ws.send(json.dumps(subscribe_msg))
+
     async def _message_handler(self) -> None:
         """Handle incoming WebSocket messages"""
 
@@ -167,9 +409,8 @@ class HyperliquidMarketData:
                 # Listen for messages
                 async for message in self.ws:
                     try:
-                        data = json.loads(message)
-                        await self._process_message(data)
-                    except json.JSONDecodeError:
+                        await self._process_raw_message(message)
+                    except self._decode_errors:
                         continue
                     except Exception as e:
                         print(f"❌ Error processing message: {e}")
@@ -185,12 +426,58 @@ class HyperliquidMarketData:
                 else:
                     break
 
+    async def _process_raw_message(self, message: Any) -> None:
+        """Decode a raw frame, skipping full decoding for allMids when possible"""
+
+        if self.fast_mids_parse and self.subscribed_assets:
+            mids = extract_all_mids(message, self.subscribed_assets)
+            if mids is not None:
+                await self._handle_price_update({"mids": mids})
+                return
+        await self._process_message(self._decode(message))
+
     async def _process_message(self, data: Dict[str, Any]) -> None:
         """Process incoming WebSocket message"""
 
         # Handle different message types
-        if data.get("channel") == "allMids":
+        channel = data.get("channel")
+        if channel == "allMids":
             await self._handle_price_update(data.get("data", {}))
+        elif channel == "trades" and self.candles:
+            self._handle_trades(data.get("data") or [])
+        elif channel in ("webData2", "userEvents", "userFills"):
+            self._notify_user(channel, data.get("data") or {})
+        elif channel == "orderUpdates":
+            self._notify_user(channel, data.get("data") or [])
+
+    def _notify(self, callbacks: List[Callable[[Any], Any]], payload: Any) -> None:
+        for callback in callbacks:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    asyncio.create_task(callback(payload))
+                else:
+                    callback(payload)
+            except Exception as e:
+                print(f"❌ Error in user update callback: {e}")
+
+    def _handle_trades(self, trades: List[Dict[str, Any]]) -> None:
+        """Accumulate traded size into the open candles"""
+
+        # Local receive time, same clock as the mids that drive the bars
+        timestamp = time.time()
+        for trade in trades:
+            asset = trade.get("coin")
+            if asset not in self.subscribed_assets:
+                continue
+            try:
+                self.candles.on_trade(
+                    asset,
+                    float(trade["px"]),
+                    float(trade["sz"]),
+                    timestamp,
+                )
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"❌ Invalid trade data for {asset}: {e}")
 
     async def _handle_price_update(self, price_data: Dict[str, Any]) -> None:
         """Handle price update message"""
@@ -198,8 +485,9 @@ class HyperliquidMarketData:
         # Extract mids data (price_data structure: {"mids": {"BTC": "12345.67", "ETH": "3456.78", ...}})
         mids = price_data.get("mids", {})
 
-        for asset, price_str in mids.items():
-            if asset in self.subscribed_assets:
+        for asset in list(self.subscribed_assets):
+            price_str = mids.get(asset)
+            if price_str is not None:
                 try:
                     price = float(price_str)
                     timestamp = time.time()
@@ -215,13 +503,17 @@ class HyperliquidMarketData:
                     # Cache latest data
                     self.latest_data[asset] = market_data
 
+                    if self.candles:
+                        self.candles.on_price(asset, price, timestamp)
+
                     # Notify callbacks
                     if asset in self.price_callbacks:
+                        mailboxes = self.mailboxes.get(asset, {})
                         for callback in self.price_callbacks[asset]:
                             try:
-                                # Check if callback is async
-                                if asyncio.iscoroutinefunction(callback):
-                                    asyncio.create_task(callback(market_data))
+                                mailbox = mailboxes.get(callback)
+                                if mailbox:
+                                    mailbox.post(market_data)
                                 else:
                                     callback(market_data)
                             except Exception as e:
@@ -267,13 +559,40 @@ class HyperliquidMarketData:
         if self.subscribed_assets and self.ws and self.running:
             subscribe_msg = {"method": "subscribe", "subscription": {"type": "allMids"}}
             await self.ws.send(json.dumps(subscribe_msg))
+            if self.track_volume:
+                for asset in self.subscribed_assets:
+                    await self._subscribe_trades(asset)
+            if self.user_channels:
+                await self._send_user_subscriptions()
 
             print(f"🔄 Re-subscribed to {len(self.subscribed_assets)} assets")
 
+    def get_dispatch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-asset counters for async price subscribers"""
+
+        stats: Dict[str, Dict[str, Any]] = {}
+        for asset, mailboxes in self.mailboxes.items():
+            if not mailboxes:
+                continue
+            per_sub = [mailbox.get_stats() for mailbox in mailboxes.values()]
+            stats[asset] = {
+                "subscribers": len(per_sub),
+                "received": sum(s["received"] for s in per_sub),
+                "delivered": sum(s["delivered"] for s in per_sub),
+                "dropped": sum(s["dropped"] for s in per_sub),
+                "coalesced": sum(s["coalesced"] for s in per_sub),
+                "errors": sum(s["errors"] for s in per_sub),
+                "last_lag": max(s["last_lag"] for s in per_sub),
+                "max_lag": max(s["max_lag"] for s in per_sub),
+            }
+        return stats
+
     def get_status(self) -> Dict[str, Any]:
         """Get market data provider status"""
         return {
             "connected": self.running and self.ws is not None,
             "subscribed_assets": list(self.subscribed_assets),
             "latest_data_count": len(self.latest_data),
+            "candles": self.candles.get_status() if self.candles else None,
+            "dispatch": self.get_dispatch_stats(),
         }
@@ -0,0 +1,121 @@
+"""
+Hyperliquid SDK Executor
+
+The official SDK is synchronous: every Info/Exchange call blocks on an HTTP
+round trip. Running those calls inline in `async def` methods stalls the
+event loop, including the WebSocket reader. This module runs them on a
+dedicated, bounded thread pool with per-call timeouts so adapter methods
+actually yield to the loop.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 10.0
+
+
+class SDKTimeoutError(asyncio.TimeoutError):
+    """Raised when a blocking SDK call does not finish within its timeout"""
+
+
+class SDKExecutor:
+    """
+    Bounded thread pool for blocking SDK calls.
+
+    At most `max_workers` calls run at once; further calls queue without
+    blocking the loop. A timeout stops the caller from waiting, but the
+    worker thread cannot be interrupted and finishes the request in the
+    background - for order placement that means the order may still land.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        thread_name_prefix: str = "hl-sdk",
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.thread_name_prefix = thread_name_prefix
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.last_latency: Optional[float] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Created lazily so a shut down executor can be reused after reconnect
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.thread_name_prefix,
+            )
+        return self._pool
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run `func(*args, **kwargs)` on the pool and await its result.
+
+        `timeout` overrides the executor default; None uses the default.
+        """
+
+        limit = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_pool(), functools.partial(self._timed, func, *args, **kwargs)
+        )
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await asyncio.wait_for(future, limit)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            name = getattr(func, "__name__", repr(func))
+            raise SDKTimeoutError(f"{name} timed out after {limit}s") from None
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def _timed(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.last_latency = time.perf_counter() - started
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Release the worker threads (a later call recreates the pool)"""
+
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "timeout": self.timeout,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "last_latency": self.last_latency,
+        }
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import json
 import time
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional, Any, Dict
+from typing import Callable, Optional, Any, Dict
 
 from interfaces.exchange import (
     ExchangeAdapter,
     Order,
+    OrderResult,
     OrderSide,
     OrderType,
+    OrderStatus,
     Balance,
     MarketInfo,
 )
@@ -17,8 +20,15 @@ from interfaces.strategy import Position
 
 
 class PaperExchange(ExchangeAdapter):
-    def __init__(self, symbol: str, initial_balance: float = 100.0):
+    def __init__(
+        self,
+        symbol: str,
+        initial_balance: float = 100.0,
+        clock: Callable[[], float] = time.time,
+        reports_dir: Optional[str] = "paper_reports",
+    ):
         super().__init__("PaperExchange")
+        self._clock = clock
         self.symbol = symbol
         self.initial_balance = initial_balance
         self.cash = initial_balance
@@ -27,8 +37,13 @@ class PaperExchange(ExchangeAdapter):
         self.last_price: Optional[float] = None
         self.realized_pnl = 0.0
         self.trade_log: list[dict[str, Any]] = []
-        self.reports_dir = Path("paper_reports")
-        self.reports_dir.mkdir(exist_ok=True)
+        self.request_count = 0  # simulated exchange round trips
+        # Fills are reported here as userFills payloads (the engine's OrderTracker)
+        self.fill_listener: Optional[Callable[[Dict[str, Any]], None]] = None
+        # None disables the session report written on disconnect
+        self.reports_dir = Path(reports_dir) if reports_dir else None
+        if self.reports_dir:
+            self.reports_dir.mkdir(exist_ok=True)
 
     def update_price(self, price: float) -> None:
         self.last_price = price
@@ -39,6 +54,8 @@ class PaperExchange(ExchangeAdapter):
 
     async def disconnect(self) -> None:
         self.is_connected = False
+        if not self.reports_dir:
+            return
         timestamp = time.strftime("%Y%m%d-%H%M%S")
         report = self.get_summary()
         report["trades"] = self.trade_log
@@ -57,6 +74,51 @@ class PaperExchange(ExchangeAdapter):
         return self.last_price
 
     async def place_order(self, order: Order) -> str:
+        self.request_count += 1
+        return self._submit(order)
+
+    async def place_orders(self, orders: list[Order]) -> list[OrderResult]:
+        # Emulates a bulk request: one round trip, each order filled in turn
+        self.request_count += 1
+        results = []
+        for order in orders:
+            try:
+                results.append(OrderResult(order, self._submit(order)))
+            except Exception as e:
+                results.append(OrderResult(order, error=str(e)))
+        return results
+
+    def _submit(self, order: Order) -> str:
+        # Every order fills on placement at its own price
+        realized_before = self.realized_pnl
+        oid = self._fill(order)
+        self._report_fill(order, oid, self.trade_log[-1]["price"], realized_before, 0.0)
+        return oid
+
+    def _report_fill(
+        self, order: Order, oid: str, price: float, realized_before: float, fee: float
+    ) -> None:
+        if not self.fill_listener:
+            return
+        self.fill_listener(
+            {
+                "fills": [
+                    {
+                        "oid": oid,
+                        "tid": len(self.trade_log),
+                        "coin": order.asset,
+                        "side": "B" if order.side == OrderSide.BUY else "A",
+                        "px": price,
+                        "sz": order.size,
+                        "time": int(self._clock() * 1000),
+                        "closedPnl": self.realized_pnl - realized_before,
+                        "fee": fee,
+                    }
+                ]
+            }
+        )
+
+    def _fill(self, order: Order) -> str:
         price = order.price or self.last_price
         if price is None:
             raise RuntimeError("Price unavailable for paper order")
@@ -95,7 +157,7 @@ class PaperExchange(ExchangeAdapter):
 
         self.position_size = new_size
         trade = {
-            "timestamp": time.time(),
+            "timestamp": self._clock(),
             "side": order.side.value,
             "size": order.size,
             "price": price,
@@ -108,8 +170,13 @@ class PaperExchange(ExchangeAdapter):
         return f"paper-{len(self.trade_log)}"
 
     async def cancel_order(self, exchange_order_id: str) -> bool:
+        self.request_count += 1
         return True
 
+    async def cancel_orders(self, exchange_order_ids: list[str]) -> list[bool]:
+        self.request_count += 1
+        return [True] * len(exchange_order_ids)
+
     async def get_order_status(self, exchange_order_id: str) -> Order:
         return Order(
             id=exchange_order_id,
@@ -141,7 +208,7 @@ class PaperExchange(ExchangeAdapter):
                 current_value=abs(self.position_size) * self.last_price,
                 unrealized_pnl=(self.last_price - self.position_price)
                 * self.position_size,
-                timestamp=time.time(),
+                timestamp=self._clock(),
             )
         ]
 
@@ -153,13 +220,13 @@ class PaperExchange(ExchangeAdapter):
         close_amount = min(abs(self.position_size), size) if size else abs(self.position_size)
         side = OrderSide.SELL if self.position_size > 0 else OrderSide.BUY
         order = Order(
-            id=f"paper-close-{int(time.time() * 1000)}",
+            id=f"paper-close-{int(self._clock() * 1000)}",
             asset=self.symbol,
             side=side,
             size=close_amount,
             order_type=OrderType.MARKET,
             price=self.last_price,
-            created_at=time.time(),
+            created_at=self._clock(),
         )
         await self.place_order(order)
         return True
@@ -191,6 +258,7 @@ class PaperExchange(ExchangeAdapter):
             "realized_pnl": self.realized_pnl,
             "unrealized_pnl": self._unrealized_pnl(),
             "trade_count": len(self.trade_log),
+            "requests": self.request_count,
         }
 
     def _equity(self) -> float:
@@ -203,3 +271,109 @@ class PaperExchange(ExchangeAdapter):
         if self.position_size == 0 or self.last_price is None:
             return 0.0
         return (self.last_price - self.position_price) * self.position_size
+
+
+class BacktestExchange(PaperExchange):
+    """
+    PaperExchange with a resting order book, for backtests.
+
+    Limit orders rest until the price trades through them and fill at their
+    limit (maker fee); market and marketable orders fill at the last price
+    (taker fee). Fills reach `fill_listener` like PaperExchange's, so the
+    engine's OrderTracker sees them exactly as it would live.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        initial_balance: float = 100.0,
+        clock: Callable[[], float] = time.time,
+        maker_fee: float = 0.00015,
+        taker_fee: float = 0.00045,
+    ):
+        super().__init__(symbol, initial_balance, clock=clock, reports_dir=None)
+        self.exchange_name = "BacktestExchange"
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.fees_paid = 0.0
+        self.orders_placed = 0
+        self.orders_cancelled = 0
+        self._book: Dict[str, Order] = {}
+        self._next_oid = 0
+
+    def update_price(self, price: float) -> None:
+        super().update_price(price)
+        if not self._book:
+            return
+        crossed = [
+            order
+            for order in self._book.values()
+            if (order.side == OrderSide.BUY and price <= order.price)
+            or (order.side == OrderSide.SELL and price >= order.price)
+        ]
+        for order in crossed:
+            del self._book[order.exchange_order_id]
+            self._execute(order, order.exchange_order_id, order.price, self.maker_fee)
+
+    def _submit(self, order: Order) -> str:
+        self.orders_placed += 1
+        self._next_oid += 1
+        oid = f"bt-{self._next_oid}"
+        last = self.last_price
+        if order.order_type == OrderType.MARKET or order.price is None:
+            if last is None:
+                raise RuntimeError("Price unavailable for backtest order")
+            self._execute(order, oid, last, self.taker_fee)
+        elif last is not None and (
+            (order.side == OrderSide.BUY and order.price >= last)
+            or (order.side == OrderSide.SELL and order.price <= last)
+        ):
+            self._execute(order, oid, last, self.taker_fee)  # crosses the book
+        else:
+            self._book[oid] = replace(
+                order, exchange_order_id=oid, status=OrderStatus.SUBMITTED
+            )
+        return oid
+
+    def _execute(self, order: Order, oid: str, price: float, fee_rate: float) -> None:
+        realized_before = self.realized_pnl
+        self._fill(replace(order, price=price))
+        fee = price * order.size * fee_rate
+        self.cash -= fee
+        self.fees_paid += fee
+        trade = self.trade_log[-1]
+        trade.update(fee=fee, cash=self.cash, equity=self._equity())
+        self._report_fill(order, oid, price, realized_before, fee)
+
+    async def cancel_order(self, exchange_order_id: str) -> bool:
+        self.request_count += 1
+        return self._cancel(exchange_order_id)
+
+    async def cancel_orders(self, exchange_order_ids: list[str]) -> list[bool]:
+        self.request_count += 1
+        return [self._cancel(oid) for oid in exchange_order_ids]
+
+    async def cancel_all_orders(self) -> int:
+        self.request_count += 1
+        cancelled = len(self._book)
+        self.orders_cancelled += cancelled
+        self._book.clear()
+        return cancelled
+
+    def _cancel(self, exchange_order_id: str) -> bool:
+        if self._book.pop(str(exchange_order_id), None) is None:
+            return False
+        self.orders_cancelled += 1
+        return True
+
+    async def get_open_orders(self) -> list[Order]:
+        return list(self._book.values())
+
+    def get_summary(self) -> Dict[str, Any]:
+        return {
+            **super().get_summary(),
+            "fees_paid": self.fees_paid,
+            "orders_placed": self.orders_placed,
+            "orders_cancelled": self.orders_cancelled,
+            "open_orders": len(self._book),
+        }
@@ -3,5 +3,12 @@ Infrastructure utilities (database, cache, etc.).
 """
 
 from .db import get_mongo_client, get_mongo_db, get_redis_client
+from .candle_store import CandleStore, CandleSeries
 
-__all__ = ["get_mongo_client", "get_mongo_db", "get_redis_client"]
+__all__ = [
+    "get_mongo_client",
+    "get_mongo_db",
+    "get_redis_client",
+    "CandleStore",
+    "CandleSeries",
+]
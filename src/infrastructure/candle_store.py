@@ -0,0 +1,315 @@
+"""
+Local columnar candle store backed by memory-mapped NumPy arrays.
+
+Each (symbol, timeframe) series lives in its own directory with one raw
+little-endian file per column (open_time, open, high, low, close, volume)
+plus a small meta.json holding the committed length. Appends only add
+candles newer than the last stored open_time, so open_time stays sorted and
+time-range lookups are a binary search; the last row itself is rewritten in
+place, as the collector keeps updating a bar stored while still forming. MongoDB is only used as a sync source;
+candles backfilled into older gaps trigger a rebuild of the series.
+
+Usage:
+    uv run python -m src.infrastructure.candle_store --symbol BTC --timeframe 15m
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .db import get_mongo_db
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_STORE_DIR = BASE_DIR / "data" / "candles"
+
+COLUMNS: Dict[str, np.dtype] = {
+    "open_time": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+
+
+class CandleSeries:
+    """Read-only column views over a contiguous run of stored candles."""
+
+    def __init__(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["open_time"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def slice(self, start: int, stop: int) -> "CandleSeries":
+        return CandleSeries(
+            self.symbol,
+            self.timeframe,
+            {name: values[start:stop] for name, values in self.columns.items()},
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize candles in the same shape as the Mongo documents."""
+
+        open_times = self.columns["open_time"].tolist()
+        opens = self.columns["open"].tolist()
+        highs = self.columns["high"].tolist()
+        lows = self.columns["low"].tolist()
+        closes = self.columns["close"].tolist()
+        volumes = self.columns["volume"].tolist()
+        return [
+            {
+                "open_time": open_times[i],
+                "open": opens[i],
+                "high": highs[i],
+                "low": lows[i],
+                "close": closes[i],
+                "volume": volumes[i],
+            }
+            for i in range(len(open_times))
+        ]
+
+
+class CandleStore:
+    """
+    Append-only memory-mapped candle columns on local disk.
+
+    Slices returned by `range`/`tail`/`head` are zero-copy views of the
+    underlying memory maps.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        env_root = os.getenv("CANDLE_STORE_DIR")
+        self.root = Path(root or env_root or DEFAULT_STORE_DIR)
+        self._maps: Dict[tuple[str, str], CandleSeries] = {}
+
+    def _series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / timeframe
+
+    def _read_length(self, symbol: str, timeframe: str) -> int:
+        meta_path = self._series_dir(symbol, timeframe) / "meta.json"
+        if not meta_path.exists():
+            return 0
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return int(json.load(f).get("length", 0))
+
+    def _write_length(self, symbol: str, timeframe: str, length: int) -> None:
+        series_dir = self._series_dir(symbol, timeframe)
+        tmp_path = series_dir / "meta.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"length": length, "columns": list(COLUMNS)}, f)
+        os.replace(tmp_path, series_dir / "meta.json")
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        return len(self.series(symbol, timeframe))
+
+    def series(self, symbol: str, timeframe: str) -> CandleSeries:
+        """Full stored series as memory-mapped columns."""
+
+        key = (symbol, timeframe)
+        cached = self._maps.get(key)
+        length = self._read_length(symbol, timeframe)
+        if cached is not None and len(cached) == length:
+            return cached
+
+        series_dir = self._series_dir(symbol, timeframe)
+        columns: Dict[str, np.ndarray] = {}
+        for name, dtype in COLUMNS.items():
+            if length == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(
+                    series_dir / f"{name}.bin", dtype=dtype, mode="r", shape=(length,)
+                )
+        series = CandleSeries(symbol, timeframe, columns)
+        self._maps[key] = series
+        return series
+
+    def last_open_time(self, symbol: str, timeframe: str) -> Optional[int]:
+        open_times = self.series(symbol, timeframe)["open_time"]
+        return int(open_times[-1]) if len(open_times) else None
+
+    def append(self, symbol: str, timeframe: str, candles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append candles newer than the last stored one; returns rows added.
+
+        A candle with the last stored open_time overwrites that row in place
+        (columns are fixed width), picking up a bar's final values.
+        """
+
+        last = self.last_open_time(symbol, timeframe)
+        rows = sorted(
+            (c for c in candles if last is None or int(c["open_time"]) >= last),
+            key=lambda c: int(c["open_time"]),
+        )
+        deduped: List[Dict[str, Any]] = []
+        for candle in rows:
+            if deduped and int(deduped[-1]["open_time"]) == int(candle["open_time"]):
+                deduped[-1] = candle
+            else:
+                deduped.append(candle)
+        if not deduped:
+            return 0
+
+        length = self._read_length(symbol, timeframe)
+        start = length - 1 if int(deduped[0]["open_time"]) == last else length
+        series_dir = self._series_dir(symbol, timeframe)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        for name, dtype in COLUMNS.items():
+            default = 0.0 if name == "volume" else None
+            values = np.fromiter(
+                (c[name] if default is None else c.get(name, default) for c in deduped),
+                dtype=dtype,
+                count=len(deduped),
+            )
+            path = series_dir / f"{name}.bin"
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                # Drop bytes left behind by an interrupted append
+                f.truncate(length * dtype.itemsize)
+                f.seek(start * dtype.itemsize)
+                f.write(values.tobytes())
+        self._write_length(symbol, timeframe, start + len(deduped))
+        self._maps.pop((symbol, timeframe), None)
+        return start + len(deduped) - length
+
+    def range(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> CandleSeries:
+        """Candles with start_time <= open_time <= end_time (binary search)."""
+
+        series = self.series(symbol, timeframe)
+        open_times = series["open_time"]
+        lo = 0 if start_time is None else int(np.searchsorted(open_times, start_time, "left"))
+        hi = (
+            len(open_times)
+            if end_time is None
+            else int(np.searchsorted(open_times, end_time, "right"))
+        )
+        return series.slice(lo, max(lo, hi))
+
+    def head(self, symbol: str, timeframe: str, limit: int) -> CandleSeries:
+        return self.series(symbol, timeframe).slice(0, limit)
+
+    def tail(self, symbol: str, timeframe: str, limit: int) -> CandleSeries:
+        series = self.series(symbol, timeframe)
+        return series.slice(max(0, len(series) - limit), len(series))
+
+    def rebuild(
+        self, symbol: str, timeframe: str, batches: Iterable[List[Dict[str, Any]]]
+    ) -> int:
+        """
+        Replace the series with the candles in `batches`; returns rows written.
+
+        Columns are staged next to the store and swapped in with os.replace,
+        so memory maps already handed out keep reading the old files.
+        """
+
+        staging = CandleStore(self.root / ".rebuild")
+        staging_dir = staging._series_dir(symbol, timeframe)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        written = 0
+        for batch in batches:
+            written += staging.append(symbol, timeframe, batch)
+
+        series_dir = self._series_dir(symbol, timeframe)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        # Readers see an empty series until every column has been swapped
+        self._write_length(symbol, timeframe, 0)
+        for name in COLUMNS:
+            staged = staging_dir / f"{name}.bin"
+            if staged.exists():
+                os.replace(staged, series_dir / f"{name}.bin")
+        self._write_length(symbol, timeframe, written)
+        self._maps.pop((symbol, timeframe), None)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return written
+
+    @staticmethod
+    def _mongo_batches(
+        collection: Any, query: Dict[str, Any], batch_size: int
+    ) -> Iterable[List[Dict[str, Any]]]:
+        cursor = collection.find(
+            query,
+            projection={"_id": 0, **{name: 1 for name in COLUMNS}},
+            sort=[("open_time", 1)],
+        )
+        batch: List[Dict[str, Any]] = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def sync_from_mongo(
+        self,
+        symbol: str,
+        timeframe: str,
+        collection: Any = None,
+        batch_size: int = 50000,
+    ) -> int:
+        """
+        Pull candles from the local tail onwards from MongoDB.
+
+        The tail itself is re-read: it may have been stored while still
+        forming, and the collector rewrites it once the bar closes.
+
+        Backfills can also insert candles into older gaps. When MongoDB's
+        count up to the local tail differs from the store's, the series is
+        rebuilt from MongoDB instead; returns rows written either way.
+        """
+
+        if collection is None:
+            collection = get_mongo_db()["candles"]
+
+        query: Dict[str, Any] = {"symbol": symbol, "timeframe": timeframe}
+        last = self.last_open_time(symbol, timeframe)
+        if last is not None:
+            stored = self.count(symbol, timeframe)
+            upstream = collection.count_documents({**query, "open_time": {"$lte": last}})
+            if upstream != stored:
+                batches = self._mongo_batches(collection, query, batch_size)
+                return self.rebuild(symbol, timeframe, batches)
+            query["open_time"] = {"$gte": last}
+
+        written = 0
+        for batch in self._mongo_batches(collection, query, batch_size):
+            written += self.append(symbol, timeframe, batch)
+        return written
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync the local candle store from MongoDB")
+    parser.add_argument("--symbol", default="BTC")
+    parser.add_argument("--timeframe", default="15m")
+    parser.add_argument("--root", help="Store directory (default: data/candles)")
+    args = parser.parse_args()
+
+    store = CandleStore(Path(args.root) if args.root else None)
+    written = store.sync_from_mongo(args.symbol, args.timeframe)
+    print(
+        f"Synced {written} candles; {store.count(args.symbol, args.timeframe)} stored "
+        f"for {args.symbol} {args.timeframe} in {store.root}"
+    )
+
+
+if __name__ == "__main__":
+    main()
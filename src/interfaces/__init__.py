@@ -10,6 +10,7 @@ from .strategy import TradingStrategy, TradingSignal, SignalType, MarketData, Po
 from .exchange import (
     ExchangeAdapter,
     Order,
+    OrderResult,
     OrderSide,
     OrderType,
     OrderStatus,
@@ -27,6 +28,7 @@ __all__ = [
     # Exchange interface
     "ExchangeAdapter",
     "Order",
+    "OrderResult",
     "OrderSide",
     "OrderType",
     "OrderStatus",
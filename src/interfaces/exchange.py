@@ -51,6 +51,20 @@ class Order:
     average_fill_price: float = 0.0
     exchange_order_id: Optional[str] = None
     created_at: float = 0.0  # Timestamp when order was created
+    reduce_only: bool = False  # Only reduce an existing position
+
+
+@dataclass
+class OrderResult:
+    """Outcome of one order in a batch placement"""
+
+    order: Order
+    exchange_order_id: Optional[str] = None  # "filled" when executed immediately
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.exchange_order_id is not None
 
 
 @dataclass
@@ -192,6 +206,41 @@ class ExchangeAdapter(ABC):
         """
         pass
 
+    # Batch methods (override when the exchange supports bulk requests)
+
+    async def place_orders(self, orders: List[Order]) -> List[OrderResult]:
+        """
+        Place several orders, ideally in one exchange request.
+
+        The default places them one by one. A failed order does not stop
+        the rest; its error is reported in the matching result.
+
+        Args:
+            orders: Orders to place
+
+        Returns:
+            One OrderResult per order, in the same order
+        """
+        results = []
+        for order in orders:
+            try:
+                results.append(OrderResult(order, await self.place_order(order)))
+            except Exception as e:
+                results.append(OrderResult(order, error=str(e)))
+        return results
+
+    async def cancel_orders(self, exchange_order_ids: List[str]) -> List[bool]:
+        """
+        Cancel several orders, ideally in one exchange request.
+
+        Args:
+            exchange_order_ids: Exchange order IDs to cancel
+
+        Returns:
+            One flag per ID, True if that order was cancelled
+        """
+        return [await self.cancel_order(order_id) for order_id in exchange_order_ids]
+
     # Position management methods (optional - implement if exchange supports positions)
 
     async def get_positions(self) -> List["Position"]:
@@ -240,12 +289,10 @@ class ExchangeAdapter(ABC):
     async def cancel_all_orders(self) -> int:
         """Cancel all open orders. Override if exchange supports this."""
         orders = await self.get_open_orders()
-        cancelled = 0
-        for order in orders:
-            if order.exchange_order_id:
-                if await self.cancel_order(order.exchange_order_id):
-                    cancelled += 1
-        return cancelled
+        order_ids = [order.exchange_order_id for order in orders if order.exchange_order_id]
+        if not order_ids:
+            return 0
+        return sum(await self.cancel_orders(order_ids))
 
     def get_status(self) -> Dict[str, Any]:
         """Get exchange adapter status."""
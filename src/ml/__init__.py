@@ -2,6 +2,6 @@
 Machine learning scaffolding (features, datasets, training, model storage).
 """
 
-from . import features, dataset, train, model_store, patterns, service
+from . import features, dataset, train, model_store, patterns, service, signal_cache
 
-__all__ = ["features", "dataset", "train", "model_store", "patterns", "service"]
+__all__ = ["features", "dataset", "train", "model_store", "patterns", "service", "signal_cache"]
@@ -4,40 +4,29 @@ Dataset construction helpers for ML experiments.
 
 from __future__ import annotations
 
+import os
 from statistics import mean, pstdev
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from infrastructure.candle_store import CandleStore
 from infrastructure.db import get_mongo_db
-from ml.patterns import analyze_patterns
-from ml.features import compute_indicator_set, INDICATOR_KEYS
-
-PATTERN_KEYS = [
-    "hammer",
-    "hanging_man",
-    "doji",
-    "bullish_engulfing",
-    "bearish_engulfing",
-    "pin_bar",
-    "morning_star",
-    "evening_star",
-    "double_bottom",
-    "double_top",
-    "head_and_shoulders",
-    "inverse_head_and_shoulders",
-    "triangle",
-    "ascending_triangle",
-    "descending_triangle",
-    "flag",
-    "pennant",
-    "channel",
-]
+from ml.patterns import PATTERN_NAMES, analyze_patterns, analyze_patterns_series
+from ml.features import compute_indicator_matrix, compute_indicator_set, INDICATOR_KEYS
+
+PATTERN_KEYS = PATTERN_NAMES
 
 
 def load_candles_from_mongo(
-    limit: int = 50000, symbol: str = "BTC", timeframe: str = "15m"
+    limit: int = 50000, symbol: str = "BTC", timeframe: str = "15m", latest: bool = False
 ) -> List[Dict[str, Any]]:
     """
     Load candles (ascending by time) from MongoDB for training.
+
+    By default the oldest `limit` candles are returned; `latest=True` returns
+    the most recent `limit` instead (still in ascending order).
     """
 
     db = get_mongo_db()
@@ -54,11 +43,40 @@ def load_candles_from_mongo(
                 "close": 1,
                 "volume": 1,
             },
-            sort=[("open_time", 1)],
+            sort=[("open_time", -1 if latest else 1)],
             limit=limit,
         )
     )
-    return list(cursor)
+    candles = list(cursor)
+    if latest:
+        candles.reverse()
+    return candles
+
+
+def load_candles(
+    limit: int = 50000,
+    symbol: str = "BTC",
+    timeframe: str = "15m",
+    source: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Load candles from MongoDB or from the local CandleStore.
+
+    `source` defaults to the CANDLE_SOURCE env var ("mongo" or "store"). The
+    store is first brought up to date from MongoDB (newer candles are pulled,
+    the series is rebuilt if older gaps were backfilled) and returns the
+    same rows as `load_candles_from_mongo`.
+    """
+
+    source = (source or os.getenv("CANDLE_SOURCE", "mongo")).lower()
+    if source == "mongo":
+        return load_candles_from_mongo(limit=limit, symbol=symbol, timeframe=timeframe)
+    if source != "store":
+        raise ValueError(f"Unknown candle source: {source}")
+
+    store = CandleStore()
+    store.sync_from_mongo(symbol, timeframe)
+    return store.head(symbol, timeframe, limit).to_dicts()
 
 
 def _window_features(window: List[Dict[str, Any]]) -> List[float]:
@@ -96,6 +114,103 @@ def _window_features(window: List[Dict[str, Any]]) -> List[float]:
     return features
 
 
+def candle_columns(candles: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of candle dicts into float column arrays (one pass).
+    """
+
+    return {
+        "open": np.fromiter((c["open"] for c in candles), dtype=float, count=len(candles)),
+        "high": np.fromiter((c["high"] for c in candles), dtype=float, count=len(candles)),
+        "low": np.fromiter((c["low"] for c in candles), dtype=float, count=len(candles)),
+        "close": np.fromiter((c["close"] for c in candles), dtype=float, count=len(candles)),
+        "volume": np.fromiter(
+            (c.get("volume", 0.0) for c in candles), dtype=float, count=len(candles)
+        ),
+    }
+
+
+def _prefix_sums(values: np.ndarray) -> np.ndarray:
+    return np.concatenate(([0.0], np.cumsum(values)))
+
+
+def build_feature_matrix(
+    columns: Dict[str, np.ndarray],
+    ends: np.ndarray,
+    lookback: int,
+) -> np.ndarray:
+    """
+    Compute `_window_features` for every window ending at `ends` at once.
+
+    Window statistics come from sliding-window views and cumulative sums over
+    the column arrays, so the series is only walked once per feature.
+    """
+
+    opens = columns["open"]
+    highs = columns["high"]
+    lows = columns["low"]
+    closes = columns["close"]
+    volumes = columns["volume"]
+    starts = ends - lookback + 1
+
+    def window_mean(values: np.ndarray) -> np.ndarray:
+        sums = _prefix_sums(values)
+        return (sums[ends + 1] - sums[starts]) / lookback
+
+    last_close = closes[ends]
+    prev_close = closes[ends - 1]
+    first_close = closes[starts]
+    close_floor = np.maximum(1e-9, closes)
+    volume_sums = _prefix_sums(volumes)
+    prev_volume_mean = (volume_sums[ends] - volume_sums[starts]) / (lookback - 1)
+
+    base = np.column_stack(
+        [
+            (last_close - prev_close) / np.maximum(1e-9, prev_close),
+            (last_close - first_close) / np.maximum(1e-9, first_close),
+            sliding_window_view(closes, lookback).std(axis=1)[starts],
+            window_mean(np.abs(closes - opens) / close_floor),
+            window_mean(np.maximum(1e-9, highs - lows) / close_floor),
+            volumes[ends] / np.maximum(1e-6, prev_volume_mean),
+        ]
+    )
+    indicators = compute_indicator_matrix(closes, highs, lows, volumes, lookback)[
+        ends - lookback + 1
+    ]
+    patterns = analyze_patterns_series(columns, lookback)[ends].astype(float)
+    return np.hstack([base, indicators, patterns])
+
+
+def build_supervised_arrays(
+    candles: List[Dict[str, Any]],
+    lookback: int,
+    prediction_horizon: int,
+    target_return_pct: float = 0.003,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    NumPy variant of `build_supervised_dataset` returning (X, y) arrays.
+    """
+
+    if lookback <= 1 or prediction_horizon < 1:
+        raise ValueError("lookback must be >1 and prediction_horizon >=1")
+
+    total = len(candles)
+    if total - prediction_horizon <= lookback:
+        raise ValueError("Not enough candles to build dataset")
+
+    columns = candle_columns(candles)
+    # Row for sample idx uses the window candles[idx - lookback : idx]
+    ends = np.arange(lookback, total - prediction_horizon) - 1
+    X = build_feature_matrix(columns, ends, lookback)
+
+    closes = columns["close"]
+    current_close = closes[ends]
+    future_close = closes[ends + prediction_horizon]
+    future_return = (future_close - current_close) / np.maximum(1e-9, current_close)
+    y = (future_return >= target_return_pct).astype(float)
+    return X, y
+
+
 def build_supervised_dataset(
     candles: List[Dict[str, Any]],
     lookback: int,
@@ -106,6 +221,20 @@ def build_supervised_dataset(
     Transform raw candles into supervised learning inputs/targets.
     """
 
+    X, y = build_supervised_arrays(candles, lookback, prediction_horizon, target_return_pct)
+    return X.tolist(), y.tolist()
+
+
+def _build_supervised_dataset_loop(
+    candles: List[Dict[str, Any]],
+    lookback: int,
+    prediction_horizon: int,
+    target_return_pct: float = 0.003,
+) -> Tuple[List[List[float]], List[float]]:
+    """
+    Window-by-window reference implementation (kept for parity checks/benchmarks).
+    """
+
     if lookback <= 1 or prediction_horizon < 1:
         raise ValueError("lookback must be >1 and prediction_horizon >=1")
 
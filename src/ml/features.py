@@ -4,9 +4,12 @@ Feature engineering helpers.
 
 from __future__ import annotations
 
-from typing import Dict, List, Any
+from collections import deque
+import math
+from typing import Any, Deque, Dict, List, Optional
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 INDICATOR_KEYS = [
     "ema_12",
@@ -21,6 +24,12 @@ INDICATOR_KEYS = [
     "volume_ratio",
 ]
 
+EMA_FAST_PERIOD = 12
+EMA_SLOW_PERIOD = 26
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+BOLLINGER_PERIOD = 20
+
 
 def _ema(values: List[float], period: int) -> float:
     if len(values) < period:
@@ -97,3 +106,294 @@ def compute_indicator_set(candles: List[Dict[str, Any]]) -> Dict[str, float]:
         indicators["volume_ratio"] = 1.0
     # Ensure ordering for downstream consumers
     return {key: indicators[key] for key in INDICATOR_KEYS}
+
+
+def _ema_weights(period: int) -> np.ndarray:
+    weights = np.exp(np.linspace(-1.0, 0.0, period))
+    return weights / weights.sum()
+
+
+def compute_indicator_matrix(
+    closes: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    volumes: np.ndarray,
+    window: int,
+) -> np.ndarray:
+    """
+    Vectorized `compute_indicator_set` for every full window of a series.
+
+    Row r holds the indicators of the window ending at index r + window - 1,
+    with columns ordered like INDICATOR_KEYS.
+    """
+
+    closes = np.asarray(closes, dtype=float)
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    if window < ATR_PERIOD:
+        raise ValueError(f"window must be >= {ATR_PERIOD} (ATR period)")
+    total = len(closes)
+    if total < window:
+        return np.empty((0, len(INDICATOR_KEYS)))
+
+    ends = np.arange(window - 1, total)
+    last = closes[ends]
+    out = np.empty((len(ends), len(INDICATOR_KEYS)))
+
+    def ema(period: int) -> np.ndarray:
+        if window < period:
+            return last
+        values = sliding_window_view(closes, period) @ _ema_weights(period)
+        return values[ends - period + 1]
+
+    ema_fast = ema(EMA_FAST_PERIOD)
+    ema_slow = ema(EMA_SLOW_PERIOD)
+    out[:, 0] = ema_fast
+    out[:, 1] = ema_slow
+    out[:, 2] = ema_fast / np.maximum(1e-9, ema_slow)
+
+    if window < RSI_PERIOD + 1:
+        out[:, 3] = 50.0
+    else:
+        deltas = np.diff(closes)
+        start = ends - RSI_PERIOD
+        avg_gain = sliding_window_view(np.maximum(deltas, 0), RSI_PERIOD).mean(axis=1)[start]
+        avg_loss = sliding_window_view(np.abs(np.minimum(deltas, 0)), RSI_PERIOD).mean(
+            axis=1
+        )[start]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        out[:, 3] = np.where(avg_loss == 0, 100.0, rsi)
+
+    out[:, 4] = ema_fast - ema_slow if window >= EMA_SLOW_PERIOD else 0.0
+
+    prev_close = np.concatenate(([closes[0]], closes[:-1]))
+    true_range = np.maximum.reduce(
+        [highs - lows, np.abs(highs - prev_close), np.abs(lows - prev_close)]
+    )
+    if window == ATR_PERIOD:
+        # `_atr` has no previous close for the first bar of a 14-candle window
+        bar_range = np.maximum.reduce(
+            [highs - lows, np.abs(highs - closes), np.abs(lows - closes)]
+        )
+        spans = sliding_window_view(true_range, ATR_PERIOD)[ends - ATR_PERIOD + 1].copy()
+        spans[:, 0] = bar_range[ends - ATR_PERIOD + 1]
+        out[:, 5] = spans.mean(axis=1)
+    else:
+        out[:, 5] = sliding_window_view(true_range, ATR_PERIOD).mean(axis=1)[
+            ends - ATR_PERIOD + 1
+        ]
+
+    if window < BOLLINGER_PERIOD:
+        out[:, 6] = last
+        out[:, 7] = last
+        out[:, 8] = 0.0
+    else:
+        spans = sliding_window_view(closes, BOLLINGER_PERIOD)[ends - BOLLINGER_PERIOD + 1]
+        mean_val = spans.mean(axis=1)
+        std_val = spans.std(axis=1)
+        out[:, 6] = mean_val + 2 * std_val
+        out[:, 7] = mean_val - 2 * std_val
+        out[:, 8] = (out[:, 6] - out[:, 7]) / np.maximum(1e-9, mean_val)
+
+    volume_sums = np.concatenate(([0.0], np.cumsum(volumes)))
+    prev_volume_mean = (volume_sums[ends] - volume_sums[ends - window + 1]) / (window - 1)
+    out[:, 9] = volumes[ends] / np.maximum(1e-9, prev_volume_mean)
+    return out
+
+
+class _RollingSum:
+    """Fixed-size window sum updated in O(1) per value."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque(maxlen=size)
+        self.total = 0.0
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.size:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class _WindowedEma:
+    """
+    Streaming form of `_ema`.
+
+    `_ema` weights the last `period` values with exp(linspace(-1, 0, period)),
+    i.e. a geometric series with ratio r = e^(1/(period-1)). Sliding that window
+    by one value divides every weight by r, so the weighted sum can be updated
+    without touching the whole window (and rounding errors decay over time).
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.ratio = math.exp(1.0 / (period - 1))
+        self.newest_weight = self.ratio ** (period - 1)
+        weights = np.exp(np.linspace(-1.0, 0.0, period))
+        self.norm = float(weights.sum() / weights[0])
+        self.values: Deque[float] = deque(maxlen=period)
+        self.weighted = 0.0
+
+    def push(self, value: float) -> None:
+        if len(self.values) < self.period:
+            self.values.append(value)
+            if len(self.values) == self.period:
+                self.weighted = sum(
+                    (self.ratio**i) * v for i, v in enumerate(self.values)
+                )
+            return
+        oldest = self.values[0]
+        self.values.append(value)
+        self.weighted = (self.weighted - oldest) / self.ratio + self.newest_weight * value
+
+    @property
+    def value(self) -> float:
+        return self.weighted / self.norm
+
+
+class IncrementalIndicators:
+    """
+    Stateful counterpart of `compute_indicator_set`.
+
+    Feed closed candles one at a time with `update`; every indicator is
+    maintained with O(1) work per candle. The values always match
+    `compute_indicator_set(candles[-window:])` over the candles pushed so far,
+    so `window` should be the lookback the caller would otherwise slice.
+    """
+
+    def __init__(self, window: int = 48):
+        if window < ATR_PERIOD:
+            raise ValueError(f"window must be >= {ATR_PERIOD} (ATR period)")
+        self.window = window
+        self.count = 0
+        self.last_close: Optional[float] = None
+
+        self._ema_fast = _WindowedEma(EMA_FAST_PERIOD)
+        self._ema_slow = _WindowedEma(EMA_SLOW_PERIOD)
+        self._gains = _RollingSum(RSI_PERIOD)
+        self._losses = _RollingSum(RSI_PERIOD)
+        self._loss_count = _RollingSum(RSI_PERIOD)
+        self._true_ranges = _RollingSum(ATR_PERIOD)
+        self._bar_ranges: Deque[float] = deque(maxlen=ATR_PERIOD)
+        # Bollinger sums are shifted by the first close to avoid cancellation
+        self._bb_shift: Optional[float] = None
+        self._bb_sum = _RollingSum(BOLLINGER_PERIOD)
+        self._bb_sumsq = _RollingSum(BOLLINGER_PERIOD)
+        self._volumes = _RollingSum(window)
+
+    @classmethod
+    def from_candles(
+        cls, candles: List[Dict[str, Any]], window: int = 48
+    ) -> "IncrementalIndicators":
+        engine = cls(window)
+        for candle in candles:
+            engine.update(candle)
+        return engine
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= ATR_PERIOD
+
+    def update(self, candle: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """Push one closed candle; returns the indicator set once ready."""
+
+        close = float(candle["close"])
+        high = float(candle["high"])
+        low = float(candle["low"])
+        volume = float(candle.get("volume", 0.0))
+
+        prev_close = self.last_close
+        self._ema_fast.push(close)
+        self._ema_slow.push(close)
+
+        if prev_close is not None:
+            delta = close - prev_close
+            self._gains.push(max(delta, 0.0))
+            self._losses.push(abs(min(delta, 0.0)))
+            self._loss_count.push(1.0 if delta < 0 else 0.0)
+
+        bar_range = max(high - low, abs(high - close), abs(low - close))
+        if prev_close is None:
+            true_range = bar_range
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        self._true_ranges.push(true_range)
+        self._bar_ranges.append(bar_range)
+
+        if self._bb_shift is None:
+            self._bb_shift = close
+        shifted = close - self._bb_shift
+        self._bb_sum.push(shifted)
+        self._bb_sumsq.push(shifted * shifted)
+
+        self._volumes.push(volume)
+        self.last_close = close
+        self.count += 1
+        return self.values() if self.ready else None
+
+    def values(self) -> Dict[str, float]:
+        """Current indicator set, keyed and ordered like INDICATOR_KEYS."""
+
+        if not self.ready:
+            raise ValueError(f"Need at least {ATR_PERIOD} candles for indicators")
+
+        visible = min(self.count, self.window)
+        close = self.last_close
+        indicators: Dict[str, float] = {}
+        indicators["ema_12"] = self._ema_fast.value if visible >= EMA_FAST_PERIOD else close
+        indicators["ema_26"] = self._ema_slow.value if visible >= EMA_SLOW_PERIOD else close
+        indicators["ema_ratio"] = indicators["ema_12"] / max(1e-9, indicators["ema_26"])
+        indicators["rsi_14"] = self._rsi(visible)
+        indicators["macd"] = (
+            indicators["ema_12"] - indicators["ema_26"]
+            if visible >= EMA_SLOW_PERIOD
+            else 0.0
+        )
+        indicators["atr_14"] = self._atr(visible)
+        indicators.update(self._bollinger(visible))
+        indicators["volume_ratio"] = self._volume_ratio(visible)
+        return {key: indicators[key] for key in INDICATOR_KEYS}
+
+    def _rsi(self, visible: int) -> float:
+        if visible < RSI_PERIOD + 1:
+            return 50.0
+        if self._loss_count.total < 0.5:
+            return 100.0
+        avg_gain = max(self._gains.total, 0.0) / RSI_PERIOD
+        avg_loss = self._losses.total / RSI_PERIOD
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def _atr(self, visible: int) -> float:
+        total = self._true_ranges.total
+        if visible == ATR_PERIOD:
+            # `_atr` has no previous close for the first bar of a 14-candle window
+            total += self._bar_ranges[0] - self._true_ranges.values[0]
+        return total / ATR_PERIOD
+
+    def _bollinger(self, visible: int) -> Dict[str, float]:
+        close = self.last_close
+        if visible < BOLLINGER_PERIOD:
+            return {"bb_upper": close, "bb_lower": close, "bb_width": 0.0}
+        mean_shifted = self._bb_sum.total / BOLLINGER_PERIOD
+        variance = max(0.0, self._bb_sumsq.total / BOLLINGER_PERIOD - mean_shifted**2)
+        std_val = math.sqrt(variance)
+        mean_val = mean_shifted + self._bb_shift
+        upper = mean_val + 2 * std_val
+        lower = mean_val - 2 * std_val
+        width = (upper - lower) / max(1e-9, mean_val)
+        return {"bb_upper": upper, "bb_lower": lower, "bb_width": width}
+
+    def _volume_ratio(self, visible: int) -> float:
+        latest = self._volumes.values[-1]
+        if visible > 1:
+            avg_volume = (self._volumes.total - latest) / (visible - 1)
+        else:
+            avg_volume = latest
+        return latest / max(1e-9, avg_volume)
@@ -3,15 +3,41 @@ Pattern detection utilities for 15m BTC candles.
 
 Each helper expects candles as dictionaries with keys:
 open, high, low, close, volume (volume optional for most checks).
+`analyze_patterns_series` runs every detector over a whole history at once.
 """
 
 from __future__ import annotations
 
 from statistics import mean
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 Candle = Dict[str, float]
 
+# Column order of analyze_patterns_series (and of analyze_patterns' keys)
+PATTERN_NAMES = [
+    "hammer",
+    "hanging_man",
+    "doji",
+    "bullish_engulfing",
+    "bearish_engulfing",
+    "pin_bar",
+    "morning_star",
+    "evening_star",
+    "double_bottom",
+    "double_top",
+    "head_and_shoulders",
+    "inverse_head_and_shoulders",
+    "triangle",
+    "ascending_triangle",
+    "descending_triangle",
+    "flag",
+    "pennant",
+    "channel",
+]
+
 
 def _body(candle: Candle) -> float:
     return abs(candle["close"] - candle["open"])
@@ -215,8 +241,218 @@ def analyze_patterns(candles: List[Candle]) -> Dict[str, bool]:
     return results
 
 
+def _series_flags(
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    lookback: int,
+) -> Dict[str, np.ndarray]:
+    """
+    Detector flags for every full window (candles[i - lookback + 1 : i + 1]
+    for i >= lookback - 1), mirroring the scalar helpers operation by
+    operation so the float comparisons come out identical.
+    """
+
+    count = len(closes) - lookback + 1
+    cur = slice(lookback - 1, None)
+    false = np.zeros(count, dtype=bool)
+
+    def tail(values: np.ndarray, size: int) -> np.ndarray:
+        # Last `size` values of each window: windows of `size` ending at i
+        return sliding_window_view(values, size)[lookback - size :]
+
+    body = np.abs(closes - opens)
+    rng = highs - lows
+    upper = highs - np.maximum(opens, closes)
+    lower = np.minimum(opens, closes) - lows
+
+    def doji(idx: slice, threshold: float) -> np.ndarray:
+        return (rng[idx] > 0) & (body[idx] <= rng[idx] * threshold)
+
+    flags: Dict[str, np.ndarray] = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hammer = (
+            (rng[cur] != 0)
+            & (lower[cur] >= body[cur] * 2)
+            & (upper[cur] <= body[cur] * 0.5)
+            & (body[cur] / rng[cur] <= 0.4)
+        )
+        flags["hammer"] = hammer
+
+        if lookback >= 3:
+            # closes[:-1] of the window: first close to the previous one
+            start = closes[: count]
+            prev = closes[lookback - 2 : -1]
+            trend = np.where(start != 0, (prev - start) / np.abs(start), 0.0)
+            flags["hanging_man"] = (trend > 0.03) & hammer
+        else:
+            flags["hanging_man"] = false
+
+        flags["doji"] = doji(cur, 0.1)
+
+        if lookback >= 2:
+            p = slice(lookback - 2, -1)
+            prev_bear = closes[p] < opens[p]
+            prev_bull = closes[p] > opens[p]
+            bigger = body[cur] > body[p]
+            flags["bullish_engulfing"] = (
+                prev_bear
+                & (closes[cur] > opens[cur])
+                & (closes[cur] >= opens[p])
+                & (opens[cur] <= closes[p])
+                & bigger
+            )
+            flags["bearish_engulfing"] = (
+                prev_bull
+                & (closes[cur] < opens[cur])
+                & (opens[cur] >= closes[p])
+                & (closes[cur] <= opens[p])
+                & bigger
+            )
+        else:
+            flags["bullish_engulfing"] = flags["bearish_engulfing"] = false
+
+        flags["pin_bar"] = (upper[cur] >= body[cur] * 2) ^ (lower[cur] >= body[cur] * 2)
+
+        if lookback >= 3:
+            first = slice(lookback - 3, len(closes) - 2)
+            second = slice(lookback - 2, len(closes) - 1)
+            mid = (opens[first] + closes[first]) / 2
+            small = doji(second, 0.2)
+            flags["morning_star"] = (
+                (closes[first] < opens[first]) & small & (closes[cur] > opens[cur]) & (closes[cur] >= mid)
+            )
+            flags["evening_star"] = (
+                (closes[first] > opens[first]) & small & (closes[cur] < opens[cur]) & (closes[cur] <= mid)
+            )
+        else:
+            flags["morning_star"] = flags["evening_star"] = false
+
+        size = min(20, lookback)
+        if size >= 5:
+            window = tail(closes, size)
+            smallest = np.partition(window, 1, axis=1)
+            low0, low1 = smallest[:, 0], smallest[:, 1]
+            flags["double_bottom"] = np.abs(low0 - low1) / np.maximum(1.0, np.abs(low0)) <= 0.01
+            largest = np.partition(window, size - 2, axis=1)
+            high0, high1 = largest[:, -1], largest[:, -2]
+            flags["double_top"] = np.abs(high0 - high1) / np.maximum(1.0, np.abs(high0)) <= 0.01
+        else:
+            flags["double_bottom"] = flags["double_top"] = false
+
+        size = min(30, lookback)
+        if size >= 7:
+            one, two = size // 3, 2 * size // 3
+            window = tail(highs, size)
+            left = window[:, :one].max(axis=1)
+            head = window[:, one:two].max(axis=1)
+            right = window[:, two:].max(axis=1)
+            flags["head_and_shoulders"] = (
+                (head > left) & (head > right) & (np.abs(left - right) / head <= 0.05)
+            )
+            window = tail(lows, size)
+            left = window[:, :one].min(axis=1)
+            head = window[:, one:two].min(axis=1)
+            right = window[:, two:].min(axis=1)
+            flags["inverse_head_and_shoulders"] = (
+                (head < left) & (head < right) & (np.abs(left - right) / np.abs(head) <= 0.05)
+            )
+        else:
+            flags["head_and_shoulders"] = flags["inverse_head_and_shoulders"] = false
+
+        size = min(20, lookback)
+        if size >= 5:
+            first = slice(lookback - size, len(closes) - size + 1)
+            high_first, low_first = highs[first], lows[first]
+            flags["triangle"] = ((highs[cur] - high_first) < 0) & ((lows[cur] - low_first) > 0)
+            high_window, low_window = tail(highs, size), tail(lows, size)
+            high_max, high_min = high_window.max(axis=1), high_window.min(axis=1)
+            low_max, low_min = low_window.max(axis=1), low_window.min(axis=1)
+            flags["ascending_triangle"] = (np.abs(high_max - high_min) <= high_max * 0.01) & (
+                lows[cur] > low_first
+            )
+            flags["descending_triangle"] = (
+                np.abs(low_max - low_min) <= np.maximum(1.0, low_max) * 0.01
+            ) & (highs[cur] < high_first)
+        else:
+            flags["triangle"] = flags["ascending_triangle"] = false
+            flags["descending_triangle"] = false
+
+        if size >= 10:
+            base = lookback - size
+            start = closes[base : base + count]
+            fifth = closes[base + 4 : base + 4 + count]
+            sixth = closes[base + 5 : base + 5 + count]
+            up_move = np.where(start != 0, (fifth - start) / np.abs(start), 0.0)
+            consolidation = np.abs(
+                np.where(sixth != 0, (closes[cur] - sixth) / np.abs(sixth), 0.0)
+            )
+            flags["flag"] = (np.abs(up_move) > 0.05) & (consolidation < 0.01)
+        else:
+            flags["flag"] = false
+
+        if min(12, lookback) >= 6:
+            sixth_last = slice(lookback - 6, len(closes) - 5)
+            flags["pennant"] = ((highs[cur] - highs[sixth_last]) < 0) & (
+                (lows[cur] - lows[sixth_last]) > 0
+            )
+        else:
+            flags["pennant"] = false
+
+        if size >= 6:
+            high_slope = (highs[cur] - high_first) / size
+            low_slope = (lows[cur] - low_first) / size
+            flags["channel"] = np.abs(high_slope - low_slope) <= 0.02 * np.maximum(
+                1.0, np.abs(high_slope)
+            )
+        else:
+            flags["channel"] = false
+
+    return flags
+
+
+def analyze_patterns_series(arrays: Mapping[str, np.ndarray], lookback: int) -> np.ndarray:
+    """
+    Pattern flags for every candle of a series in one pass.
+
+    `arrays` holds open/high/low/close columns. Row i of the returned
+    (N x len(PATTERN_NAMES)) boolean matrix equals
+    analyze_patterns(candles[max(0, i - lookback + 1) : i + 1]); the first
+    lookback - 1 rows (partial windows) go through the scalar detectors.
+    """
+
+    if lookback < 1:
+        raise ValueError("lookback must be >= 1")
+    opens, highs, lows, closes = (
+        np.asarray(arrays[key], dtype=np.float64) for key in ("open", "high", "low", "close")
+    )
+    total = len(closes)
+    out = np.zeros((total, len(PATTERN_NAMES)), dtype=bool)
+
+    head = min(total, lookback - 1)
+    if head:
+        candles = [
+            {"open": o, "high": h, "low": l, "close": c}
+            for o, h, l, c in zip(
+                opens[:head].tolist(), highs[:head].tolist(), lows[:head].tolist(), closes[:head].tolist()
+            )
+        ]
+        for idx in range(head):
+            patterns = analyze_patterns(candles[: idx + 1])
+            out[idx] = [bool(patterns.get(name)) for name in PATTERN_NAMES]
+
+    if total >= lookback:
+        flags = _series_flags(opens, highs, lows, closes, lookback)
+        for col, name in enumerate(PATTERN_NAMES):
+            out[lookback - 1 :, col] = flags[name]
+    return out
+
+
 __all__ = [
+    "PATTERN_NAMES",
     "analyze_patterns",
+    "analyze_patterns_series",
     "detect_bearish_engulfing",
     "detect_bullish_engulfing",
     "detect_double_bottom",
@@ -4,8 +4,10 @@ Runtime ML signal service for the trading engine.
 
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 
@@ -13,6 +15,8 @@ from .dataset import load_candles_from_mongo, _window_features  # type: ignore
 from .model_store import load_model, MODELS_DIR
 from .patterns import analyze_patterns
 from .features import compute_indicator_set, INDICATOR_KEYS
+from .signal_cache import SignalCache
+from utils.candle_time import bar_open_time, interval_to_ms
 from utils.pattern_helpers import classify_pattern, infer_bias
 
 
@@ -36,6 +40,12 @@ class MLSignalService:
         self.pattern_stop_pct = pattern_stop_pct
         self.pattern_horizon = pattern_horizon
         self.context_days = context_days
+        # Optional in-memory candle source (e.g. the streaming CandleAggregator)
+        self.candle_source: Optional[Any] = None
+        # Read MongoDB when the source holds fewer than `lookback` candles
+        self.mongo_fallback = True
+        # Optional cache shared with other bots evaluating the same model
+        self.signal_cache: Optional[SignalCache] = None
 
         path = Path(model_path)
         if not path.is_absolute():
@@ -46,21 +56,114 @@ class MLSignalService:
             raise FileNotFoundError(f"Model not found at {path}")
 
         self.pattern_models: Dict[str, Any] = {}
+        artifacts = [path]
         if pattern_models:
             for pattern, model_path in pattern_models.items():
-                model = load_model(model_path if Path(model_path).is_absolute() else str((MODELS_DIR / model_path).resolve()))
+                resolved = model_path if Path(model_path).is_absolute() else str((MODELS_DIR / model_path).resolve())
+                model = load_model(resolved)
                 if model:
                     self.pattern_models[pattern] = model
-
-    def evaluate_signal(self) -> Dict[str, Any]:
-        candles = load_candles_from_mongo(
-            limit=max(
-                self.lookback + 20,
-                int(self.context_days * 96) + 20,
-            ),
+                    artifacts.append(Path(resolved))
+        self.model_id = self._fingerprint(artifacts)
+
+    def _fingerprint(self, artifacts: List[Path]) -> str:
+        """Identify the models and settings that determine a signal"""
+
+        parts: List[Any] = []
+        for artifact in artifacts:
+            try:
+                stat = artifact.stat()
+                parts.append([artifact.name, stat.st_size, int(stat.st_mtime)])
+            except OSError:
+                parts.append([artifact.name])
+        parts.append(
+            [
+                sorted(self.pattern_models),
+                self.lookback,
+                self.context_days,
+                self.pattern_gain_pct,
+                self.pattern_stop_pct,
+                self.pattern_horizon,
+            ]
+        )
+        digest = hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+        return f"{artifacts[0].stem}-{digest[:12]}"
+
+    @property
+    def history_limit(self) -> int:
+        return max(self.lookback + 20, int(self.context_days * 96) + 20)
+
+    def attach_candle_source(self, source: Any, seed: bool = True) -> None:
+        """
+        Read candles from `source.closed_candles(symbol, timeframe, limit)`.
+
+        The source is seeded once with the latest stored candles so the
+        context window is available immediately; after that evaluations do
+        not touch MongoDB. With `seed=False` (replayed history, where the
+        stored candles lie in the future) MongoDB is never read.
+        """
+
+        if seed:
+            history = load_candles_from_mongo(
+                limit=self.history_limit,
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+                latest=True,
+            )
+            source.seed(self.symbol, self.timeframe, history)
+        self.candle_source = source
+        self.mongo_fallback = seed
+
+    def _recent_candles(self) -> List[Dict[str, Any]]:
+        if self.candle_source is not None:
+            candles = self.candle_source.closed_candles(
+                self.symbol, self.timeframe, self.history_limit
+            )
+            if len(candles) >= self.lookback or not self.mongo_fallback:
+                return candles
+        return load_candles_from_mongo(
+            limit=self.history_limit,
             symbol=self.symbol,
             timeframe=self.timeframe,
+            latest=True,
         )
+
+    def evaluate_cached(self, bar: int) -> Dict[str, Any]:
+        """
+        Signal for the candle that opened at `bar`, shared through
+        `signal_cache` when one is attached (blocking; run off the loop).
+
+        Results computed from lagging data (latest candle older than `bar`)
+        are returned but not shared.
+        """
+
+        if self.signal_cache is None:
+            return self.evaluate_signal(bar)
+        key = SignalCache.key(self.symbol, self.timeframe, self.model_id, bar)
+        return self.signal_cache.get_or_compute(
+            key,
+            lambda: self.evaluate_signal(bar),
+            shareable=lambda signal: signal.get("timestamp") == bar,
+        )
+
+    def evaluate_signal(self, bar: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Evaluate the models on the latest candles.
+
+        With `bar`, candles opened after it (e.g. a still-forming candle
+        saved by the collector) are ignored, so the result depends only on
+        candles up to `bar`. Labels are floored to the bar open first: the
+        Hyperliquid collector stores the close time as open_time. The
+        returned `timestamp` is the bar open of the latest candle used.
+        """
+
+        interval_ms = interval_to_ms(self.timeframe)
+        candles = self._recent_candles()
+        if bar is not None:
+            end = len(candles)
+            while end and bar_open_time(candles[end - 1]["open_time"], interval_ms) > bar:
+                end -= 1
+            candles = candles[:end]
         if len(candles) < self.lookback:
             raise ValueError("Not enough candles to evaluate ML signal")
 
@@ -101,7 +204,7 @@ class MLSignalService:
             "probability": float(probability),
             "patterns": patterns,
             "pattern_predictions": pattern_predictions,
-            "timestamp": candles[-1]["open_time"],
+            "timestamp": bar_open_time(candles[-1]["open_time"], interval_ms),
             "context_days": self.context_days,
             "context_summary": context_summary,
             "indicator_snapshot": indicators,
@@ -0,0 +1,269 @@
+"""
+Shared cache for ML signal evaluations.
+
+A signal is a pure function of (symbol, timeframe, model id, candle
+open_time), so bots running the same model on the same market can share
+one evaluation. Lookups go through a process-local LRU first, then a
+shared backend (Redis). On a miss a short-lived lock elects one process to
+compute while the others wait for its result.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_NAMESPACE = "ml:signal"
+
+SignalKey = Tuple[str, str, str, int]
+
+
+def _to_builtin(value: Any) -> Any:
+    # numpy scalars (np.float64, np.bool_) in indicator snapshots
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class InMemoryRedis:
+    """
+    Minimal thread-safe stand-in for the Redis commands the cache uses
+    (get / set with ex and nx / delete). Useful in tests and to share
+    results between bots running in one process.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name: str) -> Optional[str]:
+        item = self._data.get(name)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._data[name]
+            return None
+        return value
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            return self._live(name)
+
+    def set(
+        self, name: str, value: str, ex: Optional[float] = None, nx: bool = False
+    ) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(name) is not None:
+                return None
+            expires_at = self._clock() + ex if ex else None
+            self._data[name] = (value, expires_at)
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+
+class SignalCache:
+    """
+    Two-tier signal cache: local LRU in front of a shared backend.
+
+    Backend errors never fail an evaluation: the cache falls back to the
+    local tier and retries the backend after `retry_after` seconds.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        local_size: int = 256,
+        ttl: int = 6 * 3600,
+        lock_timeout: float = 30.0,
+        poll_interval: float = 0.05,
+        retry_after: float = 30.0,
+        namespace: str = DEFAULT_NAMESPACE,
+    ):
+        self.backend = backend
+        self.local_size = local_size
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.retry_after = retry_after
+        self.namespace = namespace
+
+        self._local: "OrderedDict[SignalKey, Dict[str, Any]]" = OrderedDict()
+        self._local_lock = threading.Lock()
+        self._backend_down_until = 0.0
+
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.computes = 0
+        self.waits = 0
+        self.backend_errors = 0
+
+    @staticmethod
+    def key(symbol: str, timeframe: str, model_id: str, open_time: int) -> SignalKey:
+        return (symbol, timeframe, model_id, int(open_time))
+
+    def _name(self, key: SignalKey) -> str:
+        return f"{self.namespace}:{':'.join(str(part) for part in key)}"
+
+    # ------------------------------------------------------------------ backend
+
+    def _backend_call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        if self.backend is None or time.monotonic() < self._backend_down_until:
+            return None
+        try:
+            return getattr(self.backend, method)(*args, **kwargs)
+        except Exception as exc:
+            self.backend_errors += 1
+            self._backend_down_until = time.monotonic() + self.retry_after
+            print(f"⚠️ Signal cache backend unavailable, using local cache only: {exc}")
+            return None
+
+    @property
+    def backend_available(self) -> bool:
+        return self.backend is not None and time.monotonic() >= self._backend_down_until
+
+    def _fetch_remote(self, key: SignalKey) -> Optional[Dict[str, Any]]:
+        raw = self._backend_call("get", self._name(key))
+        if raw is None:
+            return None
+        try:
+            value = json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        self._store_local(key, value)
+        return value
+
+    # ------------------------------------------------------------------ local tier
+
+    def _get_local(self, key: SignalKey) -> Optional[Dict[str, Any]]:
+        with self._local_lock:
+            value = self._local.get(key)
+            if value is not None:
+                self._local.move_to_end(key)
+            return value
+
+    def _store_local(self, key: SignalKey, value: Dict[str, Any]) -> None:
+        with self._local_lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    # ------------------------------------------------------------------ public API
+
+    def get(self, key: SignalKey) -> Optional[Dict[str, Any]]:
+        value = self._get_local(key)
+        if value is not None:
+            self.local_hits += 1
+            return value
+        value = self._fetch_remote(key)
+        if value is not None:
+            self.remote_hits += 1
+        return value
+
+    def set(self, key: SignalKey, value: Dict[str, Any]) -> None:
+        self._store_local(key, value)
+        payload = json.dumps(value, default=_to_builtin)
+        self._backend_call("set", self._name(key), payload, ex=self.ttl)
+
+    def get_or_compute(
+        self,
+        key: SignalKey,
+        compute: Callable[[], Dict[str, Any]],
+        shareable: Callable[[Dict[str, Any]], bool] = lambda _value: True,
+    ) -> Dict[str, Any]:
+        """
+        Return the cached signal for `key` or compute it once.
+
+        Blocking (waits on other processes), so call it off the event loop.
+        Results rejected by `shareable` are returned but not cached.
+        """
+
+        value = self.get(key)
+        if value is not None:
+            return value
+        self.misses += 1
+
+        lock_name = f"{self._name(key)}:lock"
+        token = uuid.uuid4().hex
+        owns_lock = bool(
+            self._backend_call("set", lock_name, token, ex=int(self.lock_timeout) or 1, nx=True)
+        )
+        if not owns_lock and self.backend_available:
+            value = self._wait_for(key)
+            if value is not None:
+                return value
+
+        try:
+            value = compute()
+            self.computes += 1
+            if shareable(value):
+                self.set(key, value)
+            return value
+        finally:
+            if owns_lock and self._backend_call("get", lock_name) == token:
+                self._backend_call("delete", lock_name)
+
+    def _wait_for(self, key: SignalKey) -> Optional[Dict[str, Any]]:
+        """Poll for another process's result until its lock would expire"""
+
+        self.waits += 1
+        deadline = time.monotonic() + self.lock_timeout
+        lock_name = f"{self._name(key)}:lock"
+        while time.monotonic() < deadline and self.backend_available:
+            value = self._fetch_remote(key)
+            if value is not None:
+                self.remote_hits += 1
+                return value
+            if self._backend_call("get", lock_name) is None:
+                return None  # holder gave up without publishing
+            time.sleep(self.poll_interval)
+        return None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "backend_available": self.backend_available,
+            "local_entries": len(self._local),
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "computes": self.computes,
+            "waits": self.waits,
+            "backend_errors": self.backend_errors,
+        }
+
+
+def create_signal_cache(config: Optional[Dict[str, Any]] = None) -> Optional[SignalCache]:
+    """
+    Build a cache from the `ml.signal_cache` config section.
+
+    backend: "redis" (REDIS_URL), "memory" (this process only) or "local"
+    (LRU only); defaults to redis when REDIS_URL is set. Returns None when
+    disabled.
+    """
+
+    config = dict(config or {})
+    if not config.pop("enabled", True):
+        return None
+    backend_name = config.pop("backend", "redis" if os.getenv("REDIS_URL") else "local")
+    backend: Optional[Any] = None
+    if backend_name == "redis":
+        from infrastructure.db import get_redis_client
+
+        backend = get_redis_client()
+    elif backend_name == "memory":
+        backend = InMemoryRedis()
+    elif backend_name != "local":
+        raise ValueError(f"Unknown signal cache backend: {backend_name}")
+    return SignalCache(backend=backend, **config)
@@ -8,7 +8,6 @@ import argparse
 from datetime import datetime, timezone
 from typing import Any, Dict, Tuple
 
-import numpy as np
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.model_selection import train_test_split
@@ -24,21 +23,19 @@ def train_model(config: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
     Train a simple classifier using logistic regression.
     """
 
-    candles = dataset.load_candles_from_mongo(
+    candles = dataset.load_candles(
         limit=config.get("max_candles", 80000),
         symbol=config.get("symbol", "BTC"),
         timeframe=config.get("timeframe", "15m"),
+        source=config.get("candle_source"),
     )
-    X, y = dataset.build_supervised_dataset(
+    X_arr, y_arr = dataset.build_supervised_arrays(
         candles,
         lookback=config["lookback"],
         prediction_horizon=config["prediction_horizon"],
         target_return_pct=config.get("target_return_pct", 0.003),
     )
 
-    X_arr = np.array(X, dtype=float)
-    y_arr = np.array(y, dtype=float)
-
     X_train, X_test, y_train, y_test = train_test_split(
         X_arr, y_arr, test_size=0.2, shuffle=False
     )
@@ -83,6 +80,11 @@ def run_cli() -> None:
     parser.add_argument("--max-candles", type=int, default=80000)
     parser.add_argument("--symbol", type=str, default="BTC")
     parser.add_argument("--timeframe", type=str, default="15m")
+    parser.add_argument(
+        "--candle-source",
+        choices=["mongo", "store"],
+        help="Read candles from MongoDB or the local candle store (default: CANDLE_SOURCE env)",
+    )
     parser.add_argument("--output", type=str, help="Optional explicit model path")
     args = parser.parse_args()
 
@@ -94,6 +96,7 @@ def run_cli() -> None:
             "max_candles": args.max_candles,
             "symbol": args.symbol,
             "timeframe": args.timeframe,
+            "candle_source": args.candle_source,
         }
     )
 
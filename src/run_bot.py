@@ -25,6 +25,7 @@ sys.path.append(str(Path(__file__).parent))
 
 from core.engine import TradingEngine
 from core.enhanced_config import EnhancedBotConfig
+from core.supervisor import BotSupervisor
 
 
 class GridTradingBot:
@@ -86,109 +87,182 @@ class GridTradingBot:
 
     def _convert_config(self) -> dict:
         """Convert EnhancedBotConfig to engine config format"""
+        return build_engine_config(self.config)
 
-        testnet = os.getenv("HYPERLIQUID_TESTNET", "true").lower() == "true"
-
-        # Calculate total allocation in USD from account balance percentage
-        # Note: This is a simplified approach - in production, you'd get actual account balance
-        # For now, using a default base amount of $1000 USD
-        base_allocation_usd = 1000.0
-        total_allocation_usd = base_allocation_usd * (
-            self.config.account.max_allocation_pct / 100.0
-        )
-
-        ml_model_path = os.getenv("ML_MODEL_PATH")
-        pattern_models_env = os.getenv("ML_PATTERN_MODELS")
-        pattern_models = {}
-        if pattern_models_env:
-            entries = [item.strip() for item in pattern_models_env.split(";") if item.strip()]
-            for entry in entries:
-                if "=" not in entry:
-                    continue
-                name, path = entry.split("=", 1)
-                pattern_models[name.strip()] = path.strip()
-
-        def parse_float_list(env_name: str, default: List[float]) -> List[float]:
-            value = os.getenv(env_name)
-            if not value:
-                return default
-            parts = [item.strip() for item in value.split(",") if item.strip()]
-            return [float(p) for p in parts] if parts else default
-
-        ml_config = {
-            "enabled": bool(ml_model_path),
-            "model_path": ml_model_path,
-            "lookback": int(os.getenv("ML_LOOKBACK", "48")),
-            "enter_threshold": float(os.getenv("ML_ENTER_THRESHOLD", "0.6")),
-            "exit_threshold": float(os.getenv("ML_EXIT_THRESHOLD", "0.4")),
-            "eval_interval": int(os.getenv("ML_EVAL_INTERVAL", "60")),
-            "pattern_models": pattern_models,
-            "pattern_gain_pct": float(os.getenv("ML_PATTERN_GAIN_PCT", "0.05")),
-            "pattern_stop_pct": float(os.getenv("ML_PATTERN_STOP_PCT", "0.05")),
-            "pattern_horizon": int(os.getenv("ML_PATTERN_HORIZON", "4")),
-            "context_days": int(os.getenv("ML_CONTEXT_DAYS", "7")),
-            "pattern_confirmation": int(os.getenv("ML_PATTERN_CONFIRMATIONS", "2")),
-            "indicator_filter": {
-                "enabled": os.getenv("ML_FILTER_ENABLED", "false").lower() == "true",
-                "rsi_buy_min": float(os.getenv("ML_FILTER_RSI_BUY_MIN", "55")),
-                "rsi_sell_max": float(os.getenv("ML_FILTER_RSI_SELL_MAX", "45")),
-                "macd_margin": float(os.getenv("ML_FILTER_MACD_MARGIN", "0.0")),
-                "ema_ratio_buffer": float(os.getenv("ML_FILTER_EMA_RATIO_BUFFER", "0.0")),
-                "volume_ratio_min": float(os.getenv("ML_FILTER_VOLUME_RATIO_MIN", "0.0")),
-                "bb_width_min": float(os.getenv("ML_FILTER_BB_WIDTH_MIN", "0.0")),
-            },
-        }
-        momentum_config = {
-            "window_minutes": int(os.getenv("MOMENTUM_WINDOW_MINUTES", "720")),
-            "drop_thresholds": parse_float_list(
-                "MOMENTUM_DROP_THRESHOLDS", [0.05, 0.10]
+
+def build_engine_config(config: EnhancedBotConfig) -> dict:
+    """Convert EnhancedBotConfig to engine config format"""
+
+    testnet = os.getenv("HYPERLIQUID_TESTNET", "true").lower() == "true"
+
+    # Calculate total allocation in USD from account balance percentage
+    # Note: This is a simplified approach - in production, you'd get actual account balance
+    # For now, using a default base amount of $1000 USD
+    base_allocation_usd = 1000.0
+    total_allocation_usd = base_allocation_usd * (
+        config.account.max_allocation_pct / 100.0
+    )
+
+    ml_model_path = os.getenv("ML_MODEL_PATH")
+    pattern_models_env = os.getenv("ML_PATTERN_MODELS")
+    pattern_models = {}
+    if pattern_models_env:
+        entries = [item.strip() for item in pattern_models_env.split(";") if item.strip()]
+        for entry in entries:
+            if "=" not in entry:
+                continue
+            name, path = entry.split("=", 1)
+            pattern_models[name.strip()] = path.strip()
+
+    def parse_float_list(env_name: str, default: List[float]) -> List[float]:
+        value = os.getenv(env_name)
+        if not value:
+            return default
+        parts = [item.strip() for item in value.split(",") if item.strip()]
+        return [float(p) for p in parts] if parts else default
+
+    ml_config = {
+        "enabled": bool(ml_model_path),
+        "model_path": ml_model_path,
+        "lookback": int(os.getenv("ML_LOOKBACK", "48")),
+        "enter_threshold": float(os.getenv("ML_ENTER_THRESHOLD", "0.6")),
+        "exit_threshold": float(os.getenv("ML_EXIT_THRESHOLD", "0.4")),
+        "eval_interval": int(os.getenv("ML_EVAL_INTERVAL", "60")),
+        "pattern_models": pattern_models,
+        "pattern_gain_pct": float(os.getenv("ML_PATTERN_GAIN_PCT", "0.05")),
+        "pattern_stop_pct": float(os.getenv("ML_PATTERN_STOP_PCT", "0.05")),
+        "pattern_horizon": int(os.getenv("ML_PATTERN_HORIZON", "4")),
+        "context_days": int(os.getenv("ML_CONTEXT_DAYS", "7")),
+        "pattern_confirmation": int(os.getenv("ML_PATTERN_CONFIRMATIONS", "2")),
+        "indicator_filter": {
+            "enabled": os.getenv("ML_FILTER_ENABLED", "false").lower() == "true",
+            "rsi_buy_min": float(os.getenv("ML_FILTER_RSI_BUY_MIN", "55")),
+            "rsi_sell_max": float(os.getenv("ML_FILTER_RSI_SELL_MAX", "45")),
+            "macd_margin": float(os.getenv("ML_FILTER_MACD_MARGIN", "0.0")),
+            "ema_ratio_buffer": float(os.getenv("ML_FILTER_EMA_RATIO_BUFFER", "0.0")),
+            "volume_ratio_min": float(os.getenv("ML_FILTER_VOLUME_RATIO_MIN", "0.0")),
+            "bb_width_min": float(os.getenv("ML_FILTER_BB_WIDTH_MIN", "0.0")),
+        },
+    }
+    momentum_config = {
+        "window_minutes": int(os.getenv("MOMENTUM_WINDOW_MINUTES", "720")),
+        "drop_thresholds": parse_float_list(
+            "MOMENTUM_DROP_THRESHOLDS", [0.05, 0.10]
+        ),
+        "rally_thresholds": parse_float_list(
+            "MOMENTUM_RALLY_THRESHOLDS", [0.05, 0.10]
+        ),
+        "bucket_seconds": float(os.getenv("MOMENTUM_BUCKET_SECONDS", "1")),
+    }
+    paper_trading = os.getenv("PAPER_TRADING", "false").lower() == "true"
+    paper_cfg = {
+        "enabled": paper_trading,
+        "initial_balance": float(os.getenv("PAPER_INITIAL_BALANCE", "100.0")),
+    }
+
+    return {
+        "exchange": {
+            "type": config.exchange.type,
+            "testnet": config.exchange.testnet,
+        },
+        "strategy": {
+            "type": "basic_grid",  # Default to basic grid
+            "symbol": config.grid.symbol,
+            "timeframe": getattr(config.grid, "timeframe", "15m"),
+            "levels": config.grid.levels,
+            "range_pct": config.grid.price_range.auto.range_pct,
+            "total_allocation": total_allocation_usd,
+            "rebalance_threshold_pct": config.risk_management.rebalance.price_move_threshold_pct,
+            "take_profit_pct": float(os.getenv("GRID_TAKE_PROFIT_PCT", "0.05")),
+            "stop_loss_pct": float(os.getenv("GRID_STOP_LOSS_PCT", "0.05")),
+            "max_usd_per_trade": float(os.getenv("GRID_MAX_USD", str(total_allocation_usd))),
+            "momentum": momentum_config,
+        },
+        "bot_config": {
+            # Pass through the entire config so KeyManager can look for bot-specific keys
+            "name": config.name,
+            "private_key_file": getattr(config, "private_key_file", None),
+            "testnet_key_file": getattr(config, "testnet_key_file", None),
+            "mainnet_key_file": getattr(config, "mainnet_key_file", None),
+            "private_key": getattr(config, "private_key", None),
+            "testnet_private_key": getattr(
+                config, "testnet_private_key", None
             ),
-            "rally_thresholds": parse_float_list(
-                "MOMENTUM_RALLY_THRESHOLDS", [0.05, 0.10]
+            "mainnet_private_key": getattr(
+                config, "mainnet_private_key", None
             ),
-        }
-        paper_trading = os.getenv("PAPER_TRADING", "false").lower() == "true"
-        paper_cfg = {
-            "enabled": paper_trading,
-            "initial_balance": float(os.getenv("PAPER_INITIAL_BALANCE", "100.0")),
-        }
-
-        return {
-            "exchange": {
-                "type": self.config.exchange.type,
-                "testnet": self.config.exchange.testnet,
-            },
-            "strategy": {
-                "type": "basic_grid",  # Default to basic grid
-                "symbol": self.config.grid.symbol,
-                "timeframe": getattr(self.config.grid, "timeframe", "15m"),
-                "levels": self.config.grid.levels,
-                "range_pct": self.config.grid.price_range.auto.range_pct,
-                "total_allocation": total_allocation_usd,
-                "rebalance_threshold_pct": self.config.risk_management.rebalance.price_move_threshold_pct,
-                "take_profit_pct": float(os.getenv("GRID_TAKE_PROFIT_PCT", "0.05")),
-                "stop_loss_pct": float(os.getenv("GRID_STOP_LOSS_PCT", "0.05")),
-                "max_usd_per_trade": float(os.getenv("GRID_MAX_USD", str(total_allocation_usd))),
-                "momentum": momentum_config,
-            },
-            "bot_config": {
-                # Pass through the entire config so KeyManager can look for bot-specific keys
-                "name": self.config.name,
-                "private_key_file": getattr(self.config, "private_key_file", None),
-                "testnet_key_file": getattr(self.config, "testnet_key_file", None),
-                "mainnet_key_file": getattr(self.config, "mainnet_key_file", None),
-                "private_key": getattr(self.config, "private_key", None),
-                "testnet_private_key": getattr(
-                    self.config, "testnet_private_key", None
-                ),
-                "mainnet_private_key": getattr(
-                    self.config, "mainnet_private_key", None
-                ),
-            },
-            "log_level": self.config.monitoring.log_level,
-            "ml": ml_config,
-            "paper": paper_cfg,
-        }
+        },
+        "log_level": config.monitoring.log_level,
+        "ml": ml_config,
+        "paper": paper_cfg,
+    }
+
+
+class MultiBotRunner:
+    """
+    Runs every active config in one process
+
+    Bots share one market data WebSocket and one exchange connection per
+    account (see BotSupervisor) instead of one process each.
+    """
+
+    def __init__(self, config_paths: List[Path]):
+        self.config_paths = config_paths
+        self.supervisor: Optional[BotSupervisor] = None
+
+        # Setup signal handlers
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+    def _signal_handler(self, signum, frame):
+        """Handle shutdown signals"""
+        print(f"\n📡 Received signal {signum}, shutting down...")
+        if self.supervisor:
+            asyncio.create_task(self.supervisor.stop())
+
+    async def run(self) -> None:
+        """Run all bots"""
+
+        configs = {}
+        for path in self.config_paths:
+            try:
+                config = EnhancedBotConfig.from_yaml(path)
+                configs[config.name] = build_engine_config(config)
+                print(f"✅ Configuration loaded: {config.name}")
+            except Exception as e:
+                print(f"⚠️ Skipping {path.name}: {e}")
+
+        self.supervisor = BotSupervisor(configs)
+        try:
+            if not await self.supervisor.initialize():
+                print("❌ No bot could be initialized")
+                return
+            print(f"🚀 Starting {len(self.supervisor.engines)} bots")
+            await self.supervisor.run()
+        except KeyboardInterrupt:
+            print("\n📡 Keyboard interrupt received")
+        finally:
+            await self.supervisor.stop()
+
+
+def find_active_configs() -> List[Path]:
+    """Find every active config in the bots folder"""
+
+    bots_dir = Path(__file__).parent.parent / "bots"
+    if not bots_dir.exists():
+        return []
+
+    active = []
+    yaml_files = list(bots_dir.glob("*.yaml")) + list(bots_dir.glob("*.yml"))
+    for yaml_file in sorted(yaml_files):
+        try:
+            with open(yaml_file, "r") as f:
+                data = yaml.safe_load(f)
+            if data and data.get("active", False):
+                active.append(yaml_file)
+        except Exception as e:
+            print(f"⚠️ Error reading {yaml_file.name}: {e}")
+    return active
 
 
 def find_first_active_config() -> Optional[Path]:
@@ -232,9 +306,23 @@ async def main():
     parser.add_argument(
         "--validate", action="store_true", help="Validate configuration only"
     )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Run every active config in bots/ in one process with a shared feed",
+    )
 
     args = parser.parse_args()
 
+    if args.all:
+        config_paths = find_active_configs()
+        if not config_paths:
+            print("❌ No active config found in bots/ folder")
+            return 1
+        print(f"📁 Found {len(config_paths)} active configs")
+        await MultiBotRunner(config_paths).run()
+        return 0
+
     # Determine config file
     config_path = None
     if args.config:
@@ -7,8 +7,7 @@ This is the main business logic for grid trading.
 
 import logging
 import time
-from collections import deque
-from typing import List, Dict, Optional, Any, Deque
+from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
@@ -25,6 +24,7 @@ from utils.pattern_helpers import (
     classify_pattern,
     infer_bias,
 )
+from utils.rolling_window import RollingExtrema
 
 
 class GridState(Enum):
@@ -108,7 +108,11 @@ class BasicGridStrategy(TradingStrategy):
         self.momentum_rally_thresholds = self._prepare_thresholds(
             momentum_cfg.get("rally_thresholds", [0.05, 0.10])
         )
-        self.price_history: Deque[tuple[float, float]] = deque()
+        # Per-second highs/lows: O(1) per tick, memory bounded by the window
+        self.price_window = RollingExtrema(
+            self.momentum_window_minutes * 60,
+            bucket_seconds=float(momentum_cfg.get("bucket_seconds", 1.0)),
+        )
         self.short_term_bias: Optional[str] = None
         self.last_momentum_event: Optional[str] = None
 
@@ -493,17 +497,12 @@ class BasicGridStrategy(TradingStrategy):
         price = market_data.price
         if price <= 0:
             return
-        window_seconds = self.momentum_window_minutes * 60
-        self.price_history.append((timestamp, price))
-        cutoff = timestamp - window_seconds
-        while self.price_history and self.price_history[0][0] < cutoff:
-            self.price_history.popleft()
-        if len(self.price_history) < 2:
+        self.price_window.add(timestamp, price)
+        if len(self.price_window) < 2:
             self.short_term_bias = None
             return
-        prices = [p for _, p in self.price_history]
-        max_price = max(prices)
-        min_price = min(prices)
+        max_price = self.price_window.max
+        min_price = self.price_window.min
         drop_pct = (max_price - price) / max_price if max_price else 0.0
         rally_pct = (price - min_price) / min_price if min_price else 0.0
 
@@ -0,0 +1,160 @@
+"""
+Backtest a bot config over historical candles.
+
+Runs the real decision path (TradingEngine + strategy + risk manager) on a
+simulated clock against a simulated order book, e.g. a year of 15m BTC:
+
+    PYTHONPATH=src python -m tools.backtest --config bots/btc.yaml --limit 35040
+    PYTHONPATH=src python -m tools.backtest --candles-file btc_15m.jsonl
+    PYTHONPATH=src python -m tools.backtest --synthetic 35040
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.backtest import BacktestResult, run_backtest
+from core.enhanced_config import EnhancedBotConfig
+from run_bot import build_engine_config, find_first_active_config
+
+
+def load_engine_config(path_arg: Optional[str]) -> Dict[str, Any]:
+    config_path = Path(path_arg).expanduser() if path_arg else find_first_active_config()
+    if not config_path or not config_path.exists():
+        raise FileNotFoundError("No bot configuration found (use --config)")
+    return build_engine_config(EnhancedBotConfig.from_yaml(config_path))
+
+
+def read_candles_file(path: str) -> List[Dict[str, Any]]:
+    """JSON array or one candle per line (JSONL), sorted by open_time"""
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        candles = json.loads(text)
+    else:
+        candles = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return sorted(candles, key=lambda c: c["open_time"])
+
+
+def load_backtest_candles(args: argparse.Namespace, symbol: str, timeframe: str) -> List[Dict[str, Any]]:
+    if args.candles_file:
+        return read_candles_file(args.candles_file)
+    if args.synthetic:
+        from tools.benchmarks import synthetic_candles
+        from utils.candle_time import interval_to_ms
+
+        return synthetic_candles(args.synthetic, interval_ms=interval_to_ms(timeframe))
+    from ml.dataset import load_candles_from_mongo
+
+    return load_candles_from_mongo(
+        limit=args.limit, symbol=symbol, timeframe=timeframe, latest=True
+    )
+
+
+def add_backtest_arguments(parser: argparse.ArgumentParser) -> None:
+    """Config, candle source and simulation options (shared with tools.sweep)"""
+
+    parser.add_argument("--config", help="Configuração YAML (default: primeiro arquivo ativo em bots/)")
+    parser.add_argument("--symbol", help="Sobrescreve o símbolo da configuração")
+    parser.add_argument("--timeframe", help="Sobrescreve o timeframe (default: o da configuração)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--candles-file", help="Candles em JSON/JSONL em vez do MongoDB")
+    source.add_argument("--synthetic", type=int, help="Gera N candles sintéticos (random walk)")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=35040,
+        help="Candles mais recentes lidos do MongoDB (default: 35040 = 1 ano de 15m)",
+    )
+    parser.add_argument("--initial-balance", type=float, default=1000.0)
+    parser.add_argument(
+        "--ticks-per-bar",
+        type=int,
+        default=4,
+        help="1 = só o fechamento; 4+ = caminho abertura/mínima/máxima/fechamento",
+    )
+    parser.add_argument("--maker-fee", type=float, default=0.00015)
+    parser.add_argument("--taker-fee", type=float, default=0.00045)
+    parser.add_argument("--log-level", default="ERROR", help="Log do engine durante o replay")
+
+
+def prepare_backtest(args: argparse.Namespace) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Engine config (with --symbol/--timeframe applied) and its candles"""
+
+    config = load_engine_config(args.config)
+    strategy = config.setdefault("strategy", {})
+    if args.symbol:
+        strategy["symbol"] = args.symbol
+    if args.timeframe:
+        strategy["timeframe"] = args.timeframe
+    symbol, timeframe = strategy.get("symbol", "BTC"), strategy.get("timeframe", "15m")
+
+    candles = load_backtest_candles(args, symbol, timeframe)
+    if candles:
+        print(f"📥 {len(candles)} candles {symbol} {timeframe} carregados")
+    else:
+        print(f"❌ Nenhum candle encontrado para {symbol} {timeframe}")
+    return config, candles
+
+
+def backtest_options(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "initial_balance": args.initial_balance,
+        "ticks_per_bar": args.ticks_per_bar,
+        "maker_fee": args.maker_fee,
+        "taker_fee": args.taker_fee,
+        "log_level": args.log_level,
+    }
+
+
+def _format_time(open_time: Optional[int]) -> str:
+    if open_time is None:
+        return "-"
+    return datetime.fromtimestamp(open_time / 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def print_result(result: BacktestResult) -> None:
+    print("\n🧪 Backtest concluído")
+    print(
+        f"📅 {result.symbol}: {_format_time(result.start_time)} → {_format_time(result.end_time)} "
+        f"({result.bars} candles, {result.ticks} ticks)"
+    )
+    print(f"💵 Saldo inicial: ${result.initial_balance:.2f}")
+    print(f"📈 Patrimônio final: ${result.final_equity:.2f} ({result.return_pct:+.2f}%)")
+    print(
+        f"📊 PnL realizado: ${result.realized_pnl:.2f} | "
+        f"não realizado: ${result.unrealized_pnl:.2f} | taxas: ${result.fees_paid:.2f}"
+    )
+    print(
+        f"📝 Trades: {result.trades} | ordens: {result.orders_placed} "
+        f"(canceladas: {result.orders_cancelled})"
+    )
+    print(f"📉 Drawdown máximo: {result.max_drawdown_pct:.2f}%")
+    print(f"⏱️ Tempo de execução: {result.elapsed:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backtest da estratégia sobre candles históricos")
+    add_backtest_arguments(parser)
+    parser.add_argument("--output", help="Salva o resultado (com curva de patrimônio) em JSON")
+    args = parser.parse_args()
+
+    config, candles = prepare_backtest(args)
+    if not candles:
+        return
+
+    result = run_backtest(config, candles, **backtest_options(args))
+    print_result(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(include_curve=True), f, indent=2)
+        print(f"🗂 Resultado salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Micro-benchmarks for the data/ML hot paths.
+
+Usage:
+    PYTHONPATH=src python -m tools.benchmarks dataset --candles 100000
+    PYTHONPATH=src python -m tools.benchmarks upsert --candles 50000
+    PYTHONPATH=src python -m tools.benchmarks ws-decode --payload allmids.jsonl
+    PYTHONPATH=src python -m tools.benchmarks momentum --hours 24 --ticks-per-second 2
+    PYTHONPATH=src python -m tools.benchmarks patterns --candles 120000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from ml import dataset
+from ml import patterns
+
+
+def synthetic_candles(
+    count: int, seed: int = 42, start_price: float = 45000.0, interval_ms: int = 900_000
+) -> List[Dict[str, Any]]:
+    """Random-walk 15m candles shaped like the Mongo documents."""
+
+    rng = random.Random(seed)
+    price = start_price
+    candles: List[Dict[str, Any]] = []
+    for idx in range(count):
+        open_price = price
+        close = max(1.0, open_price * (1 + rng.gauss(0, 0.004)))
+        high = max(open_price, close) * (1 + abs(rng.gauss(0, 0.002)))
+        low = min(open_price, close) * (1 - abs(rng.gauss(0, 0.002)))
+        candles.append(
+            {
+                "symbol": "BTC",
+                "timeframe": "15m",
+                "open_time": 1_600_000_000_000 + idx * interval_ms,
+                "open": open_price,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": abs(rng.gauss(100, 30)),
+            }
+        )
+        price = close
+    return candles
+
+
+def synthetic_all_mids(coins: int = 450, seed: int = 7) -> str:
+    """allMids frame shaped like the Hyperliquid feed (perps plus @N spot ids)."""
+
+    rng = random.Random(seed)
+    names = ["BTC", "ETH", "SOL"] + [f"COIN{i}" for i in range(coins // 2)]
+    names += [f"@{i}" for i in range(coins - len(names))]
+    rng.shuffle(names)
+    mids = {name: f"{rng.uniform(0.0001, 100000):.6g}" for name in names}
+    return json.dumps({"channel": "allMids", "data": {"mids": mids}}, separators=(",", ":"))
+
+
+def synthetic_ticks(
+    count: int, seed: int = 11, start_price: float = 45000.0, interval_s: float = 0.5
+) -> List[tuple[float, float]]:
+    """Random-walk (timestamp, price) ticks with jittered spacing."""
+
+    rng = random.Random(seed)
+    timestamp, price = 1_600_000_000.0, start_price
+    ticks: List[tuple[float, float]] = []
+    for _ in range(count):
+        timestamp += rng.uniform(0.0, 2 * interval_s)
+        price = max(1.0, price * (1 + rng.gauss(0, 0.0002)))
+        ticks.append((timestamp, price))
+    return ticks
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_dataset(args: argparse.Namespace) -> None:
+    candles = synthetic_candles(args.candles)
+    print(f"Dataset build: {len(candles)} candles, lookback={args.lookback}, horizon={args.horizon}")
+
+    vec_time, (X, _) = _timed(
+        lambda: dataset.build_supervised_arrays(candles, args.lookback, args.horizon)
+    )
+    print(f"  vectorized: {vec_time:8.2f}s ({len(X)} rows)")
+
+    if args.skip_reference:
+        return
+    ref_time, _ = _timed(
+        lambda: dataset._build_supervised_dataset_loop(candles, args.lookback, args.horizon)
+    )
+    print(f"  per-window: {ref_time:8.2f}s")
+    print(f"  speedup:    {ref_time / max(vec_time, 1e-9):8.1f}x")
+
+
+def bench_patterns(args: argparse.Namespace) -> None:
+    candles = synthetic_candles(args.candles)
+    print(f"Pattern scan: {len(candles)} candles, lookback={args.lookback}")
+
+    vec_time, flags = _timed(
+        lambda: patterns.analyze_patterns_series(dataset.candle_columns(candles), args.lookback)
+    )
+    print(f"  vectorized: {vec_time:8.2f}s ({int(flags.sum())} pattern hits)")
+
+    count = min(args.reference_windows, len(candles))
+    if count <= 0:
+        return
+    lookback = args.lookback
+    ref_time, _ = _timed(
+        lambda: [
+            patterns.analyze_patterns(candles[max(0, idx - lookback + 1) : idx + 1])
+            for idx in range(count)
+        ]
+    )
+    projected = ref_time * len(candles) / count
+    print(f"  per-window: {ref_time:8.2f}s ({count} windows, ~{projected:.2f}s projected)")
+    print(f"  speedup:    {projected / max(vec_time, 1e-9):8.1f}x")
+
+
+def _benchmark_collection(name: str) -> Any:
+    """Scratch collection on MONGO_URI, falling back to mongomock if installed."""
+
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    try:
+        client = MongoClient(uri, serverSelectionTimeoutMS=1000)
+        client.admin.command("ping")
+        print(f"  backend: mongod ({uri})")
+    except PyMongoError:
+        try:
+            import mongomock
+        except ImportError:
+            raise SystemExit("No reachable mongod and mongomock is not installed")
+        client = mongomock.MongoClient()
+        print("  backend: mongomock")
+    collection = client["benchmarks"][name]
+    collection.drop()
+    return collection
+
+
+def bench_upsert(args: argparse.Namespace) -> None:
+    from data_pipeline import collector
+
+    candles = synthetic_candles(args.candles)
+    print(f"Candle upsert: {len(candles)} candles, batch_size={args.batch_size}")
+
+    def per_candle(collection: Any) -> None:
+        for candle in candles:
+            key = {k: candle[k] for k in ("symbol", "timeframe", "open_time")}
+            collection.update_one(key, {"$set": candle}, upsert=True)
+
+    def bulk(collection: Any) -> None:
+        collector.bulk_upsert_candles(candles, collection=collection, batch_size=args.batch_size)
+
+    results = {}
+    for label, fn in (("per-candle", per_candle), ("bulk", bulk)):
+        collection = _benchmark_collection(f"upsert_{label}")
+        fresh, _ = _timed(lambda: fn(collection))
+        rerun, _ = _timed(lambda: fn(collection))
+        results[label] = fresh
+        print(
+            f"  {label:10s}: insert {len(candles) / fresh:10.0f} candles/s, "
+            f"re-upsert {len(candles) / rerun:10.0f} candles/s"
+        )
+        collection.drop()
+    print(f"  speedup:    {results['per-candle'] / max(results['bulk'], 1e-9):8.1f}x")
+
+
+def bench_ws_decode(args: argparse.Namespace) -> None:
+    from exchanges.hyperliquid.market_data import extract_all_mids
+    from utils import json_codec
+
+    if args.payload:
+        with open(args.payload, "r", encoding="utf-8") as f:
+            frames = [line.strip() for line in f if line.strip()]
+    else:
+        frames = [synthetic_all_mids(args.coins, seed) for seed in range(16)]
+    assets = set(args.assets.split(","))
+    total = args.messages
+    print(
+        f"allMids decode: {total} messages, {len(frames)} distinct frames, "
+        f"~{sum(len(f) for f in frames) // len(frames)} bytes each, assets={sorted(assets)}"
+    )
+
+    def full_decode(decode: Callable[[str], Any]) -> Callable[[], None]:
+        def run() -> None:
+            for idx in range(total):
+                mids = decode(frames[idx % len(frames)])["data"]["mids"]
+                for asset, price in mids.items():
+                    if asset in assets:
+                        float(price)
+
+        return run
+
+    def filtered() -> None:
+        for idx in range(total):
+            for price in extract_all_mids(frames[idx % len(frames)], assets).values():
+                float(price)
+
+    cases = [("json.loads + full scan", full_decode(json.loads))]
+    if json_codec.DECODER_NAME != "json":
+        cases.append((f"{json_codec.DECODER_NAME} + full scan", full_decode(json_codec.loads)))
+    cases.append(("subscription filter", filtered))
+
+    baseline = None
+    for label, fn in cases:
+        cpu_start = time.process_time()
+        wall, _ = _timed(fn)
+        cpu = time.process_time() - cpu_start
+        baseline = baseline or wall
+        print(
+            f"  {label:26s}: {total / wall:10.0f} msg/s, "
+            f"{cpu / total * 1e6:8.2f} us CPU/msg, {baseline / wall:6.1f}x"
+        )
+
+
+class _ListScanWindow:
+    """The pre-deque momentum window: append, evict, then max/min over a list."""
+
+    def __init__(self, window_seconds: float):
+        from collections import deque
+
+        self.window_seconds = window_seconds
+        self.history: Any = deque()
+        self.max = self.min = 0.0
+
+    def add(self, timestamp: float, price: float) -> None:
+        self.history.append((timestamp, price))
+        cutoff = timestamp - self.window_seconds
+        while self.history and self.history[0][0] < cutoff:
+            self.history.popleft()
+        prices = [p for _, p in self.history]
+        self.max, self.min = max(prices), min(prices)
+
+    @property
+    def entries(self) -> int:
+        return len(self.history)
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+
+def bench_momentum(args: argparse.Namespace) -> None:
+    from interfaces.strategy import MarketData
+    from strategies.grid.basic_grid import BasicGridStrategy
+
+    total = int(args.hours * 3600 * args.ticks_per_second)
+    ticks = synthetic_ticks(total, interval_s=1.0 / args.ticks_per_second)
+    data = [
+        MarketData(asset="BTC", price=price, volume_24h=0.0, timestamp=timestamp)
+        for timestamp, price in ticks
+    ]
+    print(
+        f"Momentum window: {total} ticks over {args.hours:g}h, "
+        f"window={args.window_minutes} min"
+    )
+
+    def replay(bucket_seconds: float, list_scan: bool, count: int) -> Callable[[], int]:
+        strategy = BasicGridStrategy(
+            {
+                "symbol": "BTC",
+                "levels": 10,
+                "range_pct": 5,
+                "momentum": {
+                    "window_minutes": args.window_minutes,
+                    "bucket_seconds": bucket_seconds,
+                },
+            }
+        )
+        if list_scan:
+            strategy.price_window = _ListScanWindow(args.window_minutes * 60)
+
+        def run() -> int:
+            for md in data[:count]:
+                strategy.generate_signals(md, [], 10_000.0)
+            return strategy.price_window.entries
+
+        return run
+
+    reference = min(total, args.reference_ticks)
+    cases = [
+        (f"list scan (first {reference})", True, 0.0, reference),
+        ("monotonic deques", False, 0.0, total),
+        ("deques + 1s buckets", False, 1.0, total),
+    ]
+    baseline = None
+    for label, list_scan, bucket_seconds, count in cases:
+        if not count:
+            continue
+        wall, entries = _timed(replay(bucket_seconds, list_scan, count))
+        per_tick = wall / count * 1e6
+        baseline = baseline or per_tick
+        print(
+            f"  {label:28s}: {per_tick:8.2f} us/tick, {entries:7d} entries held, "
+            f"{baseline / per_tick:6.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot path benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ds = sub.add_parser("dataset", help="build_supervised_dataset: loop vs vectorized")
+    ds.add_argument("--candles", type=int, default=100_000)
+    ds.add_argument("--lookback", type=int, default=48)
+    ds.add_argument("--horizon", type=int, default=4)
+    ds.add_argument(
+        "--skip-reference", action="store_true", help="Only time the vectorized path"
+    )
+    ds.set_defaults(func=bench_dataset)
+
+    pa = sub.add_parser("patterns", help="candlestick/chart patterns: per-window vs series")
+    pa.add_argument("--candles", type=int, default=120_000)
+    pa.add_argument("--lookback", type=int, default=48)
+    pa.add_argument(
+        "--reference-windows",
+        type=int,
+        default=20_000,
+        help="Windows scanned with the scalar detectors (0 to skip)",
+    )
+    pa.set_defaults(func=bench_patterns)
+
+    up = sub.add_parser("upsert", help="save_candles_to_mongo: update_one vs bulk_write")
+    up.add_argument("--candles", type=int, default=50_000)
+    up.add_argument("--batch-size", type=int, default=1000)
+    up.set_defaults(func=bench_upsert)
+
+    ws = sub.add_parser("ws-decode", help="allMids frame decoding: json vs filtered")
+    ws.add_argument("--payload", help="File with one recorded allMids frame per line")
+    ws.add_argument("--messages", type=int, default=20_000)
+    ws.add_argument("--coins", type=int, default=450, help="Coins per synthetic frame")
+    ws.add_argument("--assets", default="BTC", help="Comma-separated subscribed assets")
+    ws.set_defaults(func=bench_ws_decode)
+
+    mo = sub.add_parser("momentum", help="BasicGridStrategy momentum window: list vs deques")
+    mo.add_argument("--hours", type=float, default=24.0)
+    mo.add_argument("--ticks-per-second", type=float, default=2.0)
+    mo.add_argument("--window-minutes", type=int, default=720)
+    mo.add_argument(
+        "--reference-ticks",
+        type=int,
+        default=20_000,
+        help="Ticks replayed through the quadratic list scan (0 to skip)",
+    )
+    mo.set_defaults(func=bench_momentum)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
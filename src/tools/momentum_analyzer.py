@@ -11,9 +11,9 @@ from datetime import datetime, timezone, timedelta
 from statistics import mean
 from typing import Dict, List, Tuple
 
-from ml.dataset import load_candles_from_mongo
-from ml.features import compute_indicator_set
-from ml.patterns import analyze_patterns
+from ml.dataset import candle_columns, load_candles
+from ml.features import IncrementalIndicators
+from ml.patterns import PATTERN_NAMES, analyze_patterns_series
 
 MOVE_THRESHOLDS = [0.03, 0.05, 0.10]
 DEFAULT_LOOKBACK = 48
@@ -25,7 +25,7 @@ DEFAULT_HORIZON = {
 
 
 def load_recent_candles(symbol: str, timeframe: str, hours: int) -> List[Dict[str, float]]:
-    candles = load_candles_from_mongo(limit=50000, symbol=symbol, timeframe=timeframe)
+    candles = load_candles(limit=50000, symbol=symbol, timeframe=timeframe)
     if not candles:
         return []
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
@@ -51,10 +51,13 @@ def analyze_momentum_context(
         thr: {"up": defaultdict(int), "down": defaultdict(int)} for thr in MOVE_THRESHOLDS
     }
 
+    indicator_engine = IncrementalIndicators.from_candles(
+        candles[: lookback - 1], window=lookback
+    )
+    pattern_rows = analyze_patterns_series(candle_columns(candles), lookback)
     for idx in range(lookback, len(candles) - horizon - 1):
-        window = candles[idx - lookback : idx]
-        indicators = compute_indicator_set(window)
-        patterns = analyze_patterns(window)
+        indicators = indicator_engine.update(candles[idx - 1])
+        active = [PATTERN_NAMES[col] for col in pattern_rows[idx - 1].nonzero()[0]]
         current = candles[idx]["close"]
         future = candles[idx + 1 : idx + 1 + horizon]
         high = max(c["high"] for c in future)
@@ -64,14 +67,12 @@ def analyze_momentum_context(
         for thr in MOVE_THRESHOLDS:
             if up_change >= thr:
                 stats[thr]["up"].append(indicators)
-                for name, flag in patterns.items():
-                    if flag:
-                        pattern_hits[thr]["up"][name] += 1
+                for name in active:
+                    pattern_hits[thr]["up"][name] += 1
             if down_change <= -thr:
                 stats[thr]["down"].append(indicators)
-                for name, flag in patterns.items():
-                    if flag:
-                        pattern_hits[thr]["down"][name] += 1
+                for name in active:
+                    pattern_hits[thr]["down"][name] += 1
 
     summary: Dict[float, Dict[str, Dict[str, object]]] = {}
     for thr in MOVE_THRESHOLDS:
@@ -0,0 +1,398 @@
+"""
+Parameter sweep over the backtester.
+
+Expands a parameter grid (or samples it at random), runs one backtest per
+combination on a process pool and writes a ranked results table. The
+candle series is placed in shared memory once; workers attach to it at
+startup instead of receiving a pickled copy with every task.
+
+    PYTHONPATH=src python -m tools.sweep --config bots/btc_conservative.yaml \\
+        --param levels=5,10,20 --param range_pct=2:10:2 \\
+        --param rebalance_threshold_pct=3,5,8 --output sweep.csv
+    PYTHONPATH=src python -m tools.sweep --space sweep.yaml --random 1000
+
+Parameters are dotted paths into the engine config (strategy.levels,
+risk_management.max_drawdown_pct, ...); the usual grid/momentum knobs have
+short aliases (see PARAM_ALIASES). Values are "a,b,c" lists or inclusive
+"start:stop:step" ranges.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from core.backtest import run_backtest
+
+PARAM_ALIASES = {
+    "levels": "strategy.levels",
+    "range_pct": "strategy.range_pct",
+    "rebalance_threshold_pct": "strategy.rebalance_threshold_pct",
+    "take_profit_pct": "strategy.take_profit_pct",
+    "stop_loss_pct": "strategy.stop_loss_pct",
+    "total_allocation": "strategy.total_allocation",
+    "momentum_window_minutes": "strategy.momentum.window_minutes",
+    "drop_thresholds": "strategy.momentum.drop_thresholds",
+    "rally_thresholds": "strategy.momentum.rally_thresholds",
+    "ml_enter_threshold": "ml.enter_threshold",
+}
+
+CANDLE_FIELDS = ("open_time", "open", "high", "low", "close", "volume")
+
+RANK_METRICS = {
+    # metric -> higher is better
+    "return_pct": True,
+    "total_pnl": True,
+    "calmar": True,
+    "max_drawdown_pct": False,
+}
+
+Combination = Dict[str, Any]
+
+
+# ---------------------------------------------------------------------- parameter space
+
+
+def _parse_scalar(text: str) -> Any:
+    text = text.strip()
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            continue
+    return text
+
+
+def parse_values(spec: Any) -> List[Any]:
+    """'5,10,20' -> [5, 10, 20]; '2:10:2' -> [2, 4, 6, 8, 10]; lists pass through"""
+
+    if isinstance(spec, (list, tuple)):
+        return list(spec)
+    if not isinstance(spec, str):
+        return [spec]
+    if ":" in spec:
+        parts = [_parse_scalar(part) for part in spec.split(":")]
+        if len(parts) != 3 or not all(isinstance(p, (int, float)) for p in parts):
+            raise ValueError(f"Range must be start:stop:step, got {spec!r}")
+        start, stop, step = parts
+        if step <= 0 or stop < start:
+            raise ValueError(f"Invalid range {spec!r}")
+        count = int(round((stop - start) / step)) + 1
+        values = [start + idx * step for idx in range(count)]
+        if all(isinstance(p, int) for p in parts):
+            return values
+        return [round(value, 10) for value in values]
+    return [_parse_scalar(part) for part in spec.split(",") if part.strip()]
+
+
+def parse_space(params: Sequence[str], space: Optional[Dict[str, Any]] = None) -> Dict[str, List[Any]]:
+    """Merge a --space mapping and --param name=values options into path -> values"""
+
+    merged: Dict[str, List[Any]] = {}
+    items = list((space or {}).items())
+    for param in params:
+        if "=" not in param:
+            raise ValueError(f"Expected name=values, got {param!r}")
+        items.append(tuple(param.split("=", 1)))
+    for name, spec in items:
+        values = parse_values(spec)
+        if not values:
+            raise ValueError(f"No values for {name}")
+        merged[PARAM_ALIASES.get(name, name)] = values
+    return merged
+
+
+def space_size(space: Dict[str, List[Any]]) -> int:
+    size = 1
+    for values in space.values():
+        size *= len(values)
+    return size
+
+
+def combination_at(space: Dict[str, List[Any]], index: int) -> Combination:
+    """The index-th combination of the grid (mixed radix, last path fastest)"""
+
+    combo: Combination = {}
+    for path, values in reversed(list(space.items())):
+        index, digit = divmod(index, len(values))
+        combo[path] = values[digit]
+    return dict(reversed(list(combo.items())))
+
+
+def expand_space(
+    space: Dict[str, List[Any]], samples: Optional[int] = None, seed: int = 42
+) -> List[Combination]:
+    """Every combination, or `samples` distinct ones drawn at random"""
+
+    if not space:
+        return [{}]
+    total = space_size(space)
+    if samples is None or samples >= total:
+        paths = list(space)
+        return [dict(zip(paths, values)) for values in itertools.product(*space.values())]
+    indices = random.Random(seed).sample(range(total), samples)
+    return [combination_at(space, index) for index in indices]
+
+
+def apply_params(config: Dict[str, Any], combo: Combination) -> Dict[str, Any]:
+    config = copy.deepcopy(config)
+    for path, value in combo.items():
+        node = config
+        keys = path.split(".")
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    return config
+
+
+# ---------------------------------------------------------------------- shared candles
+
+
+def candles_to_array(candles: Sequence[Dict[str, Any]]) -> np.ndarray:
+    return np.array(
+        [[float(c.get(name, 0.0)) for name in CANDLE_FIELDS] for c in candles],
+        dtype=np.float64,
+    ).reshape(-1, len(CANDLE_FIELDS))
+
+
+def array_to_candles(array: np.ndarray) -> List[Dict[str, Any]]:
+    rows = array.tolist()
+    return [
+        {
+            "open_time": int(row[0]),
+            "open": row[1],
+            "high": row[2],
+            "low": row[3],
+            "close": row[4],
+            "volume": row[5],
+        }
+        for row in rows
+    ]
+
+
+class SharedCandles:
+    """Candle series in a shared memory block, published by the parent"""
+
+    def __init__(self, candles: Sequence[Dict[str, Any]]):
+        array = candles_to_array(candles)
+        self.shape = array.shape
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)[:] = array
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedCandles":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: keep the tracker from unlinking the parent's block
+        from multiprocessing import resource_tracker
+
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+# Worker state, set once per process by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(
+    shm_name: str,
+    shape: Tuple[int, int],
+    config: Dict[str, Any],
+    options: Dict[str, Any],
+) -> None:
+    shm = _attach(shm_name)
+    array = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker.update(
+        candles=array_to_candles(array), config=config, options=options
+    )
+    shm.close()
+
+
+def _run_combination(task: Tuple[int, Combination]) -> Dict[str, Any]:
+    index, combo = task
+    row: Dict[str, Any] = {"id": index, "params": combo}
+    try:
+        config = apply_params(_worker["config"], combo)
+        result = run_backtest(config, _worker["candles"], **_worker["options"])
+        row.update(result.to_dict())
+    except Exception as exc:
+        row["error"] = str(exc)
+    return row
+
+
+# ---------------------------------------------------------------------- sweep
+
+
+def _score(row: Dict[str, Any], metric: str) -> float:
+    if metric == "calmar":
+        return row["return_pct"] / max(row["max_drawdown_pct"], 1.0)
+    return float(row[metric])
+
+
+def rank_results(rows: List[Dict[str, Any]], metric: str = "return_pct") -> List[Dict[str, Any]]:
+    """Best first; failed runs last"""
+
+    higher_is_better = RANK_METRICS[metric]
+    ok = [row for row in rows if "error" not in row]
+    failed = [row for row in rows if "error" in row]
+    for row in ok:
+        row["score"] = _score(row, metric)
+    ok.sort(key=lambda row: row["score"], reverse=higher_is_better)
+    for rank, row in enumerate(ok, start=1):
+        row["rank"] = rank
+    return ok + failed
+
+
+def run_sweep(
+    config: Dict[str, Any],
+    candles: Sequence[Dict[str, Any]],
+    combinations: List[Combination],
+    workers: Optional[int] = None,
+    options: Optional[Dict[str, Any]] = None,
+    progress: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Backtest every combination on a process pool; yields rows as they finish"""
+
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker: cheap dispatch while keeping every core busy
+    chunksize = max(1, len(combinations) // (workers * 8))
+    with SharedCandles(candles) as shared, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(shared.name, shared.shape, config, options or {}),
+    ) as pool:
+        started = time.perf_counter()
+        tasks = list(enumerate(combinations))
+        for done, row in enumerate(pool.map(_run_combination, tasks, chunksize=chunksize), 1):
+            if progress and (done % max(1, len(tasks) // 20) == 0 or done == len(tasks)):
+                elapsed = time.perf_counter() - started
+                print(f"  ⏳ {done}/{len(tasks)} backtests ({done / elapsed:.1f}/s)")
+            yield row
+
+
+def write_results(path: str, rows: List[Dict[str, Any]], paths: List[str]) -> None:
+    metrics = [
+        "return_pct",
+        "total_pnl",
+        "max_drawdown_pct",
+        "trades",
+        "fees_paid",
+        "realized_pnl",
+        "final_equity",
+    ]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", *paths, "score", *metrics, "error"])
+        for row in rows:
+            params = row["params"]
+            writer.writerow(
+                [
+                    row.get("rank", ""),
+                    *(params.get(p) for p in paths),
+                    row.get("score", ""),
+                    *(row.get(m, "") for m in metrics),
+                    row.get("error", ""),
+                ]
+            )
+
+
+def print_table(rows: List[Dict[str, Any]], paths: List[str], top: int) -> None:
+    names = [path.rsplit(".", 1)[-1] for path in paths]
+    header = " ".join(f"{name[:14]:>14}" for name in names)
+    print(f"\n🏆 Top {min(top, len(rows))}")
+    print(f"{'#':>4} {header} {'retorno%':>9} {'dd%':>7} {'trades':>7} {'taxas':>8}")
+    for row in rows[:top]:
+        if "error" in row:
+            break
+        values = " ".join(f"{str(row['params'].get(p))[:14]:>14}" for p in paths)
+        print(
+            f"{row['rank']:>4} {values} {row['return_pct']:>9.2f} "
+            f"{row['max_drawdown_pct']:>7.2f} {row['trades']:>7} {row['fees_paid']:>8.2f}"
+        )
+
+
+def main() -> None:
+    from tools.backtest import add_backtest_arguments, backtest_options, prepare_backtest
+
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros com backtests em paralelo")
+    add_backtest_arguments(parser)
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help="nome=valores, ex.: levels=5,10,20 ou range_pct=2:10:2 (repetível)",
+    )
+    parser.add_argument("--space", help="YAML com {parâmetro: valores}")
+    parser.add_argument("--random", type=int, help="Sorteia N combinações em vez da grade completa")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, help="Processos (default: todos os núcleos)")
+    parser.add_argument("--rank-by", choices=sorted(RANK_METRICS), default="return_pct")
+    parser.add_argument("--top", type=int, default=20, help="Linhas exibidas no terminal")
+    parser.add_argument("--output", default="sweep_results.csv", help="Tabela completa em CSV")
+    args = parser.parse_args()
+
+    space_file = None
+    if args.space:
+        with open(args.space, "r", encoding="utf-8") as f:
+            space_file = yaml.safe_load(f) or {}
+    space = parse_space(args.param, space_file)
+    if not space:
+        parser.error("informe ao menos um --param ou --space")
+
+    config, candles = prepare_backtest(args)
+    if not candles:
+        return
+    ml_config = config.get("ml") or {}
+    ml_paths = [path for path in space if path.startswith("ml.")]
+    if ml_paths and not (ml_config.get("enabled") and ml_config.get("model_path")):
+        parser.error(f"{', '.join(ml_paths)} exige ML habilitado (ml.enabled e ml.model_path)")
+
+    combinations = expand_space(space, args.random, args.seed)
+    workers = args.workers or os.cpu_count() or 1
+    print(
+        f"🔬 {len(combinations)} combinações (grade de {space_size(space)}) "
+        f"em {workers} processos"
+    )
+    started = time.perf_counter()
+    rows = list(
+        run_sweep(config, candles, combinations, workers, backtest_options(args), progress=True)
+    )
+    ranked = rank_results(rows, args.rank_by)
+
+    paths = list(space)
+    print_table(ranked, paths, args.top)
+    failed = sum(1 for row in ranked if "error" in row)
+    if failed:
+        print(f"❌ {failed} backtests falharam (ver coluna error)")
+    write_results(args.output, ranked, paths)
+    print(f"🗂 Resultados salvos em: {args.output} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Candle time helpers.
+
+Interval parsing and bar-open flooring shared by the collectors, the live
+candle builder, the ML service and the backtester.
+"""
+
+
+def interval_to_ms(interval: str) -> int:
+    """
+    Convert interval strings (e.g., 5m, 15m, 1h) to milliseconds.
+    """
+
+    unit = interval[-1]
+    value = int(interval[:-1])
+    if unit == "m":
+        return value * 60 * 1000
+    if unit == "h":
+        return value * 60 * 60 * 1000
+    if unit == "d":
+        return value * 24 * 60 * 60 * 1000
+    raise ValueError(f"Unsupported interval: {interval}")
+
+
+def bar_open_time(timestamp_ms: int, interval_ms: int) -> int:
+    """
+    Open time of the bar containing `timestamp_ms`.
+
+    Also normalizes candle labels: the Hyperliquid collector stores the
+    close time (open + interval - 1) as open_time, Binance the open time.
+    """
+
+    return int(timestamp_ms) - int(timestamp_ms) % interval_ms
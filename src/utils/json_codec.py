@@ -0,0 +1,54 @@
+"""
+Pluggable JSON decoding for hot paths.
+
+Uses orjson or msgspec when installed and falls back to the stdlib. The
+backend can be forced with the JSON_DECODER env var (orjson|msgspec|json).
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional, Tuple, Union
+
+JsonInput = Union[str, bytes, bytearray, memoryview]
+Decoder = Callable[[JsonInput], Any]
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _load_backend(name: str) -> Optional[Tuple[Decoder, Tuple[type, ...]]]:
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return orjson.loads, (orjson.JSONDecodeError,)
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        return msgspec.json.Decoder().decode, (msgspec.DecodeError,)
+    if name == "json":
+        return json.loads, (json.JSONDecodeError,)
+    raise ValueError(f"Unknown JSON decoder: {name}")
+
+
+def get_decoder(name: Optional[str] = None) -> Tuple[str, Decoder, Tuple[type, ...]]:
+    """
+    Return (backend name, decode function, decode error types).
+
+    With no explicit name the first available backend in BACKENDS order is
+    used, unless JSON_DECODER selects one.
+    """
+
+    preferred = name or os.getenv("JSON_DECODER")
+    candidates = (preferred,) if preferred else BACKENDS
+    for candidate in candidates:
+        backend = _load_backend(candidate.lower())
+        if backend:
+            return (candidate.lower(), *backend)
+    # An explicitly requested backend that is not installed falls back to the stdlib
+    return ("json", *_load_backend("json"))
+
+
+DECODER_NAME, loads, DECODE_ERRORS = get_decoder()
@@ -0,0 +1,92 @@
+"""
+Rolling window extrema.
+
+Monotonic deques give the max/min of a time window in amortized O(1) per
+sample: the max deque keeps decreasing prices (the min deque increasing
+ones), so anything dominated by a newer sample can never be the extreme
+again and is dropped on insert. With `bucket_seconds` set, samples are
+folded into per-bucket highs/lows, bounding memory by
+window_seconds / bucket_seconds whatever the tick rate.
+"""
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class RollingExtrema:
+    """Max/min of the samples seen in the last `window_seconds`"""
+
+    def __init__(self, window_seconds: float, bucket_seconds: float = 0.0):
+        self.window_seconds = float(window_seconds)
+        self.bucket_seconds = float(bucket_seconds) if bucket_seconds > 0 else 0.0
+        # (bucket, price) pairs; bucket is the raw timestamp when not downsampling
+        self._max: Deque[Tuple[float, float]] = deque()
+        self._min: Deque[Tuple[float, float]] = deque()
+        # (bucket, samples) to know how many samples the window holds
+        self._counts: Deque[Tuple[float, int]] = deque()
+        self._count = 0
+
+    def _bucket(self, timestamp: float) -> float:
+        if not self.bucket_seconds:
+            return timestamp
+        return timestamp - timestamp % self.bucket_seconds
+
+    def add(self, timestamp: float, price: float) -> None:
+        """Add a sample and evict everything older than the window"""
+
+        bucket = self._bucket(timestamp)
+
+        # A tail entry from the same bucket that survives the pops already
+        # holds the bucket's extreme (both leave the window together)
+        max_q = self._max
+        while max_q and max_q[-1][1] <= price:
+            max_q.pop()
+        if not max_q or max_q[-1][0] != bucket:
+            max_q.append((bucket, price))
+
+        min_q = self._min
+        while min_q and min_q[-1][1] >= price:
+            min_q.pop()
+        if not min_q or min_q[-1][0] != bucket:
+            min_q.append((bucket, price))
+
+        if self._counts and self._counts[-1][0] == bucket:
+            self._counts[-1] = (bucket, self._counts[-1][1] + 1)
+        else:
+            self._counts.append((bucket, 1))
+        self._count += 1
+
+        self.evict(timestamp - self.window_seconds)
+
+    def evict(self, cutoff: float) -> None:
+        """Drop samples (or whole buckets) that started before `cutoff`"""
+
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._counts and self._counts[0][0] < cutoff:
+            self._count -= self._counts.popleft()[1]
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max[0][1] if self._max else None
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def entries(self) -> int:
+        """Deque entries held (memory footprint)"""
+
+        return len(self._max) + len(self._min) + len(self._counts)
+
+    def clear(self) -> None:
+        self._max.clear()
+        self._min.clear()
+        self._counts.clear()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
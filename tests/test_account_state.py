@@ -0,0 +1,203 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.account_state import AccountStateCache
+from core.engine import TradingEngine
+from exchanges.hyperliquid.adapter import HyperliquidAdapter
+from interfaces.exchange import Balance
+from interfaces.strategy import MarketData, Position, TradingStrategy
+
+
+class CountingExchange:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.position_calls = 0
+        self.balance_calls = 0
+        self.size = 1.0
+
+    async def get_positions(self):
+        self.position_calls += 1
+        await asyncio.sleep(self.delay)
+        return [Position("BTC", self.size, 100.0, 100.0 * abs(self.size), 0.0, 0.0)]
+
+    async def get_balance(self, asset):
+        self.balance_calls += 1
+        return Balance(asset=asset, available=500.0, locked=0.0, total=500.0)
+
+    def get_status(self):
+        return {"connected": True}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+USER_STATE = {
+    "assetPositions": [
+        {"position": {"coin": "BTC", "szi": "0.5", "entryPx": "100"}},
+        {"position": {"coin": "ETH", "szi": "0", "entryPx": None}},
+    ],
+    "balances": [{"coin": "USD", "total": "250", "hold": "50"}],
+}
+
+
+@pytest.mark.asyncio
+async def test_reads_are_served_from_memory_within_ttl():
+    exchange = CountingExchange()
+    clock = Clock()
+    cache = AccountStateCache(exchange, ttl=30, clock=clock)
+
+    for _ in range(100):
+        await cache.get_positions()
+        await cache.get_balance("USD")
+    assert (exchange.position_calls, exchange.balance_calls) == (1, 1)
+
+    clock.now += 31
+    await cache.get_positions()
+    assert exchange.position_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_one_refresh():
+    exchange = CountingExchange(delay=0.01)
+    cache = AccountStateCache(exchange)
+    await asyncio.gather(*(cache.get_positions() for _ in range(20)))
+    assert exchange.position_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_refreshes_and_mid_flight_invalidation_is_not_lost():
+    exchange = CountingExchange(delay=0.01)
+    cache = AccountStateCache(exchange)
+    await cache.get_positions()
+
+    cache.invalidate("fill")
+    await asyncio.sleep(0)  # refresh is now waiting on REST
+    exchange.size = 2.0  # a second fill lands while it is in flight
+    cache.invalidate("fill")
+    await asyncio.sleep(0.02)
+    assert exchange.position_calls == 2
+    assert cache.is_stale()
+
+    positions = await cache.get_positions()
+    assert positions[0].size == 2.0
+    assert not cache.is_stale()
+
+
+class FlakyExchange(CountingExchange):
+    """get_positions swallows errors into []; fetch_positions raises"""
+
+    def __init__(self):
+        super().__init__()
+        self.fail = False
+
+    async def get_positions(self):
+        raise AssertionError("the cache must use fetch_positions")
+
+    async def fetch_positions(self):
+        if self.fail:
+            raise RuntimeError("positions unavailable")
+        return await super().get_positions()
+
+    async def get_balance(self, asset):
+        if self.fail:
+            raise RuntimeError("Failed to get USD balance")
+        return await super().get_balance(asset)
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_is_logged_and_keeps_snapshot_stale(caplog):
+    exchange = FlakyExchange()
+    cache = AccountStateCache(exchange)
+    assert (await cache.get_positions())[0].size == 1.0
+
+    exchange.fail = True
+    cache.invalidate("fill")
+    await asyncio.sleep(0.01)
+    assert cache.is_stale()
+    assert cache.get_status()["refresh_errors"] == 1
+    assert "Account state refresh failed" in caplog.text
+    with pytest.raises(RuntimeError):
+        await cache.get_positions()
+    assert cache.is_stale() and cache.rest_refreshes == 1
+
+    exchange.fail = False
+    exchange.size = 3.0
+    assert (await cache.get_positions())[0].size == 3.0
+    assert not cache.is_stale()
+
+
+@pytest.mark.asyncio
+async def test_pushed_user_state_replaces_rest_and_mark_price_revalues():
+    exchange = CountingExchange()
+    clock = Clock()
+    cache = AccountStateCache(exchange, ttl=30, clock=clock)
+
+    positions, balances = HyperliquidAdapter.parse_user_state(USER_STATE, {"BTC": 110.0}.get)
+    cache.apply_snapshot(positions, balances)
+    clock.now += 20
+    cache.apply_snapshot(positions, balances)
+    clock.now += 20
+
+    [position] = await cache.get_positions()
+    balance = await cache.get_balance("USD")
+    assert exchange.position_calls == 0
+    assert (position.size, position.unrealized_pnl) == (0.5, pytest.approx(5.0))
+    assert (balance.available, balance.locked) == (200.0, 50.0)
+
+    cache.mark_price("BTC", 120.0)
+    [position] = await cache.get_positions()
+    assert position.unrealized_pnl == pytest.approx(10.0)
+    assert position.current_value == pytest.approx(60.0)
+
+
+class DummyStrategy(TradingStrategy):
+    def __init__(self):
+        super().__init__("dummy", {})
+        self.seen_positions = []
+
+    def generate_signals(self, market_data, positions, balance):
+        self.seen_positions.append(positions)
+        return []
+
+
+@pytest.mark.asyncio
+async def test_engine_tick_path_uses_cache_and_user_feed():
+    engine = TradingEngine({"log_level": "ERROR", "strategy": {"symbol": "BTC"}})
+    engine.running = True
+    engine.strategy = DummyStrategy()
+    engine.exchange = CountingExchange()
+    engine.exchange.wallet_address = "0xabc"
+    engine.exchange.parse_user_state = HyperliquidAdapter.parse_user_state
+    engine.risk_manager = None
+
+    subscriptions = {}
+
+    async def subscribe_user_updates(user, state_cb, event_cb):
+        subscriptions.update(user=user, state=state_cb, event=event_cb)
+
+    engine.market_data = SimpleNamespace(
+        subscribe_user_updates=subscribe_user_updates,
+        get_latest_price=lambda asset: 100.0,
+        get_status=lambda: {},
+    )
+    await engine._initialize_account_state()
+    assert subscriptions["user"] == "0xabc"
+
+    subscriptions["state"]({"clearinghouseState": USER_STATE})
+    tick = MarketData(asset="BTC", price=100.0, volume_24h=0.0, timestamp=1.0)
+    for _ in range(10):
+        await engine._handle_price_update(tick)
+    assert engine.exchange.position_calls == 0
+    assert engine.strategy.seen_positions[-1][0].size == 0.5
+
+    subscriptions["event"]({"fills": [{"coin": "BTC"}]})
+    await engine._handle_price_update(tick)
+    assert engine.exchange.position_calls == 1
+    assert engine.get_status()["account_state"]["pushed_updates"] == 1
@@ -0,0 +1,296 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from hyperliquid.utils.error import ClientError
+
+from data_pipeline import backfill, binance_collector, collector
+from data_pipeline.backfill import (
+    BackfillCheckpoint,
+    BackfillScheduler,
+    TokenBucket,
+    chunk_ranges,
+    find_gaps,
+    plan_backfill,
+    subtract_ranges,
+)
+
+INTERVAL_MS = 15 * 60 * 1000
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch, tmp_path):
+    monkeypatch.setattr(backfill, "backoff_delay", lambda *args, **kwargs: 0.0)
+    monkeypatch.setenv("BACKFILL_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+
+
+class FakeCandleCollection:
+    """Dict-backed `find` + save callable standing in for the candles collection."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def find(self, query, projection=None, sort=None):
+        bounds = query.get("open_time", {})
+        times = sorted(
+            t
+            for t in self.docs
+            if bounds.get("$gte", t) <= t <= bounds.get("$lte", t)
+        )
+        return [{"open_time": t} for t in times]
+
+    def save(self, candles):
+        for candle in candles:
+            self.docs[candle["open_time"]] = candle
+        return len(candles)
+
+
+def to_ms(date):
+    return int(collector._parse_date(date).timestamp() * 1000)
+
+
+class FakeInfo:
+    """Synchronous candles_snapshot stand-in that rate limits its first calls."""
+
+    def __init__(self, rate_limited_calls=1):
+        self.rate_limited_calls = rate_limited_calls
+        self.calls = []
+
+    def candles_snapshot(self, symbol, interval, start_ts, end_ts):
+        self.calls.append((start_ts, end_ts))
+        if self.rate_limited_calls > 0:
+            self.rate_limited_calls -= 1
+            raise ClientError(429, None, "rate limited", {})
+        first = -(-start_ts // INTERVAL_MS) * INTERVAL_MS
+        return [
+            {"t": t, "T": t, "o": "1", "h": "2", "l": "0.5", "c": "1.5", "v": "10", "i": interval}
+            for t in range(first, end_ts + 1, INTERVAL_MS)
+        ]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=50.0, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 4 / 50.0 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff_only_retries_rate_limits():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ClientError(429, None, "slow down", {})
+        return "ok"
+
+    assert await backfill.retry_with_backoff(flaky, max_retries=5) == "ok"
+    assert len(calls) == 3
+
+    async def broken():
+        raise ClientError(500, None, "boom", {})
+
+    with pytest.raises(ClientError):
+        await backfill.retry_with_backoff(broken, max_retries=5)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_concurrency_and_saves_every_chunk():
+    in_flight = 0
+    peak = 0
+    saved = []
+    checkpoints = []
+
+    async def fetch(start, end):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [{"open_time": start}]
+
+    def save(candles):
+        saved.extend(candles)
+        return len(candles)
+
+    scheduler = BackfillScheduler(
+        fetch,
+        save,
+        concurrency=3,
+        rate=1000.0,
+        queue_size=2,
+        on_chunk_saved=lambda start, end, candles: checkpoints.append(start),
+    )
+    ranges = chunk_ranges(0, 20_000, 999)
+    stats = await scheduler.run(ranges)
+
+    assert peak == 3
+    assert stats.chunks == len(ranges) == stats.candles == stats.upserts
+    assert sorted(c["open_time"] for c in saved) == [start for start, _ in ranges]
+    assert sorted(checkpoints) == [start for start, _ in ranges]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_propagates_fetch_errors():
+    async def fetch(start, end):
+        if start > 0:
+            raise RuntimeError("upstream down")
+        return []
+
+    scheduler = BackfillScheduler(fetch, lambda candles: 0, concurrency=2, rate=1000.0)
+    with pytest.raises(RuntimeError):
+        await scheduler.run(chunk_ranges(0, 10_000, 999))
+
+
+@pytest.mark.asyncio
+async def test_collect_btc_history_with_fake_info():
+    info = FakeInfo(rate_limited_calls=2)
+    store = FakeCandleCollection()
+
+    await collector.collect_btc_15m_history(
+        start_date="2024-01-01",
+        end_date="2024-03-15",
+        rate=1000.0,
+        client=info,
+        save=store.save,
+        collection=store,
+    )
+
+    open_times = sorted(store.docs)
+    assert len(info.calls) == 3 + 2  # three 30 day chunks plus two rate limited calls
+    assert open_times[0] == to_ms("2024-01-01")
+    assert all(b - a == INTERVAL_MS for a, b in zip(open_times, open_times[1:]))
+
+
+@pytest.mark.asyncio
+async def test_collect_binance_history_with_mock_transport():
+    requests = []
+
+    def handler(request):
+        params = request.url.params
+        start, end = int(params["startTime"]), int(params["endTime"])
+        requests.append((start, end))
+        if len(requests) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        first = -(-start // INTERVAL_MS) * INTERVAL_MS
+        klines = [
+            [t, "1", "2", "0.5", "1.5", "10", t + INTERVAL_MS - 1]
+            for t in range(first, end + 1, INTERVAL_MS)
+        ]
+        assert len(klines) <= int(params["limit"])
+        return httpx.Response(200, json=klines)
+
+    store = FakeCandleCollection()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        upserts = await binance_collector.collect_binance_history(
+            start_date="2024-01-01",
+            end_date="2024-02-01",
+            throttle=0.0,
+            client=client,
+            save=store.save,
+            collection=store,
+        )
+
+    open_times = sorted(store.docs)
+    assert upserts == len(open_times) == 31 * 96 + 1
+    assert all(b - a == INTERVAL_MS for a, b in zip(open_times, open_times[1:]))
+
+
+def test_find_gaps_reports_head_interior_and_tail():
+    times = [t * INTERVAL_MS for t in (2, 3, 4, 7, 8)]
+    gaps = find_gaps(times, 0, 10 * INTERVAL_MS, INTERVAL_MS)
+    assert gaps == [
+        (0, 1 * INTERVAL_MS),
+        (5 * INTERVAL_MS, 6 * INTERVAL_MS),
+        (9 * INTERVAL_MS, 10 * INTERVAL_MS),
+    ]
+    assert find_gaps([], 0, 100, INTERVAL_MS) == [(0, 100)]
+    assert find_gaps(times[:3], 2 * INTERVAL_MS, 4 * INTERVAL_MS, INTERVAL_MS) == []
+
+
+def test_subtract_ranges():
+    assert subtract_ranges([(0, 100)], [(10, 19), (20, 30), (90, 200)]) == [(0, 9), (31, 89)]
+    assert subtract_ranges([(0, 10)], []) == [(0, 10)]
+    assert subtract_ranges([(0, 10)], [(0, 10)]) == []
+
+
+def test_plan_backfill_refetches_last_candle_and_skips_checkpoint(tmp_path):
+    times = [t * INTERVAL_MS for t in range(0, 10)]
+    checkpoint = BackfillCheckpoint(tmp_path / "cp.json")
+    checkpoint.mark(12 * INTERVAL_MS, 14 * INTERVAL_MS)
+
+    plan = plan_backfill(times, 0, 20 * INTERVAL_MS, INTERVAL_MS, 100 * INTERVAL_MS, checkpoint)
+    assert plan == [(9 * INTERVAL_MS, 12 * INTERVAL_MS - 1), (14 * INTERVAL_MS + 1, 20 * INTERVAL_MS)]
+
+    reloaded = BackfillCheckpoint(tmp_path / "cp.json")
+    assert reloaded.completed == [(12 * INTERVAL_MS, 14 * INTERVAL_MS)]
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_fetches_only_missing_ranges():
+    info = FakeInfo(rate_limited_calls=0)
+    store = FakeCandleCollection()
+    kwargs = dict(
+        start_date="2024-01-01",
+        end_date="2024-03-01",
+        rate=1000.0,
+        client=info,
+        save=store.save,
+        collection=store,
+    )
+
+    await collector.collect_btc_15m_history(**kwargs)
+    full_count = len(store.docs)
+    last_open_time = max(store.docs)
+
+    # Punch a hole and drop the checkpoint: only the hole and the last candle are re-fetched
+    hole = sorted(store.docs)[1000:1010]
+    for open_time in hole:
+        del store.docs[open_time]
+    BackfillCheckpoint.for_series("hyperliquid", "BTC", "15m").clear()
+    info.calls.clear()
+
+    upserts = await collector.collect_btc_15m_history(**kwargs)
+    assert len(store.docs) == full_count
+    assert upserts == len(hole) + 1
+    assert sorted(info.calls) == [(hole[0], hole[-1]), (last_open_time, to_ms("2024-03-01"))]
+
+    # Everything is checkpointed now, so a rerun makes no requests
+    info.calls.clear()
+    assert await collector.collect_btc_15m_history(**kwargs) == 0
+    assert info.calls == []
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_checkpoint():
+    store = FakeCandleCollection()
+    failing_after = {"chunks": 0}
+
+    class FlakyInfo(FakeInfo):
+        def candles_snapshot(self, symbol, interval, start_ts, end_ts):
+            failing_after["chunks"] += 1
+            if failing_after["chunks"] > 1:
+                raise ClientError(500, None, "exchange down", {})
+            return super().candles_snapshot(symbol, interval, start_ts, end_ts)
+
+    kwargs = dict(
+        start_date="2024-01-01",
+        end_date="2024-03-01",
+        rate=1000.0,
+        concurrency=1,
+        save=store.save,
+        collection=store,
+    )
+    with pytest.raises(ClientError):
+        await collector.collect_btc_15m_history(client=FlakyInfo(rate_limited_calls=0), **kwargs)
+    first_chunk = sorted(store.docs)
+
+    info = FakeInfo(rate_limited_calls=0)
+    await collector.collect_btc_15m_history(client=info, **kwargs)
+    assert info.calls == [(first_chunk[-1] + 1, to_ms(kwargs["end_date"]))]
+    open_times = sorted(store.docs)
+    assert all(b - a == INTERVAL_MS for a, b in zip(open_times, open_times[1:]))
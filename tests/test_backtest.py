@@ -0,0 +1,152 @@
+import numpy as np
+import pytest
+
+from core.backtest import Backtester, candle_ticks, run_backtest
+from exchanges.paper import BacktestExchange
+from interfaces.exchange import Order, OrderSide, OrderType
+from tools.benchmarks import synthetic_candles
+from utils.candle_time import bar_open_time
+
+INTERVAL = 900_000
+
+
+def candle(open_time, open_, high, low, close):
+    return {"open_time": open_time, "open": open_, "high": high, "low": low, "close": close}
+
+
+def test_candle_ticks_walk_the_bar_range():
+    up = candle(0, 100.0, 110.0, 95.0, 105.0)
+    assert [p for _, p in candle_ticks(up, INTERVAL)] == [100.0, 95.0, 110.0, 105.0]
+    down = candle(0, 100.0, 110.0, 95.0, 97.0)
+    assert [p for _, p in candle_ticks(down, INTERVAL)] == [100.0, 110.0, 95.0, 97.0]
+
+    ticks = candle_ticks(up, INTERVAL, ticks_per_bar=7)
+    assert [p for _, p in ticks] == [100.0, 97.5, 95.0, 102.5, 110.0, 107.5, 105.0]
+    assert ticks[0][0] == 0.0 and ticks[-1][0] < INTERVAL / 1000
+    assert candle_ticks(up, INTERVAL, ticks_per_bar=1) == [((INTERVAL - 1) / 1000, 105.0)]
+    with pytest.raises(ValueError):
+        candle_ticks(up, INTERVAL, ticks_per_bar=2)
+
+
+def order(side, price, order_type=OrderType.LIMIT, order_id="o1"):
+    return Order(id=order_id, asset="BTC", side=side, size=1.0, order_type=order_type, price=price)
+
+
+@pytest.mark.asyncio
+async def test_limit_orders_rest_until_price_trades_through():
+    exchange = BacktestExchange("BTC", 1000.0, clock=lambda: 50.0, maker_fee=0.001, taker_fee=0.002)
+    fills = []
+    exchange.fill_listener = fills.append
+    exchange.update_price(100.0)
+
+    buy_oid = await exchange.place_order(order(OrderSide.BUY, 95.0))
+    sell_oid = await exchange.place_order(order(OrderSide.SELL, 110.0, order_id="o2"))
+    assert len(await exchange.get_open_orders()) == 2
+
+    exchange.update_price(96.0)
+    assert fills == []
+    exchange.update_price(94.0)
+    fill = fills[0]["fills"][0]
+    assert (fill["oid"], fill["px"], fill["side"], fill["time"]) == (buy_oid, 95.0, "B", 50_000)
+    assert fill["fee"] == pytest.approx(95.0 * 0.001)
+    assert exchange.position_size == 1.0
+
+    assert await exchange.cancel_orders([sell_oid, "bt-404"]) == [True, False]
+    # Marketable limit and market orders fill at the last price, as taker
+    await exchange.place_order(order(OrderSide.SELL, 90.0, order_id="o3"))
+    assert fills[-1]["fills"][0]["px"] == 94.0
+    assert exchange.position_size == 0.0
+    assert exchange.realized_pnl == pytest.approx(-1.0)
+    assert exchange.fees_paid == pytest.approx(95.0 * 0.001 + 94.0 * 0.002)
+    assert exchange.get_summary()["orders_cancelled"] == 1
+
+
+GRID_CONFIG = {
+    "strategy": {
+        "type": "basic_grid",
+        "symbol": "BTC",
+        "levels": 10,
+        "range_pct": 3,
+        "total_allocation": 500,
+        "rebalance_threshold_pct": 4,
+    },
+    "risk_management": {"max_drawdown_pct": 90, "max_position_size_pct": 100},
+}
+
+
+def test_backtest_replays_grid_through_engine():
+    candles = synthetic_candles(2000)
+    result = run_backtest(GRID_CONFIG, candles, initial_balance=1000.0)
+
+    assert result.bars == 2000 and result.ticks == 8000
+    assert len(result.equity_curve) == 2000
+    assert result.equity_curve[-1] == (candles[-1]["open_time"], pytest.approx(result.final_equity))
+    assert result.trades > 0 and result.orders_placed > result.trades
+    assert result.final_equity == pytest.approx(
+        result.initial_balance + result.realized_pnl + result.unrealized_pnl - result.fees_paid
+    )
+    assert 0 < result.max_drawdown_pct < 100
+
+    # Deterministic: the simulated clock drives everything
+    again = run_backtest(GRID_CONFIG, candles, initial_balance=1000.0)
+    assert again.to_dict(include_curve=True) | {"elapsed": 0} == result.to_dict(
+        include_curve=True
+    ) | {"elapsed": 0}
+
+
+@pytest.mark.asyncio
+async def test_fills_reach_strategy_via_order_tracker():
+    backtester = Backtester(GRID_CONFIG, synthetic_candles(300))
+    result = await backtester.run()
+    engine = backtester.engine
+
+    assert backtester.clock() == pytest.approx(result.equity_curve[-1][0] / 1000 + 899.999)
+    assert engine.executed_trades == result.trades
+    assert engine.strategy.total_trades == result.trades
+    assert engine.order_tracker.fills_applied == result.trades
+    assert not engine.running
+
+
+class ConstantModel:
+    def __init__(self, probability):
+        self.probability = probability
+
+    def predict_proba(self, rows):
+        return np.array([[1 - self.probability, self.probability]] * len(rows))
+
+
+def ml_config(enter_threshold):
+    return {
+        **GRID_CONFIG,
+        "ml": {
+            "enabled": True,
+            "model_path": "constant.pkl",
+            "lookback": 48,
+            "context_days": 1,
+            "enter_threshold": enter_threshold,
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_ml_gate_reads_replayed_closed_candles(monkeypatch):
+    monkeypatch.setattr("ml.service.load_model", lambda path: ConstantModel(0.7))
+    monkeypatch.setattr(
+        "ml.service.load_candles_from_mongo",
+        lambda **kwargs: pytest.fail("the replay must not read MongoDB"),
+    )
+    candles = synthetic_candles(300)
+
+    blocked = await Backtester(ml_config(0.8), candles).run()
+    assert blocked.orders_placed == 0
+
+    backtester = Backtester(ml_config(0.6), candles)
+    result = await backtester.run()
+    engine = backtester.engine
+    assert result.trades > 0
+    # The first `lookback` candles only fill the model's window
+    assert result.bars == 300 - 48 and result.start_time == candles[48]["open_time"]
+    assert engine.get_status()["ml"]["evaluations"] == result.bars
+    # The last bar was gated on the signal of the bar before it
+    last_closed = bar_open_time(candles[-2]["open_time"], INTERVAL)
+    assert engine._ml_signal_cache["timestamp"] == last_closed
@@ -0,0 +1,217 @@
+import pytest
+
+from core.engine import TradingEngine
+from exchanges.hyperliquid.adapter import HyperliquidAdapter
+from exchanges.paper import PaperExchange
+from interfaces.exchange import Order, OrderSide, OrderStatus, OrderType
+from interfaces.strategy import MarketData, SignalType, TradingSignal
+from strategies.grid.basic_grid import BasicGridStrategy
+
+
+class FakeExchange:
+    """Records bulk requests made through the SDK Exchange"""
+
+    def __init__(self):
+        self.wallet = type("Wallet", (), {"address": "0x" + "b" * 40})()
+        self.bulk_order_calls = []
+        self.bulk_cancel_calls = []
+        self.statuses = None
+
+    def bulk_orders(self, order_requests):
+        self.bulk_order_calls.append(order_requests)
+        statuses = self.statuses or [
+            {"resting": {"oid": 1000 + idx}} for idx in range(len(order_requests))
+        ]
+        return {"status": "ok", "response": {"data": {"statuses": statuses}}}
+
+    def bulk_cancel(self, cancel_requests):
+        self.bulk_cancel_calls.append(cancel_requests)
+        return {
+            "status": "ok",
+            "response": {"data": {"statuses": ["success"] * len(cancel_requests)}},
+        }
+
+
+class FakeInfo:
+    def __init__(self, open_orders=()):
+        self.open_orders_list = list(open_orders)
+        self.calls = []
+
+    def all_mids(self):
+        self.calls.append("all_mids")
+        return {"BTC": "50000", "ETH": "3000"}
+
+    def open_orders(self, address):
+        self.calls.append("open_orders")
+        return self.open_orders_list
+
+    def query_order_by_oid(self, address, oid):
+        self.calls.append("order_status")
+        if oid != 77:
+            return {"status": "unknownOid"}
+        order = {"coin": "BTC", "side": "B", "limitPx": "49000", "sz": "0.0", "origSz": "0.002"}
+        return {"status": "order", "order": {"order": order, "status": "filled"}}
+
+
+def make_adapter(open_orders=()):
+    adapter = HyperliquidAdapter(private_key="0x" + "a" * 64, testnet=True)
+    adapter.is_connected = True
+    adapter.asset_meta.load(
+        {"universe": [{"name": "BTC", "szDecimals": 5}, {"name": "ETH", "szDecimals": 4}]}
+    )
+    adapter.exchange = FakeExchange()
+    adapter.info = FakeInfo(open_orders)
+    return adapter
+
+
+def order(idx, order_type=OrderType.LIMIT, asset="BTC", price=49000.0):
+    return Order(
+        id=f"o{idx}",
+        asset=asset,
+        side=OrderSide.BUY,
+        size=0.001,
+        order_type=order_type,
+        price=price if order_type == OrderType.LIMIT else None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_place_orders_sends_one_bulk_request():
+    adapter = make_adapter()
+    orders = [order(idx) for idx in range(20)]
+
+    results = await adapter.place_orders(orders)
+    adapter.sdk.shutdown()
+
+    assert len(adapter.exchange.bulk_order_calls) == 1
+    assert len(adapter.exchange.bulk_order_calls[0]) == 20
+    assert [r.exchange_order_id for r in results] == [str(1000 + i) for i in range(20)]
+    assert all(r.ok for r in results)
+    assert adapter.info.calls == []  # limit orders need no price lookup
+
+
+@pytest.mark.asyncio
+async def test_place_orders_reports_per_order_outcomes():
+    adapter = make_adapter()
+    adapter.exchange.statuses = [
+        {"filled": {"totalSz": "0.001", "avgPx": "50000", "oid": 1}},
+        {"error": "Order must have minimum value of $10"},
+    ]
+    orders = [
+        order(0, OrderType.MARKET),
+        order(1),
+        order(2, OrderType.MARKET, asset="DOGE"),
+    ]
+
+    results = await adapter.place_orders(orders)
+    adapter.sdk.shutdown()
+
+    assert adapter.info.calls == ["all_mids"]
+    [request] = adapter.exchange.bulk_order_calls
+    assert [r["coin"] for r in request] == ["BTC", "BTC"]
+    assert request[0]["limit_px"] == 50500.0
+    assert request[0]["order_type"] == {"limit": {"tif": "Ioc"}}
+    assert results[0].exchange_order_id == "filled"
+    assert "minimum value" in results[1].error
+    assert "DOGE" in results[2].error
+
+
+@pytest.mark.asyncio
+async def test_place_order_raises_on_rejection():
+    adapter = make_adapter()
+    adapter.exchange.statuses = [{"error": "Insufficient margin"}]
+    with pytest.raises(RuntimeError, match="Insufficient margin"):
+        await adapter.place_order(order(0))
+    adapter.sdk.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_orders_uses_one_bulk_cancel():
+    open_orders = [{"coin": "BTC", "oid": oid} for oid in range(1, 21)]
+    adapter = make_adapter(open_orders)
+
+    assert await adapter.cancel_all_orders() == 20
+    assert adapter.info.calls == ["open_orders"]
+    assert len(adapter.exchange.bulk_cancel_calls) == 1
+
+    flags = await adapter.cancel_orders(["3", "999"])
+    adapter.sdk.shutdown()
+    assert flags == [True, False]
+    assert adapter.exchange.bulk_cancel_calls[-1] == [{"coin": "BTC", "oid": 3}]
+
+
+@pytest.mark.asyncio
+async def test_order_status_is_queried_by_oid():
+    adapter = make_adapter()
+    status = await adapter.get_order_status("77")
+    with pytest.raises(ValueError):
+        await adapter.get_order_status("78")
+    adapter.sdk.shutdown()
+
+    assert status.status == OrderStatus.FILLED
+    assert (status.size, status.filled_size, status.price) == (0.002, 0.002, 49000.0)
+
+
+@pytest.mark.asyncio
+async def test_paper_exchange_emulates_batches():
+    exchange = PaperExchange("BTC", initial_balance=10_000.0)
+    exchange.update_price(50000.0)
+
+    results = await exchange.place_orders([order(0), order(1, OrderType.MARKET)])
+    assert [r.ok for r in results] == [True, True]
+    assert exchange.position_size == pytest.approx(0.002)
+    assert await exchange.cancel_orders(["a", "b"]) == [True, True]
+    assert exchange.request_count == 2
+
+
+@pytest.mark.asyncio
+async def test_paper_fills_reach_the_strategy_through_the_order_tracker():
+    engine = TradingEngine({"log_level": "ERROR", "strategy": {"symbol": "BTC"}})
+    engine._paper_mode = True
+    engine.exchange = PaperExchange("BTC", initial_balance=10_000.0, reports_dir=None)
+    engine.exchange.update_price(50000.0)
+    await engine._initialize_order_tracking()
+    executed = []
+
+    class Strategy:
+        def on_trade_executed(self, signal, price, size):
+            executed.append((signal.price, price, size))
+
+    engine.strategy = Strategy()
+    signal = TradingSignal(SignalType.BUY, "BTC", 0.001, price=49000.0)
+    await engine._place_orders([signal])
+
+    assert executed == [(49000.0, 49000.0, 0.001)]
+    assert engine.pending_orders == {}
+    await engine._reconcile_orders()
+    assert engine.order_tracker.get_status()["missing_orders"] == 0
+
+
+@pytest.mark.asyncio
+async def test_engine_places_grid_in_one_request():
+    engine = TradingEngine({"log_level": "ERROR", "strategy": {"symbol": "BTC"}})
+    engine.running = True
+    engine.risk_manager = None
+    engine.strategy = BasicGridStrategy(
+        {"symbol": "BTC", "levels": 20, "range_pct": 10.0, "total_allocation": 2000.0}
+    )
+    engine.strategy.start()
+    engine.exchange = make_adapter()
+
+    async def no_positions():
+        return []
+
+    async def balance(asset):
+        return type("Balance", (), {"available": 10_000.0})()
+
+    engine.exchange.get_positions = no_positions
+    engine.exchange.get_balance = balance
+
+    await engine._handle_price_update(
+        MarketData(asset="BTC", price=50010.0, volume_24h=0.0, timestamp=1.0)
+    )
+    engine.exchange.sdk.shutdown()
+
+    [request] = engine.exchange.exchange.bulk_order_calls
+    assert len(request) == 20
+    assert len(engine.pending_orders) == 20
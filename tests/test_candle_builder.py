@@ -0,0 +1,191 @@
+import pytest
+
+from exchanges.hyperliquid.candle_builder import CandleAggregator
+from exchanges.hyperliquid.market_data import HyperliquidMarketData
+
+MINUTE = 60.0
+T0 = 1_700_000_000 - 1_700_000_000 % 900  # aligned to a 15m boundary (seconds)
+
+
+def test_ticks_build_ohlc_and_close_on_boundary():
+    agg = CandleAggregator(timeframes=["1m", "5m"])
+    for offset, price in [(1, 100.0), (10, 105.0), (20, 95.0), (59, 101.0)]:
+        assert agg.on_price("BTC", price, T0 + offset) == []
+
+    closed = agg.on_price("BTC", 102.0, T0 + MINUTE + 1)
+    assert [c["timeframe"] for c in closed] == ["1m"]
+    bar = closed[0]
+    assert bar["open_time"] == T0 * 1000
+    assert (bar["open"], bar["high"], bar["low"], bar["close"]) == (100.0, 105.0, 95.0, 101.0)
+    assert bar["ticks"] == 4
+
+    closed = agg.on_price("BTC", 103.0, T0 + 5 * MINUTE)
+    five = [c for c in closed if c["timeframe"] == "5m"][0]
+    assert (five["open"], five["high"], five["low"], five["close"]) == (100.0, 105.0, 95.0, 102.0)
+    assert len(agg.closed_candles("BTC", "1m")) == 5
+    assert agg.current_candle("BTC", "5m")["open"] == 103.0
+
+
+def test_silent_intervals_are_filled_with_flat_bars():
+    agg = CandleAggregator(timeframes=["1m"])
+    agg.on_price("BTC", 100.0, T0)
+    agg.on_price("BTC", 110.0, T0 + 4 * MINUTE)
+
+    bars = agg.closed_candles("BTC", "1m")
+    assert [b["open_time"] for b in bars] == [int((T0 + i * MINUTE) * 1000) for i in range(4)]
+    assert all(b["close"] == 100.0 and b["ticks"] == 0 for b in bars[1:])
+
+
+def test_ring_buffer_capacity_and_stale_ticks():
+    agg = CandleAggregator(timeframes=["1m"], capacity=3)
+    for i in range(10):
+        agg.on_price("BTC", 100.0 + i, T0 + i * MINUTE)
+    bars = agg.closed_candles("BTC", "1m")
+    assert [b["close"] for b in bars] == [106.0, 107.0, 108.0]
+    assert agg.closed_candles("BTC", "1m", limit=2) == bars[1:]
+
+    agg.on_price("BTC", 1.0, T0)
+    assert agg.stale_ticks == 1
+    assert agg.current_candle("BTC", "1m")["low"] == 109.0
+
+
+def test_trades_add_volume_and_seed_deduplicates():
+    agg = CandleAggregator(timeframes=["15m"])
+    history = [
+        {"open_time": int((T0 - (3 - i) * 900) * 1000), "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 7}
+        for i in range(3)
+    ]
+    assert agg.seed("BTC", "15m", history) == 3
+
+    agg.on_price("BTC", 100.0, T0 + 1)
+    agg.on_trade("BTC", 100.5, 0.25, T0 + 2)
+    agg.on_trade("BTC", 100.4, 0.75, T0 + 3)
+    # A late copy of the live bar from the database must not be seeded twice
+    assert agg.seed("BTC", "15m", [dict(history[-1], open_time=T0 * 1000)]) == 0
+    closed = agg.on_price("BTC", 101.0, T0 + 900)
+
+    assert closed[0]["volume"] == pytest.approx(1.0)
+    series = agg.closed_candles("BTC", "15m")
+    assert [c["open_time"] for c in series] == [h["open_time"] for h in history] + [T0 * 1000]
+
+
+def test_seed_normalizes_close_time_labels_and_drops_forming_bar(capsys):
+    agg = CandleAggregator(timeframes=["15m"])
+    # Collector rows are labelled with the close time; the last one is still forming
+    history = [
+        {
+            "open_time": int((T0 - (3 - i) * 900) * 1000) + 899_999,
+            "open": 1,
+            "high": 2,
+            "low": 0.5,
+            "close": 1.5 + i,
+        }
+        for i in range(4)
+    ]
+    assert agg.seed("BTC", "15m", history, now=T0 + 60) == 3
+    assert [c["open_time"] for c in agg.closed_candles("BTC", "15m")] == [
+        int((T0 - (3 - i) * 900) * 1000) for i in range(3)
+    ]
+
+    agg.on_price("BTC", 100.0, T0 + 61)
+    closed = agg.on_price("BTC", 101.0, T0 + 900)
+    assert closed[0]["open_time"] == T0 * 1000 and closed[0]["close"] == 100.0
+    assert agg.latest_closed("BTC", "15m")["ticks"] == 1
+    assert agg.history_gaps == 0 and capsys.readouterr().out == ""
+
+
+def test_gap_between_history_and_live_bars_is_filled_and_reported(capsys):
+    agg = CandleAggregator(timeframes=["15m"])
+    stale = [
+        {"open_time": int((T0 - 3 * 900) * 1000), "open": 1, "high": 2, "low": 0.5, "close": 1.5}
+    ]
+    agg.seed("BTC", "15m", stale, now=T0)
+    agg.on_price("BTC", 100.0, T0 + 1)
+
+    bars = agg.closed_candles("BTC", "15m")
+    assert [b["open_time"] for b in bars] == [int((T0 - i * 900) * 1000) for i in (3, 2, 1)]
+    assert all(b["close"] == 1.5 and b["ticks"] == 0 for b in bars[1:])
+    assert agg.history_gaps == 1
+    assert "2 candles missing" in capsys.readouterr().out
+
+    unfilled = CandleAggregator(timeframes=["15m"], fill_gaps=False)
+    unfilled.seed("BTC", "15m", stale, now=T0)
+    unfilled.on_price("BTC", 100.0, T0 + 1)
+    assert len(unfilled.closed_candles("BTC", "15m")) == 1
+    assert unfilled.get_status()["history_gaps"] == 1
+
+
+def test_listeners_and_batched_persistence():
+    persisted = []
+    seen = []
+    agg = CandleAggregator(timeframes=["1m"], persist=persisted.append, persist_batch_size=3)
+    agg.add_listener(seen.append)
+
+    for i in range(5):
+        agg.on_price("BTC", 100.0, T0 + i * MINUTE)
+
+    assert len(seen) == 4
+    assert [len(batch) for batch in persisted] == [3]
+    assert agg.get_status()["pending_persist"] == 1
+
+
+def test_failed_persist_is_retried():
+    calls = []
+
+    def flaky(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("mongo down")
+
+    agg = CandleAggregator(timeframes=["1m"], persist=flaky, persist_batch_size=2)
+    for i in range(5):
+        agg.on_price("BTC", 100.0, T0 + i * MINUTE)
+    # The failed batch is retried together with the next closed bar
+    assert calls == [2, 3]
+    assert agg.bars_persisted == 3
+
+
+@pytest.mark.asyncio
+async def test_market_data_feeds_aggregator_from_messages(monkeypatch):
+    clock = {"now": T0 + 1}
+    monkeypatch.setattr("exchanges.hyperliquid.market_data.time.time", lambda: clock["now"])
+
+    md = HyperliquidMarketData(candle_timeframes=["1m"])
+    md.subscribed_assets.add("BTC")
+
+    await md._process_message({"channel": "allMids", "data": {"mids": {"BTC": "100", "ETH": "5"}}})
+    await md._process_message(
+        {"channel": "trades", "data": [{"coin": "BTC", "px": "100", "sz": "2", "time": 0}]}
+    )
+    clock["now"] = T0 + MINUTE
+    await md._process_message({"channel": "allMids", "data": {"mids": {"BTC": "101"}}})
+
+    candles = md.get_candles("BTC", "1m")
+    assert len(candles) == 1
+    assert candles[0]["volume"] == 2.0
+    assert md.get_candles("ETH", "1m") == []
+    assert md.get_status()["candles"]["bars_closed"] == 1
+
+
+def test_ml_service_reads_window_from_aggregator(monkeypatch):
+    from ml import service as ml_service
+
+    mongo_calls = []
+
+    def fake_mongo(limit, symbol, timeframe, latest=False):
+        mongo_calls.append((limit, latest))
+        return []
+
+    monkeypatch.setattr(ml_service, "load_model", lambda path: object())
+    monkeypatch.setattr(ml_service, "load_candles_from_mongo", fake_mongo)
+
+    svc = ml_service.MLSignalService("model.joblib", lookback=3, context_days=0)
+    agg = CandleAggregator(timeframes=["15m"])
+    svc.attach_candle_source(agg)
+    assert mongo_calls == [(svc.history_limit, True)]
+
+    for i in range(5):
+        agg.on_price("BTC", 100.0 + i, T0 + i * 900)
+    candles = svc._recent_candles()
+    assert [c["close"] for c in candles] == [100.0, 101.0, 102.0, 103.0]
+    assert len(mongo_calls) == 1
@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+
+from infrastructure.candle_store import CandleStore
+from tools.benchmarks import synthetic_candles
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def _matches(self, query):
+        bounds = query.get("open_time", {})
+        lower, upper = bounds.get("$gte"), bounds.get("$lte")
+        return [
+            doc
+            for doc in self.docs
+            if doc["symbol"] == query["symbol"]
+            and doc["timeframe"] == query["timeframe"]
+            and (lower is None or doc["open_time"] >= lower)
+            and (upper is None or doc["open_time"] <= upper)
+        ]
+
+    def find(self, query, projection=None, sort=None):
+        self.queries.append(query)
+        rows = [{k: v for k, v in doc.items() if k in projection} for doc in self._matches(query)]
+        return sorted(rows, key=lambda d: d["open_time"])
+
+    def count_documents(self, query):
+        return len(self._matches(query))
+
+
+def test_append_persists_and_reopens(tmp_path):
+    candles = synthetic_candles(100)
+    store = CandleStore(tmp_path)
+    assert store.append("BTC", "15m", candles) == 100
+
+    reopened = CandleStore(tmp_path)
+    series = reopened.series("BTC", "15m")
+    assert len(series) == 100
+    np.testing.assert_array_equal(series["close"], [c["close"] for c in candles])
+    assert reopened.last_open_time("BTC", "15m") == candles[-1]["open_time"]
+
+
+def test_append_skips_overlap_and_duplicates(tmp_path):
+    candles = synthetic_candles(50)
+    store = CandleStore(tmp_path)
+    store.append("BTC", "15m", candles[:30])
+
+    # Overlapping batch, shuffled, with a duplicated row
+    batch = list(reversed(candles[20:])) + [candles[-1]]
+    assert store.append("BTC", "15m", batch) == 20
+    assert store.append("BTC", "15m", candles[:10]) == 0
+
+    open_times = store.series("BTC", "15m")["open_time"]
+    np.testing.assert_array_equal(open_times, [c["open_time"] for c in candles])
+
+
+def test_range_is_zero_copy_binary_search(tmp_path):
+    candles = synthetic_candles(200)
+    store = CandleStore(tmp_path)
+    store.append("BTC", "15m", candles)
+
+    start, end = candles[40]["open_time"], candles[59]["open_time"]
+    window = store.range("BTC", "15m", start, end)
+    assert len(window) == 20
+    assert window["open_time"][0] == start
+    assert window["open_time"][-1] == end
+    assert np.shares_memory(window["close"], store.series("BTC", "15m")["close"])
+
+    assert len(store.range("BTC", "15m", end_time=candles[0]["open_time"] - 1)) == 0
+    assert [c["open_time"] for c in store.tail("BTC", "15m", 3).to_dicts()] == [
+        c["open_time"] for c in candles[-3:]
+    ]
+
+
+def test_sync_from_mongo_pulls_only_new_candles(tmp_path):
+    candles = synthetic_candles(120)
+    collection = FakeCollection(candles[:80])
+    store = CandleStore(tmp_path)
+
+    assert store.sync_from_mongo("BTC", "15m", collection=collection, batch_size=25) == 80
+    collection.docs = candles
+    assert store.sync_from_mongo("BTC", "15m", collection=collection) == 40
+    assert collection.queries[-1]["open_time"] == {"$gte": candles[79]["open_time"]}
+
+    stored = store.head("BTC", "15m", 120).to_dicts()
+    assert stored == [
+        {key: c[key] for key in ("open_time", "open", "high", "low", "close", "volume")}
+        for c in candles
+    ]
+
+
+def test_sync_from_mongo_rebuilds_after_gap_backfill(tmp_path):
+    candles = synthetic_candles(100)
+    with_gap = candles[:30] + candles[50:80]
+    collection = FakeCollection(with_gap)
+    store = CandleStore(tmp_path)
+    assert store.sync_from_mongo("BTC", "15m", collection=collection) == 60
+    held = store.series("BTC", "15m")
+
+    # A backfill fills the gap and new candles arrive at the tail
+    collection.docs = candles
+    assert store.sync_from_mongo("BTC", "15m", collection=collection) == 100
+    np.testing.assert_array_equal(
+        store.series("BTC", "15m")["open_time"], [c["open_time"] for c in candles]
+    )
+    # Views taken before the rebuild still read the old files
+    np.testing.assert_array_equal(held["open_time"], [c["open_time"] for c in with_gap])
+    assert not (tmp_path / ".rebuild" / "BTC" / "15m").exists()
+
+    assert store.sync_from_mongo("BTC", "15m", collection=collection) == 0
+    assert collection.queries[-1]["open_time"] == {"$gte": candles[-1]["open_time"]}
+
+
+def test_sync_from_mongo_rewrites_a_tail_stored_while_forming(tmp_path):
+    candles = [dict(c) for c in synthetic_candles(3)]
+    candles[0]["close"], candles[1]["close"], candles[2]["close"] = 1.0, 2.0, 6.0
+    collection = FakeCollection([dict(c) for c in candles[:2]])
+    store = CandleStore(tmp_path)
+    assert store.sync_from_mongo("BTC", "15m", collection=collection) == 2
+    held = store.series("BTC", "15m")
+
+    # The collector rewrites the bar with its final values once it closes
+    candles[1]["close"] = 5.0
+    collection.docs = candles
+    assert store.sync_from_mongo("BTC", "15m", collection=collection) == 1
+
+    np.testing.assert_array_equal(store.series("BTC", "15m")["close"], [1.0, 5.0, 6.0])
+    assert held["close"][-1] == 5.0  # fixed-width row overwritten in place
+    assert store.append("BTC", "15m", [{**candles[2], "close": 7.0}]) == 0
+    assert store.series("BTC", "15m")["close"][-1] == 7.0
+
+
+def test_empty_series(tmp_path):
+    store = CandleStore(tmp_path)
+    assert store.count("ETH", "1h") == 0
+    assert store.last_open_time("ETH", "1h") is None
+    assert store.range("ETH", "1h").to_dicts() == []
+
+
+def test_load_candles_rejects_unknown_source():
+    from ml.dataset import load_candles
+
+    with pytest.raises(ValueError):
+        load_candles(source="parquet")
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+
+from data_pipeline import collector
+from tools.benchmarks import synthetic_candles
+
+
+class FakeCandleCollection:
+    """Minimal stand-in for the pymongo collection API used by the collector."""
+
+    def __init__(self):
+        self.docs = {}
+        self.indexes = []
+        self.bulk_calls = []
+
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+        return kwargs.get("name")
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_calls.append((len(operations), ordered))
+        inserted = modified = matched = 0
+        for op in operations:
+            key = tuple(op._filter[k] for k in ("symbol", "timeframe", "open_time"))
+            new_doc = dict(op._doc["$set"])
+            if key not in self.docs:
+                inserted += 1
+            else:
+                matched += 1
+                modified += self.docs[key] != new_doc
+            self.docs[key] = new_doc
+        return SimpleNamespace(
+            upserted_count=inserted, modified_count=modified, matched_count=matched
+        )
+
+
+def test_bulk_upsert_batches_and_counts():
+    collection = FakeCandleCollection()
+    candles = synthetic_candles(25)
+
+    stats = collector.bulk_upsert_candles(candles, collection=collection, batch_size=10)
+    assert (stats.inserted, stats.modified, stats.matched) == (25, 0, 0)
+    assert collection.bulk_calls == [(10, False), (10, False), (5, False)]
+
+    changed = dict(candles[3], close=candles[3]["close"] + 1)
+    stats = collector.bulk_upsert_candles(
+        candles[:5] + [changed], collection=collection, batch_size=10
+    )
+    assert (stats.inserted, stats.modified, stats.matched) == (0, 1, 5)
+    assert collection.docs[("BTC", "15m", changed["open_time"])]["close"] == changed["close"]
+
+
+def test_unique_index_created_once_per_collection():
+    collection = FakeCandleCollection()
+    candles = synthetic_candles(3)
+
+    collector.save_candles_to_mongo(candles, collection=collection)
+    collector.save_candles_to_mongo(candles, collection=collection)
+
+    assert len(collection.indexes) == 1
+    keys, options = collection.indexes[0]
+    assert [field for field, _ in keys] == ["symbol", "timeframe", "open_time"]
+    assert options["unique"] is True
+
+
+def test_save_candles_returns_changed_documents():
+    collection = FakeCandleCollection()
+    candles = synthetic_candles(4)
+
+    assert collector.save_candles_to_mongo(candles, collection=collection) == 4
+    assert collector.save_candles_to_mongo(candles, collection=collection) == 0
+    assert collector.save_candles_to_mongo([], collection=collection) == 0
+
+
+def test_bulk_upsert_rejects_bad_batch_size():
+    with pytest.raises(ValueError):
+        collector.bulk_upsert_candles(synthetic_candles(1), collection=object(), batch_size=0)
+
+
+def test_index_cache_keys_pymongo_collections_by_server_and_name(monkeypatch):
+    from pymongo import MongoClient
+
+    monkeypatch.setattr(collector, "_indexed_collections", set())
+    calls = []
+    monkeypatch.setattr(
+        "pymongo.collection.Collection.create_index",
+        lambda self, *args, **kwargs: calls.append(self.full_name),
+    )
+    client = MongoClient("mongodb://localhost:27017", connect=False)
+    other = MongoClient("mongodb://otherhost:27017", connect=False)
+
+    # A fresh Collection object per lookup, as get_mongo_db()["candles"] returns
+    collector.ensure_candle_index(client["bot"]["candles"])
+    collector.ensure_candle_index(client["bot"]["candles"])
+    collector.ensure_candle_index(client["bot"]["candles_5m"])
+    collector.ensure_candle_index(other["bot"]["candles"])
+    assert calls == ["bot.candles", "bot.candles_5m", "bot.candles"]
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from ml import dataset
+from tools.benchmarks import synthetic_candles
+
+
+@pytest.mark.parametrize("lookback", [14, 20, 48])
+def test_vectorized_dataset_matches_window_loop(lookback):
+    candles = synthetic_candles(400, seed=11)
+    # flat stretch exercises the doji / zero-loss RSI branches
+    for candle in candles[200:230]:
+        candle.update(open=candle["close"], high=candle["close"], low=candle["close"])
+
+    X_ref, y_ref = dataset._build_supervised_dataset_loop(candles, lookback, 4)
+    X_vec, y_vec = dataset.build_supervised_dataset(candles, lookback, 4)
+
+    assert y_vec == y_ref
+    assert np.array(X_vec).shape == np.array(X_ref).shape
+    np.testing.assert_allclose(np.array(X_vec), np.array(X_ref), rtol=1e-9, atol=1e-9)
+
+
+def test_vectorized_dataset_rejects_short_series():
+    with pytest.raises(ValueError):
+        dataset.build_supervised_arrays(synthetic_candles(50), 48, 4)
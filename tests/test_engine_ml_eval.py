@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from core.engine import TradingEngine
+from exchanges.hyperliquid.candle_builder import CandleAggregator
+
+T0 = 1_700_000_000 - 1_700_000_000 % 900
+
+
+class FakeMLService:
+    def __init__(self, candle_source=None, timestamp=None):
+        self.symbol = "BTC"
+        self.timeframe = "15m"
+        self.candle_source = candle_source
+        self.timestamp = timestamp
+        self.calls = 0
+
+    def attach_candle_source(self, source):
+        self.candle_source = source
+
+    def evaluate_cached(self, bar):
+        self.calls += 1
+        latest = self.candle_source.latest_closed("BTC", "15m") if self.candle_source else None
+        return {
+            "probability": 0.5,
+            "patterns": {},
+            "timestamp": latest["open_time"] if latest else self.timestamp,
+        }
+
+
+def _engine(ml_service, eval_interval=60, clock=None):
+    config = {"log_level": "ERROR", "ml": {"eval_interval": eval_interval}}
+    engine = TradingEngine(config, clock=clock) if clock else TradingEngine(config)
+    engine.running = True
+    engine.ml_service = ml_service
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_ml_signal_memoized_until_next_bar_closes():
+    candles = CandleAggregator(timeframes=["15m"])
+    service = FakeMLService(candles)
+    engine = _engine(service, eval_interval=0)
+
+    candles.on_price("BTC", 100.0, T0)
+    candles.on_price("BTC", 101.0, T0 + 900)
+    first = await engine._evaluate_ml_signal()
+    for _ in range(5):
+        assert await engine._evaluate_ml_signal() is first
+    assert service.calls == 1
+
+    candles.on_price("BTC", 102.0, T0 + 1000)  # same bar still open
+    await engine._evaluate_ml_signal()
+    assert service.calls == 1
+
+    candles.on_price("BTC", 103.0, T0 + 1800)
+    second = await engine._evaluate_ml_signal()
+    assert service.calls == 2
+    assert second["timestamp"] == (T0 + 900) * 1000
+    assert engine.get_status()["ml"]["cache_hits"] == 6
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ticks_share_one_evaluation():
+    candles = CandleAggregator(timeframes=["15m"])
+    service = FakeMLService(candles)
+    engine = _engine(service)
+    candles.on_price("BTC", 100.0, T0)
+    candles.on_price("BTC", 101.0, T0 + 900)
+
+    results = await asyncio.gather(*(engine._evaluate_ml_signal() for _ in range(10)))
+    assert service.calls == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_bar_close_hook_triggers_evaluation():
+    candles = CandleAggregator(timeframes=["1m", "15m"])
+    service = FakeMLService()
+    engine = _engine(service)
+    engine.market_data = type("MD", (), {"candles": candles})()
+    engine._attach_live_candles()
+
+    candles.on_price("BTC", 100.0, T0)
+    candles.on_price("BTC", 101.0, T0 + 60)  # 1m close only
+    await asyncio.sleep(0)
+    assert service.calls == 0
+
+    candles.on_price("BTC", 102.0, T0 + 900)
+    await asyncio.sleep(0.05)
+    assert service.calls == 1
+    assert engine._ml_cache_bar == T0 * 1000
+
+    await engine._evaluate_ml_signal()
+    assert service.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_lagging_source_retries_after_eval_interval():
+    clock = {"now": T0 + 900 + 5}
+    service = FakeMLService(timestamp=(T0 - 900) * 1000)  # store one bar behind
+    engine = _engine(service, eval_interval=30, clock=lambda: clock["now"])
+
+    await engine._evaluate_ml_signal()
+    await engine._evaluate_ml_signal()
+    assert service.calls == 1
+
+    clock["now"] += 31
+    await engine._evaluate_ml_signal()
+    assert service.calls == 2
+
+    service.timestamp = T0 * 1000  # store caught up: memoized for the rest of the bar
+    clock["now"] += 31
+    await engine._evaluate_ml_signal()
+    clock["now"] += 31
+    await engine._evaluate_ml_signal()
+    assert service.calls == 3
+
+
+
+class ListCandleSource:
+    def __init__(self, candles):
+        self.candles = candles
+
+    def latest_closed(self, symbol, timeframe):
+        return self.candles[-1]
+
+    def closed_candles(self, symbol, timeframe, limit):
+        return self.candles[-limit:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("from_source", [False, True])
+async def test_close_time_labelled_candles_evaluate_once_per_bar(monkeypatch, from_source):
+    import numpy as np
+
+    from ml import service as ml_service
+
+    class Model:
+        def predict_proba(self, rows):
+            return np.array([[0.4, 0.6]] * len(rows))
+
+    interval = 900_000
+    bar = T0 * 1000
+    # Collector rows carry the close time in open_time; the last one is forming
+    candles = [
+        {
+            "open_time": bar - (60 - i) * interval + interval - 1,
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": 100.0 + i % 3,
+            "volume": 1.0,
+        }
+        for i in range(62)
+    ]
+    monkeypatch.setattr(ml_service, "load_model", lambda path: Model())
+    monkeypatch.setattr(ml_service, "load_candles_from_mongo", lambda **kwargs: list(candles))
+    service = ml_service.MLSignalService("model.joblib", lookback=30, context_days=0)
+    if from_source:
+        service.candle_source = ListCandleSource(candles[:-1])
+    calls = []
+    evaluate = service.evaluate_signal
+    monkeypatch.setattr(service, "evaluate_signal", lambda b=None: calls.append(b) or evaluate(b))
+
+    clock = {"now": T0 + 900 + 5}
+    engine = _engine(service, eval_interval=30, clock=lambda: clock["now"])
+    for _ in range(4):
+        signal = await engine._evaluate_ml_signal()
+        clock["now"] += 31
+
+    assert calls == [bar]
+    assert signal["timestamp"] == bar
@@ -0,0 +1,160 @@
+from unittest.mock import Mock
+
+import pytest
+
+from core.equity_curve import RECORD, EquityCurve, read_log
+from exchanges.hyperliquid.adapter import HyperliquidAdapter
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def fill(tid, closed_pnl, fee=0.0, time_ms=2_000_000):
+    return {"tid": tid, "closedPnl": str(closed_pnl), "fee": str(fee), "time": time_ms}
+
+
+def test_peak_to_trough_drawdown():
+    curve = EquityCurve(clock=Clock())
+    for value in (1000, 1200, 900, 1100):
+        curve.record_value(value, unrealized_pnl=value - 1000)
+
+    assert curve.high_water_mark == 1200
+    assert curve.drawdown_pct == pytest.approx(100 / 1200 * 100)
+    assert curve.max_drawdown_pct == pytest.approx(300 / 1200 * 100)
+
+
+def test_deposits_and_withdrawals_do_not_move_drawdown(tmp_path):
+    path = tmp_path / "equity.log"
+    curve = EquityCurve(path, clock=Clock())
+    curve.record_value(1000)
+    curve.record_value(5000)  # deposit
+    curve.record_value(1100, unrealized_pnl=100)
+    curve.record_value(300, unrealized_pnl=100)  # withdrawal
+    curve.close()
+
+    assert curve.value == 300
+    assert curve.high_water_mark == 1100
+    assert curve.drawdown_pct == 0.0
+    assert curve.max_drawdown_pct == 0.0
+
+    restored = EquityCurve(path, clock=Clock())
+    assert restored.equity == pytest.approx(1100)
+    assert restored.high_water_mark == 1100
+    assert restored.drawdown_pct == 0.0
+
+
+def test_realized_pnl_from_fills_is_deduplicated():
+    curve = EquityCurve(clock=Clock(1000.0))
+    curve.record_value(1000)
+
+    curve.on_user_fills({"fills": [fill(1, 10.0, fee=0.5), fill(2, -3.0, fee=0.5)]})
+    curve.on_user_fills({"fills": [fill(2, -3.0, fee=0.5)]})  # resent
+    # Reconnect snapshot: only fills after the curve started count
+    curve.on_user_fills(
+        {"isSnapshot": True, "fills": [fill(3, 50.0, time_ms=500_000), fill(4, 1.0)]}
+    )
+
+    assert curve.realized_pnl == pytest.approx(10.0 - 0.5 - 3.0 - 0.5 + 1.0)
+    assert curve.fills == 3
+
+
+def test_log_survives_restart_and_torn_record(tmp_path):
+    path = tmp_path / "equity.log"
+    clock = Clock()
+    curve = EquityCurve(path, clock=clock)
+    for value in (1000, 1500, 1200):
+        clock.now += 120
+        curve.record_value(value, unrealized_pnl=value - 1000)
+    curve.record_fill(fill(7, 25.0))
+    curve.close()
+
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")  # crash mid-write
+
+    restored = EquityCurve(path, clock=clock)
+    assert restored.high_water_mark == 1500
+    assert restored.value == 1200
+    assert restored.equity == pytest.approx(1225.0)
+    assert restored.realized_pnl == pytest.approx(25.0)
+    assert restored.record_fill(fill(7, 25.0)) is False
+    assert path.stat().st_size == 6 * RECORD.size  # 3 samples, 2 unrealized, 1 fill
+
+    restored.record_value(1600)
+    restored.close()
+    assert [record[3] for record in read_log(path)][-1] == 1600
+
+
+def test_samples_are_throttled(tmp_path):
+    clock = Clock()
+    curve = EquityCurve(tmp_path / "e.log", sample_interval=60, min_change_pct=0.5, clock=clock)
+    for i in range(100):
+        clock.now += 0.5
+        curve.record_value(1000 + i * 0.01)  # tiny moves within a minute
+    clock.now += 60
+    curve.record_value(1001)
+    curve.record_value(1100, unrealized_pnl=100)  # large move is written immediately
+    curve.close()
+
+    assert curve.records_written == 4
+    assert curve.high_water_mark == 1100
+
+
+@pytest.fixture
+def adapter():
+    adapter = HyperliquidAdapter(private_key="0x" + "a" * 64, testnet=True)
+    adapter.is_connected = True
+    adapter.info = Mock()
+    adapter.info.user_state.return_value = {
+        "marginSummary": {"accountValue": "1000"},
+        "assetPositions": [
+            {"position": {"coin": "BTC", "szi": "0.01", "entryPx": "40000"}}
+        ],
+    }
+    adapter.exchange = Mock()
+    adapter.exchange.wallet.address = "0x" + "b" * 40
+    yield adapter
+    adapter.sdk.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_account_metrics_served_from_feed_samples(adapter):
+    btc = {"position": {"coin": "BTC", "szi": "1", "entryPx": "100"}}
+    adapter._streamed_price = {"BTC": 400.0}.get
+    adapter.record_account_state(
+        {"marginSummary": {"accountValue": "1200"}, "assetPositions": [btc]}
+    )
+    adapter._streamed_price = {"BTC": 100.0}.get
+    adapter.record_account_state(
+        {"marginSummary": {"accountValue": "900"}, "assetPositions": [btc]}
+    )
+    adapter.record_account_state({"marginSummary": {"accountValue": "400"}})  # withdrawal
+    adapter.on_user_fills({"fills": [fill(1, 12.0, fee=2.0, time_ms=0)]})
+
+    metrics = await adapter.get_account_metrics()
+
+    adapter.info.user_state.assert_not_called()
+    adapter.info.all_mids.assert_not_called()
+    assert metrics["total_value"] == 400
+    assert metrics["equity"] == pytest.approx(910)
+    assert metrics["high_water_mark"] == 1200
+    assert metrics["drawdown_pct"] == pytest.approx(290 / 1200 * 100)
+    assert metrics["realized_pnl"] == pytest.approx(10.0)
+
+
+@pytest.mark.asyncio
+async def test_account_metrics_refresh_with_single_request_when_stale(adapter):
+    metrics = await adapter.get_account_metrics()
+
+    assert adapter.info.user_state.call_count == 1
+    adapter.info.all_mids.assert_not_called()
+    assert metrics["total_value"] == 1000
+    assert metrics["positions_count"] == 1
+    assert metrics["largest_position_pct"] == pytest.approx(40.0)
+
+    await adapter.get_account_metrics()
+    assert adapter.info.user_state.call_count == 1
@@ -458,3 +458,137 @@ class TestHyperliquidAdapterPrecision:
 
         rounded = round_size(order.size)
         assert rounded == 0.12345
+
+
+META = {
+    "universe": [
+        {"name": "BTC", "szDecimals": 5, "maxLeverage": 40},
+        {"name": "ETH", "szDecimals": 4, "maxLeverage": 25},
+        {"name": "OLD", "szDecimals": 2, "isDelisted": True},
+        {"name": "kPEPE", "szDecimals": 0, "maxLeverage": 10},
+    ]
+}
+SPOT_META = {
+    "tokens": [
+        {"name": "USDC", "index": 0, "szDecimals": 8},
+        {"name": "PURR", "index": 1, "szDecimals": 0},
+    ],
+    "universe": [{"name": "PURR/USDC", "tokens": [1, 0], "index": 0}],
+}
+
+
+class TestAssetMetaPrecision:
+    """Rounding driven by the cached meta/spotMeta metadata"""
+
+    @pytest.fixture
+    def cache(self):
+        from exchanges.hyperliquid.asset_meta import AssetMetaCache
+
+        cache = AssetMetaCache()
+        cache.load(META, SPOT_META)
+        return cache
+
+    def test_perp_and_spot_metadata_parsed(self, cache):
+        btc = cache.get("BTC")
+        assert (btc.asset_id, btc.sz_decimals, btc.price_decimals) == (0, 5, 1)
+        assert cache.get("kPEPE").asset_id == 3
+        assert "OLD" not in cache
+        purr = cache.get("PURR/USDC")
+        assert purr.is_spot and purr.asset_id == 10000
+        assert purr.price_decimals == 8
+
+    def test_btc_price_keeps_whole_dollar_behaviour(self, cache):
+        btc = cache.get("BTC")
+        assert btc.round_price(45123.456) == 45123.0
+        assert btc.round_price(99999.4) == 99999.0
+        # Integer prices are always valid, even above 5 significant figures
+        assert btc.round_price(123456.7) == 123457.0
+
+    def test_non_btc_prices_use_significant_figures(self, cache):
+        assert cache.get("ETH").round_price(2345.678) == 2345.7
+        assert cache.get("ETH").round_price(3.456789) == 3.46  # capped at 6 - szDecimals
+        assert cache.get("kPEPE").round_price(0.0123456789) == 0.012346
+
+    def test_sizes_round_to_sz_decimals(self, cache):
+        assert cache.get("BTC").round_size(0.123456) == 0.12346
+        assert cache.get("ETH").round_size(1.23456) == 1.2346
+        assert cache.get("kPEPE").round_size(1234.6) == 1235.0
+
+    def test_tick_size_and_min_size(self, cache):
+        btc = cache.get("BTC")
+        assert btc.tick_size(45000.0) == 1.0
+        assert btc.tick_size(150000.0) == 1.0
+        assert cache.get("ETH").tick_size(2345.0) == pytest.approx(0.1)
+        assert btc.min_size(50000.0) == 0.0002
+        assert btc.min_size(50000.0) * 50000.0 >= btc.min_notional
+
+    def test_staleness_follows_refresh_interval(self):
+        from exchanges.hyperliquid.asset_meta import AssetMetaCache
+
+        now = [0.0]
+        cache = AssetMetaCache(refresh_interval=60, clock=lambda: now[0])
+        assert cache.is_stale()
+        cache.load(META)
+        now[0] = 59
+        assert not cache.is_stale()
+        now[0] = 61
+        assert cache.is_stale()
+
+
+class TestAdapterUsesCachedMetadata:
+    @pytest.fixture
+    def adapter(self):
+        adapter = HyperliquidAdapter(private_key="0x" + "a" * 64, testnet=True)
+        adapter.is_connected = True
+        adapter.info = Mock()
+        adapter.info.meta.return_value = META
+        adapter.info.spot_meta.return_value = SPOT_META
+        adapter.exchange = Mock()
+        adapter.exchange.wallet.address = "0x" + "b" * 40
+        adapter.exchange.bulk_orders.return_value = {
+            "status": "ok",
+            "response": {"data": {"statuses": [{"resting": {"oid": 1}}]}},
+        }
+        yield adapter
+        adapter.sdk.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_metadata_loaded_once_for_many_orders(self, adapter):
+        for idx in range(3):
+            await adapter.place_order(
+                Order(
+                    id=f"eth_{idx}",
+                    asset="ETH",
+                    side=OrderSide.SELL,
+                    size=0.123456,
+                    order_type=OrderType.LIMIT,
+                    price=3456.789,
+                )
+            )
+
+        assert adapter.info.meta.call_count == 1
+        [request] = adapter.exchange.bulk_orders.call_args[0][0]
+        assert request["limit_px"] == 3456.8
+        assert request["sz"] == 0.1235
+
+    @pytest.mark.asyncio
+    async def test_order_below_min_notional_rejected_locally(self, adapter):
+        with pytest.raises(RuntimeError, match="below minimum"):
+            await adapter.place_order(
+                Order(
+                    id="tiny",
+                    asset="BTC",
+                    side=OrderSide.BUY,
+                    size=0.0001,
+                    order_type=OrderType.LIMIT,
+                    price=45000.0,
+                )
+            )
+        adapter.exchange.bulk_orders.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_market_info_from_cache(self, adapter):
+        info = await adapter.get_market_info("ETH")
+        await adapter.get_market_info("BTC")
+        assert (info.size_precision, info.price_precision, info.min_order_size) == (4, 2, 0.0001)
+        assert adapter.info.meta.call_count == 1
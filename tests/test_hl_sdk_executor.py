@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from exchanges.hyperliquid.adapter import HyperliquidAdapter
+from exchanges.hyperliquid.market_data import HyperliquidMarketData
+from exchanges.hyperliquid.sdk_executor import SDKExecutor, SDKTimeoutError
+from interfaces.exchange import Order, OrderSide, OrderType
+
+
+class SlowExchange:
+    """Blocking stand-in for hyperliquid.exchange.Exchange"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.wallet = type("Wallet", (), {"address": "0x" + "b" * 40})()
+        self.orders = []
+
+    def bulk_orders(self, order_requests):
+        time.sleep(self.delay)
+        self.orders.extend(order_requests)
+        return {
+            "status": "ok",
+            "response": {"data": {"statuses": [{"resting": {"oid": 42}}]}},
+        }
+
+
+class SlowInfo:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def all_mids(self):
+        time.sleep(self.delay)
+        return {"BTC": "50000"}
+
+
+def make_adapter(delay, **kwargs):
+    adapter = HyperliquidAdapter(private_key="0x" + "a" * 64, testnet=True, **kwargs)
+    adapter.is_connected = True
+    adapter.asset_meta.load(
+        {"universe": [{"name": "BTC", "szDecimals": 5}, {"name": "ETH", "szDecimals": 4}]}
+    )
+    adapter.exchange = SlowExchange(delay)
+    adapter.info = SlowInfo(delay)
+    return adapter
+
+
+def limit_order():
+    return Order(
+        id="o1",
+        asset="BTC",
+        side=OrderSide.BUY,
+        size=0.001,
+        order_type=OrderType.LIMIT,
+        price=50000.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_market_data_keeps_flowing_while_an_order_is_placed():
+    adapter = make_adapter(delay=0.3)
+    market_data = HyperliquidMarketData(testnet=True, candle_timeframes=None)
+    market_data.subscribed_assets.add("BTC")
+    received = []
+    market_data.price_callbacks["BTC"] = [lambda data: received.append(time.monotonic())]
+
+    async def feed():
+        price = 50000.0
+        while True:
+            price += 1
+            frame = json.dumps({"channel": "allMids", "data": {"mids": {"BTC": str(price)}}})
+            await market_data._process_raw_message(frame)
+            await asyncio.sleep(0.01)
+
+    feeder = asyncio.create_task(feed())
+    try:
+        started = time.monotonic()
+        order_id = await adapter.place_order(limit_order())
+        finished = time.monotonic()
+    finally:
+        feeder.cancel()
+        adapter.sdk.shutdown()
+
+    assert order_id == "42"
+    assert finished - started >= 0.3
+    during = [t for t in received if started < t < finished]
+    # An inline SDK call would have frozen the loop: no ticks at all
+    assert len(during) >= 10
+
+
+@pytest.mark.asyncio
+async def test_order_timeout_surfaces_as_error():
+    adapter = make_adapter(delay=0.5, order_timeout=0.05)
+    with pytest.raises(RuntimeError, match="timed out"):
+        await adapter.place_order(limit_order())
+    assert adapter.sdk.get_stats()["timeouts"] == 1
+    adapter.sdk.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_info_calls_use_request_timeout():
+    adapter = make_adapter(delay=0.5, request_timeout=0.05)
+    with pytest.raises(RuntimeError, match="timed out"):
+        await adapter.get_market_price("BTC")
+    adapter.sdk.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_is_bounded():
+    executor = SDKExecutor(max_workers=2, timeout=5)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def blocking_call():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return True
+
+    results = await asyncio.gather(*(executor.run(blocking_call) for _ in range(6)))
+    executor.shutdown()
+
+    assert results == [True] * 6
+    assert peak == 2
+    assert executor.get_stats()["calls"] == 6
+
+    # Reusable after shutdown (e.g. reconnect)
+    assert await executor.run(lambda: "again") == "again"
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_error_is_an_asyncio_timeout():
+    executor = SDKExecutor(max_workers=1)
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.run(time.sleep, 0.2, timeout=0.01)
+    with pytest.raises(SDKTimeoutError):
+        await executor.run(time.sleep, 0.2, timeout=0.01)
+    executor.shutdown()
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from ml.features import IncrementalIndicators, INDICATOR_KEYS, compute_indicator_set
+
+
+def _random_candles(count, seed=7, flat_every=0):
+    rng = random.Random(seed)
+    price = 45000.0
+    candles = []
+    for idx in range(count):
+        open_price = price
+        if flat_every and idx % flat_every < 16:
+            close = open_price  # flat stretch -> RSI avg_loss == 0 edge case
+        else:
+            close = max(1.0, open_price * (1 + rng.gauss(0, 0.004)))
+        high = max(open_price, close) * (1 + abs(rng.gauss(0, 0.002)))
+        low = min(open_price, close) * (1 - abs(rng.gauss(0, 0.002)))
+        candles.append(
+            {
+                "open_time": idx * 900_000,
+                "open": open_price,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": abs(rng.gauss(100, 30)),
+            }
+        )
+        price = close
+    return candles
+
+
+@pytest.mark.parametrize("window", [14, 20, 26, 48])
+def test_incremental_matches_compute_indicator_set(window):
+    candles = _random_candles(600, flat_every=150)
+    engine = IncrementalIndicators(window)
+
+    for idx, candle in enumerate(candles):
+        result = engine.update(candle)
+        if idx + 1 < 14:
+            assert result is None
+            continue
+        expected = compute_indicator_set(candles[max(0, idx + 1 - window) : idx + 1])
+        assert list(result.keys()) == INDICATOR_KEYS
+        for key in INDICATOR_KEYS:
+            assert result[key] == pytest.approx(expected[key], rel=1e-9, abs=1e-9), (
+                idx,
+                key,
+            )
+
+
+def test_from_candles_seeds_state():
+    candles = _random_candles(120, seed=3)
+    engine = IncrementalIndicators.from_candles(candles, window=48)
+    expected = compute_indicator_set(candles[-48:])
+    assert engine.values() == pytest.approx(expected, rel=1e-9)
+
+
+def test_values_requires_warmup():
+    engine = IncrementalIndicators(48)
+    engine.update(_random_candles(1)[0])
+    assert not engine.ready
+    with pytest.raises(ValueError):
+        engine.values()
+
+
+def test_window_below_atr_period_rejected():
+    with pytest.raises(ValueError):
+        IncrementalIndicators(10)
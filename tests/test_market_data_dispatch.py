@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from exchanges.hyperliquid.market_data import HyperliquidMarketData
+
+
+def _mids(price):
+    return {"channel": "allMids", "data": {"mids": {"BTC": str(price)}}}
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_sees_latest_price_without_backlog():
+    md = HyperliquidMarketData(candle_timeframes=None)
+    seen = []
+    in_flight = 0
+    peak = 0
+
+    async def slow_handler(market_data):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        seen.append(market_data.price)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+
+    await md.subscribe_price_updates("BTC", slow_handler)
+    for i in range(50):
+        await md._process_message(_mids(100 + i))
+        if i % 10 == 0:
+            await asyncio.sleep(0.025)
+    await asyncio.sleep(0.1)
+
+    assert peak == 1
+    assert seen == sorted(seen)
+    assert seen[-1] == 149.0
+    assert len(seen) < 50
+
+    stats = md.get_status()["dispatch"]["BTC"]
+    assert stats["received"] == 50
+    assert stats["delivered"] == len(seen)
+    assert stats["dropped"] == 50 - len(seen)
+    assert 0 < stats["coalesced"] <= stats["dropped"]
+    assert stats["max_lag"] > 0
+
+
+@pytest.mark.asyncio
+async def test_sync_callbacks_are_called_inline_and_errors_counted():
+    md = HyperliquidMarketData(candle_timeframes=None)
+    sync_seen = []
+
+    async def failing(market_data):
+        raise RuntimeError("boom")
+
+    await md.subscribe_price_updates("BTC", sync_seen.append)
+    await md.subscribe_price_updates("BTC", failing)
+    await md._process_message(_mids(100))
+    assert [m.price for m in sync_seen] == [100.0]
+
+    await asyncio.sleep(0)
+    assert md.get_dispatch_stats()["BTC"]["errors"] == 1
+
+    await md.unsubscribe_price_updates("BTC", failing)
+    assert md.get_dispatch_stats() == {}
@@ -0,0 +1,251 @@
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from core.engine import TradingEngine
+from core.order_tracker import OrderTracker
+from exchanges.hyperliquid.market_data import HyperliquidMarketData
+from interfaces.exchange import Order, OrderSide, OrderStatus, OrderType
+from interfaces.strategy import SignalType, TradingSignal
+
+
+def make_order(idx, oid, price=50000.0, size=0.01, asset="BTC", created_at=100.0):
+    return Order(
+        id=f"order_{idx}",
+        asset=asset,
+        side=OrderSide.BUY,
+        size=size,
+        order_type=OrderType.LIMIT,
+        price=price,
+        exchange_order_id=str(oid),
+        created_at=created_at,
+    )
+
+
+def make_signal(level):
+    return TradingSignal(
+        signal_type=SignalType.BUY,
+        asset="BTC",
+        size=0.01,
+        price=50000.0,
+        metadata={"level_index": level},
+    )
+
+
+def fill(oid, px, sz, tid):
+    return {"coin": "BTC", "oid": oid, "px": str(px), "sz": str(sz), "tid": tid}
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, order, signal):
+        self.calls.append((order.id, order.filled_size, order.average_fill_price, signal))
+
+
+def test_indexes_by_oid_asset_and_price_level():
+    tracker = OrderTracker()
+    tracker.track(make_order(1, 11, price=49000.0))
+    tracker.track(make_order(2, 12, price=49000.0))
+    tracker.track(make_order(3, 13, asset="ETH", price=3000.0))
+
+    assert tracker.get_by_oid(12).id == "order_2"
+    assert {o.id for o in tracker.orders_at("BTC", 49000.0)} == {"order_1", "order_2"}
+    assert [o.id for o in tracker.open_orders("ETH")] == ["order_3"]
+    assert tracker.has_open_orders("BTC") and not tracker.has_open_orders("SOL")
+
+
+def test_partial_then_full_fill_notifies_once():
+    recorder = Recorder()
+    tracker = OrderTracker(on_fill=recorder)
+    signal = make_signal(3)
+    tracker.track(make_order(1, 11), signal)
+
+    tracker.on_user_fills({"fills": [fill(11, 50000, 0.004, tid=1)]})
+    order = tracker.get("order_1")
+    assert order.status == OrderStatus.PARTIALLY_FILLED
+    assert recorder.calls == []
+
+    # Duplicate trade id (e.g. redelivered after reconnect) is ignored
+    tracker.on_user_fills({"fills": [fill(11, 50000, 0.004, tid=1), fill(11, 50100, 0.006, tid=2)]})
+    tracker.on_order_updates([{"order": {"oid": 11, "coin": "BTC"}, "status": "filled"}])
+
+    assert order.status == OrderStatus.FILLED
+    assert not tracker.has_open_orders()
+    [(order_id, size, price, seen_signal)] = recorder.calls
+    assert (order_id, seen_signal) == ("order_1", signal)
+    assert size == pytest.approx(0.01)
+    assert price == pytest.approx(50060.0)
+
+
+def test_snapshot_applies_missed_fills_of_tracked_orders_only():
+    recorder = Recorder()
+    tracker = OrderTracker(on_fill=recorder)
+    tracker.track(make_order(1, 11), make_signal(0))
+    tracker.track(make_order(2, 12), make_signal(1))
+    tracker.on_user_fills({"fills": [fill(12, 50000, 0.01, tid=2)]})
+
+    # Resubscribe snapshot: history, a fill applied live, and one missed while down
+    snapshot = [
+        fill(5, 48000, 0.01, tid=0),
+        fill(12, 50000, 0.01, tid=2),
+        fill(11, 49900, 0.01, tid=3),
+    ]
+    tracker.on_user_fills({"isSnapshot": True, "fills": snapshot})
+
+    assert tracker.get("order_1").status == OrderStatus.FILLED
+    assert [call[0] for call in recorder.calls] == ["order_2", "order_1"]
+    assert tracker.get_status()["early_fills"] == 0
+
+
+def test_fill_arriving_before_placement_returns_is_applied_on_track():
+    recorder = Recorder()
+    tracker = OrderTracker(on_fill=recorder)
+    tracker.apply_fill(fill(11, 50000, 0.01, tid=1))
+    tracker.track(make_order(1, 11), make_signal(0))
+    assert tracker.get("order_1").status == OrderStatus.FILLED
+    assert len(recorder.calls) == 1
+
+
+def test_cancel_after_partial_fill_reports_filled_part():
+    recorder = Recorder()
+    tracker = OrderTracker(on_fill=recorder)
+    tracker.track(make_order(1, 11), make_signal(0))
+    tracker.apply_fill(fill(11, 50000, 0.002, tid=1))
+    tracker.on_order_updates([{"order": {"oid": 11}, "status": "canceled"}])
+
+    assert tracker.get("order_1").status == OrderStatus.CANCELLED
+    assert recorder.calls[0][1] == pytest.approx(0.002)
+
+
+def test_reconcile_closes_missing_and_adopts_unknown():
+    tracker = OrderTracker()
+    tracker.track(make_order(1, 11, created_at=100.0))
+    tracker.track(make_order(2, 12, created_at=100.0))
+    tracker.track(make_order(3, 13, created_at=205.0))  # placed after the snapshot request
+    foreign = make_order(99, 99)
+
+    diff = tracker.reconcile([make_order(1, 11), foreign], as_of=200.0)
+
+    assert [o.id for o in diff["missing"]] == ["order_2"]
+    assert tracker.get("order_2").status == OrderStatus.CANCELLED
+    assert [o.id for o in diff["adopted"]] == ["order_99"]
+    assert {o.id for o in tracker.open_orders()} == {"order_1", "order_3", "order_99"}
+
+
+def test_reconcile_looks_up_orders_filled_while_disconnected():
+    recorder = Recorder()
+    tracker = OrderTracker(on_fill=recorder)
+    tracker.track(make_order(1, 77), make_signal(0))
+    tracker.track(make_order(2, 78), make_signal(1))
+    tracker.track(make_order(3, 79), make_signal(2))
+
+    assert [o.id for o in tracker.unresolved([], as_of=200.0)] == ["order_1", "order_2", "order_3"]
+    filled = make_order(0, 77, price=49500.0)
+    filled.status = OrderStatus.FILLED
+    resting = make_order(0, 78)
+    resting.status = OrderStatus.SUBMITTED
+    diff = tracker.reconcile([], as_of=200.0, statuses={"77": filled, "78": resting})
+
+    assert [o.id for o in diff["missing"]] == ["order_1", "order_3"]
+    assert tracker.get("order_1").status == OrderStatus.FILLED
+    [(order_id, size, price, signal)] = recorder.calls
+    assert (order_id, size, price, signal.metadata["level_index"]) == ("order_1", 0.01, 49500.0, 0)
+    assert tracker.get("order_2").status == OrderStatus.SUBMITTED  # stale snapshot
+    assert tracker.get("order_3").status == OrderStatus.CANCELLED  # no status: as before
+
+
+@pytest.mark.asyncio
+async def test_engine_reconcile_books_fill_missed_across_reconnect():
+    engine = TradingEngine({"log_level": "ERROR", "strategy": {"symbol": "BTC"}})
+    executed = []
+
+    class Strategy:
+        def on_trade_executed(self, signal, price, size):
+            executed.append((signal.metadata["level_index"], price, size))
+
+    async def get_order_status(oid):
+        order = make_order(0, oid)
+        order.status = OrderStatus.FILLED
+        return order
+
+    engine.strategy = Strategy()
+    engine.exchange = Mock(is_connected=True)
+    engine.exchange.get_open_orders = AsyncMock(return_value=[])
+    engine.exchange.get_order_status = get_order_status
+    engine.order_tracker.track(make_order(1, 77), make_signal(4))
+
+    await engine._reconcile_orders()
+
+    assert executed == [(4, 50000.0, 0.01)]
+    assert engine.pending_orders == {}
+
+
+def test_history_is_bounded():
+    tracker = OrderTracker(history=2)
+    for idx in range(5):
+        tracker.track(make_order(idx, 100 + idx))
+        tracker.on_order_updates([{"order": {"oid": 100 + idx}, "status": "canceled"}])
+    assert tracker.get_status()["tracked"] == 2
+    assert tracker.get_by_oid(100) is None
+
+
+@pytest.mark.asyncio
+async def test_market_data_routes_order_channels():
+    market_data = HyperliquidMarketData(testnet=True, candle_timeframes=None)
+    tracker = OrderTracker()
+    await market_data.subscribe_order_updates("0xabc", tracker.on_order_updates, tracker.on_user_fills)
+    assert market_data.user_channels == {"0xabc": {"orderUpdates", "userFills"}}
+
+    tracker.track(make_order(1, 11))
+    await market_data._process_raw_message(
+        json.dumps({"channel": "userFills", "data": {"fills": [fill(11, 50000, 0.01, tid=7)]}})
+    )
+    assert tracker.get("order_1").status == OrderStatus.FILLED
+
+
+@pytest.mark.asyncio
+async def test_market_data_multiplexes_wallets_on_one_connection():
+    market_data = HyperliquidMarketData(testnet=True, candle_timeframes=None)
+    trackers = {"0xabc": OrderTracker(), "0xdef": OrderTracker()}
+    for user, tracker in trackers.items():
+        await market_data.subscribe_order_updates(
+            user, tracker.on_order_updates, tracker.on_user_fills
+        )
+        tracker.track(make_order(1, 11))  # same oid on both wallets
+
+    sent = []
+    market_data.ws = Mock(send=AsyncMock(side_effect=lambda msg: sent.append(json.loads(msg))))
+    await market_data._send_user_subscriptions()
+    assert sorted((m["subscription"]["user"], m["subscription"]["type"]) for m in sent) == [
+        ("0xabc", "orderUpdates"),
+        ("0xabc", "userFills"),
+        ("0xdef", "orderUpdates"),
+        ("0xdef", "userFills"),
+    ]
+
+    payload = {"user": "0xDEF", "fills": [fill(11, 50000, 0.01, tid=7)]}
+    await market_data._process_raw_message(json.dumps({"channel": "userFills", "data": payload}))
+    assert trackers["0xdef"].get("order_1").status == OrderStatus.FILLED
+    assert trackers["0xabc"].get("order_1").status != OrderStatus.FILLED
+
+
+@pytest.mark.asyncio
+async def test_engine_drives_strategy_from_fills():
+    engine = TradingEngine({"log_level": "ERROR", "strategy": {"symbol": "BTC"}})
+    executed = []
+
+    class Strategy:
+        def on_trade_executed(self, signal, price, size):
+            executed.append((signal.metadata["level_index"], price, size))
+
+    engine.strategy = Strategy()
+    engine.order_tracker.track(make_order(1, 11), make_signal(4))
+    assert len(engine.pending_orders) == 1
+
+    engine.order_tracker.on_user_fills({"fills": [fill(11, 49950, 0.01, tid=1)]})
+    assert executed == [(4, 49950.0, 0.01)]
+    assert engine.executed_trades == 1
+    assert engine.pending_orders == {}
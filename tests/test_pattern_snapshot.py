@@ -0,0 +1,116 @@
+import pytest
+
+from data_pipeline import pattern_snapshot
+from data_pipeline.pattern_snapshot import (
+    SnapshotParams,
+    candle_chunks,
+    evaluate_outcome,
+    resume_point,
+    snapshot_chunk,
+    write_signals,
+)
+from ml.features import compute_indicator_set
+from ml.patterns import analyze_patterns
+from tools.benchmarks import synthetic_candles
+
+PARAMS = SnapshotParams(lookback=20, horizon=4, gain_pct=0.01, stop_pct=0.01)
+
+
+class FakeSignalCollection:
+    """Minimal stand-in for the pymongo collection API used by the snapshot."""
+
+    def __init__(self):
+        self.docs = []
+        self.insert_calls = []
+
+    def insert_many(self, docs, ordered=True):
+        self.insert_calls.append((len(docs), ordered))
+        self.docs.extend(dict(doc) for doc in docs)
+
+    def find_one(self, query, projection=None, sort=None):
+        matches = [d for d in self.docs if all(d[k] == v for k, v in query.items())]
+        return max(matches, key=lambda d: d["entry_time"], default=None)
+
+    def delete_many(self, query):
+        self.docs = [d for d in self.docs if not all(d[k] == v for k, v in query.items())]
+
+
+def reference_docs(candles, params):
+    """The original one-window-at-a-time snapshot loop"""
+
+    docs = []
+    for entry in range(params.lookback - 1, len(candles) - params.horizon - 1):
+        window = candles[entry - params.lookback + 1 : entry + 1]
+        active = [name for name, flag in analyze_patterns(window).items() if flag]
+        if not active:
+            continue
+        outcome = evaluate_outcome(
+            candles, entry, params.horizon, params.gain_pct, params.stop_pct
+        )
+        for name in active:
+            docs.append((candles[entry]["open_time"], name, outcome, compute_indicator_set(window)))
+    return docs
+
+
+def assert_matches_reference(docs, candles, params):
+    expected = reference_docs(candles, params)
+    assert sorted((d["entry_time"], d["pattern"]) for d in docs) == sorted(
+        (t, name) for t, name, _, _ in expected
+    )
+    by_key = {(d["entry_time"], d["pattern"]): d for d in docs}
+    for entry_time, name, outcome, indicators in expected:
+        doc = by_key[(entry_time, name)]
+        assert {k: doc[k] for k in outcome} == pytest.approx(outcome)
+        assert doc["indicators"] == pytest.approx(indicators, rel=1e-9)
+
+
+def test_chunked_snapshot_matches_window_loop():
+    candles = synthetic_candles(700, seed=3)
+    chunks = list(candle_chunks(iter(candles), 150, PARAMS.overlap))
+
+    assert len(chunks) == 6
+    assert chunks[1]["open_time"][0] == candles[150 - PARAMS.overlap]["open_time"]
+    docs = [doc for chunk in chunks for doc in snapshot_chunk(chunk, PARAMS)]
+    assert len({(d["entry_time"], d["pattern"]) for d in docs}) == len(docs)
+    assert {d["outcome"] for d in docs} == {"target", "stop", "open"}
+    assert_matches_reference(docs, candles, PARAMS)
+
+
+def test_write_signals_on_workers_and_resume_incrementally():
+    candles = synthetic_candles(900, seed=4)
+    collection = FakeSignalCollection()
+
+    chunks = candle_chunks(candles[:500], 200, PARAMS.overlap)
+    first = write_signals(collection, chunks, PARAMS, workers=2, batch=50, max_pending=1)
+    assert first == len(collection.docs) > 0
+    assert all(ordered is False and size <= 50 for size, ordered in collection.insert_calls)
+    entry_times = [d["entry_time"] for d in collection.docs]
+    assert entry_times == sorted(entry_times)
+
+    # Simulate an interrupted run: only part of the last entry got written
+    last_time = entry_times[-1]
+    collection.docs.pop()
+    since = resume_point(collection, PARAMS)
+    assert since == last_time
+    assert all(d["entry_time"] < since for d in collection.docs)
+
+    # The caller streams the lookback - 1 candles before `since` as warmup
+    start = next(i for i, c in enumerate(candles) if c["open_time"] >= since)
+    resumed = candles[start - (PARAMS.lookback - 1) :]
+    write_signals(collection, candle_chunks(resumed, 200, PARAMS.overlap), PARAMS, since, workers=1)
+
+    assert_matches_reference(collection.docs, candles, PARAMS)
+    other = SnapshotParams(lookback=20, horizon=4, gain_pct=0.02, stop_pct=0.01)
+    assert resume_point(collection, other) is None
+
+
+def test_series_chunks_cover_store_columns():
+    candles = synthetic_candles(450, seed=5)
+    columns = pattern_snapshot._columns(candles)
+    streamed = list(candle_chunks(candles, 100, PARAMS.overlap))
+    sliced = list(pattern_snapshot.series_chunks(columns, 100, PARAMS.overlap))
+
+    assert [len(c["open_time"]) for c in sliced] == [len(c["open_time"]) for c in streamed]
+    assert [c["open_time"][0] for c in sliced] == [c["open_time"][0] for c in streamed]
+    with pytest.raises(ValueError):
+        list(candle_chunks(candles, PARAMS.overlap, PARAMS.overlap))
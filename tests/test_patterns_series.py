@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from ml.dataset import candle_columns
+from ml.patterns import PATTERN_NAMES, analyze_patterns, analyze_patterns_series
+from tools.benchmarks import synthetic_candles
+
+
+@pytest.mark.parametrize("lookback", [1, 3, 5, 12, 48])
+def test_series_matches_scalar_detectors(lookback):
+    candles = synthetic_candles(600, seed=5)
+    # flat stretch and dojis exercise the zero-range branches
+    for candle in candles[300:330]:
+        candle.update(open=candle["close"], high=candle["close"], low=candle["close"])
+    for candle in candles[400:420]:
+        candle["open"] = candle["close"]
+
+    flags = analyze_patterns_series(candle_columns(candles), lookback)
+
+    assert flags.shape == (len(candles), len(PATTERN_NAMES)) and flags.dtype == bool
+    for idx in range(len(candles)):
+        scalar = analyze_patterns(candles[max(0, idx - lookback + 1) : idx + 1])
+        expected = [bool(scalar.get(name)) for name in PATTERN_NAMES]
+        assert flags[idx].tolist() == expected, idx
+    assert flags.any(axis=0).sum() >= 3
+
+
+def test_series_handles_empty_input():
+    empty = {key: np.array([]) for key in ("open", "high", "low", "close")}
+    assert analyze_patterns_series(empty, 10).shape == (0, len(PATTERN_NAMES))
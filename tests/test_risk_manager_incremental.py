@@ -0,0 +1,185 @@
+import pytest
+
+from core.engine import TradingEngine
+from core.risk_manager import (
+    RiskEvent,
+    RiskAction,
+    RiskEventHistory,
+    RiskManager,
+    StopLossRule,
+)
+from interfaces.strategy import MarketData, Position
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def tick(asset, price, ts=0.0):
+    return MarketData(asset=asset, price=price, volume_24h=0.0, timestamp=ts)
+
+
+def position(asset, size, entry):
+    return Position(asset, size, entry, abs(size) * entry, 0.0, 0.0)
+
+
+class RecordingStopLoss(StopLossRule):
+    def __init__(self, config):
+        super().__init__(config)
+        self.seen = []
+
+    def evaluate(self, positions, market_data, account_metrics):
+        self.seen.append(sorted(p.asset for p in positions))
+        return super().evaluate(positions, market_data, account_metrics)
+
+
+def make_manager(clock=None, **risk):
+    manager = RiskManager({"risk_management": risk}, clock=clock or Clock())
+    rule = RecordingStopLoss({"enabled": True, "loss_pct": 5.0})
+    manager.add_rule(rule)
+    return manager, rule
+
+
+def test_per_asset_rule_only_sees_ticked_asset():
+    manager, rule = make_manager()
+    positions = [position("BTC", 1.0, 100.0), position("ETH", 2.0, 50.0)]
+    manager.sync_account(1000.0, positions)
+    manager.evaluate_pending()
+    rule.seen.clear()
+
+    manager.on_market_data(tick("ETH", 51.0), positions)
+    manager.on_market_data(tick("SOL", 10.0), positions)  # no position: nothing to re-run
+
+    assert rule.seen == [["ETH"]]
+
+
+def test_stop_loss_fires_from_tick_revaluation():
+    manager, _ = make_manager()
+    positions = [position("BTC", 1.0, 100.0)]
+    manager.sync_account(1000.0, positions)
+
+    events = manager.on_market_data(tick("BTC", 90.0), positions)
+
+    assert [e.rule_name for e in events] == ["stop_loss"]
+    assert manager.get_account_metrics().unrealized_pnl == pytest.approx(-10.0)
+
+
+def test_events_are_stamped_from_the_manager_clock():
+    clock = Clock(50_000.0)  # simulated time, far from the wall clock
+    manager, _ = make_manager(clock=clock)
+    positions = [position("BTC", 1.0, 100.0)]
+    manager.sync_account(1000.0, positions)
+
+    events = manager.on_market_data(tick("BTC", 90.0), positions)
+    assert [e.timestamp for e in events] == [50_000.0]
+    assert manager.get_status()["recent_events"] == 1
+    assert manager.get_recent_events() == events
+
+    clock.now += 2 * 3600
+    assert manager.get_status()["recent_events"] == 0
+
+
+def test_drawdown_is_measured_from_high_water_mark():
+    manager, _ = make_manager()
+    positions = [position("BTC", 1.0, 100.0)]
+    manager.sync_account(1000.0, positions)
+
+    manager.on_market_data(tick("BTC", 200.0), positions)  # equity 1100
+    manager.on_market_data(tick("BTC", 150.0), positions)  # equity 1050
+
+    metrics = manager.metrics
+    assert metrics.high_water_mark == pytest.approx(1100.0)
+    assert metrics.drawdown_pct == pytest.approx(50 / 1100 * 100)
+
+
+def drawdown_events(events):
+    return [e.action for e in events if e.rule_name == "max_drawdown"]
+
+
+def test_withdrawal_does_not_trigger_drawdown_rule():
+    manager = RiskManager({"risk_management": {"max_drawdown_pct": 15.0}}, clock=Clock())
+    positions = [position("BTC", 5.0, 100.0)]
+    manager.sync_account(1000.0, positions)
+    manager.evaluate_pending()
+
+    manager.sync_account(400.0, positions)  # 600 withdrawn, no PnL
+
+    assert drawdown_events(manager.evaluate_pending()) == []
+    assert manager.metrics.account_value == pytest.approx(400.0)
+    assert manager.metrics.high_water_mark == pytest.approx(1000.0)
+    assert manager.metrics.drawdown_pct == 0.0
+
+    # A persisted peak is honoured in the same equity units after a restart
+    restarted = RiskManager({"risk_management": {"max_drawdown_pct": 15.0}}, clock=Clock())
+    restarted.sync_account(
+        400.0, positions, realized_pnl=0.0, high_water_mark=1000.0, equity=1000.0
+    )
+    assert drawdown_events(restarted.evaluate_pending()) == []
+
+    events = manager.on_market_data(tick("BTC", 60.0), positions)  # a real 200 loss
+    assert drawdown_events(events) == [RiskAction.EMERGENCY_EXIT]
+
+
+def test_realized_pnl_from_fills_books_into_equity():
+    manager, _ = make_manager()
+    manager.sync_account(1000.0, [])
+    assert not manager.account_sync_due()
+
+    manager.on_fill(realized_pnl=25.0)
+
+    assert manager.metrics.equity == pytest.approx(1025.0)
+    assert manager.metrics.realized_pnl == pytest.approx(25.0)
+    assert manager.account_sync_due()
+
+
+def test_history_is_bounded_and_counts_window():
+    clock = Clock(0.0)
+    history = RiskEventHistory(
+        bucket_seconds=10, max_buckets=6, max_events_per_bucket=3, clock=clock
+    )
+
+    for second in range(0, 120):
+        clock.now = float(second)
+        history.add(
+            RiskEvent("r", "BTC", RiskAction.NONE, "x", "LOW", {}, timestamp=clock.now)
+        )
+
+    assert history.total == 120
+    assert len(history) <= 6 * 3
+    assert history.count_since(30) == 40  # buckets 80-119
+    assert history.count_since(10_000) == 60  # whole ring
+    assert all(e.timestamp >= 90 for e in history.events_since(30))
+
+    clock.now = 1000.0
+    assert history.count_since(3600) == 0
+
+
+class MetricsExchange:
+    def __init__(self):
+        self.metric_calls = 0
+
+    async def get_account_metrics(self):
+        self.metric_calls += 1
+        return {"total_value": 1000.0, "realized_pnl": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_engine_fetches_account_metrics_only_when_sync_due():
+    engine = TradingEngine({"log_level": "ERROR", "strategy": {"symbol": "BTC"}})
+    engine.exchange = MetricsExchange()
+    engine.risk_manager = RiskManager(
+        {"risk_management": {"account_sync_interval": 60}}
+    )
+    engine.current_positions = [position("BTC", 0.1, 100.0)]
+
+    for i in range(50):
+        await engine._handle_risk_events(tick("BTC", 100.0 + i * 0.01))
+    assert engine.exchange.metric_calls == 1
+
+    engine.risk_manager.request_account_sync()  # e.g. after a fill
+    await engine._handle_risk_events(tick("BTC", 101.0))
+    assert engine.exchange.metric_calls == 2
@@ -0,0 +1,92 @@
+import random
+from collections import deque
+
+import pytest
+
+from interfaces.strategy import MarketData
+from strategies.grid.basic_grid import BasicGridStrategy
+from utils.rolling_window import RollingExtrema
+
+
+def _ticks(count, seed=3):
+    rng = random.Random(seed)
+    timestamp, price = 1_700_000_000.0, 100.0
+    for _ in range(count):
+        timestamp += rng.choice([0.0, 0.05, 0.3, 1.0, 7.0])
+        price = max(1.0, price * (1 + rng.gauss(0, 0.002)))
+        yield timestamp, price
+
+
+def test_matches_naive_window_scan():
+    window = RollingExtrema(60.0)
+    naive = deque()
+    for timestamp, price in _ticks(5000):
+        window.add(timestamp, price)
+        naive.append((timestamp, price))
+        while naive[0][0] < timestamp - 60.0:
+            naive.popleft()
+        prices = [p for _, p in naive]
+        assert window.max == max(prices)
+        assert window.min == min(prices)
+        assert len(window) == len(naive)
+
+
+def test_buckets_bound_memory():
+    window = RollingExtrema(60.0, bucket_seconds=1.0)
+    timestamp = 0.0
+    for i in range(20_000):
+        timestamp += 0.01  # 100 ticks per second
+        window.add(timestamp, 100.0 + (i % 50))
+    assert window.entries <= 3 * 62
+    assert len(window) > 5000
+    assert window.max == 149.0 and window.min == 100.0
+
+
+@pytest.mark.parametrize("step", [-0.01, 0.01])
+def test_buckets_bound_memory_on_monotonic_tape(step):
+    window = RollingExtrema(60.0, bucket_seconds=1.0)
+    naive = deque()
+    for i in range(12_000):
+        timestamp, price = i * 0.01, 1000.0 + i * step  # 100 ticks/s, one direction
+        window.add(timestamp, price)
+        naive.append((window._bucket(timestamp), price))
+        while naive[0][0] < timestamp - 60.0:
+            naive.popleft()
+    assert window.entries <= 3 * 62
+    assert window.max == max(p for _, p in naive)
+    assert window.min == min(p for _, p in naive)
+
+
+def test_extremes_expire_with_the_window():
+    window = RollingExtrema(10.0, bucket_seconds=1.0)
+    window.add(0.2, 150.0)
+    window.add(0.7, 50.0)
+    window.add(5.0, 100.0)
+    assert (window.max, window.min) == (150.0, 50.0)
+    window.add(11.5, 101.0)  # bucket [0, 1) is now outside the window
+    assert (window.max, window.min) == (101.0, 100.0)
+    assert len(window) == 2
+
+
+@pytest.mark.parametrize("bucket_seconds", [0.0, 1.0])
+def test_strategy_momentum_bias(bucket_seconds):
+    strategy = BasicGridStrategy(
+        {
+            "symbol": "BTC",
+            "levels": 5,
+            "range_pct": 5,
+            "momentum": {"window_minutes": 1, "bucket_seconds": bucket_seconds},
+        }
+    )
+
+    def tick(timestamp, price):
+        strategy._update_short_term_bias(
+            MarketData(asset="BTC", price=price, volume_24h=0.0, timestamp=timestamp)
+        )
+        return strategy.short_term_bias
+
+    assert tick(1000.0, 100.0) is None
+    assert tick(1010.0, 94.0) == "bearish"
+    assert strategy.last_momentum_event == "drop_0.05"
+    assert tick(1090.0, 94.5) is None  # the 100.0 peak left the 60s window
+    assert tick(1100.0, 104.0) == "bullish"
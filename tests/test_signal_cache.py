@@ -0,0 +1,176 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ml.signal_cache import InMemoryRedis, SignalCache, create_signal_cache
+
+KEY = SignalCache.key("BTC", "15m", "model-abc", 1_700_000_000_000)
+
+
+def test_local_lru_evicts_oldest():
+    cache = SignalCache(local_size=2)
+    for open_time in (1, 2, 3):
+        cache.set(SignalCache.key("BTC", "15m", "m", open_time), {"t": open_time})
+
+    assert cache.get(SignalCache.key("BTC", "15m", "m", 1)) is None
+    assert cache.get(SignalCache.key("BTC", "15m", "m", 3)) == {"t": 3}
+    assert cache.local_hits == 1
+
+
+def test_second_process_reuses_shared_result():
+    backend = InMemoryRedis()
+    first, second = SignalCache(backend), SignalCache(backend)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"probability": np.float64(0.7), "patterns": {"doji": np.bool_(True)}}
+
+    first.get_or_compute(KEY, compute)
+    shared = second.get_or_compute(KEY, compute)
+
+    assert len(calls) == 1
+    assert shared == {"probability": 0.7, "patterns": {"doji": True}}
+    assert second.remote_hits == 1
+    second.get_or_compute(KEY, compute)
+    assert second.local_hits == 1
+
+
+def test_concurrent_misses_compute_once():
+    backend = InMemoryRedis()
+    caches = [SignalCache(backend, poll_interval=0.01) for _ in range(4)]
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"probability": 0.4}
+
+    threads = [
+        threading.Thread(target=lambda c=c: results.append(c.get_or_compute(KEY, compute)))
+        for c in caches
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"probability": 0.4}] * 4
+
+
+def test_unshareable_result_is_not_cached():
+    cache = SignalCache(InMemoryRedis())
+    value = cache.get_or_compute(KEY, lambda: {"timestamp": 1}, shareable=lambda v: False)
+
+    assert value == {"timestamp": 1}
+    assert cache.get(KEY) is None
+
+
+class BrokenBackend:
+    def get(self, name):
+        raise ConnectionError("redis down")
+
+    set = delete = get
+
+
+def test_backend_failure_falls_back_to_local():
+    cache = SignalCache(BrokenBackend(), retry_after=60)
+
+    assert cache.get_or_compute(KEY, lambda: {"p": 1}) == {"p": 1}
+    assert cache.get_or_compute(KEY, lambda: {"p": 2}) == {"p": 1}
+    assert cache.backend_errors == 1
+    assert not cache.backend_available
+
+
+def test_create_signal_cache_from_config(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    assert create_signal_cache({"enabled": False}) is None
+    assert create_signal_cache(None).backend is None
+    memory = create_signal_cache({"backend": "memory", "local_size": 8})
+    assert isinstance(memory.backend, InMemoryRedis) and memory.local_size == 8
+    with pytest.raises(ValueError):
+        create_signal_cache({"backend": "memcached"})
+
+
+class FakeModel:
+    def predict_proba(self, rows):
+        return np.array([[0.25, 0.75]] * len(rows))
+
+
+def test_ml_services_share_evaluations(monkeypatch):
+    from ml import service as ml_service
+
+    interval = 900_000
+    candles = [
+        {
+            "open_time": i * interval,
+            "open": 100.0 + i,
+            "high": 101.0 + i,
+            "low": 99.0 + i,
+            "close": 100.5 + i,
+            "volume": 10.0,
+        }
+        for i in range(80)
+    ]
+    mongo_reads = []
+
+    def fake_mongo(limit, symbol, timeframe, latest=False):
+        mongo_reads.append(limit)
+        return list(candles)
+
+    monkeypatch.setattr(ml_service, "load_model", lambda path: FakeModel())
+    monkeypatch.setattr(ml_service, "load_candles_from_mongo", fake_mongo)
+
+    backend = InMemoryRedis()
+    services = []
+    for _ in range(3):
+        svc = ml_service.MLSignalService("model.joblib", lookback=30, context_days=0)
+        svc.signal_cache = SignalCache(backend)
+        services.append(svc)
+
+    bar = candles[-2]["open_time"]  # the last stored candle is still forming
+    signals = [svc.evaluate_cached(bar) for svc in services]
+
+    assert len(mongo_reads) == 1
+    assert signals[0]["timestamp"] == bar
+    assert all(s["probability"] == pytest.approx(0.75) for s in signals)
+    assert len({svc.model_id for svc in services}) == 1
+
+
+def test_close_time_labelled_candles_are_shared(monkeypatch):
+    from ml import service as ml_service
+
+    interval = 900_000
+    # Hyperliquid collector rows: open_time holds the close time
+    candles = [
+        {
+            "open_time": i * interval + interval - 1,
+            "open": 100.0 + i,
+            "high": 101.0 + i,
+            "low": 99.0 + i,
+            "close": 100.5 + i,
+            "volume": 10.0,
+        }
+        for i in range(80)
+    ]
+    monkeypatch.setattr(ml_service, "load_model", lambda path: FakeModel())
+    monkeypatch.setattr(ml_service, "load_candles_from_mongo", lambda **kwargs: list(candles))
+
+    backend = InMemoryRedis()
+    first, second = (
+        ml_service.MLSignalService("model.joblib", lookback=30, context_days=0)
+        for _ in range(2)
+    )
+    first.signal_cache = SignalCache(backend)
+    second.signal_cache = SignalCache(backend)
+    second.evaluate_signal = lambda bar=None: pytest.fail("should reuse the shared signal")
+
+    bar = 78 * interval  # bar 79 is still forming
+    signal = first.evaluate_cached(bar)
+    assert signal["timestamp"] == bar
+    assert signal["indicator_snapshot"] == first.evaluate_signal(bar)["indicator_snapshot"]
+    assert second.evaluate_cached(bar)["timestamp"] == bar
@@ -0,0 +1,83 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from exchanges.hyperliquid.adapter import HyperliquidAdapter
+from interfaces.exchange import Order, OrderSide, OrderType
+from interfaces.strategy import MarketData
+
+META = {"universe": [{"name": "BTC", "szDecimals": 5}, {"name": "ETH", "szDecimals": 4}]}
+
+
+@pytest.fixture
+def adapter():
+    adapter = HyperliquidAdapter(private_key="0x" + "a" * 64, testnet=True, max_price_age=2.0)
+    adapter.is_connected = True
+    adapter.asset_meta.load(META)
+    adapter.info = Mock()
+    adapter.info.all_mids.return_value = {"BTC": "40000", "ETH": "3000"}
+    adapter.exchange = Mock()
+    adapter.exchange.wallet.address = "0x" + "b" * 40
+    adapter.exchange.bulk_orders.return_value = {
+        "status": "ok",
+        "response": {"data": {"statuses": [{"filled": {"oid": 1}}]}},
+    }
+    yield adapter
+    adapter.sdk.shutdown()
+
+
+def feed(prices, age=0.0):
+    now = time.time() - age
+    cache = {
+        asset: MarketData(asset=asset, price=price, volume_24h=0.0, timestamp=now)
+        for asset, price in prices.items()
+    }
+    return cache.get
+
+
+def market_buy(asset="BTC", size=0.001):
+    return Order(id="m1", asset=asset, side=OrderSide.BUY, size=size, order_type=OrderType.MARKET)
+
+
+@pytest.mark.asyncio
+async def test_market_order_uses_fresh_streamed_mid(adapter):
+    adapter.set_price_provider(feed({"BTC": 50000.0}))
+
+    assert await adapter.place_order(market_buy()) == "filled"
+
+    adapter.info.all_mids.assert_not_called()
+    [request] = adapter.exchange.bulk_orders.call_args[0][0]
+    assert request["limit_px"] == 50500.0
+
+
+@pytest.mark.asyncio
+async def test_stale_or_missing_mid_falls_back_to_rest(adapter):
+    adapter.set_price_provider(feed({"BTC": 50000.0}, age=5.0))
+    await adapter.place_order(market_buy())
+    [request] = adapter.exchange.bulk_orders.call_args[0][0]
+    assert request["limit_px"] == 40400.0
+
+    # Only the asset without a fresh mid triggers the (single) REST fetch
+    adapter.set_price_provider(feed({"BTC": 50000.0}))
+    await adapter.place_orders([market_buy(), market_buy("ETH", 0.01)])
+    assert adapter.info.all_mids.call_count == 2
+    btc, eth = adapter.exchange.bulk_orders.call_args[0][0]
+    assert (btc["limit_px"], eth["limit_px"]) == (50500.0, 3030.0)
+
+
+@pytest.mark.asyncio
+async def test_close_position_skips_all_mids(adapter):
+    adapter.set_price_provider(feed({"BTC": 50000.0}))
+    adapter.info.user_state.return_value = {
+        "assetPositions": [{"position": {"coin": "BTC", "szi": "-0.0001", "entryPx": "51000"}}]
+    }
+
+    assert await adapter.close_position("BTC")
+
+    adapter.info.all_mids.assert_not_called()
+    [request] = adapter.exchange.bulk_orders.call_args[0][0]
+    # Reduce-only closes are exempt from the minimum order value
+    assert request["is_buy"] and request["reduce_only"]
+    assert request["sz"] == 0.0001
+    assert adapter.get_status()["prices"]["rest_fetches"] == 0
@@ -0,0 +1,266 @@
+import asyncio
+
+import pytest
+
+from core.risk_manager import RiskAction, RiskEvent
+from core.supervisor import BotSupervisor
+from interfaces.exchange import Balance, Order, OrderSide, OrderType
+from interfaces.strategy import MarketData, Position, TradingStrategy
+
+
+class FakeFeed:
+    instances = []
+
+    def __init__(self, testnet, **options):
+        self.testnet = testnet
+        self.options = options
+        self.price_callbacks = {}
+        self.user_subscriptions = []
+        self.fill_callbacks = []
+        self.candles = None
+        self.disconnected = False
+        FakeFeed.instances.append(self)
+
+    async def connect(self):
+        return True
+
+    async def disconnect(self):
+        self.disconnected = True
+
+    async def subscribe_price_updates(self, asset, callback):
+        self.price_callbacks.setdefault(asset, []).append(callback)
+
+    async def unsubscribe_price_updates(self, asset, callback):
+        self.price_callbacks.get(asset, []).remove(callback)
+
+    async def subscribe_user_updates(self, user, state_cb, event_cb):
+        self.user_subscriptions.append(user)
+
+    async def subscribe_order_updates(self, user, order_cb, fill_cb):
+        if fill_cb:
+            self.fill_callbacks.append(fill_cb)
+
+    def get_latest_data(self, asset):
+        return None
+
+    def get_latest_price(self, asset):
+        return None
+
+    def get_status(self):
+        return {}
+
+    async def tick(self, asset, price):
+        data = MarketData(asset=asset, price=price, volume_24h=0.0, timestamp=0.0)
+        for callback in list(self.price_callbacks.get(asset, [])):
+            await callback(data)
+
+
+class FakeExchange:
+    instances = []
+
+    def __init__(self, config):
+        self.config = config
+        self.is_connected = False
+        self.wallet_address = "0x" + "c" * 40
+        self.cancelled = []
+        self.cancel_all_calls = 0
+        self.open_orders = []
+        self.fills = []
+        self.positions = []
+        self.closed = []
+        FakeExchange.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+        return True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    @staticmethod
+    def parse_user_state(state, price_lookup):
+        return [], {}
+
+    def on_user_fills(self, payload):
+        self.fills.append(payload)
+
+    async def get_positions(self):
+        return list(self.positions)
+
+    async def close_position(self, asset, size=None):
+        self.closed.append(asset)
+        return True
+
+    async def get_balance(self, asset):
+        return Balance(asset=asset, available=1000.0, locked=0.0, total=1000.0)
+
+    async def get_open_orders(self):
+        return list(self.open_orders)
+
+    async def cancel_orders(self, order_ids):
+        self.cancelled.extend(order_ids)
+        return [True] * len(order_ids)
+
+    async def cancel_all_orders(self):
+        self.cancel_all_calls += 1
+        return 0
+
+    async def get_account_metrics(self):
+        return {"total_value": 1000.0}
+
+    def get_status(self):
+        return {"connected": self.is_connected}
+
+
+class RecordingStrategy(TradingStrategy):
+    def __init__(self, fail=False):
+        super().__init__("recording", {})
+        self.fail = fail
+        self.assets = []
+
+    def generate_signals(self, market_data, positions, balance):
+        self.assets.append(market_data.asset)
+        if self.fail:
+            raise RuntimeError("strategy bug")
+        return []
+
+
+def bot_config(symbol, key="k1"):
+    return {
+        "log_level": "ERROR",
+        "exchange": {"type": "hyperliquid", "testnet": True},
+        "strategy": {"type": "basic_grid", "symbol": symbol, "levels": 5, "range_pct": 5},
+        "bot_config": {"name": symbol, "key": key},
+    }
+
+
+def make_supervisor(configs):
+    FakeFeed.instances.clear()
+    FakeExchange.instances.clear()
+
+    def key_resolver(testnet, bot_cfg):
+        if bot_cfg["key"] is None:
+            raise ValueError("no private key configured")
+        return bot_cfg["key"]
+
+    return BotSupervisor(
+        configs,
+        feed_factory=FakeFeed,
+        exchange_factory=FakeExchange,
+        key_resolver=key_resolver,
+    )
+
+
+@pytest.mark.asyncio
+async def test_bots_share_one_feed_exchange_and_account_cache():
+    supervisor = make_supervisor(
+        {"btc": bot_config("BTC"), "eth": bot_config("ETH"), "sol": bot_config("SOL")}
+    )
+    assert await supervisor.initialize()
+
+    assert len(FakeFeed.instances) == 1
+    assert len(FakeExchange.instances) == 1
+    feed, exchange = FakeFeed.instances[0], FakeExchange.instances[0]
+    engines = supervisor.engines.values()
+    assert all(e.market_data is feed and e.exchange is exchange for e in engines)
+    assert len({id(e.account_state) for e in engines}) == 1
+    # Account feed and fill forwarding wired once, not per bot
+    assert feed.user_subscriptions == [exchange.wallet_address]
+    assert feed.fill_callbacks.count(exchange.on_user_fills) == 1
+
+
+@pytest.mark.asyncio
+async def test_accounts_and_paper_bots_share_one_feed_per_network():
+    paper = {**bot_config("ETH"), "paper": {"enabled": True}}
+    mainnet = bot_config("SOL", key="k3")
+    mainnet["exchange"] = {"type": "hyperliquid", "testnet": False}
+    supervisor = make_supervisor(
+        {"a": bot_config("BTC"), "b": bot_config("ETH", key="k2"), "paper": paper, "main": mainnet}
+    )
+    assert await supervisor.initialize()
+
+    assert len(FakeExchange.instances) == 3
+    assert sorted(feed.testnet for feed in FakeFeed.instances) == [False, True]
+    testnet_feed = supervisor.feeds[True]
+    assert len(testnet_feed.user_subscriptions) == 2  # both accounts, one socket
+    assert all(supervisor.engines[name].market_data is testnet_feed for name in ("a", "b", "paper"))
+
+
+@pytest.mark.asyncio
+async def test_ticks_are_routed_by_asset_and_errors_stay_contained():
+    supervisor = make_supervisor(
+        {"btc": bot_config("BTC"), "eth": bot_config("ETH"), "broken": bot_config("DOGE", key=None)}
+    )
+    assert await supervisor.initialize()
+    assert set(supervisor.engines) == {"btc", "eth"}
+    assert "no private key" in supervisor.failed["broken"]
+
+    btc, eth = RecordingStrategy(fail=True), RecordingStrategy()
+    supervisor.engines["btc"].strategy = btc
+    supervisor.engines["eth"].strategy = eth
+    for engine in supervisor.engines.values():
+        engine.risk_manager = None
+
+    run = asyncio.create_task(supervisor.run())
+    feed = FakeFeed.instances[0]
+    while len(feed.price_callbacks) < 2:
+        await asyncio.sleep(0)
+    await feed.tick("BTC", 100.0)
+    await feed.tick("ETH", 10.0)
+    await feed.tick("BTC", 101.0)
+
+    assert btc.assets == ["BTC", "BTC"]
+    assert eth.assets == ["ETH"]
+
+    await supervisor.stop()
+    await asyncio.gather(run, return_exceptions=True)
+    assert feed.disconnected
+    assert feed.price_callbacks == {"BTC": [], "ETH": []}
+
+
+@pytest.mark.asyncio
+async def test_shared_exchange_only_cancels_and_reconciles_own_orders():
+    supervisor = make_supervisor({"btc": bot_config("BTC"), "eth": bot_config("ETH")})
+    assert await supervisor.initialize()
+    btc = supervisor.engines["btc"]
+    exchange = FakeExchange.instances[0]
+
+    ours = Order(id="o1", asset="BTC", side=OrderSide.BUY, size=1.0, order_type=OrderType.LIMIT, price=100.0)
+    ours.exchange_order_id = "101"
+    btc.order_tracker.track(ours)
+    foreign = Order(id="x", asset="ETH", side=OrderSide.SELL, size=1.0, order_type=OrderType.LIMIT, price=10.0)
+    foreign.exchange_order_id = "202"
+    exchange.open_orders = [ours, foreign]
+
+    await btc._reconcile_orders()
+    assert btc.order_tracker.get_by_oid("202") is None
+
+    assert await btc._cancel_orders() == 1
+    assert exchange.cancelled == ["101"]
+    assert exchange.cancel_all_calls == 0
+    await supervisor.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_exchange_risk_actions_only_touch_own_positions():
+    supervisor = make_supervisor({"btc": bot_config("BTC"), "eth": bot_config("ETH")})
+    assert await supervisor.initialize()
+    btc = supervisor.engines["btc"]
+    exchange = FakeExchange.instances[0]
+    exchange.positions = [
+        Position("BTC", 1.0, 100.0, 100.0, 0.0, 0.0),
+        Position("ETH", 2.0, 10.0, 20.0, 0.0, 0.0),
+    ]
+    btc.account_state = None
+
+    assert [p.asset for p in await btc._get_positions()] == ["BTC"]
+
+    await btc._execute_risk_action(
+        RiskEvent("max_drawdown", "SYSTEM", RiskAction.EMERGENCY_EXIT, "dd", "CRITICAL", {})
+    )
+    foreign = RiskEvent("stop_loss", "ETH", RiskAction.CLOSE_POSITION, "sl", "HIGH", {})
+    await btc._execute_risk_action(foreign)
+
+    assert exchange.closed == ["BTC"]
+    assert not btc.strategy.is_active
+    await supervisor.stop()
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from tools.benchmarks import synthetic_candles
+from tools.sweep import (
+    SharedCandles,
+    _attach,
+    apply_params,
+    array_to_candles,
+    combination_at,
+    expand_space,
+    parse_space,
+    parse_values,
+    rank_results,
+    run_sweep,
+)
+
+
+def test_parse_values_and_aliases():
+    assert parse_values("5,10,20") == [5, 10, 20]
+    assert parse_values("2:10:2") == [2, 4, 6, 8, 10]
+    assert parse_values("0.01:0.03:0.01") == [0.01, 0.02, 0.03]
+    assert parse_values([0.05, 0.1]) == [0.05, 0.1]
+    with pytest.raises(ValueError):
+        parse_values("5:1:1")
+
+    space = parse_space(["levels=5,10"], {"risk_management.max_drawdown_pct": [10, 20]})
+    assert space == {"risk_management.max_drawdown_pct": [10, 20], "strategy.levels": [5, 10]}
+
+
+def test_grid_and_random_expansion():
+    space = {"a": [1, 2, 3], "b": ["x", "y"], "c": [0.1, 0.2]}
+    grid = expand_space(space)
+    assert len(grid) == 12
+    assert grid == [combination_at(space, idx) for idx in range(12)]
+
+    sampled = expand_space(space, samples=5, seed=1)
+    assert len(sampled) == 5
+    assert len({tuple(combo.values()) for combo in sampled}) == 5
+    assert all(combo in grid for combo in sampled)
+    assert expand_space(space, samples=5, seed=1) == sampled
+
+
+def test_apply_params_sets_nested_paths_on_a_copy():
+    config = {"strategy": {"levels": 10, "momentum": {"window_minutes": 720}}}
+    swept = apply_params(
+        config, {"strategy.levels": 5, "strategy.momentum.drop_thresholds": 0.03, "ml.enter_threshold": 0.7}
+    )
+    assert swept["strategy"]["levels"] == 5
+    assert swept["strategy"]["momentum"] == {"window_minutes": 720, "drop_thresholds": 0.03}
+    assert swept["ml"] == {"enter_threshold": 0.7}
+    assert config["strategy"]["levels"] == 10
+
+
+def test_shared_candles_round_trip():
+    candles = synthetic_candles(50)
+    with SharedCandles(candles) as shared:
+        shm = _attach(shared.name)
+        restored = array_to_candles(np.ndarray(shared.shape, dtype=np.float64, buffer=shm.buf))
+        shm.close()
+    assert restored == [
+        {key: candle[key] for key in ("open_time", "open", "high", "low", "close", "volume")}
+        for candle in candles
+    ]
+
+
+def test_sweep_runs_on_process_pool_and_ranks():
+    config = {
+        "strategy": {"type": "basic_grid", "symbol": "BTC", "total_allocation": 500},
+        "risk_management": {"max_drawdown_pct": 90, "max_position_size_pct": 100},
+    }
+    combinations = expand_space({"strategy.levels": [4, 8], "strategy.range_pct": [2, 4]})
+    combinations.append({"strategy.type": "unknown"})
+
+    rows = list(run_sweep(config, synthetic_candles(400), combinations, workers=2))
+    ranked = rank_results(rows, "return_pct")
+
+    assert sorted(row["id"] for row in rows) == list(range(5))
+    assert [row["rank"] for row in ranked[:4]] == [1, 2, 3, 4]
+    scores = [row["score"] for row in ranked[:4]]
+    assert scores == sorted(scores, reverse=True)
+    assert "error" in ranked[-1] and ranked[-1]["params"] == {"strategy.type": "unknown"}
+    assert all(row["bars"] == 400 for row in ranked[:4])
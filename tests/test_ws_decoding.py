@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from exchanges.hyperliquid.market_data import HyperliquidMarketData, extract_all_mids
+from tools.benchmarks import synthetic_all_mids
+from utils import json_codec
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_extract_all_mids_matches_full_decode(seed):
+    frame = synthetic_all_mids(coins=300, seed=seed)
+    mids = json.loads(frame)["data"]["mids"]
+    assets = {"BTC", "ETH", "@7", "COIN12"}
+
+    assert extract_all_mids(frame, assets) == {asset: mids[asset] for asset in assets}
+    assert extract_all_mids(frame.encode(), {"BTC"}) == {"BTC": mids["BTC"]}
+
+
+def test_extract_all_mids_rejects_other_frames():
+    assert extract_all_mids('{"channel":"trades","data":[]}', {"BTC"}) is None
+    assert extract_all_mids('{"channel":"allMids","data":{"mids":{"ETH":"1"}}}', {"BTC"}) is None
+    # Only exact keys match, not coins whose names end with the asset
+    frame = '{"channel":"allMids","data":{"mids":{"UBTC":"1","BTC":"2"}}}'
+    assert extract_all_mids(frame, {"BTC"}) == {"BTC": "2"}
+
+
+def test_decoder_fallback():
+    name, decode, errors = json_codec.get_decoder("json")
+    assert name == "json"
+    assert decode('{"a": 1}') == {"a": 1}
+    with pytest.raises(errors):
+        decode("{not json")
+    assert json_codec.DECODER_NAME in json_codec.BACKENDS
+    with pytest.raises(ValueError):
+        json_codec.get_decoder("yaml")
+
+
+@pytest.mark.asyncio
+async def test_raw_frames_reach_subscribers_via_both_paths():
+    md = HyperliquidMarketData(candle_timeframes=None)
+    prices = []
+    await md.subscribe_price_updates("BTC", lambda data: prices.append(data.price))
+
+    await md._process_raw_message(synthetic_all_mids(coins=100, seed=1))
+    # Non-compact JSON misses the fast path and is decoded in full
+    await md._process_raw_message('{"channel": "allMids", "data": {"mids": {"BTC": "101.5"}}}')
+    await md._process_raw_message('{"channel":"subscriptionResponse","data":{}}')
+
+    expected = float(json.loads(synthetic_all_mids(coins=100, seed=1))["data"]["mids"]["BTC"])
+    assert prices == [expected, 101.5]